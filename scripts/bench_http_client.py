@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Benchmark pooled keep-alive fetches against per-request urlopen on a local stub server."""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from quantsentinel.infra.providers.http_client import HttpClient
+
+
+def _payload(bars: int) -> bytes:
+    quote = {k: [100.0 + i * 0.01 for i in range(bars)] for k in ("open", "high", "low", "close", "volume")}
+    body = {"chart": {"result": [{"timestamp": list(range(bars)), "indicators": {"quote": [quote]}}], "error": None}}
+    return json.dumps(body).encode()
+
+
+def _server(bars: int, connect_delay: float) -> ThreadingHTTPServer:
+    raw = _payload(bars)
+    packed = gzip.compress(raw)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def setup(self) -> None:
+            # Stand-in for the TCP+TLS handshake cost of a new connection to a remote host.
+            time.sleep(connect_delay)
+            super().setup()
+
+        def do_GET(self) -> None:
+            gz = "gzip" in self.headers.get("Accept-Encoding", "")
+            body = packed if gz else raw
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if gz:
+                self.send_header("Content-Encoding", "gzip")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--bars", type=int, default=5, help="bars per response (small incremental fetch)")
+    parser.add_argument("--connect-delay-ms", type=float, default=30.0)
+    args = parser.parse_args()
+
+    srv = _server(args.bars, args.connect_delay_ms / 1000.0)
+    url = f"http://127.0.0.1:{srv.server_address[1]}/v8/finance/chart/T?interval=1d"
+
+    started = time.perf_counter()
+    plain_bytes = 0
+    for _ in range(args.requests):
+        with urllib.request.urlopen(url, timeout=10) as resp:
+            plain_bytes += len(resp.read())
+    urlopen_s = time.perf_counter() - started
+
+    client = HttpClient()
+    started = time.perf_counter()
+    for _ in range(args.requests):
+        client.get(url, timeout=10)
+    pooled_s = time.perf_counter() - started
+    client.close()
+    srv.shutdown()
+
+    print(f"requests={args.requests} bars={args.bars} connect_delay={args.connect_delay_ms:.0f}ms")
+    print(f"urlopen: {urlopen_s:.3f}s ({args.requests / urlopen_s:,.0f} req/s), {plain_bytes / args.requests:,.0f} B/resp")
+    print(f"pooled : {pooled_s:.3f}s ({args.requests / pooled_s:,.0f} req/s), connections={client.connections_opened}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
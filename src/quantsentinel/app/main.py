@@ -37,6 +37,7 @@ from quantsentinel.app.ui.state import (
 )
 from quantsentinel.common.config import get_settings
 from quantsentinel.i18n.gettext import get_translator
+from quantsentinel.infra.cache.price_cache import configure_price_cache
 from quantsentinel.infra.db.engine import db_healthcheck
 from quantsentinel.infra.db.models import LayoutWorkspace, UserRole
 from quantsentinel.services.audit_service import AuditService
@@ -50,6 +51,7 @@ from quantsentinel.services.rbac_service import AuditActionType, RBACService
 st.set_page_config(page_title="QuantSentinel", layout="wide")
 
 settings = get_settings()
+configure_price_cache(settings.price_cache_dir)
 auth_svc = AuthService()
 audit_svc = AuditService()
 
@@ -12,6 +12,7 @@ from quantsentinel.app.ui.components import (
 from quantsentinel.app.ui.drawer import Drawer
 from quantsentinel.app.ui.layout import render_workspace_shell
 from quantsentinel.app.ui.state import auth, push_toast
+from quantsentinel.domain.alerts.profiling import MONITOR_STAGES
 from quantsentinel.i18n.gettext import get_translator
 from quantsentinel.infra.db.models import AlertEventStatus, AlertRule
 from quantsentinel.infra.db.repos.alerts_repo import AlertRuleCreate
@@ -48,6 +49,10 @@ def render() -> None:
         st.divider()
         _render_events_section(t, can_mutate=can_mutate)
         st.divider()
+        _render_event_summary_section(t)
+        st.divider()
+        _render_performance_section(t)
+        st.divider()
         _render_recent_tasks_section(t)
 
     def _render_drawer() -> None:
@@ -277,6 +282,94 @@ def _render_events_section(t, *, can_mutate: bool) -> None:
                 st.caption(f"{t('Status')}: {ev.status.value}")
 
 
+def _render_event_summary_section(t) -> None:
+    st.header(t("Alert Event Summary"))
+    days = st.selectbox(t("Period (days)"), options=[7, 30, 90], index=1, key="monitor_rollup_days")
+    summary = AlertsService().event_rollups(days=int(days), top=10)
+    totals = summary["totals"]
+    if not totals["total"]:
+        render_empty_state(t("No alert events in this period."))
+        return
+
+    col_total, col_new, col_acked = st.columns(3)
+    col_total.metric(t("Events"), totals["total"])
+    col_new.metric(t("New"), totals["new"])
+    col_acked.metric(t("Acknowledged"), totals["acked"])
+
+    st.subheader(t("Events per Day"))
+    st.bar_chart(
+        {
+            t("New"): {row["day"]: row["new"] for row in summary["by_day"]},
+            t("Acknowledged"): {row["day"]: row["acked"] for row in summary["by_day"]},
+        }
+    )
+
+    col_rules, col_tickers = st.columns(2)
+    with col_rules:
+        st.subheader(t("Top Rules"))
+        st.dataframe(
+            [
+                {t("Rule"): r["name"], t("Severity"): r["severity"], t("New"): r["new"], t("Acknowledged"): r["acked"]}
+                for r in summary["by_rule"]
+            ]
+        )
+    with col_tickers:
+        st.subheader(t("Top Tickers"))
+        st.dataframe(
+            [{t("Ticker"): r["ticker"], t("New"): r["new"], t("Acknowledged"): r["acked"]} for r in summary["by_ticker"]]
+        )
+
+    st.subheader(t("Events by Severity"))
+    st.bar_chart({t("Events"): {r["severity"]: r["total"] for r in summary["by_severity"]}})
+
+
+def _render_performance_section(t) -> None:
+    st.header(t("Monitor Performance"))
+    profiles = AlertsService().list_cycle_profiles(limit=20)
+    if not profiles:
+        render_empty_state(t("No monitor cycle profiles yet."))
+        return
+
+    latest = profiles[0]
+    col_total, col_queries, col_trigger = st.columns(3)
+    col_total.metric(t("Cycle Time (ms)"), f"{latest.get('total_ms', 0):.0f}")
+    col_queries.metric(t("Queries"), latest.get("queries", 0))
+    col_trigger.metric(t("Trigger"), latest.get("trigger", ""))
+
+    stages = latest.get("stages_ms") or {}
+    ordered = [s for s in MONITOR_STAGES if s in stages] + [s for s in stages if s not in MONITOR_STAGES]
+    st.subheader(t("Stage Timings"))
+    st.bar_chart({t("Milliseconds"): {s: stages[s] for s in ordered}})
+
+    if latest.get("rule_types_ms"):
+        st.subheader(t("Evaluation Time by Rule Type"))
+        st.bar_chart({t("Milliseconds"): latest["rule_types_ms"]})
+
+    st.subheader(t("Slowest Rules"))
+    rules = latest.get("rules") or []
+    if rules:
+        st.dataframe(
+            [
+                {
+                    t("Rule"): r.get("name") or r.get("rule_id"),
+                    t("Rule Type"): r.get("rule_type"),
+                    t("Tickers"): r.get("tickers"),
+                    t("Total (ms)"): r.get("total_ms"),
+                    "p50 (ms)": r.get("p50_ms"),
+                    "p95 (ms)": r.get("p95_ms"),
+                    t("Queries"): r.get("queries"),
+                }
+                for r in rules
+            ]
+        )
+    else:
+        st.caption(t("No rules evaluated in the last cycle."))
+
+    if len(profiles) > 1:
+        st.subheader(t("Recent Cycles"))
+        st.line_chart({t("Cycle Time (ms)"): {p["ts"]: p.get("total_ms", 0) for p in reversed(profiles)}})
+
+
 def _run_monitor_cycle(t) -> None:
     task_svc = TaskService()
     try:
@@ -53,6 +53,22 @@ class Settings(BaseSettings):
     celery_broker_url: str = Field("redis://redis:6379/1", alias="CELERY_BROKER_URL")
     celery_result_backend: str = Field("redis://redis:6379/2", alias="CELERY_RESULT_BACKEND")
 
+    # Share provider rate-limit token buckets across workers through REDIS_URL.
+    provider_rate_limit_redis: bool = Field(False, alias="PROVIDER_RATE_LIMIT_REDIS")
+
+    # On-disk cache of raw provider responses (None disables). Offline mode replays
+    # cached payloads only and never touches the network. Entries older than the max
+    # age are pruned (0 keeps everything).
+    provider_cache_dir: str | None = Field(None, alias="PROVIDER_CACHE_DIR")
+    provider_cache_offline: bool = Field(False, alias="PROVIDER_CACHE_OFFLINE")
+    provider_cache_max_age_days: int = Field(30, alias="PROVIDER_CACHE_MAX_AGE_DAYS")
+
+    # -----------------------------
+    # Local price cache (optional, per node) and Parquet price lake
+    # -----------------------------
+    price_cache_dir: str | None = Field(None, alias="PRICE_CACHE_DIR")
+    price_lake_dir: str = Field("artifacts/lake", alias="PRICE_LAKE_DIR")
+
     # -----------------------------
     # Email (optional)
     # -----------------------------
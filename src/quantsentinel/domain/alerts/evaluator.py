@@ -1,5 +1,263 @@
-"""Alert evaluation engine"""
+"""
+Alert evaluation engine.
 
+Pure, DB-free evaluation of monitor rules against an in-memory price panel.
+Features (return stats, moving averages, correlations) are computed once per
+(ticker, feature, window) by ``FeatureCache`` and shared by every rule that
+needs them, e.g. one 20-bar return stdev serves all ``volatility`` and
+``z_score`` rules with ``lookback=20``. Correlations are computed for all
+tickers at once per (benchmark, lookback), by default from scratch or, given a
+``correlate`` hook such as ``RollingCorrelations.correlations``, from state kept
+across cycles.
+"""
 
-def evaluate_alert():
-    pass
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, TypeVar
+
+import numpy as np
+
+from quantsentinel.domain.alerts.expression import evaluate
+from quantsentinel.domain.alerts.models import AlertHit
+from quantsentinel.domain.market.correlation import correlations_to_benchmark
+from quantsentinel.domain.market.models import PricePanel, PriceSeries
+
+T = TypeVar("T")
+
+# (panel, tickers, benchmark, lookback) -> correlation per ticker
+Correlate = Callable[[PricePanel, list[str], str, int], dict[str, float | None]]
+
+
+@dataclass(frozen=True)
+class RuleSpec:
+    """Evaluation-time view of an alert rule, independent of the ORM model."""
+
+    rule_id: Any
+    rule_type: str
+    params: Mapping[str, Any]
+    tickers: tuple[str, ...] = ()
+
+    @classmethod
+    def from_rule(cls, rule: Any, tickers: Iterable[str] = ()) -> RuleSpec:
+        """Build from any object exposing ``id``, ``rule_type`` and ``params_json``."""
+        return cls(
+            rule_id=getattr(rule, "id", None),
+            rule_type=(rule.rule_type or "").strip(),
+            params=dict(rule.params_json or {}),
+            tickers=tuple(tickers),
+        )
+
+
+def required_history(rule_type: str, params: Mapping[str, Any]) -> int:
+    """Number of most recent bars per ticker a rule needs to be evaluated exactly."""
+    rtype = (rule_type or "").strip()
+    if rtype in ("z_score", "volatility", "correlation_break"):
+        return int(params.get("lookback", 20)) + 1
+    if rtype == "missing_data":
+        return int(params.get("lookback_days", 30))
+    if rtype == "custom_expression":
+        return max(int(params.get("lookback", 20)) + 1, 60)
+    return 2
+
+
+def benchmark_tickers(rules: Iterable[RuleSpec]) -> set[str]:
+    """Benchmark tickers referenced by ``correlation_break`` rules."""
+    out: set[str] = set()
+    for rule in rules:
+        if rule.rule_type == "correlation_break":
+            bench = str(rule.params.get("benchmark_ticker", "")).strip()
+            if bench:
+                out.add(bench)
+    return out
+
+
+def _returns(closes: np.ndarray) -> np.ndarray:
+    prev = closes[:-1]
+    mask = prev != 0
+    return closes[1:][mask] / prev[mask] - 1.0
+
+
+class FeatureCache:
+    """Memoized per-ticker features over a price panel."""
+
+    def __init__(self, panel: PricePanel, *, correlate: Correlate = correlations_to_benchmark) -> None:
+        self._panel = panel
+        self._correlate = correlate
+        self._memo: dict[tuple[Any, ...], Any] = {}
+        self.computed = 0
+        self.reused = 0
+
+    def _cached(self, key: tuple[Any, ...], fn: Callable[[], T]) -> T:
+        if key in self._memo:
+            self.reused += 1
+            return self._memo[key]
+        self.computed += 1
+        value = fn()
+        self._memo[key] = value
+        return value
+
+    def series(self, ticker: str) -> PriceSeries:
+        return self._panel.get(ticker) or PriceSeries.empty(ticker)
+
+    def last_close(self, ticker: str) -> tuple[date | None, float | None]:
+        s = self.series(ticker)
+        if not len(s):
+            return None, None
+        return s.last_date, float(s.closes[-1])
+
+    def return_stats(self, ticker: str, lookback: int) -> tuple[float | None, float | None]:
+        """(mean, population stdev) of the last ``lookback`` simple returns."""
+
+        def _compute() -> tuple[float | None, float | None]:
+            closes = self.series(ticker).closes[-(max(lookback, 1) + 1) :]
+            if closes.shape[0] < 3:
+                return None, None
+            rets = _returns(closes)
+            if rets.shape[0] < 2:
+                return None, None
+            return float(rets.mean()), float(rets.std())
+
+        return self._cached((ticker, "return_stats", lookback), _compute)
+
+    def pct_change(self, ticker: str, days: int = 1) -> tuple[date | None, float | None]:
+        """Percent change over the last ``days`` bars, as of the latest bar."""
+
+        def _compute() -> tuple[date | None, float | None]:
+            s = self.series(ticker)
+            closes = s.closes[-(days + 1) :]
+            if closes.shape[0] < 2:
+                return None, None
+            start = float(closes[0])
+            if start == 0:
+                return s.last_date, None
+            return s.last_date, ((float(closes[-1]) - start) / start) * 100.0
+
+        return self._cached((ticker, "pct_change", days), _compute)
+
+    def mean_close(self, ticker: str, window: int) -> float | None:
+        def _compute() -> float | None:
+            closes = self.series(ticker).closes[-max(window, 1) :]
+            return float(closes.mean()) if closes.shape[0] else None
+
+        return self._cached((ticker, "mean_close", window), _compute)
+
+    def n_points(self, ticker: str, window: int) -> int:
+        return min(len(self.series(ticker)), max(window, 1))
+
+    def correlation(self, ticker: str, benchmark: str, lookback: int) -> float | None:
+        """Correlation of date-aligned returns over the last ``lookback + 1`` common bars."""
+        return self.correlations(benchmark, lookback).get(ticker)
+
+    def correlations(self, benchmark: str, lookback: int) -> dict[str, float | None]:
+        """Correlations of every panel ticker with ``benchmark``, computed in one vectorized pass."""
+        return self._cached(
+            ("*", "correlation", benchmark, lookback),
+            lambda: self._correlate(self._panel, list(self._panel), benchmark, lookback),
+        )
+
+
+def evaluate_rule(rule: RuleSpec, ticker: str, features: FeatureCache, *, today: date) -> list[AlertHit]:
+    """Evaluate one rule for one ticker; returns zero or one hit."""
+    params = rule.params
+    rtype = rule.rule_type
+
+    def _hit(message: str, context: dict[str, Any], asof_date: date | None) -> list[AlertHit]:
+        return [AlertHit(message=message, context=context, asof_date=asof_date, rule_id=rule.rule_id, ticker=ticker)]
+
+    if rtype == "threshold":
+        asof_date, value = features.last_close(ticker)
+        threshold = float(params.get("value", 0))
+        op = str(params.get("operator", "<")).strip()
+        if asof_date is None or value is None:
+            return []
+        if (op == "<" and value < threshold) or (op == ">" and value > threshold):
+            return _hit(f"{ticker}: last close {value:.4f} {op} {threshold:.4f}", {"last_close": value}, asof_date)
+        return []
+
+    if rtype == "z_score":
+        lookback = int(params.get("lookback", 20))
+        threshold = float(params.get("threshold", 2.0))
+        mean, std = features.return_stats(ticker, lookback)
+        asof_date, pct = features.pct_change(ticker, 1)
+        if mean is None or std in (None, 0) or pct is None:
+            return []
+        z = ((pct / 100.0) - mean) / std
+        if abs(z) >= threshold:
+            return _hit(f"{ticker}: z-score {z:.2f} exceeds {threshold:.2f}", {"z": z}, asof_date)
+        return []
+
+    if rtype == "volatility":
+        lookback = int(params.get("lookback", 20))
+        threshold = float(params.get("threshold", 0.03))
+        asof_date, _ = features.last_close(ticker)
+        _, std = features.return_stats(ticker, lookback)
+        if std is not None and std >= threshold:
+            return _hit(f"{ticker}: volatility {std:.4f} >= {threshold:.4f}", {"vol": std}, asof_date)
+        return []
+
+    if rtype == "staleness":
+        max_days = int(params.get("max_days", 7))
+        latest = features.series(ticker).last_date
+        if latest is None or (today - latest).days >= max_days:
+            return _hit(f"{ticker}: stale data", {"max_days": max_days}, latest)
+        return []
+
+    if rtype == "missing_data":
+        lookback = int(params.get("lookback_days", 30))
+        min_points = int(params.get("min_points", lookback))
+        n = features.n_points(ticker, lookback)
+        if n < min_points:
+            return _hit(f"{ticker}: missing data points ({n}/{min_points})", {}, features.series(ticker).last_date)
+        return []
+
+    if rtype == "correlation_break":
+        benchmark = str(params.get("benchmark_ticker", ""))
+        lookback = int(params.get("lookback", 20))
+        threshold = float(params.get("min_corr", 0.2))
+        corr = features.correlation(ticker, benchmark, lookback)
+        if corr is None:
+            return []
+        asof_date, _ = features.last_close(ticker)
+        if corr <= threshold:
+            return _hit(f"{ticker}: corr({benchmark})={corr:.3f} <= {threshold:.3f}", {"correlation": corr}, asof_date)
+        return []
+
+    if rtype == "custom_expression":
+        expr = str(params.get("expression", ""))
+        asof_date, close = features.last_close(ticker)
+        _, ret_pct = features.pct_change(ticker, 1)
+        mean, vol = features.return_stats(ticker, int(params.get("lookback", 20)))
+        ret = (ret_pct or 0.0) / 100.0
+        z = 0.0 if mean is None or vol in (None, 0) else (ret - mean) / vol
+        values = {
+            "close": float(close or 0),
+            "ret": ret,
+            "vol": float(vol or 0),
+            "z": z,
+            "ma20": features.mean_close(ticker, 20) or 0.0,
+            "ma60": features.mean_close(ticker, 60) or 0.0,
+        }
+        if evaluate(expr, values):
+            return _hit(f"{ticker}: custom expression triggered", {"expression": expr}, asof_date)
+        return []
+
+    return []
+
+
+def evaluate_rules(
+    panel: PricePanel,
+    rules: Iterable[RuleSpec],
+    *,
+    today: date,
+    features: FeatureCache | None = None,
+) -> list[AlertHit]:
+    """Evaluate every rule over its ``tickers`` against ``panel``, sharing features across rules."""
+    cache = features or FeatureCache(panel)
+    hits: list[AlertHit] = []
+    for rule in rules:
+        for ticker in rule.tickers:
+            hits.extend(evaluate_rule(rule, ticker, cache, today=today))
+    return hits
@@ -4,8 +4,11 @@ from __future__ import annotations
 
 import ast
 from collections.abc import Mapping
+from functools import reduce
 from typing import Any
 
+import numpy as np
+
 _ALLOWED_VARIABLES = {"close", "ret", "vol", "z", "ma20", "ma60"}
 _ALLOWED_FUNCTIONS = {"abs": abs, "min": min, "max": max}
 _FORBIDDEN_NAMES = {"eval", "exec", "__import__"}
@@ -40,6 +43,24 @@ _ALLOWED_NODES = {
 }
 
 
+_VECTOR_BINOPS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.true_divide,
+    ast.Mod: np.mod,
+    ast.Pow: np.power,
+}
+_VECTOR_CMPOPS = {
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+}
+
+
 class ExpressionValidationError(ValueError):
     """Raised when an expression violates safety rules."""
 
@@ -84,3 +105,98 @@ def evaluate(expr: str, values: Mapping[str, float | int] | None = None) -> bool
     code = compile(parsed, "<alert-expression>", "eval")
     result = eval(code, {"__builtins__": {}}, {**_ALLOWED_FUNCTIONS, **context})
     return bool(result)
+
+
+def _truthy(value: Any) -> Any:
+    return np.not_equal(value, 0)
+
+
+def _eval_vector(node: ast.AST, context: Mapping[str, Any]) -> tuple[Any, Any]:
+    """
+    Return ``(value, raised)`` for ``node``.
+
+    ``raised`` marks elements for which scalar evaluation would have raised,
+    honouring short-circuiting of ``and``/``or`` and conditional expressions.
+    """
+    if isinstance(node, ast.Expression):
+        return _eval_vector(node.body, context)
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, bool | int | float):
+            return float(node.value), False
+        raise ExpressionValidationError("Only numeric constants are supported")
+    if isinstance(node, ast.Name):
+        return context[node.id], False
+    if isinstance(node, ast.BoolOp):
+        # Python semantics: `a and b` -> a if not a else b; `a or b` -> a if a else b.
+        result, raised = _eval_vector(node.values[0], context)
+        for operand in node.values[1:]:
+            value, value_raised = _eval_vector(operand, context)
+            take = _truthy(result) if isinstance(node.op, ast.And) else np.logical_not(_truthy(result))
+            raised = raised | (take & value_raised)
+            result = np.where(take, value, result)
+        return result, raised
+    if isinstance(node, ast.UnaryOp):
+        operand, raised = _eval_vector(node.operand, context)
+        if isinstance(node.op, ast.Not):
+            return np.logical_not(_truthy(operand)), raised
+        return (np.negative(operand) if isinstance(node.op, ast.USub) else operand), raised
+    if isinstance(node, ast.BinOp):
+        left, left_raised = _eval_vector(node.left, context)
+        right, right_raised = _eval_vector(node.right, context)
+        raised = left_raised | right_raised
+        if isinstance(node.op, ast.Div | ast.Mod):
+            raised = raised | np.equal(right, 0)
+        elif isinstance(node.op, ast.Pow):
+            raised = raised | (np.equal(left, 0) & np.less(right, 0))
+        return _VECTOR_BINOPS[type(node.op)](left, right), raised
+    if isinstance(node, ast.Compare):
+        left, raised = _eval_vector(node.left, context)
+        result: Any = True
+        for op, comparator in zip(node.ops, node.comparators, strict=True):
+            right, right_raised = _eval_vector(comparator, context)
+            raised = raised | (result & right_raised)
+            result = np.logical_and(result, _VECTOR_CMPOPS[type(op)](left, right))
+            left = right
+        return result, raised
+    if isinstance(node, ast.IfExp):
+        test, raised = _eval_vector(node.test, context)
+        body, body_raised = _eval_vector(node.body, context)
+        orelse, orelse_raised = _eval_vector(node.orelse, context)
+        cond = _truthy(test)
+        raised = raised | np.where(cond, body_raised, orelse_raised)
+        return np.where(cond, body, orelse), raised
+    if isinstance(node, ast.Call):
+        evaluated = [_eval_vector(arg, context) for arg in node.args]
+        args = [value for value, _ in evaluated]
+        raised = reduce(np.logical_or, [r for _, r in evaluated], False)
+        name = node.func.id  # type: ignore[attr-defined]
+        if name == "abs" and len(args) == 1:
+            return np.abs(args[0]), raised
+        if name in ("min", "max") and len(args) >= 2:
+            return reduce(np.minimum if name == "min" else np.maximum, args), raised
+        raise ExpressionValidationError(f"Unsupported call signature for '{name}'")
+    raise ExpressionValidationError(f"Unsupported syntax: {type(node).__name__}")
+
+
+def evaluate_vectorized(expr: str, columns: Mapping[str, np.ndarray], *, size: int | None = None) -> np.ndarray:
+    """
+    Evaluate an alert expression element-wise over equal-length feature columns.
+
+    Same whitelist and truthiness as ``evaluate``. Elements for which scalar
+    evaluation would raise (division or modulo by zero) evaluate to False.
+    """
+    parsed = ast.parse(expr, mode="eval")
+    _validate_ast(parsed)
+
+    unknown = set(columns) - _ALLOWED_VARIABLES
+    if unknown:
+        unknown_fmt = ", ".join(sorted(unknown))
+        raise ExpressionValidationError(f"Unknown variables provided: {unknown_fmt}")
+    n = size if size is not None else max((np.shape(v)[0] for v in columns.values()), default=1)
+    context: dict[str, Any] = {name: np.zeros(n) for name in _ALLOWED_VARIABLES}
+    context.update({name: np.asarray(col, dtype=np.float64) for name, col in columns.items()})
+
+    with np.errstate(all="ignore"):
+        value, raised = _eval_vector(parsed, context)
+        hits = np.broadcast_to(_truthy(value), (n,))
+        return hits & ~np.broadcast_to(np.asarray(raised, dtype=bool), (n,))
@@ -14,6 +14,8 @@ class AlertHit:
     message: str
     context: dict[str, Any]
     asof_date: Any | None = None
+    rule_id: Any | None = None
+    ticker: str | None = None
 
 
 @dataclass(frozen=True)
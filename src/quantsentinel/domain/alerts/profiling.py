@@ -0,0 +1,147 @@
+"""
+Monitor cycle cost profile.
+
+Collects wall time per cycle stage, evaluation time per rule type and per-rule
+latency (one sample per scoped ticker: dedup lookup + evaluation), plus DB
+query counts when a query counter is supplied. ``to_dict`` produces the
+JSON-safe summary persisted with the cycle audit entry.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Generator, Iterable, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+# Stages in cycle order; unknown stage names are still recorded.
+MONITOR_STAGES = ("load_rules", "dedup", "load_prices", "evaluate", "write_events")
+
+# Slowest rules kept in a persisted profile.
+PROFILE_TOP_RULES = 20
+
+
+def _round(ms: float) -> float:
+    return round(float(ms), 3)
+
+
+@dataclass
+class RuleCost:
+    rule_id: str
+    rule_type: str
+    name: str = ""
+    queries: int = 0
+    ticker_ms: dict[str, float] = field(default_factory=dict)
+
+    def add(self, ticker: str, ms: float) -> None:
+        self.ticker_ms[ticker] = self.ticker_ms.get(ticker, 0.0) + ms
+
+    def to_dict(self) -> dict[str, Any]:
+        samples = np.fromiter(self.ticker_ms.values(), dtype=np.float64, count=len(self.ticker_ms))
+        p50, p95 = (np.percentile(samples, [50, 95]) if samples.size else (0.0, 0.0))
+        return {
+            "rule_id": self.rule_id,
+            "rule_type": self.rule_type,
+            "name": self.name,
+            "tickers": int(samples.size),
+            "total_ms": _round(samples.sum()),
+            "p50_ms": _round(p50),
+            "p95_ms": _round(p95),
+            "queries": self.queries,
+        }
+
+
+class CycleProfile:
+    """Mutable per-cycle profile; cheap enough to keep on for every cycle."""
+
+    def __init__(self, *, query_count: Callable[[], int] | None = None) -> None:
+        self._query_count = query_count or (lambda: 0)
+        self._started = time.perf_counter()
+        self.stages_ms: dict[str, float] = {}
+        self.stage_queries: dict[str, int] = {}
+        self.rule_types_ms: dict[str, float] = {}
+        self.rules: dict[str, RuleCost] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Generator[None, None, None]:
+        t0, q0 = time.perf_counter(), self._query_count()
+        try:
+            yield
+        finally:
+            self.stages_ms[name] = self.stages_ms.get(name, 0.0) + (time.perf_counter() - t0) * 1000.0
+            self.stage_queries[name] = self.stage_queries.get(name, 0) + self._query_count() - q0
+
+    @contextmanager
+    def measure(self, rule: Any, ticker: str, *, evaluation: bool) -> Generator[None, None, None]:
+        """Time one rule x ticker step; evaluation steps also count toward the rule type."""
+        cost = self._rule(rule)
+        t0, q0 = time.perf_counter(), self._query_count()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - t0) * 1000.0
+            cost.add(ticker, ms)
+            cost.queries += self._query_count() - q0
+            if evaluation:
+                self.rule_types_ms[cost.rule_type] = self.rule_types_ms.get(cost.rule_type, 0.0) + ms
+
+    def _rule(self, rule: Any) -> RuleCost:
+        key = str(getattr(rule, "id", None))
+        cost = self.rules.get(key)
+        if cost is None:
+            cost = RuleCost(
+                rule_id=key,
+                rule_type=(getattr(rule, "rule_type", "") or "").strip(),
+                name=str(getattr(rule, "name", "") or ""),
+            )
+            self.rules[key] = cost
+        return cost
+
+    def to_dict(self, *, top_rules: int = PROFILE_TOP_RULES) -> dict[str, Any]:
+        rules = sorted((c.to_dict() for c in self.rules.values()), key=lambda r: (-r["total_ms"], r["rule_id"]))
+        return {
+            "total_ms": _round((time.perf_counter() - self._started) * 1000.0),
+            "queries": self._query_count(),
+            "stages_ms": {k: _round(v) for k, v in self.stages_ms.items()},
+            "stage_queries": dict(self.stage_queries),
+            "rule_types_ms": {k: _round(v) for k, v in self.rule_types_ms.items()},
+            "rules": rules[:top_rules],
+        }
+
+
+def merge_profiles(profiles: Iterable[Mapping[str, Any] | None], *, top_rules: int = PROFILE_TOP_RULES) -> dict[str, Any]:
+    """
+    Combine shard profiles into one cycle profile.
+
+    Stage and rule-type times are summed (CPU time across shards, not wall time;
+    ``total_ms`` is the slowest shard). A rule split across shards gets summed
+    totals, the ticker-weighted mean p50 and the max p95.
+    """
+    out: dict[str, Any] = {"total_ms": 0.0, "queries": 0, "stages_ms": {}, "stage_queries": {}, "rule_types_ms": {}, "rules": []}
+    rules: dict[str, dict[str, Any]] = {}
+    for prof in profiles:
+        if not prof:
+            continue
+        out["total_ms"] = max(out["total_ms"], float(prof.get("total_ms", 0.0)))
+        out["queries"] += int(prof.get("queries", 0))
+        for key in ("stages_ms", "stage_queries", "rule_types_ms"):
+            for name, value in (prof.get(key) or {}).items():
+                out[key][name] = out[key].get(name, 0) + value
+        for rule in prof.get("rules") or []:
+            prev = rules.get(rule["rule_id"])
+            if prev is None:
+                rules[rule["rule_id"]] = dict(rule)
+                continue
+            n = prev["tickers"] + rule["tickers"]
+            prev["p50_ms"] = _round((prev["p50_ms"] * prev["tickers"] + rule["p50_ms"] * rule["tickers"]) / max(n, 1))
+            prev["p95_ms"] = max(prev["p95_ms"], rule["p95_ms"])
+            prev["tickers"] = n
+            prev["total_ms"] = _round(prev["total_ms"] + rule["total_ms"])
+            prev["queries"] += rule["queries"]
+    for key in ("stages_ms", "rule_types_ms"):
+        out[key] = {k: _round(v) for k, v in out[key].items()}
+    out["rules"] = sorted(rules.values(), key=lambda r: (-r["total_ms"], r["rule_id"]))[:top_rules]
+    return out
@@ -0,0 +1,380 @@
+"""
+Historical alert replay.
+
+Answers "how often would this rule have fired?" without touching the DB or
+writing events. Each rule type is computed as one array expression per ticker
+over its full history (rolling windows via ``sliding_window_view``), then
+governance is applied over the resulting signal matrix.
+
+Replay models one monitor cycle per bar date: the timeline is the union of the
+scoped tickers' bar dates in ``[start, end]``, and each ticker is evaluated on
+its latest bar as of that date, exactly as ``evaluator.evaluate_rule`` would
+have seen it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from typing import Any
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from quantsentinel.domain.alerts.evaluator import RuleSpec
+from quantsentinel.domain.alerts.expression import evaluate_vectorized
+from quantsentinel.domain.alerts.governance import resolve_aggregation_key
+from quantsentinel.domain.alerts.models import GovernancePolicy
+from quantsentinel.domain.market.models import PricePanel, PriceSeries
+
+
+@dataclass(frozen=True)
+class ReplayHit:
+    """One event the monitor would have created."""
+
+    event_date: date
+    ticker: str
+    source_ticker: str
+    asof_date: date | None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "event_date": self.event_date.isoformat(),
+            "ticker": self.ticker,
+            "source_ticker": self.source_ticker,
+            "asof_date": self.asof_date.isoformat() if self.asof_date else None,
+        }
+
+
+@dataclass(frozen=True)
+class ReplayResult:
+    rule_type: str
+    bars: int
+    tickers: int
+    signals: int
+    events_deduped: int
+    events_silenced: int
+    hits: list[ReplayHit] = field(default_factory=list)
+
+    @property
+    def hit_count(self) -> int:
+        return len(self.hits)
+
+    def per_ticker(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for hit in self.hits:
+            counts[hit.ticker] = counts.get(hit.ticker, 0) + 1
+        return counts
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rule_type": self.rule_type,
+            "bars": self.bars,
+            "tickers": self.tickers,
+            "signals": self.signals,
+            "hit_count": self.hit_count,
+            "events_deduped": self.events_deduped,
+            "events_silenced": self.events_silenced,
+            "per_ticker": self.per_ticker(),
+            "hits": [h.to_dict() for h in self.hits],
+        }
+
+
+# -----------------------------
+# Rolling features (bar space)
+# -----------------------------
+
+
+def _windows(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing windows ending at each element, NaN-padded at the start."""
+    window = max(int(window), 1)
+    padded = np.concatenate([np.full(window - 1, np.nan), values.astype(np.float64)])
+    return sliding_window_view(padded, window)
+
+
+def _simple_returns(closes: np.ndarray) -> np.ndarray:
+    """Return at each bar vs the previous bar; NaN at bar 0 and after a zero close."""
+    out = np.full(closes.shape[0], np.nan)
+    if closes.shape[0] > 1:
+        prev = closes[:-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[1:] = np.where(prev != 0, closes[1:] / prev - 1.0, np.nan)
+    return out
+
+
+def _rolling_return_stats(closes: np.ndarray, lookback: int) -> tuple[np.ndarray, np.ndarray]:
+    """Per-bar (mean, population stdev) matching ``FeatureCache.return_stats``; NaN when undefined."""
+    lookback = max(int(lookback), 1)
+    n = closes.shape[0]
+    mean = np.full(n, np.nan)
+    std = np.full(n, np.nan)
+    if n == 0:
+        return mean, std
+    win = _windows(_simple_returns(closes), lookback)
+    valid = np.sum(~np.isnan(win), axis=1)
+    bars = np.minimum(np.arange(n) + 1, lookback + 1)
+    ok = (bars >= 3) & (valid >= 2)
+    if ok.any():
+        mean[ok] = np.nanmean(win[ok], axis=1)
+        std[ok] = np.nanstd(win[ok], axis=1)
+    return mean, std
+
+
+def _rolling_mean(closes: np.ndarray, window: int) -> np.ndarray:
+    if closes.shape[0] == 0:
+        return np.empty(0)
+    return np.nanmean(_windows(closes, window), axis=1)
+
+
+def _rolling_correlation(a: PriceSeries, b: PriceSeries, lookback: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Correlation of date-aligned returns over the last ``lookback + 1`` common bars.
+
+    Returns ``(common_dates, corr)`` with NaN where ``FeatureCache.correlation``
+    would return None.
+    """
+    common, ia, ib = np.intersect1d(a.dates, b.dates, assume_unique=True, return_indices=True)
+    n = common.shape[0]
+    corr = np.full(n, np.nan)
+    if n < 2:
+        return common, corr
+    ra = _simple_returns(a.closes[ia])
+    rb = _simple_returns(b.closes[ib])
+    both = ~np.isnan(ra) & ~np.isnan(rb)
+    wa = _windows(np.where(both, ra, np.nan), lookback)
+    wb = _windows(np.where(both, rb, np.nan), lookback)
+    valid = np.sum(~np.isnan(wa), axis=1)
+    bars = np.minimum(np.arange(n) + 1, lookback + 1)
+    ok = (bars >= 4) & (valid >= 3)
+    if ok.any():
+        da = wa[ok] - np.nanmean(wa[ok], axis=1, keepdims=True)
+        db = wb[ok] - np.nanmean(wb[ok], axis=1, keepdims=True)
+        sa = np.sqrt(np.nanmean(da * da, axis=1))
+        sb = np.sqrt(np.nanmean(db * db, axis=1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            c = np.nanmean(da * db, axis=1) / (sa * sb)
+        corr[ok] = np.where((sa == 0) | (sb == 0), np.nan, c)
+    return common, corr
+
+
+# -----------------------------
+# Signals (timeline space)
+# -----------------------------
+
+
+def replay_timeline(panel: PricePanel, tickers: Iterable[str], *, start: date, end: date) -> np.ndarray:
+    """Union of the tickers' bar dates within ``[start, end]`` as ``datetime64[D]``."""
+    lo, hi = np.datetime64(start, "D"), np.datetime64(end, "D")
+    parts = [s.dates[(s.dates >= lo) & (s.dates <= hi)] for t in tickers if (s := panel.get(t)) is not None]
+    if not parts:
+        return np.empty(0, dtype="datetime64[D]")
+    return np.unique(np.concatenate(parts))
+
+
+def _asof_index(dates: np.ndarray, timeline: np.ndarray) -> np.ndarray:
+    """Index of the latest bar on or before each timeline date (-1 when none)."""
+    return np.searchsorted(dates, timeline, side="right") - 1
+
+
+def _gather(values: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    out = np.full(idx.shape[0], np.nan)
+    has = idx >= 0
+    out[has] = values[idx[has]]
+    return out
+
+
+def ticker_signals(rule: RuleSpec, ticker: str, panel: PricePanel, timeline: np.ndarray) -> np.ndarray:
+    """Boolean per timeline date: would ``evaluate_rule`` have hit for ``ticker``?"""
+    params = rule.params
+    rtype = rule.rule_type
+    series = panel.get(ticker) or PriceSeries.empty(ticker)
+    closes = series.closes
+    idx = _asof_index(series.dates, timeline)
+    has = idx >= 0
+
+    with np.errstate(invalid="ignore"):
+        if rtype == "threshold":
+            value = float(params.get("value", 0))
+            op = str(params.get("operator", "<")).strip()
+            close = _gather(closes, idx)
+            if op == "<":
+                return has & (close < value)
+            if op == ">":
+                return has & (close > value)
+            return np.zeros(timeline.shape[0], dtype=bool)
+
+        if rtype == "z_score":
+            mean, std = _rolling_return_stats(closes, int(params.get("lookback", 20)))
+            ret = _gather(_simple_returns(closes), idx)
+            mean, std = _gather(mean, idx), _gather(std, idx)
+            with np.errstate(divide="ignore"):
+                z = (ret - mean) / std
+            threshold = float(params.get("threshold", 2.0))
+            return (std != 0) & ~np.isnan(z) & (np.abs(z) >= threshold)
+
+        if rtype == "volatility":
+            _, std = _rolling_return_stats(closes, int(params.get("lookback", 20)))
+            return _gather(std, idx) >= float(params.get("threshold", 0.03))
+
+        if rtype == "staleness":
+            max_days = int(params.get("max_days", 7))
+            age = np.full(timeline.shape[0], np.iinfo(np.int64).max)
+            age[has] = (timeline[has] - series.dates[idx[has]]).astype(np.int64)
+            return ~has | (age >= max_days)
+
+        if rtype == "missing_data":
+            lookback = int(params.get("lookback_days", 30))
+            min_points = int(params.get("min_points", lookback))
+            n_points = np.minimum(idx + 1, max(lookback, 1))
+            return n_points < min_points
+
+        if rtype == "correlation_break":
+            benchmark = str(params.get("benchmark_ticker", ""))
+            bench = panel.get(benchmark) or PriceSeries.empty(benchmark)
+            common, corr = _rolling_correlation(series, bench, int(params.get("lookback", 20)))
+            corr_t = _gather(corr, _asof_index(common, timeline))
+            return has & (corr_t <= float(params.get("min_corr", 0.2)))
+
+        if rtype == "custom_expression":
+            n = timeline.shape[0]
+            mean, vol = _rolling_return_stats(closes, int(params.get("lookback", 20)))
+            ret = np.nan_to_num(_gather(_simple_returns(closes), idx))
+            mean, vol = _gather(mean, idx), np.nan_to_num(_gather(vol, idx))
+            with np.errstate(divide="ignore"):
+                z = np.where(np.isnan(mean) | (vol == 0), 0.0, (ret - mean) / vol)
+            columns = {
+                "close": np.nan_to_num(_gather(closes, idx)),
+                "ret": ret,
+                "vol": vol,
+                "z": z,
+                "ma20": np.nan_to_num(_gather(_rolling_mean(closes, 20), idx)),
+                "ma60": np.nan_to_num(_gather(_rolling_mean(closes, 60), idx)),
+            }
+            return evaluate_vectorized(str(params.get("expression", "")), columns, size=n)
+
+    return np.zeros(timeline.shape[0], dtype=bool)
+
+
+# -----------------------------
+# Governance + driver
+# -----------------------------
+
+
+def _to_datetime64(ts: datetime) -> np.datetime64:
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(UTC).replace(tzinfo=None)
+    return np.datetime64(ts, "us")
+
+
+def _silenced_mask(
+    timeline: np.ndarray,
+    *,
+    policy: GovernancePolicy,
+    silence_windows: Sequence[tuple[datetime, datetime]],
+) -> np.ndarray:
+    """Cycles skipped by ``should_silence``: before ``silenced_until`` or inside a window."""
+    cycle_ts = timeline.astype("datetime64[us]")  # each cycle runs at 00:00 UTC of its bar date
+    mask = np.zeros(timeline.shape[0], dtype=bool)
+    if policy.silenced_until is not None:
+        mask |= cycle_ts < _to_datetime64(policy.silenced_until)
+    for lo, hi in silence_windows:
+        mask |= (cycle_ts >= _to_datetime64(lo)) & (cycle_ts < _to_datetime64(hi))
+    return mask
+
+
+def apply_governance(
+    signals: np.ndarray,
+    *,
+    tickers: Sequence[str],
+    timeline: np.ndarray,
+    policy: GovernancePolicy,
+    asof: np.ndarray,
+    silence_windows: Sequence[tuple[datetime, datetime]] = (),
+) -> tuple[list[ReplayHit], int, int]:
+    """
+    Turn a ``(tickers, bars)`` signal matrix into the events the monitor would write.
+
+    Mirrors one monitor cycle per bar: silenced cycles are skipped, tickers sharing
+    an aggregation key collapse to the first hitting ticker in scope order, and a
+    key that already fired within ``dedup_minutes`` is suppressed. Returns
+    ``(hits, deduped, silenced_cycles)`` where ``deduped`` counts suppressed signals.
+    """
+    if not tickers or timeline.shape[0] == 0:
+        return [], 0, 0
+    silenced = _silenced_mask(timeline, policy=policy, silence_windows=silence_windows)
+    live = signals & ~silenced[np.newaxis, :]
+
+    groups: dict[str, list[int]] = {}
+    for row, ticker in enumerate(tickers):
+        groups.setdefault(resolve_aggregation_key(policy=policy, ticker=ticker), []).append(row)
+
+    window_minutes = max(int(policy.dedup_minutes), 1)
+    day_index = timeline.astype(np.int64)
+    hits: list[ReplayHit] = []
+    deduped = 0
+    for key, rows in groups.items():
+        block = live[rows]
+        fired = block.any(axis=0)
+        deduped += int(block.sum() - fired.sum())
+        first = np.argmax(block, axis=0)
+        last_day: int | None = None
+        for col in np.flatnonzero(fired):
+            day = int(day_index[col])
+            if last_day is not None and (day - last_day) * 1440 <= window_minutes:
+                deduped += 1
+                continue
+            last_day = day
+            row = rows[int(first[col])]
+            asof_day = asof[row, col]
+            hits.append(
+                ReplayHit(
+                    event_date=timeline[col].astype(object),
+                    ticker=key,
+                    source_ticker=tickers[row],
+                    asof_date=None if np.isnat(asof_day) else asof_day.astype(object),
+                )
+            )
+    hits.sort(key=lambda h: (h.event_date, h.ticker))
+    return hits, deduped, int(silenced.sum())
+
+
+def run_replay(
+    rule: RuleSpec,
+    panel: PricePanel,
+    *,
+    start: date,
+    end: date,
+    policy: GovernancePolicy,
+    silence_windows: Sequence[tuple[datetime, datetime]] = (),
+) -> ReplayResult:
+    """Replay ``rule`` over ``rule.tickers`` for every bar date in ``[start, end]``."""
+    tickers = list(rule.tickers)
+    timeline = replay_timeline(panel, tickers, start=start, end=end)
+    n = timeline.shape[0]
+    signals = np.zeros((len(tickers), n), dtype=bool)
+    asof = np.full((len(tickers), n), np.datetime64("NaT"), dtype="datetime64[D]")
+    for row, ticker in enumerate(tickers):
+        signals[row] = ticker_signals(rule, ticker, panel, timeline)
+        series = panel.get(ticker)
+        if series is not None and len(series):
+            idx = _asof_index(series.dates, timeline)
+            asof[row, idx >= 0] = series.dates[idx[idx >= 0]]
+
+    hits, deduped, silenced = apply_governance(
+        signals,
+        tickers=tickers,
+        timeline=timeline,
+        policy=policy,
+        asof=asof,
+        silence_windows=silence_windows,
+    )
+    return ReplayResult(
+        rule_type=rule.rule_type,
+        bars=n,
+        tickers=len(tickers),
+        signals=int(signals.sum()),
+        events_deduped=deduped,
+        events_silenced=silenced,
+        hits=hits,
+    )
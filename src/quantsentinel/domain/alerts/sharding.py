@@ -0,0 +1,93 @@
+"""Cost-based partitioning of alert rules into monitor shards."""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+# Relative per-ticker evaluation cost by rule type (threshold == 1 query).
+RULE_TYPE_COSTS: dict[str, float] = {
+    "threshold": 1.0,
+    "staleness": 1.0,
+    "missing_data": 1.0,
+    "volatility": 2.0,
+    "z_score": 3.0,
+    "correlation_break": 4.0,
+    "custom_expression": 6.0,
+}
+
+
+@dataclass(frozen=True)
+class ShardItem:
+    """One unit of monitor work: a rule evaluated over a subset of its scope."""
+
+    rule_id: str
+    tickers: tuple[str, ...]
+    cost: float
+
+    def to_dict(self) -> dict[str, object]:
+        return {"rule_id": self.rule_id, "tickers": list(self.tickers)}
+
+
+def estimate_rule_cost(*, rule_type: str, n_tickers: int) -> float:
+    """Estimate evaluation cost of a rule over ``n_tickers`` scoped tickers."""
+    weight = RULE_TYPE_COSTS.get((rule_type or "").strip(), 1.0)
+    return weight * max(int(n_tickers), 1)
+
+
+def split_rule(
+    *,
+    rule_id: str,
+    rule_type: str,
+    tickers: Sequence[str],
+    max_cost: float,
+) -> list[ShardItem]:
+    """Split one rule into rule x ticker-chunk items no larger than ``max_cost``."""
+    weight = RULE_TYPE_COSTS.get((rule_type or "").strip(), 1.0)
+    if not tickers:
+        return [ShardItem(rule_id=rule_id, tickers=(), cost=weight)]
+    if max_cost <= 0 or math.isinf(max_cost):
+        chunk = len(tickers)
+    else:
+        chunk = max(int(max_cost // weight), 1)
+    return [
+        ShardItem(
+            rule_id=rule_id,
+            tickers=tuple(tickers[i : i + chunk]),
+            cost=weight * len(tickers[i : i + chunk]),
+        )
+        for i in range(0, len(tickers), chunk)
+    ]
+
+
+def partition_by_cost(items: Sequence[ShardItem], *, max_shards: int) -> list[list[ShardItem]]:
+    """
+    Greedy longest-processing-time partition into at most ``max_shards`` shards.
+
+    Items are assigned heaviest first to the currently lightest shard, which keeps
+    the most expensive shard within 4/3 of the optimal makespan. Empty shards are
+    dropped and the output order is deterministic.
+    """
+    if max_shards <= 0:
+        raise ValueError("max_shards must be > 0")
+    if not items:
+        return []
+
+    n = min(max_shards, len(items))
+    shards: list[list[ShardItem]] = [[] for _ in range(n)]
+    heap: list[tuple[float, int]] = [(0.0, i) for i in range(n)]
+    ordered = sorted(items, key=lambda it: (-it.cost, it.rule_id, it.tickers))
+    for item in ordered:
+        load, idx = heapq.heappop(heap)
+        shards[idx].append(item)
+        heapq.heappush(heap, (load + item.cost, idx))
+    return [s for s in shards if s]
+
+
+def shard_count(*, total_cost: float, target_cost: float, max_shards: int) -> int:
+    """Number of shards needed so each carries roughly ``target_cost``."""
+    if target_cost <= 0:
+        return max(max_shards, 1)
+    return max(1, min(max_shards, math.ceil(total_cost / target_cost)))
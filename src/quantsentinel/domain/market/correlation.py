@@ -0,0 +1,280 @@
+"""
+Vectorized return correlations against a benchmark.
+
+All tickers are aligned on the benchmark's date grid once, their returns over
+the last ``lookback + 1`` common bars are laid out as an ``(n_tickers, lookback)``
+window matrix, and every correlation is computed in one pass. Semantics match a
+per-ticker computation on date-intersected closes: returns are taken between
+consecutive common bars, returns after a zero close are dropped, and a
+correlation needs at least 4 common closes, 3 returns and non-zero variance.
+
+``RollingCorrelation`` keeps the same window matrix and shifts in new bars as
+they arrive, so a monitor that receives new bars does not rebuild the matrix;
+``RollingCorrelations`` keeps one per (benchmark, lookback) across cycles.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from datetime import date
+
+import numpy as np
+
+from quantsentinel.domain.market.models import PricePanel
+
+
+def aligned_closes(panel: PricePanel, tickers: Sequence[str], grid: np.ndarray) -> np.ndarray:
+    """``(len(tickers), len(grid))`` close matrix on ``grid`` dates, NaN where a ticker has no bar."""
+    out = np.full((len(tickers), grid.shape[0]), np.nan)
+    if grid.shape[0] == 0:
+        return out
+    for row, ticker in enumerate(tickers):
+        series = panel.get(ticker)
+        if series is None or not len(series):
+            continue
+        pos = np.searchsorted(grid, series.dates)
+        hit = pos < grid.shape[0]
+        hit[hit] = grid[pos[hit]] == series.dates[hit]
+        out[row, pos[hit]] = series.closes[hit]
+    return out
+
+
+def _return_windows(
+    closes: np.ndarray,
+    bench: np.ndarray,
+    lookback: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Right-aligned return windows over each row's last ``lookback + 1`` common bars.
+
+    Returns ``(ra, rb, n_closes, last_a, last_b)``: ticker/benchmark return windows
+    (NaN for empty or dropped slots), the number of common closes used per row and
+    the last common close pair per row (NaN when the row has none).
+    """
+    n, m = closes.shape
+    lookback = max(int(lookback), 1)
+    ra = np.full((n, lookback), np.nan)
+    rb = np.full((n, lookback), np.nan)
+    last_a = np.full(n, np.nan)
+    last_b = np.full(n, np.nan)
+    if m == 0 or n == 0:
+        return ra, rb, np.zeros(n, dtype=np.int64), last_a, last_b
+
+    valid = ~np.isnan(closes)
+    from_end = np.cumsum(valid[:, ::-1], axis=1)[:, ::-1]
+    keep = valid & (from_end <= lookback + 1)
+    n_closes = keep.sum(axis=1)
+
+    cols = np.arange(m)
+    kept_idx = np.where(keep, cols, -1)
+    latest = np.maximum.accumulate(kept_idx, axis=1)
+    prev_idx = np.concatenate([np.full((n, 1), -1), latest[:, :-1]], axis=1)
+    has_ret = keep & (prev_idx >= 0)
+
+    rows, at = np.nonzero(has_ret)
+    prev = prev_idx[rows, at]
+    pa, ca = closes[rows, prev], closes[rows, at]
+    pb, cb = bench[prev], bench[at]
+    ok = (pa != 0) & (pb != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        va = np.where(ok, ca / pa - 1.0, np.nan)
+        vb = np.where(ok, cb / pb - 1.0, np.nan)
+    rets_from_end = np.cumsum(has_ret[:, ::-1], axis=1)[:, ::-1]
+    slot = lookback - rets_from_end[rows, at]
+    ra[rows, slot] = va
+    rb[rows, slot] = vb
+
+    has_last = latest[:, -1] >= 0
+    last_col = latest[has_last, -1]
+    last_a[has_last] = closes[has_last, last_col]
+    last_b[has_last] = bench[last_col]
+    return ra, rb, n_closes, last_a, last_b
+
+
+def _window_correlation(ra: np.ndarray, rb: np.ndarray, n_closes: np.ndarray) -> np.ndarray:
+    """Row-wise population correlation of NaN-masked return windows; NaN where undefined."""
+    both = ~np.isnan(ra) & ~np.isnan(rb)
+    count = both.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_a = np.where(both, ra, 0.0).sum(axis=1) / count
+        mean_b = np.where(both, rb, 0.0).sum(axis=1) / count
+        da = np.where(both, ra - mean_a[:, None], 0.0)
+        db = np.where(both, rb - mean_b[:, None], 0.0)
+        var_a = (da * da).sum(axis=1) / count
+        var_b = (db * db).sum(axis=1) / count
+        corr = (da * db).sum(axis=1) / count / np.sqrt(var_a * var_b)
+    ok = (n_closes >= 4) & (count >= 3) & (var_a > 0) & (var_b > 0)
+    return np.where(ok, corr, np.nan)
+
+
+def _as_dict(tickers: Sequence[str], values: np.ndarray) -> dict[str, float | None]:
+    return {t: (None if np.isnan(v) else float(v)) for t, v in zip(tickers, values, strict=True)}
+
+
+def correlations_to_benchmark(
+    panel: PricePanel,
+    tickers: Sequence[str],
+    benchmark: str,
+    lookback: int,
+) -> dict[str, float | None]:
+    """Correlation of each ticker's returns with ``benchmark`` over the last ``lookback + 1`` common bars."""
+    bench = panel.get(benchmark)
+    if bench is None or len(bench) < 2:
+        return dict.fromkeys(tickers)
+    closes = aligned_closes(panel, tickers, bench.dates)
+    ra, rb, n_closes, _, _ = _return_windows(closes, bench.closes, lookback)
+    return _as_dict(tickers, _window_correlation(ra, rb, n_closes))
+
+
+class RollingCorrelation:
+    """
+    Correlations of many tickers with one benchmark, updated bar by bar.
+
+    Holds the ``(n_tickers, lookback)`` return windows and, per ticker, the last
+    common bar shifted in, so a new bar costs O(n_tickers * lookback) with no
+    history reload. ``advance`` feeds it from a panel: rows already tracked take
+    only bars after their last common bar, rows that are new or whose last bar
+    predates the panel are seeded from it.
+    """
+
+    def __init__(self, tickers: Sequence[str], lookback: int) -> None:
+        self.tickers: list[str] = []
+        self.lookback = max(int(lookback), 1)
+        self._index: dict[str, int] = {}
+        self._ra = np.full((0, self.lookback), np.nan)
+        self._rb = np.full((0, self.lookback), np.nan)
+        self._n_closes = np.zeros(0, dtype=np.int64)
+        self._last_a = np.full(0, np.nan)
+        self._last_b = np.full(0, np.nan)
+        self._last_date = np.full(0, np.datetime64("NaT"), dtype="datetime64[D]")
+        self.add_tickers(tickers)
+
+    @classmethod
+    def from_panel(
+        cls,
+        panel: PricePanel,
+        tickers: Sequence[str],
+        benchmark: str,
+        lookback: int,
+    ) -> RollingCorrelation:
+        """Seed the windows from history in ``panel``."""
+        out = cls(tickers, lookback)
+        out.advance(panel, benchmark)
+        return out
+
+    def add_tickers(self, tickers: Sequence[str]) -> None:
+        """Track ``tickers`` not seen yet; their windows start empty."""
+        new = [t for t in dict.fromkeys(tickers) if t not in self._index]
+        if not new:
+            return
+        for ticker in new:
+            self._index[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+        k = len(new)
+        self._ra = np.concatenate([self._ra, np.full((k, self.lookback), np.nan)])
+        self._rb = np.concatenate([self._rb, np.full((k, self.lookback), np.nan)])
+        self._n_closes = np.concatenate([self._n_closes, np.zeros(k, dtype=np.int64)])
+        self._last_a = np.concatenate([self._last_a, np.full(k, np.nan)])
+        self._last_b = np.concatenate([self._last_b, np.full(k, np.nan)])
+        self._last_date = np.concatenate([self._last_date, np.full(k, np.datetime64("NaT"), dtype="datetime64[D]")])
+
+    def advance(self, panel: PricePanel, benchmark: str, *, reseed: bool = False) -> None:
+        """
+        Bring tracked tickers present in ``panel`` up to its latest common bar.
+
+        With ``reseed`` every such row is rebuilt from ``panel`` (picks up revised or
+        late bars the incremental path cannot see). Tickers absent from ``panel`` are
+        left untouched.
+        """
+        bench = panel.get(benchmark)
+        if bench is None or not len(bench):
+            return
+        rows = np.flatnonzero([t in panel for t in self.tickers])
+        if not rows.shape[0]:
+            return
+        grid = bench.dates
+        closes = aligned_closes(panel, [self.tickers[r] for r in rows], grid)
+        last_date = self._last_date[rows]
+        seed = np.isnat(last_date) | (last_date < grid[0])
+        if reseed:
+            seed[:] = True
+        if seed.any():
+            self._seed(rows[seed], closes[seed], grid, bench.closes)
+        live = ~seed
+        for col in range(grid.shape[0]):
+            day = grid[col]
+            push = live & ~np.isnan(closes[:, col]) & (day > last_date)
+            if push.any():
+                self._push(rows[push], closes[push, col], float(bench.closes[col]), day)
+
+    def update(self, day: date | np.datetime64, closes: Mapping[str, float], benchmark_close: float) -> None:
+        """Append one benchmark bar; tracked tickers missing from ``closes`` had no bar that day."""
+        values = np.array([closes.get(t, np.nan) for t in self.tickers], dtype=np.float64)
+        present = np.flatnonzero(~np.isnan(values))
+        if present.shape[0]:
+            self._push(present, values[present], benchmark_close, np.datetime64(day, "D"))
+
+    def values(self, tickers: Sequence[str] | None = None) -> dict[str, float | None]:
+        """Current correlations of ``tickers`` (default: all tracked); None for untracked ones."""
+        if tickers is None:
+            return _as_dict(self.tickers, _window_correlation(self._ra, self._rb, self._n_closes))
+        rows = [self._index[t] for t in tickers if t in self._index]
+        corr = _window_correlation(self._ra[rows], self._rb[rows], self._n_closes[rows])
+        out = dict.fromkeys(tickers)
+        out.update(_as_dict([self.tickers[r] for r in rows], corr))
+        return out
+
+    def _seed(self, rows: np.ndarray, closes: np.ndarray, grid: np.ndarray, bench: np.ndarray) -> None:
+        ra, rb, n_closes, last_a, last_b = _return_windows(closes, bench, self.lookback)
+        valid = ~np.isnan(closes)
+        last_col = grid.shape[0] - 1 - np.argmax(valid[:, ::-1], axis=1)
+        self._ra[rows], self._rb[rows], self._n_closes[rows] = ra, rb, n_closes
+        self._last_a[rows], self._last_b[rows] = last_a, last_b
+        self._last_date[rows] = np.where(valid.any(axis=1), grid[last_col], np.datetime64("NaT"))
+
+    def _push(self, rows: np.ndarray, values: np.ndarray, benchmark_close: float, day: np.datetime64) -> None:
+        last_a, last_b = self._last_a[rows], self._last_b[rows]
+        shift = ~np.isnan(last_a)
+        ok = shift & (last_a != 0) & (last_b != 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            new_a = np.where(ok, values / last_a - 1.0, np.nan)
+            new_b = np.where(ok, benchmark_close / last_b - 1.0, np.nan)
+        shifted = rows[shift]
+        if shifted.shape[0]:
+            self._ra[shifted] = np.concatenate([self._ra[shifted, 1:], new_a[shift, None]], axis=1)
+            self._rb[shifted] = np.concatenate([self._rb[shifted, 1:], new_b[shift, None]], axis=1)
+        self._n_closes[rows] = np.minimum(self._n_closes[rows] + 1, self.lookback + 1)
+        self._last_a[rows] = values
+        self._last_b[rows] = benchmark_close
+        self._last_date[rows] = day
+
+
+class RollingCorrelations:
+    """
+    ``RollingCorrelation`` state per (benchmark, lookback), kept across monitor cycles.
+
+    A drop-in for ``correlations_to_benchmark``: each call advances the matching
+    state with the bars in ``panel`` instead of rebuilding the window matrix.
+    """
+
+    def __init__(self) -> None:
+        self._states: dict[tuple[str, int], RollingCorrelation] = {}
+
+    def correlations(
+        self,
+        panel: PricePanel,
+        tickers: Sequence[str],
+        benchmark: str,
+        lookback: int,
+        *,
+        reseed: bool = False,
+    ) -> dict[str, float | None]:
+        state = self._states.get((benchmark, lookback))
+        if state is None:
+            state = self._states[(benchmark, lookback)] = RollingCorrelation((), lookback)
+        state.add_tickers([t for t in tickers if t in panel])
+        state.advance(panel, benchmark, reseed=reseed)
+        return state.values(tickers)
+
+    def clear(self) -> None:
+        self._states.clear()
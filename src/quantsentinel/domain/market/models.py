@@ -1,4 +1,60 @@
 """Market models"""
 
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+
 class Instrument:
     pass
+
+
+@dataclass(frozen=True)
+class PriceSeries:
+    """
+    Daily close history for one ticker, oldest first.
+
+    ``dates`` is ``datetime64[D]`` and ``closes`` is ``float64``; both are
+    contiguous and of equal length. Rows with a missing close are not stored.
+    """
+
+    ticker: str
+    dates: np.ndarray
+    closes: np.ndarray
+
+    @classmethod
+    def empty(cls, ticker: str) -> PriceSeries:
+        return cls(ticker=ticker, dates=np.empty(0, dtype="datetime64[D]"), closes=np.empty(0, dtype=np.float64))
+
+    @classmethod
+    def from_pairs(cls, ticker: str, pairs: Iterable[tuple[date, float]]) -> PriceSeries:
+        """Build from ``(date, close)`` pairs as returned by ``PricesRepo.get_recent_closes``."""
+        rows = [(d, float(c)) for d, c in pairs if c is not None]
+        if not rows:
+            return cls.empty(ticker)
+        dates = np.array([d for d, _ in rows], dtype="datetime64[D]")
+        closes = np.array([c for _, c in rows], dtype=np.float64)
+        return cls(ticker=ticker, dates=dates, closes=closes)
+
+    def __len__(self) -> int:
+        return int(self.closes.shape[0])
+
+    @property
+    def last_date(self) -> date | None:
+        if not len(self):
+            return None
+        return self.dates[-1].astype(object)
+
+    def tail(self, n: int) -> PriceSeries:
+        """Last ``n`` bars (all bars when fewer are available)."""
+        if n <= 0:
+            return PriceSeries.empty(self.ticker)
+        return PriceSeries(ticker=self.ticker, dates=self.dates[-n:], closes=self.closes[-n:])
+
+
+# ticker -> close history; the unit of input for alert evaluation and research.
+PricePanel = Mapping[str, PriceSeries]
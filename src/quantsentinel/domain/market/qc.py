@@ -1,5 +1,189 @@
-"""Quality control utilities"""
+"""
+Vectorized quality control for daily bars.
 
+``check_bars`` takes column arrays (one row per bar, any order, optionally many
+tickers via ``groups``) and returns a ``QCFlag`` bitmask per row plus a summary.
+Everything is numpy over whole arrays; the only Python loop is the per-group
+median for spike detection, so a multi-million row ingest batch costs a few
+sorts and passes.
 
-def check_data():
-    pass
+Checks:
+- OHLC_INCONSISTENT   low <= open/close <= high violated (missing values ignored)
+- NON_POSITIVE_PRICE  an open/high/low/close/adj_close <= 0
+- DUPLICATE_DATE      an earlier row for the same (group, date); the last one wins,
+                      matching ``PricesRepo.upsert_many``
+- RETURN_SPIKE        |log return - median| > ``spike_threshold`` x MAD-sigma of
+                      the group's returns (needs ``min_spike_returns`` returns)
+- ZERO_VOLUME_RUN     part of a run of at least ``zero_volume_run`` zero-volume bars
+- CALENDAR_GAP        more than ``max_gap_days`` calendar days since the previous bar
+
+``REJECT_FLAGS`` mark bars that must not be stored; the other flags are warnings.
+"""
+
+from __future__ import annotations
+
+import enum
+import itertools
+from dataclasses import dataclass
+
+import numpy as np
+
+# Scales the median absolute deviation to a standard deviation for normal data.
+_MAD_TO_SIGMA = 1.4826
+
+
+class QCFlag(enum.IntFlag):
+    OHLC_INCONSISTENT = 1
+    NON_POSITIVE_PRICE = 2
+    DUPLICATE_DATE = 4
+    RETURN_SPIKE = 8
+    ZERO_VOLUME_RUN = 16
+    CALENDAR_GAP = 32
+
+
+REJECT_FLAGS = QCFlag.OHLC_INCONSISTENT | QCFlag.NON_POSITIVE_PRICE | QCFlag.DUPLICATE_DATE
+
+
+@dataclass(frozen=True)
+class QCConfig:
+    spike_threshold: float = 10.0
+    min_spike_returns: int = 20
+    zero_volume_run: int = 5
+    max_gap_days: int = 7
+    ohlc_tolerance: float = 1e-6  # relative slack for rounding in vendor data
+
+
+@dataclass(frozen=True)
+class QCSummary:
+    rows: int
+    flagged: int
+    rejected: int
+    counts: dict[str, int]
+
+    def describe(self) -> str:
+        """Compact ``name:count`` list of the flags raised (empty when clean)."""
+        return ",".join(f"{name}:{n}" for name, n in self.counts.items() if n)
+
+
+@dataclass(frozen=True)
+class QCResult:
+    flags: np.ndarray  # uint8 QCFlag bitmask per input row, in input order
+    summary: QCSummary
+
+    @property
+    def keep(self) -> np.ndarray:
+        """Rows without any ``REJECT_FLAGS`` (warnings are kept)."""
+        return (self.flags & int(REJECT_FLAGS)) == 0
+
+    def has(self, flag: QCFlag) -> np.ndarray:
+        return (self.flags & int(flag)) != 0
+
+
+def _column(values: np.ndarray | None, n: int) -> np.ndarray:
+    if values is None:
+        return np.full(n, np.nan)
+    out = np.asarray(values, dtype=np.float64)
+    if out.shape != (n,):
+        raise ValueError("all columns must have the same length as dates")
+    return out
+
+
+def _runs_at_least(mask: np.ndarray, boundary: np.ndarray, length: int) -> np.ndarray:
+    """Rows inside runs of ``mask`` at least ``length`` long; runs do not cross ``boundary`` rows."""
+    starts_run = mask & (boundary | ~np.concatenate(([False], mask[:-1])))
+    run_id = np.cumsum(starts_run)
+    run_id[~mask] = 0
+    if not run_id.any():
+        return np.zeros_like(mask)
+    sizes = np.bincount(run_id)
+    sizes[0] = 0
+    return sizes[run_id] >= length
+
+
+def check_bars(
+    dates: np.ndarray,
+    *,
+    open: np.ndarray | None = None,
+    high: np.ndarray | None = None,
+    low: np.ndarray | None = None,
+    close: np.ndarray | None = None,
+    adj_close: np.ndarray | None = None,
+    volume: np.ndarray | None = None,
+    groups: np.ndarray | None = None,
+    config: QCConfig | None = None,
+) -> QCResult:
+    """
+    QC flags for bars given as parallel arrays (NaN = missing value).
+
+    ``dates`` is anything ``datetime64[D]`` accepts; ``groups`` (e.g. tickers) keeps
+    series-level checks (duplicates, spikes, runs, gaps) within one instrument.
+    """
+    cfg = config or QCConfig()
+    days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+    n = days.shape[0]
+    o, h, lo, c, ac, v = (_column(x, n) for x in (open, high, low, close, adj_close, volume))
+    flags = np.zeros(n, dtype=np.uint8)
+    if n == 0:
+        return QCResult(flags=flags, summary=QCSummary(rows=0, flagged=0, rejected=0, counts={f.name: 0 for f in QCFlag}))
+
+    # Row-local checks (NaN comparisons are False, so missing values never trip them).
+    tol = 1.0 + cfg.ohlc_tolerance
+    with np.errstate(invalid="ignore"):
+        ohlc_bad = (h * tol < lo) | (o > h * tol) | (c > h * tol) | (o * tol < lo) | (c * tol < lo)
+        non_positive = (o <= 0) | (h <= 0) | (lo <= 0) | (c <= 0) | (ac <= 0)
+    flags[ohlc_bad] |= int(QCFlag.OHLC_INCONSISTENT)
+    flags[non_positive] |= int(QCFlag.NON_POSITIVE_PRICE)
+
+    # Series checks run in (group, date) order; ``new_group`` marks each series' first row.
+    if groups is None:
+        group_codes = np.zeros(n, dtype=np.int64)
+    else:
+        _, group_codes = np.unique(np.asarray(groups), return_inverse=True)
+    order = np.lexsort((np.arange(n), days, group_codes))
+    g, d = group_codes[order], days[order]
+    new_group = np.concatenate(([True], g[1:] != g[:-1]))
+    sorted_flags = np.zeros(n, dtype=np.uint8)
+
+    duplicate = np.zeros(n, dtype=bool)
+    duplicate[:-1] = (d[:-1] == d[1:]) & ~new_group[1:]
+    sorted_flags[duplicate] |= int(QCFlag.DUPLICATE_DATE)
+
+    gap = np.zeros(n, dtype=bool)
+    gap[1:] = (d[1:] - d[:-1] > cfg.max_gap_days) & ~new_group[1:]
+    sorted_flags[gap] |= int(QCFlag.CALENDAR_GAP)
+
+    vol = v[order]
+    if cfg.zero_volume_run > 0:
+        sorted_flags[_runs_at_least(vol == 0, new_group, cfg.zero_volume_run)] |= int(QCFlag.ZERO_VOLUME_RUN)
+
+    # Spikes: log returns between consecutive usable closes of the same group.
+    px = c[order]
+    usable = np.isfinite(px) & (px > 0) & ~duplicate & ((flags[order] & int(REJECT_FLAGS)) == 0)
+    idx = np.flatnonzero(usable)
+    if idx.shape[0] > 1:
+        same = g[idx[1:]] == g[idx[:-1]]
+        rets = np.log(px[idx[1:]] / px[idx[:-1]])[same]
+        ret_rows = idx[1:][same]
+        ret_groups = g[ret_rows]
+        if rets.shape[0]:
+            bounds = np.flatnonzero(np.concatenate(([True], ret_groups[1:] != ret_groups[:-1], [True])))
+            spike = np.zeros(rets.shape[0], dtype=bool)
+            for start, stop in itertools.pairwise(bounds):
+                window = rets[start:stop]
+                if window.shape[0] < cfg.min_spike_returns:
+                    continue
+                med = np.median(window)
+                sigma = _MAD_TO_SIGMA * np.median(np.abs(window - med))
+                if sigma > 0:
+                    spike[start:stop] = np.abs(window - med) > cfg.spike_threshold * sigma
+            sorted_flags[ret_rows[spike]] |= int(QCFlag.RETURN_SPIKE)
+
+    flags[order] |= sorted_flags
+    counts = {f.name: int(np.count_nonzero(flags & int(f))) for f in QCFlag}
+    summary = QCSummary(
+        rows=n,
+        flagged=int(np.count_nonzero(flags)),
+        rejected=int(np.count_nonzero(flags & int(REJECT_FLAGS))),
+        counts=counts,
+    )
+    return QCResult(flags=flags, summary=summary)
@@ -1 +1,42 @@
 """Snapshot export functionality"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+
+from quantsentinel.infra.artifacts.storage import DEFAULT_BUCKETS, LakeManifest, PriceLake
+from quantsentinel.infra.db.engine import session_scope
+from quantsentinel.infra.db.repos.prices_repo import PricesRepo
+
+
+def export_price_lake(
+    root: str | Path,
+    *,
+    buckets: int = DEFAULT_BUCKETS,
+    batch_size: int = 50_000,
+    on_batch: Callable[[int], None] | None = None,
+) -> LakeManifest:
+    """
+    Export ``prices_daily`` into a new Parquet lake revision under ``root``.
+
+    Rows are streamed in one read transaction, so the lake reflects a single
+    point in time; ``on_batch`` receives the running row count. A failed export
+    leaves the current revision untouched.
+    """
+    lake = PriceLake(root)
+    writer = lake.writer(buckets=buckets)
+    rows = 0
+    try:
+        with session_scope() as session:
+            repo = PricesRepo(session)
+            for batch in repo.iter_bar_batches(batch_size=batch_size):
+                writer.add_rows(batch)
+                rows += len(batch)
+                if on_batch is not None:
+                    on_batch(rows)
+            latest = repo.get_latest_revisions(writer.tickers)
+    except Exception:
+        writer.abort()
+        raise
+    return writer.commit(revisions={t: rev.revision_id for t, rev in latest.items()})
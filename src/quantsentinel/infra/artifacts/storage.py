@@ -1 +1,352 @@
-"""Storage utilities"""
+"""
+Parquet price lake.
+
+A read-optimized copy of ``prices_daily`` for heavy research scans, laid out as::
+
+    <root>/manifest.json                                      current revision
+    <root>/<revision>/bucket=NN/year=YYYY/part-NNNNN.parquet
+
+Tickers are hashed into a fixed number of buckets and each bucket is split by
+calendar year; rows inside a part are sorted by (ticker, date), so Parquet
+row-group statistics prune well on both. The manifest lists every part with its
+bucket, year and date range plus the per-ticker ``revision_id`` the export saw,
+so readers skip whole files before opening them and can tell how current the
+lake is.
+
+Each export writes a new revision directory and then swaps ``manifest.json``
+atomically; the previous revision is kept for readers that are still scanning
+it and older ones are removed. A copy of the manifest is stored in the revision
+directory when it is published, and only published revisions are pruned, so a
+concurrent export that is still writing its parts is left alone (unpublished
+directories are only removed once abandoned for ``ABANDONED_EXPORT_SECONDS``).
+
+Requires the optional ``pyarrow`` dependency (``poetry install -E lake``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+import zlib
+from collections.abc import Collection, Iterable, Mapping, Sequence
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, date, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+LAKE_COLUMNS = ("ticker", "date", "open", "high", "low", "close", "adj_close", "volume")
+DEFAULT_BUCKETS = 16
+# Rows buffered per (bucket, year) before a part file is written.
+PART_ROWS = 250_000
+# Rows buffered across all (bucket, year) keys; past this the largest buffer is
+# written early, so exports ordered by ticker do not hold the table in memory.
+MAX_BUFFERED_ROWS = 1_000_000
+# Unpublished revision directories untouched for this long are left over from a
+# crashed export and are pruned with the old revisions.
+ABANDONED_EXPORT_SECONDS = 24 * 3600
+
+
+def _pyarrow() -> tuple[Any, Any]:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # pragma: no cover - depends on installed extras
+        raise RuntimeError("The Parquet price lake requires pyarrow (poetry install -E lake)") from exc
+    return pa, pq
+
+
+def _schema() -> Any:
+    pa, _ = _pyarrow()
+    return pa.schema(
+        [("ticker", pa.string()), ("date", pa.date32())]
+        + [(col, pa.float64()) for col in LAKE_COLUMNS[2:]]
+    )
+
+
+def ticker_bucket(ticker: str, buckets: int) -> int:
+    """Stable bucket for ``ticker`` (crc32, so it does not depend on PYTHONHASHSEED)."""
+    return zlib.crc32(ticker.encode("utf-8")) % buckets
+
+
+@dataclass(frozen=True)
+class LakePartition:
+    path: str  # relative to the lake root
+    bucket: int
+    year: int
+    rows: int
+    min_date: date
+    max_date: date
+
+
+@dataclass(frozen=True)
+class LakeManifest:
+    revision: str
+    created_at: datetime
+    buckets: int
+    partitions: tuple[LakePartition, ...] = ()
+    # ticker -> prices revision_id at export time
+    tickers: Mapping[str, str] = field(default_factory=dict)
+
+    @property
+    def rows(self) -> int:
+        return sum(p.rows for p in self.partitions)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "revision": self.revision,
+            "created_at": self.created_at.isoformat(),
+            "buckets": self.buckets,
+            "partitions": [
+                {**asdict(p), "min_date": p.min_date.isoformat(), "max_date": p.max_date.isoformat()}
+                for p in self.partitions
+            ],
+            "tickers": dict(self.tickers),
+        }
+
+    @classmethod
+    def from_json(cls, raw: Mapping[str, Any]) -> LakeManifest:
+        return cls(
+            revision=raw["revision"],
+            created_at=datetime.fromisoformat(raw["created_at"]),
+            buckets=int(raw["buckets"]),
+            partitions=tuple(
+                LakePartition(
+                    path=p["path"],
+                    bucket=int(p["bucket"]),
+                    year=int(p["year"]),
+                    rows=int(p["rows"]),
+                    min_date=date.fromisoformat(p["min_date"]),
+                    max_date=date.fromisoformat(p["max_date"]),
+                )
+                for p in raw.get("partitions", [])
+            ),
+            tickers=dict(raw.get("tickers", {})),
+        )
+
+    def select(
+        self,
+        *,
+        tickers: Collection[str] | None = None,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> list[LakePartition]:
+        """Parts that can hold rows for ``tickers`` within ``[start, end]``."""
+        buckets = None if tickers is None else {ticker_bucket(t, self.buckets) for t in tickers}
+        return [
+            p
+            for p in self.partitions
+            if (buckets is None or p.bucket in buckets)
+            and (start is None or p.max_date >= start)
+            and (end is None or p.min_date <= end)
+        ]
+
+
+class LakeWriter:
+    """
+    Buffers rows per (bucket, year) and writes a part file whenever a buffer fills,
+    or writes the largest buffer once ``max_buffered_rows`` are held in total.
+
+    Rows must arrive ordered by (ticker, date), as ``PricesRepo.iter_bar_batches``
+    yields them, so every part is sorted too.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        buckets: int,
+        part_rows: int = PART_ROWS,
+        max_buffered_rows: int = MAX_BUFFERED_ROWS,
+    ) -> None:
+        if buckets <= 0:
+            raise ValueError("buckets must be positive")
+        self._root = root
+        self._buckets = buckets
+        self._part_rows = part_rows
+        self._max_buffered = max(1, max_buffered_rows)
+        self._buffered = 0
+        self.max_buffered = 0  # high-water mark of rows held, for monitoring/tests
+        self.revision = uuid.uuid4().hex
+        self._buffers: dict[tuple[int, int], list[tuple]] = {}
+        self._bucket_of: dict[str, int] = {}
+        self._partitions: list[LakePartition] = []
+        (root / self.revision).mkdir(parents=True)
+
+    @property
+    def tickers(self) -> list[str]:
+        return list(self._bucket_of)
+
+    def add_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        for row in rows:
+            ticker = row[0]
+            bucket = self._bucket_of.get(ticker)
+            if bucket is None:
+                bucket = self._bucket_of[ticker] = ticker_bucket(ticker, self._buckets)
+            key = (bucket, row[1].year)
+            buf = self._buffers.setdefault(key, [])
+            buf.append(tuple(row))
+            self._buffered += 1
+            self.max_buffered = max(self.max_buffered, self._buffered)
+            if len(buf) >= self._part_rows:
+                self._flush(key)
+            elif self._buffered >= self._max_buffered:
+                self._flush(max(self._buffers, key=lambda k: len(self._buffers[k])))
+
+    def _flush(self, key: tuple[int, int]) -> None:
+        rows = self._buffers.pop(key, None)
+        if not rows:
+            return
+        self._buffered -= len(rows)
+        pa, pq = _pyarrow()
+        bucket, year = key
+        seq = sum(1 for p in self._partitions if (p.bucket, p.year) == key)
+        rel = Path(self.revision) / f"bucket={bucket:02d}" / f"year={year}" / f"part-{seq:05d}.parquet"
+        (self._root / rel).parent.mkdir(parents=True, exist_ok=True)
+        columns = list(zip(*rows, strict=True))
+        table = pa.Table.from_arrays(
+            [pa.array(col, type=f.type) for col, f in zip(columns, _schema(), strict=True)],
+            schema=_schema(),
+        )
+        pq.write_table(table, self._root / rel, compression="zstd")
+        self._partitions.append(
+            LakePartition(
+                path=rel.as_posix(),
+                bucket=bucket,
+                year=year,
+                rows=len(rows),
+                min_date=min(r[1] for r in rows),
+                max_date=max(r[1] for r in rows),
+            )
+        )
+
+    def commit(self, *, revisions: Mapping[str, object] | None = None) -> LakeManifest:
+        """Flush remaining rows, publish the manifest and prune old revisions."""
+        for key in sorted(self._buffers):
+            self._flush(key)
+        manifest = LakeManifest(
+            revision=self.revision,
+            created_at=datetime.now(UTC),
+            buckets=self._buckets,
+            partitions=tuple(sorted(self._partitions, key=lambda p: (p.bucket, p.year, p.path))),
+            tickers={t: str(r) for t, r in sorted((revisions or {}).items())},
+        )
+        previous = PriceLake(self._root).manifest()
+        _write_json(self._root / self.revision / "manifest.json", manifest.to_json())
+        _write_json(self._root / "manifest.json", manifest.to_json())
+        keep = {self.revision} | ({previous.revision} if previous else set())
+        abandoned_before = time.time() - ABANDONED_EXPORT_SECONDS
+        for stale in self._root.iterdir():
+            if not stale.is_dir() or stale.name in keep:
+                continue
+            # Directories without a manifest belong to exports still writing (or crashed).
+            if (stale / "manifest.json").exists() or stale.stat().st_mtime < abandoned_before:
+                shutil.rmtree(stale, ignore_errors=True)
+        return manifest
+
+    def abort(self) -> None:
+        shutil.rmtree(self._root / self.revision, ignore_errors=True)
+
+
+def _write_json(path: Path, payload: dict[str, Any]) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".manifest-", suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh)
+    os.replace(tmp, path)
+
+
+class PriceLake:
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def manifest(self) -> LakeManifest | None:
+        try:
+            raw = json.loads((self.root / "manifest.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return LakeManifest.from_json(raw)
+
+    def writer(
+        self,
+        *,
+        buckets: int = DEFAULT_BUCKETS,
+        part_rows: int = PART_ROWS,
+        max_buffered_rows: int = MAX_BUFFERED_ROWS,
+    ) -> LakeWriter:
+        self.root.mkdir(parents=True, exist_ok=True)
+        return LakeWriter(self.root, buckets=buckets, part_rows=part_rows, max_buffered_rows=max_buffered_rows)
+
+    def scan(
+        self,
+        *,
+        tickers: Collection[str] | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> Any:
+        """
+        Rows of the current revision as a ``pyarrow.Table`` sorted by (ticker, date).
+
+        Parts are pruned by bucket and date range from the manifest, and the
+        remaining filters are pushed down to Parquet row groups. ``columns``
+        selects a subset of ``LAKE_COLUMNS`` (``ticker`` and ``date`` are always read).
+        """
+        pa, pq = _pyarrow()
+        wanted = ["ticker", "date", *(c for c in (columns or LAKE_COLUMNS[2:]) if c not in ("ticker", "date"))]
+        unknown = sorted(set(wanted) - set(LAKE_COLUMNS))
+        if unknown:
+            raise ValueError(f"Unknown lake columns: {', '.join(unknown)}")
+        schema = _schema()
+        empty = schema.empty_table().select(wanted)
+        manifest = self.manifest()
+        if manifest is None:
+            return empty
+
+        filters: list[tuple[str, str, Any]] = []
+        if tickers is not None:
+            tickers = sorted(set(tickers))
+            if not tickers:
+                return empty
+            filters.append(("ticker", "in", tickers))
+        if start is not None:
+            filters.append(("date", ">=", start))
+        if end is not None:
+            filters.append(("date", "<=", end))
+
+        parts = manifest.select(tickers=tickers, start=start, end=end)
+        tables = [
+            pq.read_table(self.root / p.path, columns=wanted, filters=filters or None, schema=schema)
+            for p in parts
+        ]
+        if not tables:
+            return empty
+        return pa.concat_tables(tables).sort_by([("ticker", "ascending"), ("date", "ascending")])
+
+    def read_close_arrays(
+        self,
+        *,
+        tickers: Collection[str],
+        start: date | None = None,
+        end: date | None = None,
+    ) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """Same shape as ``PricesRepo.get_close_arrays``, served from the lake."""
+        tickers = list(dict.fromkeys(tickers))
+        out = {t: (np.empty(0, dtype="datetime64[D]"), np.empty(0, dtype=np.float64)) for t in tickers}
+        table = self.scan(tickers=tickers, start=start, end=end, columns=["close"])
+        if table.num_rows == 0:
+            return out
+        names = table.column("ticker").to_numpy(zero_copy_only=False)
+        dates = table.column("date").to_numpy(zero_copy_only=False).astype("datetime64[D]")
+        closes = table.column("close").to_numpy(zero_copy_only=False).astype(np.float64)
+        keep = ~np.isnan(closes)
+        names, dates, closes = names[keep], dates[keep], closes[keep]
+        bounds = np.flatnonzero(names[1:] != names[:-1]) + 1
+        for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, names.shape[0]], strict=True):
+            if hi > lo:
+                out[str(names[lo])] = (dates[lo:hi], closes[lo:hi])
+        return out
@@ -0,0 +1 @@
+# local (per-node) caches
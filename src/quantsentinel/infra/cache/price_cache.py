@@ -0,0 +1,257 @@
+"""
+Local columnar price cache.
+
+Per-node, on-disk copy of each ticker's close history as ``.npy`` arrays that
+are memory-mapped on read, so repeated history reads (replays, monitor cycles)
+come from local disk instead of Postgres.
+
+Layout under ``root``::
+
+    <ticker>/meta.json          revision, sync marker, current generation
+    <ticker>/<gen>/dates.npy    datetime64[D]
+    <ticker>/<gen>/closes.npy   float64
+
+A ticker's entry is valid while ``instrument_latest`` still reports the
+revision and ``updated_at`` it was synced at. When they move on, bars
+ingested since the last sync are fetched: if they all lie after the cached
+history they are appended, otherwise (older bars rewritten, rows deleted) the
+ticker is reloaded in full. Each write goes to a new generation directory and
+``meta.json`` is swapped atomically, so concurrent readers never see a mix of
+old and new arrays.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from collections.abc import Collection, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import quote
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from quantsentinel.infra.db.repos.prices_repo import LatestRevision, PricesRepo
+
+CloseArrays = tuple[np.ndarray, np.ndarray]
+
+
+@dataclass(frozen=True)
+class CacheMeta:
+    revision_id: str
+    synced_at: datetime
+    last_date: date | None
+    rows: int
+    generation: str
+
+    def matches(self, latest: LatestRevision) -> bool:
+        return self.revision_id == str(latest.revision_id) and self.synced_at == latest.updated_at
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    appended: int = 0
+    reloaded: int = 0
+    evicted: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return {"hits": self.hits, "appended": self.appended, "reloaded": self.reloaded, "evicted": self.evicted}
+
+
+def _empty() -> CloseArrays:
+    return np.empty(0, dtype="datetime64[D]"), np.empty(0, dtype=np.float64)
+
+
+def _slice(arrays: CloseArrays, *, start: date | None, end: date | None, days: int | None) -> CloseArrays:
+    dates, closes = arrays
+    lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start, "D"), side="left"))
+    hi = dates.shape[0] if end is None else int(np.searchsorted(dates, np.datetime64(end, "D"), side="right"))
+    if days is not None:
+        lo = max(lo, hi - max(int(days), 0))
+    return dates[lo:hi], closes[lo:hi]
+
+
+class PriceCache:
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.stats = CacheStats()
+
+    # -----------------------------
+    # Files
+    # -----------------------------
+
+    def _ticker_dir(self, ticker: str) -> Path:
+        # Tickers like "^GSPC" or "EURUSD=X" must map to a single safe path segment.
+        return self.root / quote(ticker, safe="")
+
+    def meta(self, ticker: str) -> CacheMeta | None:
+        try:
+            raw = json.loads((self._ticker_dir(ticker) / "meta.json").read_text(encoding="utf-8"))
+            return CacheMeta(
+                revision_id=raw["revision_id"],
+                synced_at=datetime.fromisoformat(raw["synced_at"]),
+                last_date=date.fromisoformat(raw["last_date"]) if raw.get("last_date") else None,
+                rows=int(raw["rows"]),
+                generation=raw["generation"],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def load(self, ticker: str, meta: CacheMeta | None = None) -> CloseArrays | None:
+        """Memory-mapped ``(dates, closes)`` for ``ticker``; None when not cached or unreadable."""
+        meta = meta or self.meta(ticker)
+        if meta is None:
+            return None
+        gen_dir = self._ticker_dir(ticker) / meta.generation
+        try:
+            dates = np.load(gen_dir / "dates.npy", mmap_mode="r")
+            closes = np.load(gen_dir / "closes.npy", mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if dates.shape[0] != meta.rows or closes.shape[0] != meta.rows:
+            return None
+        return dates, closes
+
+    def store(self, ticker: str, arrays: CloseArrays, *, latest: LatestRevision) -> CacheMeta:
+        """Write a new generation for ``ticker`` and atomically make it current."""
+        dates = np.ascontiguousarray(arrays[0], dtype="datetime64[D]")
+        closes = np.ascontiguousarray(arrays[1], dtype=np.float64)
+        ticker_dir = self._ticker_dir(ticker)
+        ticker_dir.mkdir(parents=True, exist_ok=True)
+        generation = uuid.uuid4().hex
+        gen_dir = ticker_dir / generation
+        gen_dir.mkdir()
+        np.save(gen_dir / "dates.npy", dates)
+        np.save(gen_dir / "closes.npy", closes)
+
+        meta = CacheMeta(
+            revision_id=str(latest.revision_id),
+            synced_at=latest.updated_at,
+            last_date=dates[-1].astype(object) if dates.shape[0] else None,
+            rows=int(dates.shape[0]),
+            generation=generation,
+        )
+        payload: dict[str, Any] = {
+            "revision_id": meta.revision_id,
+            "synced_at": meta.synced_at.isoformat(),
+            "last_date": meta.last_date.isoformat() if meta.last_date else None,
+            "rows": meta.rows,
+            "generation": meta.generation,
+        }
+        fd, tmp = tempfile.mkstemp(dir=ticker_dir, prefix=".meta-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh)
+        os.replace(tmp, ticker_dir / "meta.json")
+        self._drop_generations(ticker_dir, keep=generation)
+        return meta
+
+    def invalidate(self, ticker: str) -> None:
+        shutil.rmtree(self._ticker_dir(ticker), ignore_errors=True)
+
+    @staticmethod
+    def _drop_generations(ticker_dir: Path, *, keep: str) -> None:
+        # Open memory maps stay valid after unlink, so readers of old generations are unaffected.
+        for child in ticker_dir.iterdir():
+            if child.is_dir() and child.name != keep:
+                shutil.rmtree(child, ignore_errors=True)
+
+    # -----------------------------
+    # Read-through
+    # -----------------------------
+
+    def read(
+        self,
+        repo: PricesRepo,
+        tickers: Collection[str],
+        *,
+        start: date | None = None,
+        end: date | None = None,
+        days: int | Mapping[str, int] | None = None,
+    ) -> dict[str, CloseArrays]:
+        """
+        ``PricesRepo.get_close_arrays`` served from the cache, syncing stale tickers first.
+
+        Costs one marker query, plus one delta query when any ticker changed and one
+        full read when any ticker is new or was rewritten.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+        history = self.sync(repo, tickers)
+        out: dict[str, CloseArrays] = {}
+        for ticker in tickers:
+            depth = days.get(ticker, 0) if isinstance(days, Mapping) else days
+            out[ticker] = _slice(history[ticker], start=start, end=end, days=depth)
+        return out
+
+    def sync(self, repo: PricesRepo, tickers: list[str]) -> dict[str, CloseArrays]:
+        """Bring ``tickers`` up to date with the database and return their full cached history."""
+        latest = repo.get_latest_revisions(tickers)
+        history: dict[str, CloseArrays] = {}
+        stale: dict[str, tuple[CacheMeta, CloseArrays]] = {}
+        reload: list[str] = []
+        for ticker in tickers:
+            current = latest.get(ticker)
+            if current is None:
+                if self._ticker_dir(ticker).exists():
+                    self.invalidate(ticker)
+                    self.stats.evicted += 1
+                history[ticker] = _empty()
+                continue
+            meta = self.meta(ticker)
+            cached = self.load(ticker, meta) if meta is not None else None
+            if meta is None or cached is None:
+                reload.append(ticker)
+            elif meta.matches(current):
+                self.stats.hits += 1
+                history[ticker] = cached
+            elif current.updated_at > meta.synced_at:
+                stale[ticker] = (meta, cached)
+            else:
+                reload.append(ticker)
+
+        if stale:
+            deltas = repo.get_close_arrays(
+                tickers=list(stale),
+                ingested_after={t: meta.synced_at for t, (meta, _) in stale.items()},
+            )
+            for ticker, (meta, cached) in stale.items():
+                new_dates, new_closes = deltas[ticker]
+                last = np.datetime64(meta.last_date, "D") if meta.last_date else None
+                if new_dates.shape[0] == 0 or (last is not None and new_dates[0] <= last):
+                    # Nothing new yet the marker moved (delete), or older bars were rewritten.
+                    reload.append(ticker)
+                    continue
+                merged = (np.concatenate([cached[0], new_dates]), np.concatenate([cached[1], new_closes]))
+                self.store(ticker, merged, latest=latest[ticker])
+                self.stats.appended += 1
+                history[ticker] = merged
+
+        if reload:
+            for ticker, arrays in repo.get_close_arrays(tickers=reload).items():
+                self.store(ticker, arrays, latest=latest[ticker])
+                self.stats.reloaded += 1
+                history[ticker] = arrays
+        return history
+
+
+# Process-wide cache, configured once at startup from ``Settings.price_cache_dir``.
+_PRICE_CACHE: PriceCache | None = None
+
+
+def configure_price_cache(root: str | Path | None) -> PriceCache | None:
+    """Enable the local price cache under ``root`` (None disables it)."""
+    global _PRICE_CACHE
+    _PRICE_CACHE = PriceCache(root) if root else None
+    return _PRICE_CACHE
+
+
+def get_price_cache() -> PriceCache | None:
+    return _PRICE_CACHE
@@ -0,0 +1,162 @@
+"""
+Shared tickers x dates close panel for process-pool workers.
+
+The parent publishes a float64 panel once per search, either into
+``multiprocessing.shared_memory`` or into an ``.npy`` file under a directory,
+and hands workers a small picklable :class:`PanelHandle`. Workers attach
+read-only, zero-copy views, so memory stays flat as the pool grows instead of
+every worker unpickling its own copy.
+
+Typical use::
+
+    with publish_panel(build_close_panel(arrays)) as shared:
+        with ProcessPoolExecutor(initializer=attach_worker_panel, initargs=(shared.handle,)) as pool:
+            ...  # workers call worker_panel()
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from collections.abc import Mapping
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SharedPricePanel:
+    """
+    Closes aligned on the union of dates; NaN where a ticker has no bar.
+
+    A dense matrix, unlike ``domain.market.models.PricePanel`` (a mapping of series).
+    """
+
+    tickers: tuple[str, ...]
+    dates: np.ndarray  # datetime64[D], ascending
+    values: np.ndarray  # float64, shape (len(tickers), len(dates))
+
+    def row(self, ticker: str) -> np.ndarray:
+        return self.values[self.tickers.index(ticker)]
+
+
+@dataclass(frozen=True)
+class PanelHandle:
+    """Picklable reference to a published panel; exactly one of ``shm_name`` / ``path`` is set."""
+
+    tickers: tuple[str, ...]
+    dates: np.ndarray
+    shm_name: str | None = None
+    path: str | None = None
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.tickers), int(self.dates.shape[0])
+
+
+def build_close_panel(arrays: Mapping[str, tuple[np.ndarray, np.ndarray]]) -> SharedPricePanel:
+    """Align per-ticker ``(dates, closes)`` arrays (e.g. ``PricesRepo.get_close_arrays``) into one panel."""
+    tickers = tuple(arrays)
+    parts = [np.asarray(arrays[t][0], dtype="datetime64[D]") for t in tickers]
+    dates = np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype="datetime64[D]")
+    values = np.full((len(tickers), dates.shape[0]), np.nan, dtype=np.float64)
+    for i, ticker in enumerate(tickers):
+        values[i, np.searchsorted(dates, parts[i])] = arrays[ticker][1]
+    return SharedPricePanel(tickers=tickers, dates=dates, values=values)
+
+
+class PublishedPanel:
+    """Owner side of a published panel; ``close()`` releases and removes the backing storage."""
+
+    def __init__(self, panel: SharedPricePanel, *, directory: str | Path | None = None) -> None:
+        values = np.ascontiguousarray(panel.values, dtype=np.float64)
+        self._shm: shared_memory.SharedMemory | None = None
+        self._path: Path | None = None
+        if directory is None:
+            # SharedMemory rejects size 0, so empty panels still get one byte.
+            self._shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            np.ndarray(values.shape, dtype=np.float64, buffer=self._shm.buf)[...] = values
+            self.handle = PanelHandle(tickers=panel.tickers, dates=panel.dates, shm_name=self._shm.name)
+        else:
+            fd, path = tempfile.mkstemp(dir=directory, prefix="panel-", suffix=".npy")
+            with os.fdopen(fd, "wb") as fh:
+                np.save(fh, values)
+            self._path = Path(path)
+            self.handle = PanelHandle(tickers=panel.tickers, dates=panel.dates, path=str(self._path))
+
+    def close(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+        if self._path is not None:
+            self._path.unlink(missing_ok=True)
+            self._path = None
+
+    def __enter__(self) -> PublishedPanel:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def publish_panel(panel: SharedPricePanel, *, directory: str | Path | None = None) -> PublishedPanel:
+    """Publish ``panel`` to shared memory (or an mmap file under ``directory``)."""
+    return PublishedPanel(panel, directory=directory)
+
+
+def _open_shm(name: str) -> shared_memory.SharedMemory:
+    # Attaching processes must not register the block with their resource tracker,
+    # otherwise it is unlinked when the first worker exits.
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    return shm
+
+
+class AttachedPanel:
+    """Worker side: a read-only view over a published panel."""
+
+    def __init__(self, handle: PanelHandle) -> None:
+        self._shm: shared_memory.SharedMemory | None = None
+        if handle.shm_name is not None:
+            self._shm = _open_shm(handle.shm_name)
+            values = np.ndarray(handle.shape, dtype=np.float64, buffer=self._shm.buf)
+        elif handle.path is not None:
+            values = np.load(handle.path, mmap_mode="r")
+        else:
+            raise ValueError("panel handle has no backing storage")
+        values.flags.writeable = False
+        self.panel = SharedPricePanel(tickers=handle.tickers, dates=handle.dates, values=values)
+
+    def close(self) -> None:
+        if self._shm is not None:
+            # Views must be dropped before the buffer can be released.
+            self.panel = SharedPricePanel(tickers=self.panel.tickers, dates=self.panel.dates, values=np.empty((0, 0)))
+            self._shm.close()
+            self._shm = None
+
+
+def attach_panel(handle: PanelHandle) -> AttachedPanel:
+    return AttachedPanel(handle)
+
+
+# Per-process attachment set by ``attach_worker_panel`` (pool initializer).
+_WORKER_PANEL: AttachedPanel | None = None
+
+
+def attach_worker_panel(handle: PanelHandle) -> None:
+    """``ProcessPoolExecutor`` initializer: attach once per worker process."""
+    global _WORKER_PANEL
+    _WORKER_PANEL = AttachedPanel(handle)
+
+
+def worker_panel() -> SharedPricePanel:
+    if _WORKER_PANEL is None:
+        raise RuntimeError("no shared panel attached in this process")
+    return _WORKER_PANEL.panel
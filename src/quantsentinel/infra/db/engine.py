@@ -6,15 +6,17 @@ Goals:
 - Lazy engine creation (no connection on import)
 - One engine per process
 - Standard session_scope() transaction boundary
+- count_queries() for per-session statement counts (monitor profiling)
 """
 
 from __future__ import annotations
 
 from collections.abc import Generator
 from contextlib import contextmanager
+from dataclasses import dataclass
 from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -77,6 +79,40 @@ def session_scope() -> Generator[Session, None, None]:
         session.close()
 
 
+@dataclass
+class QueryCounter:
+    count: int = 0
+
+    def __call__(self) -> int:
+        return self.count
+
+
+@contextmanager
+def count_queries(session: Session) -> Generator[QueryCounter, None, None]:
+    """
+    Count SQL statements sent on ``session``'s connection inside the block.
+
+    Listens on the session's own connection, so statements from other sessions
+    or threads are not counted. Objects that are not a ``Session`` (test doubles)
+    yield a counter that stays at zero.
+    """
+    counter = QueryCounter()
+    if not isinstance(session, Session):
+        yield counter
+        return
+
+    conn = session.connection()
+
+    def _on_execute(*_args: Any, **_kwargs: Any) -> None:
+        counter.count += 1
+
+    event.listen(conn, "before_cursor_execute", _on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(conn, "before_cursor_execute", _on_execute)
+
+
 def db_healthcheck() -> dict[str, Any]:
     """
     Returns:
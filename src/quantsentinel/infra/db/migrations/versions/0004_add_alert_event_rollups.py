@@ -0,0 +1,49 @@
+"""add alert event rollups
+
+Revision ID: 0004_add_alert_event_rollups
+Revises: 0003_add_task_log
+Create Date: 2026-03-05
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0004_add_alert_event_rollups"
+down_revision = "0003_add_task_log"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    alert_event_status = postgresql.ENUM("NEW", "ACKED", name="alert_event_status", create_type=False)
+
+    op.create_table(
+        "alert_event_rollups",
+        sa.Column("rule_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("alert_rules.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("ticker", sa.String(length=64), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("status", alert_event_status, nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.PrimaryKeyConstraint("rule_id", "ticker", "day", "status", name="pk_alert_event_rollups"),
+    )
+    op.create_index("ix_alert_event_rollups_day", "alert_event_rollups", ["day"])
+
+    # Backfill from existing events; later changes are applied incrementally by the app.
+    op.execute(
+        """
+        INSERT INTO alert_event_rollups (rule_id, ticker, day, status, count)
+        SELECT rule_id, ticker, (event_ts AT TIME ZONE 'UTC')::date, status, count(*)
+        FROM alert_events
+        GROUP BY rule_id, ticker, (event_ts AT TIME ZONE 'UTC')::date, status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_alert_event_rollups_day", table_name="alert_event_rollups")
+    op.drop_table("alert_event_rollups")
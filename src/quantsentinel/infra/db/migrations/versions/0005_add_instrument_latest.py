@@ -0,0 +1,51 @@
+"""add instrument latest summary
+
+Revision ID: 0005_add_instrument_latest
+Revises: 0004_add_alert_event_rollups
+Create Date: 2026-03-06
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0005_add_instrument_latest"
+down_revision = "0004_add_alert_event_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "instrument_latest",
+        sa.Column("ticker", sa.String(length=64), sa.ForeignKey("instruments.ticker", ondelete="CASCADE"), primary_key=True, nullable=False),
+        sa.Column("last_date", sa.Date(), nullable=False),
+        sa.Column("last_close", sa.Numeric(18, 8), nullable=True),
+        sa.Column("prev_close", sa.Numeric(18, 8), nullable=True),
+        sa.Column("change", sa.Numeric(18, 8), nullable=True),
+        sa.Column("revision_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    )
+
+    # Backfill from existing prices; ingest keeps the table current afterwards.
+    op.execute(
+        """
+        INSERT INTO instrument_latest (ticker, last_date, last_close, prev_close, change, revision_id)
+        SELECT ticker, date, close, prev_close, close - prev_close, revision_id
+        FROM (
+            SELECT ticker, date, close, revision_id,
+                   lead(close) OVER (PARTITION BY ticker ORDER BY date DESC) AS prev_close,
+                   row_number() OVER (PARTITION BY ticker ORDER BY date DESC) AS rn
+            FROM prices_daily
+        ) ranked
+        WHERE rn = 1
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("instrument_latest")
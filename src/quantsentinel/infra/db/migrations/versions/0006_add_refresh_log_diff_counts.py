@@ -0,0 +1,30 @@
+"""add refresh log diff counts
+
+Revision ID: 0006_add_refresh_log_diff_counts
+Revises: 0005_add_instrument_latest
+Create Date: 2026-03-07
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006_add_refresh_log_diff_counts"
+down_revision = "0005_add_instrument_latest"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = ("rows_inserted", "rows_changed", "rows_unchanged")
+
+
+def upgrade() -> None:
+    for name in _COLUMNS:
+        op.add_column("refresh_log", sa.Column(name, sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    for name in reversed(_COLUMNS):
+        op.drop_column("refresh_log", name)
@@ -0,0 +1,38 @@
+"""add backfill chunk checkpoints
+
+Revision ID: 0007_add_backfill_chunks
+Revises: 0006_add_refresh_log_diff_counts
+Create Date: 2026-03-08
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0007_add_backfill_chunks"
+down_revision = "0006_add_refresh_log_diff_counts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "backfill_chunks",
+        sa.Column("ticker", sa.String(length=64), sa.ForeignKey("instruments.ticker", ondelete="CASCADE"), primary_key=True, nullable=False),
+        sa.Column("chunk_start", sa.Date(), primary_key=True, nullable=False),
+        sa.Column("chunk_end", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("rows", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("revision_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("backfill_chunks")
@@ -184,7 +184,24 @@ class PriceDaily(Base):
 
     revision_id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
 
-    instrument: Mapped[Instrument] = relationship("Instrument", lazy="joined")
+    instrument: Mapped[Instrument] = relationship("Instrument", lazy="select")
+
+
+class InstrumentLatest(Base):
+    """Latest two bars per instrument, rebuilt by ``PricesRepo`` whenever prices are written."""
+
+    __tablename__ = "instrument_latest"
+
+    ticker: Mapped[str] = mapped_column(
+        String(64), ForeignKey("instruments.ticker", ondelete="CASCADE"), primary_key=True
+    )
+    last_date: Mapped[date] = mapped_column(Date, nullable=False)
+    last_close: Mapped[Decimal | None] = mapped_column(Numeric(18, 8), nullable=True)
+    prev_close: Mapped[Decimal | None] = mapped_column(Numeric(18, 8), nullable=True)
+    change: Mapped[Decimal | None] = mapped_column(Numeric(18, 8), nullable=True)
+
+    revision_id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
 
 # -----------------------------
@@ -289,6 +306,24 @@ class AlertEvent(Base):
     acker: Mapped[User | None] = relationship("User", lazy="joined")
 
 
+class AlertEventRollup(Base):
+    """Event counts per (rule, ticker, UTC day of ``event_ts``, status), kept current by ``EventsRepo``."""
+
+    __tablename__ = "alert_event_rollups"
+
+    rule_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True), ForeignKey("alert_rules.id", ondelete="CASCADE"), primary_key=True
+    )
+    ticker: Mapped[str] = mapped_column(String(64), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    status: Mapped[AlertEventStatus] = mapped_column(
+        SAEnum(AlertEventStatus, name="alert_event_status", native_enum=True),
+        primary_key=True,
+    )
+
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+
+
 # -----------------------------
 # Strategy projects/runs
 # -----------------------------
@@ -356,6 +391,29 @@ class RefreshLog(Base):
     last_date: Mapped[date | None] = mapped_column(Date, nullable=True)
     revision_id: Mapped[uuid.UUID | None] = mapped_column(PG_UUID(as_uuid=True), nullable=True)
 
+    # Bars written vs. found identical (diff ingest); None when not counted.
+    rows_inserted: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    rows_changed: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    rows_unchanged: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+
+class BackfillChunk(Base):
+    """Checkpoint per fetched history chunk, so an interrupted backfill resumes where it stopped."""
+
+    __tablename__ = "backfill_chunks"
+
+    ticker: Mapped[str] = mapped_column(
+        String(64), ForeignKey("instruments.ticker", ondelete="CASCADE"), primary_key=True
+    )
+    chunk_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    chunk_end: Mapped[date] = mapped_column(Date, nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False)  # DONE | FAILED
+    rows: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    revision_id: Mapped[uuid.UUID | None] = mapped_column(PG_UUID(as_uuid=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
 
 # -----------------------------
 # UI layout presets
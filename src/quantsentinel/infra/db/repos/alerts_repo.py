@@ -1,20 +1,27 @@
 from __future__ import annotations
 
 import uuid
+from collections import Counter
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 from typing import Any
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from quantsentinel.infra.db.models import AlertEvent, AlertEventStatus, AlertRule
+from quantsentinel.infra.db.models import AlertEvent, AlertEventRollup, AlertEventStatus, AlertRule
 
 
 def _utc_now() -> datetime:
     return datetime.now(UTC)
 
 
+def _rollup_day(ts: datetime) -> date:
+    return ts.astimezone(UTC).date()
+
+
 @dataclass(frozen=True)
 class AlertRuleCreate:
     name: str
@@ -66,6 +73,12 @@ class AlertsRepo:
     def get_rule(self, rule_id: uuid.UUID) -> AlertRule | None:
         return self._session.get(AlertRule, rule_id)
 
+    def list_rules_by_ids(self, rule_ids: list[uuid.UUID]) -> list[AlertRule]:
+        if not rule_ids:
+            return []
+        stmt = select(AlertRule).where(AlertRule.id.in_(rule_ids)).order_by(AlertRule.created_at.desc())
+        return list(self._session.execute(stmt).scalars().all())
+
     def create_rule(self, payload: AlertRuleCreate) -> uuid.UUID:
         rule = AlertRule(
             id=uuid.uuid4(),
@@ -106,6 +119,9 @@ class AlertsRepo:
 
 
 class EventsRepo:
+    # Rows per multi-row INSERT (10 binds each, well under the 65535 bind limit).
+    BULK_INSERT_CHUNK = 1000
+
     def __init__(self, session: Session) -> None:
         self._session = session
 
@@ -146,8 +162,40 @@ class EventsRepo:
         )
         self._session.add(ev)
         self._session.flush()
+        self._bump_rollups({(rule_id, ticker, _rollup_day(ev.event_ts), status): 1})
         return event_id
 
+    def create_events(self, events: Sequence[AlertEventCreate]) -> list[uuid.UUID]:
+        """
+        Insert many events with one multi-row INSERT per chunk.
+
+        Ids are generated client-side so no RETURNING round-trip is needed; they are
+        returned in input order. All rows of one call share the same ``event_ts``.
+        """
+        if not events:
+            return []
+        now = _utc_now()
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "rule_id": ev.rule_id,
+                "ticker": ev.ticker,
+                "event_ts": now,
+                "asof_date": ev.asof_date,
+                "message": ev.message,
+                "context_json": ev.context or {},
+                "status": ev.status,
+                "ack_ts": now if ev.status == AlertEventStatus.ACKED else None,
+                "ack_by": ev.ack_by,
+            }
+            for ev in events
+        ]
+        for start in range(0, len(rows), self.BULK_INSERT_CHUNK):
+            self._session.execute(insert(AlertEvent).values(rows[start : start + self.BULK_INSERT_CHUNK]))
+        day = _rollup_day(now)
+        self._bump_rollups(Counter((row["rule_id"], row["ticker"], day, row["status"]) for row in rows))
+        return [row["id"] for row in rows]
+
     def get(self, event_id: uuid.UUID) -> AlertEvent | None:
         return self._session.get(AlertEvent, event_id)
 
@@ -157,8 +205,84 @@ class EventsRepo:
             stmt = stmt.where(AlertEvent.status == status)
         return list(self._session.execute(stmt).scalars().all())
 
-    def ack(self, *, event_id: uuid.UUID, actor_id: uuid.UUID) -> None:
+    def ack(self, *, event_id: uuid.UUID, actor_id: uuid.UUID) -> bool:
+        """Acknowledge a NEW event and move it between rollup buckets; False if it was not NEW."""
         now = _utc_now()
-        self._session.execute(
-            update(AlertEvent).where(AlertEvent.id == event_id).values(status=AlertEventStatus.ACKED, ack_ts=now, ack_by=actor_id)
+        row = self._session.execute(
+            update(AlertEvent)
+            .where(AlertEvent.id == event_id, AlertEvent.status == AlertEventStatus.NEW)
+            .values(status=AlertEventStatus.ACKED, ack_ts=now, ack_by=actor_id)
+            .returning(AlertEvent.rule_id, AlertEvent.ticker, AlertEvent.event_ts)
+        ).one_or_none()
+        if row is None:
+            return False
+        day = _rollup_day(row.event_ts)
+        self._bump_rollups(
+            {
+                (row.rule_id, row.ticker, day, AlertEventStatus.NEW): -1,
+                (row.rule_id, row.ticker, day, AlertEventStatus.ACKED): 1,
+            }
         )
+        return True
+
+    # -----------------------------
+    # Rollups
+    # -----------------------------
+
+    def _bump_rollups(self, deltas: Mapping[tuple[uuid.UUID, str, date, AlertEventStatus], int]) -> None:
+        """
+        Add ``deltas`` to the rollup counters with one upsert per chunk.
+
+        Keys are sorted so concurrent writers touch counter rows in the same order.
+        """
+        rows = [
+            {"rule_id": rule_id, "ticker": ticker, "day": day, "status": status, "count": delta}
+            for (rule_id, ticker, day, status), delta in sorted(deltas.items(), key=lambda kv: tuple(map(str, kv[0])))
+            if delta
+        ]
+        table = AlertEventRollup.__table__
+        for start in range(0, len(rows), self.BULK_INSERT_CHUNK):
+            stmt = pg_insert(table).values(rows[start : start + self.BULK_INSERT_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.rule_id, table.c.ticker, table.c.day, table.c.status],
+                set_={"count": table.c.count + stmt.excluded.count},
+            )
+            self._session.execute(stmt)
+
+    def rollup_counts(
+        self,
+        *,
+        group_by: str,
+        since: date | None = None,
+        limit: int | None = None,
+    ) -> list[tuple[Any, ...]]:
+        """
+        Event counts from the rollup table, grouped by ``day``, ``rule``, ``ticker`` or ``severity``.
+
+        Rows are ``(*keys, new, acked)`` ordered by day (for ``day``) or by total
+        count descending; ``rule`` keys are ``(rule_id, name, severity)``. Cost
+        depends on the number of rollup rows in range, not on the number of events.
+        """
+        keys = {
+            "day": (AlertEventRollup.day,),
+            "rule": (AlertRule.id, AlertRule.name, AlertRule.severity),
+            "ticker": (AlertEventRollup.ticker,),
+            "severity": (AlertRule.severity,),
+        }.get(group_by)
+        if keys is None:
+            raise ValueError(f"Unknown rollup grouping: {group_by}")
+        new = func.sum(case((AlertEventRollup.status == AlertEventStatus.NEW, AlertEventRollup.count), else_=0))
+        acked = func.sum(case((AlertEventRollup.status == AlertEventStatus.ACKED, AlertEventRollup.count), else_=0))
+        stmt = select(*keys, new, acked).select_from(AlertEventRollup).group_by(*keys)
+        if group_by in ("rule", "severity"):
+            stmt = stmt.join(AlertRule, AlertRule.id == AlertEventRollup.rule_id)
+        if since is not None:
+            stmt = stmt.where(AlertEventRollup.day >= since)
+        stmt = stmt.having(func.sum(AlertEventRollup.count) > 0)
+        if group_by == "day":
+            stmt = stmt.order_by(AlertEventRollup.day)
+        else:
+            stmt = stmt.order_by(func.sum(AlertEventRollup.count).desc(), *keys)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return [tuple(row) for row in self._session.execute(stmt).all()]
@@ -56,6 +56,10 @@ class AuditRepo:
         stmt = select(AuditLog).order_by(AuditLog.ts.desc()).limit(limit)
         return list(self._session.execute(stmt).scalars().all())
 
+    def list_by_action(self, action: str, *, limit: int = 200) -> list[AuditLog]:
+        stmt = select(AuditLog).where(AuditLog.action == action).order_by(AuditLog.ts.desc()).limit(limit)
+        return list(self._session.execute(stmt).scalars().all())
+
     def list_by_actor(self, actor_id: uuid.UUID, *, limit: int = 200) -> list[AuditLog]:
         stmt = (
             select(AuditLog)
@@ -0,0 +1,104 @@
+"""
+Backfill checkpoint repository.
+
+Responsibilities:
+- Read/write ``backfill_chunks`` (one row per fetched history chunk)
+- No provider calls; the backfill task (tasks_ingest.backfill_history) decides
+  what to fetch
+- Session injected; commit controlled by service/session_scope
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from quantsentinel.infra.db.models import BackfillChunk
+
+STATUS_DONE = "DONE"
+STATUS_FAILED = "FAILED"
+
+
+@dataclass(frozen=True)
+class BackfillCheckpoint:
+    ticker: str
+    chunk_start: date
+    chunk_end: date
+    status: str
+    rows: int = 0
+    error: str | None = None
+    revision_id: uuid.UUID | None = None
+
+
+class BackfillRepo:
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def completed(self, tickers: Collection[str]) -> set[tuple[str, date]]:
+        """(ticker, chunk_start) of every DONE chunk of ``tickers``."""
+        if not tickers:
+            return set()
+        stmt = select(BackfillChunk.ticker, BackfillChunk.chunk_start).where(
+            BackfillChunk.ticker.in_(list(tickers)),
+            BackfillChunk.status == STATUS_DONE,
+        )
+        return {(ticker, start) for ticker, start in self._session.execute(stmt).all()}
+
+    def unfinished(self, tickers: Collection[str], *, chunk_starts: Collection[date]) -> set[str]:
+        """
+        Tickers among ``tickers`` whose backfill started but did not finish: a FAILED
+        chunk, or no DONE chunk for one of ``chunk_starts``. Tickers without any
+        checkpoint are not included.
+        """
+        if not tickers:
+            return set()
+        starts = sorted(set(chunk_starts))
+        failed = func.count().filter(BackfillChunk.status == STATUS_FAILED)
+        done = func.count().filter(and_(BackfillChunk.status == STATUS_DONE, BackfillChunk.chunk_start.in_(starts)))
+        stmt = (
+            select(BackfillChunk.ticker)
+            .where(BackfillChunk.ticker.in_(list(tickers)))
+            .group_by(BackfillChunk.ticker)
+            .having(or_(failed > 0, done < len(starts)))
+        )
+        return set(self._session.execute(stmt).scalars().all())
+
+    def record(self, checkpoints: Iterable[BackfillCheckpoint]) -> None:
+        """Upsert checkpoints in one statement; a chunk seen again counts another attempt."""
+        by_key = {(c.ticker, c.chunk_start): c for c in checkpoints}
+        if not by_key:
+            return
+        table = BackfillChunk.__table__
+        stmt = pg_insert(table).values(
+            [
+                {
+                    "ticker": c.ticker,
+                    "chunk_start": c.chunk_start,
+                    "chunk_end": c.chunk_end,
+                    "status": c.status,
+                    "rows": c.rows,
+                    "error": c.error,
+                    "revision_id": c.revision_id,
+                }
+                for c in by_key.values()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["ticker", "chunk_start"],
+            set_={
+                "chunk_end": stmt.excluded.chunk_end,
+                "status": stmt.excluded.status,
+                "rows": stmt.excluded.rows,
+                "error": stmt.excluded.error,
+                "revision_id": stmt.excluded.revision_id,
+                "attempts": table.c.attempts + 1,
+                "updated_at": func.now(),
+            },
+        )
+        self._session.execute(stmt)
@@ -1,5 +1,5 @@
 """Events repository."""
 
-from quantsentinel.infra.db.repos.alerts_repo import EventsRepo
+from quantsentinel.infra.db.repos.alerts_repo import AlertEventCreate, EventsRepo
 
-__all__ = ["EventsRepo"]
+__all__ = ["AlertEventCreate", "EventsRepo"]
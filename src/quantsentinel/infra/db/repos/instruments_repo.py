@@ -9,12 +9,14 @@ Responsibilities:
 
 from __future__ import annotations
 
+from collections.abc import Collection
 from dataclasses import dataclass
 
 from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from quantsentinel.infra.db.models import Instrument
+from quantsentinel.infra.db.models import Instrument, InstrumentLatest
 
 
 @dataclass(frozen=True)
@@ -57,6 +59,17 @@ class InstrumentsRepo:
         self._session.flush()
         return inst
 
+    def ensure_many(self, tickers: Collection[str], *, source: str | None = None) -> None:
+        """
+        Bulk ``ensure_exists``: one ``INSERT ... ON CONFLICT DO NOTHING`` for all
+        ``tickers``, so price loads never trip the ``prices_daily`` foreign key.
+        """
+        rows = [{"ticker": t, "is_watched": False, "source": source} for t in sorted({t.strip() for t in tickers} - {""})]
+        if not rows:
+            return
+        stmt = pg_insert(Instrument.__table__).values(rows).on_conflict_do_nothing(index_elements=["ticker"])
+        self._session.execute(stmt)
+
     def upsert_metadata(self, data: InstrumentUpsert) -> Instrument:
         """
         Upsert basic instrument metadata (name/exchange/currency/source).
@@ -107,4 +120,15 @@ class InstrumentsRepo:
             .order_by(Instrument.ticker.asc())
             .limit(limit)
         )
-        return list(self._session.execute(stmt).scalars().all())
\ No newline at end of file
+        return list(self._session.execute(stmt).scalars().all())
+
+    def list_watched_with_latest(self, *, limit: int = 200) -> list[tuple[Instrument, InstrumentLatest | None]]:
+        """Watched instruments with their ``instrument_latest`` summary (None before the first ingest)."""
+        stmt = (
+            select(Instrument, InstrumentLatest)
+            .outerjoin(InstrumentLatest, InstrumentLatest.ticker == Instrument.ticker)
+            .where(Instrument.is_watched.is_(True))
+            .order_by(Instrument.ticker.asc())
+            .limit(limit)
+        )
+        return [(inst, latest) for inst, latest in self._session.execute(stmt).all()]
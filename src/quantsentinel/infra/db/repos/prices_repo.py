@@ -2,23 +2,43 @@
 Prices repository.
 
 Responsibilities:
-- CRUD/query for PriceDaily only
+- CRUD/query for PriceDaily, plus the derived InstrumentLatest summary kept in step with it
 - No provider/network calls
 - No indicator calculations
 """
 
 from __future__ import annotations
 
+import hashlib
 import statistics
-from collections.abc import Iterable
+from collections.abc import Collection, Iterable, Iterator, Mapping
 from dataclasses import dataclass
-from datetime import date
-from decimal import Decimal
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal
 
-from sqlalchemy import delete, select
+import numpy as np
+from sqlalchemy import (
+    Date,
+    Float,
+    String,
+    Text,
+    and_,
+    cast,
+    column,
+    delete,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+    values,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
-from quantsentinel.infra.db.models import PriceDaily
+from quantsentinel.infra.db.models import InstrumentLatest, PriceDaily
 
 
 @dataclass(frozen=True)
@@ -35,7 +55,93 @@ class PriceDailyCreate:
     revision_id: object = None  # uuid.UUID typically; kept generic to avoid importing uuid here
 
 
+@dataclass(frozen=True)
+class LatestRevision:
+    """Change marker for one ticker's stored history (from ``instrument_latest``)."""
+
+    revision_id: object
+    last_date: date
+    updated_at: datetime
+
+
+@dataclass(frozen=True)
+class BarDiff:
+    """Incoming bars split against what is stored: only ``rows`` need writing."""
+
+    inserted: list[PriceDailyCreate]
+    changed: list[PriceDailyCreate]
+    unchanged: int
+    per_ticker: dict[str, tuple[int, int, int]]  # ticker -> (inserted, changed, unchanged)
+
+    @property
+    def rows(self) -> list[PriceDailyCreate]:
+        return self.inserted + self.changed
+
+
+@dataclass(frozen=True)
+class UpsertResult:
+    inserted: int = 0
+    updated: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated
+
+
+def _return_stats(closes: list[float]) -> tuple[float | None, float | None]:
+    """(mean, population stdev) of simple returns; None below 3 closes or 2 returns."""
+    if len(closes) < 3:
+        return None, None
+    rets = [(closes[i] / closes[i - 1]) - 1.0 for i in range(1, len(closes)) if closes[i - 1] != 0]
+    if len(rets) < 2:
+        return None, None
+    return statistics.mean(rets), statistics.pstdev(rets)
+
+
+# Dates travel as integer days since this epoch so they map straight onto datetime64[D].
+_EPOCH = date(1970, 1, 1)
+
+_BAR_COLUMNS = ("open", "high", "low", "close", "adj_close", "volume")
+
+_UPSERT_COLUMNS = ("ticker", "date", "open", "high", "low", "close", "adj_close", "volume", "source", "revision_id")
+
+# Session-local staging table for COPY loads (dropped at commit).
+_STAGE_TABLE = "prices_daily_stage"
+
+# Bar content hashed for diff ingest, at the stored column scales. Postgres renders
+# numeric(p, s) as text with exactly ``s`` decimals, which the Python side mirrors.
+_HASH_SCALES = {
+    "open": Decimal("1e-8"),
+    "high": Decimal("1e-8"),
+    "low": Decimal("1e-8"),
+    "close": Decimal("1e-8"),
+    "adj_close": Decimal("1e-8"),
+    "volume": Decimal("0.01"),
+}
+
+
+def bar_content_hash(row: PriceDailyCreate | PriceDaily) -> str:
+    """md5 of a bar's OHLCV as stored; equal to the SQL-side ``_content_hash_expr``."""
+    parts = []
+    for col, scale in _HASH_SCALES.items():
+        value = getattr(row, col)
+        if value is None:
+            parts.append("")
+            continue
+        number = value if isinstance(value, Decimal) else Decimal(str(value))
+        parts.append(format(number.quantize(scale, rounding=ROUND_HALF_UP), "f"))
+    return hashlib.md5("|".join(parts).encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def _content_hash_expr():
+    cols = [func.coalesce(cast(getattr(PriceDaily, col), Text), "") for col in _HASH_SCALES]
+    return func.md5(func.concat_ws("|", *cols))
+
+
 class PricesRepo:
+    # Rows per multi-row upsert (10 binds each, well under the 65535 bind limit).
+    UPSERT_CHUNK = 2000
+
     def __init__(self, session: Session) -> None:
         self._session = session
 
@@ -90,6 +196,264 @@ class PricesRepo:
         rows.reverse()
         return [(r[0], float(r[1])) for r in rows if r[1] is not None]
 
+    def get_closes_between(self, *, ticker: str, start: date | None, end: date) -> list[tuple[date, float]]:
+        """(date, close) pairs with ``start <= date <= end``, oldest first (``start=None``: from the first bar)."""
+        stmt = select(PriceDaily.date, PriceDaily.close).where(
+            PriceDaily.ticker == ticker,
+            PriceDaily.close.is_not(None),
+            PriceDaily.date <= end,
+        )
+        if start is not None:
+            stmt = stmt.where(PriceDaily.date >= start)
+        rows = self._session.execute(stmt.order_by(PriceDaily.date.asc())).all()
+        return [(r[0], float(r[1])) for r in rows if r[1] is not None]
+
+    # -----------------------------
+    # Bulk reads (one round trip for many tickers)
+    # -----------------------------
+
+    def get_latest_price_dates(self, tickers: Collection[str]) -> dict[str, date]:
+        """Latest bar date per ticker; tickers without prices are absent."""
+        if not tickers:
+            return {}
+        stmt = (
+            select(PriceDaily.ticker, func.max(PriceDaily.date))
+            .where(PriceDaily.ticker.in_(list(tickers)))
+            .group_by(PriceDaily.ticker)
+        )
+        return dict(self._session.execute(stmt).all())
+
+    def _latest_bars(
+        self,
+        tickers: list[str],
+        days: int | Mapping[str, int],
+        *,
+        skip_null: bool,
+    ) -> dict[str, list[tuple[date, Decimal | None]]]:
+        """Latest bars per ticker, oldest first, in one ``row_number()`` window query."""
+        out: dict[str, list[tuple[date, Decimal | None]]] = {t: [] for t in tickers}
+        keep = self._depth_filter(tickers, days)
+        if keep is None:
+            return out
+
+        rn = func.row_number().over(partition_by=PriceDaily.ticker, order_by=PriceDaily.date.desc()).label("rn")
+        inner = select(PriceDaily.ticker, PriceDaily.date, PriceDaily.close, rn).where(PriceDaily.ticker.in_(tickers))
+        if skip_null:
+            inner = inner.where(PriceDaily.close.is_not(None))
+        ranked = inner.subquery()
+        stmt = select(ranked.c.ticker, ranked.c.date, ranked.c.close).where(keep(ranked)).order_by(ranked.c.ticker, ranked.c.date.asc())
+        for ticker, day, close in self._session.execute(stmt).all():
+            out[ticker].append((day, close))
+        return out
+
+    def get_recent_closes_many(
+        self,
+        *,
+        tickers: Collection[str],
+        days: int | Mapping[str, int],
+    ) -> dict[str, list[tuple[date, float]]]:
+        """
+        ``get_recent_closes`` for many tickers in one query.
+
+        ``days`` is one depth for all tickers or a per-ticker mapping. Every requested
+        ticker is in the result, possibly with no bars.
+        """
+        bars = self._latest_bars(list(dict.fromkeys(tickers)), days, skip_null=True)
+        return {t: [(d, float(c)) for d, c in rows if c is not None] for t, rows in bars.items()}
+
+    def get_latest_two_closes_many(self, tickers: Collection[str]) -> dict[str, tuple[Decimal | None, Decimal | None]]:
+        """``get_latest_two_closes`` for many tickers in one query."""
+        bars = self._latest_bars(list(dict.fromkeys(tickers)), 2, skip_null=False)
+        out: dict[str, tuple[Decimal | None, Decimal | None]] = {}
+        for ticker, rows in bars.items():
+            last = rows[-1][1] if rows else None
+            prev = rows[-2][1] if len(rows) >= 2 else None
+            out[ticker] = (last, prev)
+        return out
+
+    def get_return_stats_many(self, *, tickers: Collection[str], lookback: int) -> dict[str, tuple[float | None, float | None]]:
+        """``get_return_stats`` for many tickers from a single closes query."""
+        series = self.get_recent_closes_many(tickers=tickers, days=lookback + 1)
+        return {ticker: _return_stats([v for _, v in closes]) for ticker, closes in series.items()}
+
+    # -----------------------------
+    # Columnar reads (NumPy-native, no ORM/Decimal materialization)
+    # -----------------------------
+
+    def get_close_arrays(
+        self,
+        *,
+        tickers: Collection[str],
+        start: date | None = None,
+        end: date | None = None,
+        days: int | Mapping[str, int] | None = None,
+        ingested_after: Mapping[str, datetime] | None = None,
+    ) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """
+        Non-null closes per ticker as ``(dates datetime64[D], closes float64)``, oldest first.
+
+        Bounded by ``start``/``end`` and/or the latest ``days`` bars (one depth or a
+        per-ticker mapping, as in ``get_recent_closes_many``). ``ingested_after`` keeps
+        only bars written after a per-ticker timestamp (delta reads for caches; tickers
+        missing from it get none). Postgres casts closes
+        to float8 and aggregates each ticker into two arrays (dates as epoch days),
+        so one round trip returns one row per ticker and no ``Decimal``/``date``
+        objects are built per bar. Every requested ticker is in the result.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        out = {t: (np.empty(0, dtype="datetime64[D]"), np.empty(0, dtype=np.float64)) for t in tickers}
+        if not tickers:
+            return out
+
+        cols = [PriceDaily.ticker, PriceDaily.date, cast(PriceDaily.close, Float).label("close")]
+        filters = [PriceDaily.ticker.in_(tickers), PriceDaily.close.is_not(None)]
+        if start is not None:
+            filters.append(PriceDaily.date >= start)
+        if end is not None:
+            filters.append(PriceDaily.date <= end)
+        if ingested_after is not None:
+            if not ingested_after:
+                return out
+            filters.append(
+                or_(*(and_(PriceDaily.ticker == t, PriceDaily.ingested_at > ts) for t, ts in sorted(ingested_after.items())))
+            )
+        if days is None:
+            src = select(*cols).where(*filters).subquery()
+        else:
+            keep = self._depth_filter(tickers, days)
+            if keep is None:
+                return out
+            rn = func.row_number().over(partition_by=PriceDaily.ticker, order_by=PriceDaily.date.desc()).label("rn")
+            ranked = select(*cols, rn).where(*filters).subquery()
+            src = select(ranked.c.ticker, ranked.c.date, ranked.c.close).where(keep(ranked)).subquery()
+
+        stmt = select(
+            src.c.ticker,
+            func.array_agg(aggregate_order_by(src.c.date - literal(_EPOCH), src.c.date)),
+            func.array_agg(aggregate_order_by(src.c.close, src.c.date)),
+        ).group_by(src.c.ticker)
+        for ticker, day_numbers, closes in self._session.execute(stmt).all():
+            out[ticker] = (
+                np.asarray(day_numbers, dtype=np.int64).astype("datetime64[D]"),
+                np.asarray(closes, dtype=np.float64),
+            )
+        return out
+
+    def iter_bar_batches(
+        self,
+        *,
+        tickers: Collection[str] | None = None,
+        batch_size: int = 50_000,
+    ) -> Iterator[list[tuple]]:
+        """
+        Stream ``(ticker, date, open, high, low, close, adj_close, volume)`` rows ordered by
+        (ticker, date), prices as floats, in batches of up to ``batch_size`` rows.
+
+        Uses a server-side cursor (``yield_per``), so full-table exports run in
+        constant memory.
+        """
+        stmt = select(
+            PriceDaily.ticker,
+            PriceDaily.date,
+            *(cast(getattr(PriceDaily, col), Float).label(col) for col in _BAR_COLUMNS),
+        ).order_by(PriceDaily.ticker, PriceDaily.date)
+        if tickers is not None:
+            stmt = stmt.where(PriceDaily.ticker.in_(list(tickers)))
+        result = self._session.execute(stmt.execution_options(yield_per=batch_size))
+        for batch in result.partitions():
+            yield [tuple(row) for row in batch]
+
+    def get_bar_hashes(self, ranges: Mapping[str, tuple[date, date]]) -> dict[tuple[str, date], str]:
+        """
+        Content hash per stored (ticker, date), computed in the database. ``ranges``
+        bounds the scan per ticker (inclusive), joined in as a ``VALUES`` list.
+        """
+        if not ranges:
+            return {}
+        bounds = (
+            values(column("ticker", String), column("lo", Date), column("hi", Date), name="bounds")
+            .data([(ticker, lo, hi) for ticker, (lo, hi) in ranges.items()])
+        )
+        stmt = select(PriceDaily.ticker, PriceDaily.date, _content_hash_expr()).join(
+            bounds,
+            and_(
+                PriceDaily.ticker == bounds.c.ticker,
+                PriceDaily.date >= bounds.c.lo,
+                PriceDaily.date <= bounds.c.hi,
+            ),
+        )
+        return {(ticker, day): digest for ticker, day, digest in self._session.execute(stmt).all()}
+
+    def diff_against_stored(self, rows: Iterable[PriceDailyCreate]) -> BarDiff:
+        """
+        Split ``rows`` into new bars, bars whose OHLCV differ from the stored ones and
+        unchanged bars, with one hash query bounded to each ticker's own date span.
+        """
+        by_key = {(row.ticker, row.date): row for row in rows}
+        if not by_key:
+            return BarDiff(inserted=[], changed=[], unchanged=0, per_ticker={})
+        ranges: dict[str, tuple[date, date]] = {}
+        for ticker, day in by_key:
+            lo, hi = ranges.get(ticker, (day, day))
+            ranges[ticker] = (min(lo, day), max(hi, day))
+        stored = self.get_bar_hashes(ranges)
+
+        inserted: list[PriceDailyCreate] = []
+        changed: list[PriceDailyCreate] = []
+        counts: dict[str, list[int]] = {}
+        for key, row in by_key.items():
+            tally = counts.setdefault(row.ticker, [0, 0, 0])
+            digest = stored.get(key)
+            if digest is None:
+                inserted.append(row)
+                tally[0] += 1
+            elif digest != bar_content_hash(row):
+                changed.append(row)
+                tally[1] += 1
+            else:
+                tally[2] += 1
+        return BarDiff(
+            inserted=inserted,
+            changed=changed,
+            unchanged=len(by_key) - len(inserted) - len(changed),
+            per_ticker={t: (c[0], c[1], c[2]) for t, c in counts.items()},
+        )
+
+    def get_latest_revisions(self, tickers: Collection[str]) -> dict[str, LatestRevision]:
+        """Per-ticker change markers from ``instrument_latest``; tickers without prices are absent."""
+        if not tickers:
+            return {}
+        stmt = select(
+            InstrumentLatest.ticker,
+            InstrumentLatest.revision_id,
+            InstrumentLatest.last_date,
+            InstrumentLatest.updated_at,
+        ).where(InstrumentLatest.ticker.in_(list(tickers)))
+        return {
+            ticker: LatestRevision(revision_id=revision_id, last_date=last_date, updated_at=updated_at)
+            for ticker, revision_id, last_date, updated_at in self._session.execute(stmt).all()
+        }
+
+    @staticmethod
+    def _depth_filter(tickers: list[str], days: int | Mapping[str, int]):
+        """
+        Predicate factory for a ``row_number()``-ranked subquery: one ``ticker IN (...)
+        AND rn <= depth`` term per distinct depth. Tickers missing from a depth mapping
+        get no bars; returns None when no ticker needs any.
+        """
+        if isinstance(days, Mapping):
+            by_depth: dict[int, list[str]] = {}
+            for t in tickers:
+                if int(days.get(t, 0)) > 0:
+                    by_depth.setdefault(int(days[t]), []).append(t)
+        else:
+            by_depth = {max(int(days), 1): tickers} if tickers else {}
+        if not by_depth:
+            return None
+        return lambda ranked: or_(
+            *(and_(ranked.c.ticker.in_(group), ranked.c.rn <= depth) for depth, group in sorted(by_depth.items()))
+        )
+
     def get_pct_change_over_days(self, *, ticker: str, days: int) -> tuple[date | None, float | None]:
         series = self.get_recent_closes(ticker=ticker, days=days + 1)
         if len(series) < 2:
@@ -101,13 +465,7 @@ class PricesRepo:
         return series[-1][0], ((end - start) / start) * 100.0
 
     def get_return_stats(self, *, ticker: str, lookback: int) -> tuple[float | None, float | None]:
-        closes = [v for _, v in self.get_recent_closes(ticker=ticker, days=lookback + 1)]
-        if len(closes) < 3:
-            return None, None
-        rets = [(closes[i] / closes[i - 1]) - 1.0 for i in range(1, len(closes)) if closes[i - 1] != 0]
-        if len(rets) < 2:
-            return None, None
-        return statistics.mean(rets), statistics.pstdev(rets)
+        return _return_stats([v for _, v in self.get_recent_closes(ticker=ticker, days=lookback + 1)])
 
     # -----------------------------
     # Write / maintenance (for ingest)
@@ -124,17 +482,139 @@ class PricesRepo:
             PriceDaily.date <= end,
         )
         res = self._session.execute(stmt)
+        self.refresh_latest([ticker])
+        self._session.execute(
+            delete(InstrumentLatest).where(
+                InstrumentLatest.ticker == ticker,
+                ~select(PriceDaily.id).where(PriceDaily.ticker == ticker).exists(),
+            )
+        )
         try:
             return int(res.rowcount or 0)
         except Exception:
             return 0
 
-    def upsert_many(self, rows: Iterable[PriceDaily]) -> None:
+    def refresh_latest(self, tickers: Collection[str]) -> None:
+        """
+        Rebuild ``instrument_latest`` rows for ``tickers`` from ``prices_daily``.
+
+        One ``INSERT ... SELECT ... ON CONFLICT (ticker) DO UPDATE`` over the two most
+        recent bars per ticker, so it stays correct for out-of-order backfills. Runs in
+        the caller's transaction, next to the price writes it summarizes.
+        """
+        tickers = sorted(set(tickers))
+        if not tickers:
+            return
+        order = PriceDaily.date.desc()
+        ranked = (
+            select(
+                PriceDaily.ticker,
+                PriceDaily.date,
+                PriceDaily.close,
+                PriceDaily.revision_id,
+                func.lead(PriceDaily.close).over(partition_by=PriceDaily.ticker, order_by=order).label("prev_close"),
+                func.row_number().over(partition_by=PriceDaily.ticker, order_by=order).label("rn"),
+            )
+            .where(PriceDaily.ticker.in_(tickers))
+            .subquery()
+        )
+        latest = select(
+            ranked.c.ticker,
+            ranked.c.date,
+            ranked.c.close,
+            ranked.c.prev_close,
+            ranked.c.close - ranked.c.prev_close,
+            ranked.c.revision_id,
+            func.now(),
+        ).where(ranked.c.rn == 1)
+        table = InstrumentLatest.__table__
+        columns = ["ticker", "last_date", "last_close", "prev_close", "change", "revision_id", "updated_at"]
+        stmt = pg_insert(table).from_select(columns, latest)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.ticker],
+            set_={col: stmt.excluded[col] for col in columns if col != "ticker"},
+        )
+        self._session.execute(stmt)
+
+    def copy_upsert(self, rows: Iterable[PriceDailyCreate]) -> UpsertResult:
         """
-        Add many PriceDaily ORM rows. Caller is responsible for handling conflicts.
+        Bulk-load path for large imports: ``COPY`` the rows into a temp staging table,
+        then merge them with one ``INSERT ... SELECT ... ON CONFLICT DO UPDATE``.
 
-        Note:
-        - For large ingest we will later implement a Postgres ON CONFLICT DO UPDATE path.
+        Same semantics as ``upsert_many`` (last duplicate wins, fresh ``ingested_at`` on
+        update, ``instrument_latest`` refreshed) but without a bind parameter per value,
+        which is what makes multi-million row loads feasible. Needs a psycopg 3
+        connection; runs in the caller's transaction.
         """
-        self._session.add_all(list(rows))
-        self._session.flush()
+        by_key: dict[tuple[str, date], tuple[object, ...]] = {}
+        for row in rows:
+            row_values = {col: getattr(row, col) for col in _UPSERT_COLUMNS}
+            row_values["source"] = row_values["source"] or "unknown"
+            by_key[(row.ticker, row.date)] = tuple(row_values.values())
+        if not by_key:
+            return UpsertResult()
+
+        columns = ", ".join(_UPSERT_COLUMNS)
+        self._session.execute(
+            text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {_STAGE_TABLE} ON COMMIT DROP AS "
+                f"SELECT {columns} FROM prices_daily WITH NO DATA"
+            )
+        )
+        driver_conn = self._session.connection().connection.driver_connection
+        with driver_conn.cursor() as cur, cur.copy(f"COPY {_STAGE_TABLE} ({columns}) FROM STDIN") as copy:
+            for row_values in by_key.values():
+                copy.write_row(row_values)
+
+        assignments = ", ".join(f"{col} = excluded.{col}" for col in _UPSERT_COLUMNS if col not in ("ticker", "date"))
+        merged = self._session.execute(
+            text(
+                f"WITH merged AS ("
+                f" INSERT INTO prices_daily ({columns}) SELECT {columns} FROM {_STAGE_TABLE}"
+                f" ON CONFLICT ON CONSTRAINT uq_prices_daily_ticker_date DO UPDATE SET {assignments}, ingested_at = now()"
+                f" RETURNING xmax = 0 AS inserted"
+                f") SELECT count(*) FILTER (WHERE inserted), count(*) FROM merged"
+            )
+        ).one()
+        self._session.execute(text(f"TRUNCATE {_STAGE_TABLE}"))
+        self.refresh_latest({ticker for ticker, _ in by_key})
+        inserted, total = int(merged[0] or 0), int(merged[1] or 0)
+        return UpsertResult(inserted=inserted, updated=total - inserted)
+
+    def upsert_many(self, rows: Iterable[PriceDailyCreate | PriceDaily]) -> UpsertResult:
+        """
+        Insert or update many bars with one ``INSERT ... ON CONFLICT (ticker, date) DO UPDATE``
+        per chunk, so overlapping ranges overwrite instead of failing.
+
+        Accepts ``PriceDailyCreate`` values or (transient) ``PriceDaily`` objects. When a
+        (ticker, date) appears more than once the last occurrence wins. Updated rows get
+        a fresh ``ingested_at``, and ``instrument_latest`` is refreshed for the touched
+        tickers. Returns inserted/updated counts (``xmax = 0`` marks rows that were
+        inserted rather than updated).
+        """
+        by_key: dict[tuple[str, date], dict[str, object]] = {}
+        for row in rows:
+            row_values = {col: getattr(row, col) for col in _UPSERT_COLUMNS}
+            row_values["source"] = row_values["source"] or "unknown"
+            by_key[(row_values["ticker"], row_values["date"])] = row_values
+        if not by_key:
+            return UpsertResult()
+
+        payload = list(by_key.values())
+        table = PriceDaily.__table__
+        inserted = updated = 0
+        for start in range(0, len(payload), self.UPSERT_CHUNK):
+            stmt = pg_insert(table).values(payload[start : start + self.UPSERT_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_prices_daily_ticker_date",
+                set_={
+                    **{col: stmt.excluded[col] for col in _UPSERT_COLUMNS if col not in ("ticker", "date")},
+                    "ingested_at": func.now(),
+                },
+            ).returning(literal_column("xmax = 0").label("inserted"))
+            flags = self._session.execute(stmt).scalars().all()
+            n_inserted = sum(1 for flag in flags if flag)
+            inserted += n_inserted
+            updated += len(flags) - n_inserted
+        self.refresh_latest({ticker for ticker, _ in by_key})
+        return UpsertResult(inserted=inserted, updated=updated)
@@ -9,13 +9,15 @@ Responsibilities:
 from __future__ import annotations
 
 import uuid
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from typing import Any
 
-from sqlalchemy import select, update
+from sqlalchemy import Select, String, and_, cast, select, update
 from sqlalchemy.orm import Session
 
-from quantsentinel.infra.db.models import Task, TaskStatus
+from quantsentinel.infra.db.models import AuditLog, Task, TaskStatus
 
 
 @dataclass(frozen=True)
@@ -52,6 +54,39 @@ class TasksRepo:
         stmt = select(Task).order_by(Task.created_at.desc()).limit(limit)
         return list(self._session.execute(stmt).scalars().all())
 
+    def find_active(self, *, task_type: str, celery_args: Mapping[str, Any]) -> uuid.UUID | None:
+        """
+        A PENDING or RUNNING task of ``task_type`` queued with arguments containing
+        ``celery_args`` (JSONB containment on the ``task_queued`` audit entry, which is
+        where a task's Celery kwargs are recorded), newest first.
+        """
+        stmt = (
+            self._active_queued(select(Task.id), task_type=task_type)
+            .where(AuditLog.payload_json["celery_args"].contains(dict(celery_args)))
+            .order_by(Task.created_at.desc())
+            .limit(1)
+        )
+        return self._session.execute(stmt).scalar_one_or_none()
+
+    def list_active_args(self, *, task_type: str) -> list[dict[str, Any]]:
+        """Celery kwargs of every PENDING or RUNNING task of ``task_type`` (see ``find_active``)."""
+        stmt = self._active_queued(select(AuditLog.payload_json["celery_args"]).select_from(Task), task_type=task_type)
+        return [dict(args or {}) for args in self._session.execute(stmt).scalars().all()]
+
+    @staticmethod
+    def _active_queued(stmt: Select, *, task_type: str) -> Select:
+        return stmt.join(
+            AuditLog,
+            and_(
+                AuditLog.entity_type == "task",
+                AuditLog.action == "task_queued",
+                AuditLog.entity_id == cast(Task.id, String),
+            ),
+        ).where(
+            Task.task_type == task_type,
+            Task.status.in_((TaskStatus.PENDING, TaskStatus.RUNNING)),
+        )
+
     def set_running(self, *, task_id: uuid.UUID, started_at: datetime) -> None:
         stmt = (
             update(Task)
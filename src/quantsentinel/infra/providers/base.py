@@ -1,4 +1,122 @@
-"""Base provider"""
+"""
+Base provider contract.
 
-class ProviderBase:
+Every price provider exposes:
+- fetch_daily(ticker, start, end) -> list[dict]            (rows as in yahoo.py)
+- fetch_daily_batch(requests) -> BatchResult                many tickers per call
+- afetch_daily / afetch_daily_batch                          asyncio variants
+- name, capabilities, rate_limit                             declared, read by ingest
+
+``ProviderBase`` derives the batch and async methods from ``fetch_daily``, so a
+single-symbol provider only implements that; vendors with multi-symbol endpoints
+override ``fetch_daily_batch`` and set ``capabilities.batch``. Providers are
+looked up by instrument ``source`` through infra/providers/registry.py.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import date
+from typing import TYPE_CHECKING, Any, ClassVar, Protocol, runtime_checkable
+
+if TYPE_CHECKING:
+    from quantsentinel.infra.providers.rate_limit import RateLimitConfig
+
+
+class ProviderError(RuntimeError):
+    pass
+
+
+class ProviderRateLimited(ProviderError):
+    """The provider asked us to slow down (HTTP 429); ``retry_after`` in seconds when given."""
+
+    def __init__(self, message: str, *, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ProviderBlocked(ProviderError):
+    """Credentials rejected or access denied (HTTP 401/403); retrying will not help."""
+
+
+class ProviderNotFound(ProviderError):
     pass
+
+
+@dataclass(frozen=True)
+class ProviderCapabilities:
+    batch: bool = False  # fetch_daily_batch is a real multi-symbol call
+    max_batch_size: int = 1  # tickers per fetch_daily_batch call the ingest tasks send
+    native_async: bool = False  # afetch_* do not just wrap the sync calls in a thread
+    adjusted_close: bool = True
+
+
+@dataclass(frozen=True)
+class FetchRequest:
+    ticker: str
+    start: date
+    end: date
+
+
+@dataclass
+class BatchResult:
+    """Rows per ticker for a batch; a ticker that failed is in ``errors`` instead."""
+
+    rows: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    errors: dict[str, Exception] = field(default_factory=dict)
+
+
+@runtime_checkable
+class PriceProvider(Protocol):
+    name: str
+    capabilities: ProviderCapabilities
+    rate_limit: RateLimitConfig | None
+
+    def fetch_daily(self, *, ticker: str, start: date, end: date) -> list[dict[str, Any]]: ...
+
+    def fetch_daily_batch(self, requests: Sequence[FetchRequest]) -> BatchResult: ...
+
+    async def afetch_daily(self, *, ticker: str, start: date, end: date) -> list[dict[str, Any]]: ...
+
+    async def afetch_daily_batch(self, requests: Sequence[FetchRequest]) -> BatchResult: ...
+
+
+class ProviderBase:
+    name: ClassVar[str] = "unknown"
+    capabilities: ClassVar[ProviderCapabilities] = ProviderCapabilities()
+    rate_limit: ClassVar[RateLimitConfig | None] = None
+
+    def fetch_daily(self, *, ticker: str, start: date, end: date) -> list[dict[str, Any]]:
+        raise NotImplementedError
+
+    def fetch_daily_batch(self, requests: Sequence[FetchRequest]) -> BatchResult:
+        """One ``fetch_daily`` per request; a failing ticker does not fail the batch."""
+        result = BatchResult()
+        for req in requests:
+            try:
+                result.rows[req.ticker] = self.fetch_daily(ticker=req.ticker, start=req.start, end=req.end)
+            except Exception as exc:
+                result.errors[req.ticker] = exc
+        return result
+
+    async def afetch_daily(self, *, ticker: str, start: date, end: date) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.fetch_daily, ticker=ticker, start=start, end=end)
+
+    async def afetch_daily_batch(self, requests: Sequence[FetchRequest]) -> BatchResult:
+        if self.capabilities.batch:
+            return await asyncio.to_thread(self.fetch_daily_batch, requests)
+        outcomes = await asyncio.gather(
+            *(self.afetch_daily(ticker=r.ticker, start=r.start, end=r.end) for r in requests),
+            return_exceptions=True,
+        )
+        result = BatchResult()
+        for req, outcome in zip(requests, outcomes, strict=True):
+            if isinstance(outcome, Exception):
+                result.errors[req.ticker] = outcome
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                result.rows[req.ticker] = outcome
+        return result
@@ -1 +1,308 @@
-"""CSV import provider"""
+"""
+CSV / Parquet import provider (vendor history dumps).
+
+Contract:
+- read_price_file(path, revision_id=..., source=...) -> Iterator[ImportChunk]
+- Each chunk holds at most ``chunk_rows`` validated ``PriceDailyCreate`` rows plus
+  the rejected input lines, so memory stays flat however large the file is.
+
+Accepted input:
+- CSV (optionally ``.gz``) with a header row, or Parquet (``.parquet`` / ``.pq``,
+  needs pyarrow: ``poetry install -E lake``).
+- Columns are matched case-insensitively with common vendor aliases
+  (``symbol`` -> ticker, ``Adj Close`` -> adj_close, ``vol`` -> volume, ...).
+  Single-ticker files without a ticker column take ``ticker=``.
+
+Validation (a failing row is rejected, never loaded):
+- ticker and date present, date parseable (ISO, ``YYYYMMDD`` or ISO datetime)
+- numeric fields parseable; empty / ``null`` / ``nan`` read as missing
+- at least one price, no negative price or volume, ``high >= low``
+- per chunk, market-data QC (domain/market/qc.py) rejects open/close outside
+  [low, high], zero prices and earlier duplicates of a (ticker, date)
+
+No DB access here: the ingest task (tasks_ingest.import_prices_file) loads chunks.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import os
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from quantsentinel.domain.market.qc import REJECT_FLAGS, QCFlag, check_bars
+from quantsentinel.infra.db.repos.prices_repo import PriceDailyCreate, UpsertResult
+
+# Input rows per chunk (one COPY + merge per chunk in the ingest task).
+CHUNK_ROWS = 50_000
+# Rejected lines kept verbatim for the task log; the rest are only counted.
+MAX_REJECT_SAMPLES = 20
+
+_PRICE_FIELDS = ("open", "high", "low", "close", "adj_close")
+_NUMERIC_FIELDS = (*_PRICE_FIELDS, "volume")
+_MISSING = {"", "null", "none", "nan", "n/a", "na", "-"}
+
+_ALIASES = {
+    "ticker": "ticker",
+    "symbol": "ticker",
+    "code": "ticker",
+    "date": "date",
+    "trade_date": "date",
+    "tradedate": "date",
+    "timestamp": "date",
+    "open": "open",
+    "high": "high",
+    "low": "low",
+    "close": "close",
+    "adj_close": "adj_close",
+    "adjclose": "adj_close",
+    "adjusted_close": "adj_close",
+    "volume": "volume",
+    "vol": "volume",
+}
+
+
+class ImportFormatError(ValueError):
+    """The file cannot be imported at all (unknown format, missing required columns)."""
+
+
+@dataclass(frozen=True)
+class ImportChunk:
+    rows: list[PriceDailyCreate]
+    rejected: list[str]
+    read: int
+    progress: float  # fraction of the file consumed, 0..1
+
+
+@dataclass
+class ImportStats:
+    rows_read: int = 0
+    rows_loaded: int = 0
+    rows_rejected: int = 0
+    inserted: int = 0
+    updated: int = 0
+    chunks: int = 0
+    tickers: set[str] = field(default_factory=set)
+    reject_samples: list[str] = field(default_factory=list)
+
+    def add(self, chunk: ImportChunk, result: UpsertResult) -> None:
+        self.chunks += 1
+        self.rows_read += chunk.read
+        self.rows_loaded += len(chunk.rows)
+        self.rows_rejected += len(chunk.rejected)
+        self.inserted += result.inserted
+        self.updated += result.updated
+        self.tickers.update(row.ticker for row in chunk.rows)
+        room = MAX_REJECT_SAMPLES - len(self.reject_samples)
+        if room > 0:
+            self.reject_samples.extend(chunk.rejected[:room])
+
+
+def _canonical(name: str) -> str | None:
+    key = name.strip().lower().replace(" ", "_").replace("-", "_")
+    return _ALIASES.get(key)
+
+
+def _column_map(names: Iterable[str], *, has_default_ticker: bool) -> dict[str, str]:
+    """Input column name -> canonical field; raises if ticker/date cannot be found."""
+    mapping: dict[str, str] = {}
+    for name in names:
+        canonical = _canonical(name)
+        if canonical is not None and canonical not in mapping.values():
+            mapping[name] = canonical
+    found = set(mapping.values())
+    required = {"date"} if has_default_ticker else {"ticker", "date"}
+    missing = sorted(required - found)
+    if missing:
+        raise ImportFormatError(f"missing required column(s): {', '.join(missing)}")
+    if not found & set(_PRICE_FIELDS):
+        raise ImportFormatError("no price column (open/high/low/close/adj_close) found")
+    return mapping
+
+
+def _parse_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    if len(text) == 8 and text.isdigit():
+        return date(int(text[:4]), int(text[4:6]), int(text[6:]))
+    return date.fromisoformat(text[:10])
+
+
+def _parse_number(value: Any) -> Decimal | None:
+    if value is None:
+        return None
+    if isinstance(value, float):
+        return None if value != value else Decimal(str(value))  # NaN -> missing
+    if isinstance(value, int | Decimal):
+        return Decimal(value)
+    text = str(value).strip()
+    if text.lower() in _MISSING:
+        return None
+    return Decimal(text.replace(",", ""))
+
+
+def _normalize(
+    record: Mapping[str, Any],
+    mapping: Mapping[str, str],
+    *,
+    default_ticker: str | None,
+    source: str,
+    revision_id: object,
+) -> PriceDailyCreate:
+    """Validate and convert one input record; raises ValueError with the reason."""
+    fields = {canonical: record.get(name) for name, canonical in mapping.items()}
+
+    ticker = str(fields.get("ticker") or default_ticker or "").strip()
+    if not ticker:
+        raise ValueError("missing ticker")
+    if fields.get("date") in (None, ""):
+        raise ValueError("missing date")
+    try:
+        day = _parse_date(fields["date"])
+    except ValueError as exc:
+        raise ValueError(f"bad date {fields['date']!r}") from exc
+
+    values: dict[str, Decimal | None] = {}
+    for name in _NUMERIC_FIELDS:
+        try:
+            values[name] = _parse_number(fields.get(name))
+        except (InvalidOperation, ValueError) as exc:
+            raise ValueError(f"bad {name} {fields.get(name)!r}") from exc
+
+    if all(values[name] is None for name in _PRICE_FIELDS):
+        raise ValueError("no prices")
+    for name in _NUMERIC_FIELDS:
+        v = values[name]
+        if v is not None and not v.is_finite():
+            raise ValueError(f"non-finite {name}")
+        if v is not None and v < 0:
+            raise ValueError(f"negative {name}")
+    if values["high"] is not None and values["low"] is not None and values["high"] < values["low"]:
+        raise ValueError("high < low")
+
+    return PriceDailyCreate(ticker=ticker, date=day, source=source, revision_id=revision_id, **values)
+
+
+def _normalize_chunk(
+    records: list[tuple[int, Mapping[str, Any]]],
+    mapping: Mapping[str, str],
+    *,
+    default_ticker: str | None,
+    source: str,
+    revision_id: object,
+) -> tuple[list[PriceDailyCreate], list[str]]:
+    rows: list[PriceDailyCreate] = []
+    lines: list[int] = []
+    rejected: list[str] = []
+    for line, record in records:
+        try:
+            rows.append(
+                _normalize(record, mapping, default_ticker=default_ticker, source=source, revision_id=revision_id)
+            )
+            lines.append(line)
+        except ValueError as exc:
+            rejected.append(f"line {line}: {exc}")
+    if not rows:
+        return rows, rejected
+
+    # Chunk-wide QC per ticker: catches open/close outside [low, high] and duplicate dates.
+    qc = check_bars(
+        np.array([r.date for r in rows], dtype="datetime64[D]"),
+        groups=np.array([r.ticker for r in rows]),
+        **{
+            name: np.array([np.nan if (v := getattr(r, name)) is None else float(v) for r in rows], dtype=np.float64)
+            for name in _NUMERIC_FIELDS
+        },
+    )
+    if not qc.summary.rejected:
+        return rows, rejected
+    kept: list[PriceDailyCreate] = []
+    for row, line, flags in zip(rows, lines, qc.flags.tolist(), strict=True):
+        bad = QCFlag(flags) & REJECT_FLAGS
+        if bad:
+            rejected.append(f"line {line}: qc {'|'.join(f.name.lower() for f in QCFlag if f in bad)}")
+        else:
+            kept.append(row)
+    return kept, rejected
+
+
+def _csv_records(path: Path, *, chunk_rows: int) -> Iterator[tuple[list[str], list[tuple[int, dict[str, Any]]], float]]:
+    """(header, [(line, record)], progress) per chunk; progress follows the on-disk (compressed) offset."""
+    size = max(os.path.getsize(path), 1)
+    with open(path, "rb") as raw:
+        binary = gzip.GzipFile(fileobj=raw) if path.suffix.lower() == ".gz" else raw
+        with io.TextIOWrapper(binary, encoding="utf-8-sig", newline="") as text_stream:
+            reader = csv.DictReader(text_stream)
+            header = list(reader.fieldnames or [])
+            chunk: list[tuple[int, dict[str, Any]]] = []
+            for record in reader:
+                chunk.append((reader.line_num, record))
+                if len(chunk) >= chunk_rows:
+                    yield header, chunk, min(raw.tell() / size, 1.0)
+                    chunk = []
+            yield header, chunk, 1.0
+
+
+def _parquet_records(
+    path: Path, *, chunk_rows: int
+) -> Iterator[tuple[list[str], list[tuple[int, dict[str, Any]]], float]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # pragma: no cover - depends on installed extras
+        raise RuntimeError("Parquet imports require pyarrow (poetry install -E lake)") from exc
+
+    parquet = pq.ParquetFile(path)
+    header = list(parquet.schema_arrow.names)
+    total = max(parquet.metadata.num_rows, 1)
+    offset = 0
+    for batch in parquet.iter_batches(batch_size=chunk_rows):
+        records = batch.to_pylist()
+        yield header, [(offset + i + 1, r) for i, r in enumerate(records)], min((offset + len(records)) / total, 1.0)
+        offset += len(records)
+
+
+def read_price_file(
+    path: str | Path,
+    *,
+    revision_id: object,
+    source: str = "csv",
+    ticker: str | None = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> Iterator[ImportChunk]:
+    """
+    Stream ``path`` as validated chunks of ``PriceDailyCreate`` rows.
+
+    ``ticker`` fills in rows without a ticker column/value. Raises ImportFormatError
+    up front when the header cannot be mapped; bad rows only end up in
+    ``ImportChunk.rejected``.
+    """
+    path = Path(path)
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be >= 1")
+    suffixes = [s.lower() for s in path.suffixes]
+    if suffixes and suffixes[-1] in (".parquet", ".pq"):
+        chunks = _parquet_records(path, chunk_rows=chunk_rows)
+    elif suffixes and (suffixes[-1] == ".csv" or suffixes[-2:] == [".csv", ".gz"]):
+        chunks = _csv_records(path, chunk_rows=chunk_rows)
+    else:
+        raise ImportFormatError(f"unsupported file type: {path.name} (expected .csv, .csv.gz or .parquet)")
+
+    mapping: dict[str, str] | None = None
+    for header, records, progress in chunks:
+        if mapping is None:
+            mapping = _column_map(header, has_default_ticker=bool(ticker))
+        rows, rejected = _normalize_chunk(
+            records, mapping, default_ticker=ticker, source=source, revision_id=revision_id
+        )
+        yield ImportChunk(rows=rows, rejected=rejected, read=len(records), progress=progress)
@@ -0,0 +1,139 @@
+"""
+Pooled keep-alive HTTP client for providers (stdlib only).
+
+``urllib.request.urlopen`` opens a fresh TCP (+TLS) connection per request.
+For small incremental daily fetches that handshake dominates, so providers share
+this client instead:
+
+- Idle ``http.client`` connections are kept per (scheme, host, port) and reused
+  across calls and threads (up to ``max_idle_per_host`` each).
+- Requests advertise ``Accept-Encoding: gzip, deflate`` and bodies are decoded
+  transparently.
+- A reused connection the server has already closed is retried once on a fresh
+  connection. Any other failure is raised to the caller, and the provider's own
+  retry policy applies.
+"""
+
+from __future__ import annotations
+
+import gzip
+import http.client
+import threading
+import zlib
+from collections.abc import Mapping
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+# Failures that mean a reused idle connection was already dead (timeouts excluded).
+_STALE_ERRORS = (OSError, http.client.RemoteDisconnected, http.client.CannotSendRequest, http.client.BadStatusLine)
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    status: int
+    headers: Mapping[str, str]
+    body: bytes  # decoded (decompressed)
+
+    def text(self, encoding: str = "utf-8") -> str:
+        return self.body.decode(encoding)
+
+
+def _decode(body: bytes, encoding: str | None) -> bytes:
+    encoding = (encoding or "").strip().lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        # Servers disagree on zlib-wrapped vs raw deflate; accept both.
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+class HttpClient:
+    def __init__(self, *, max_idle_per_host: int = 8, user_agent: str | None = None) -> None:
+        self._max_idle = max_idle_per_host
+        self._user_agent = user_agent
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def _checkout(self, key: tuple[str, str, int], timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+            self.connections_opened += 1
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=timeout), False
+
+    def _checkin(self, key: tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self._max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def get(self, url: str, *, headers: Mapping[str, str] | None = None, timeout: float = 15.0) -> HttpResponse:
+        """GET ``url``; returns the response for any status (callers map codes to errors)."""
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        request_headers = {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+        if self._user_agent:
+            request_headers["User-Agent"] = self._user_agent
+        request_headers.update(headers or {})
+
+        while True:
+            conn, reused = self._checkout(key, timeout)
+            try:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                conn.request("GET", target, headers=request_headers)
+                resp = conn.getresponse()
+                raw = resp.read()
+            except _STALE_ERRORS as exc:
+                conn.close()
+                if reused and not isinstance(exc, TimeoutError):
+                    continue  # the server dropped an idle keep-alive connection
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            response_headers = {k.lower(): v for k, v in resp.getheaders()}
+            return HttpResponse(
+                status=resp.status,
+                headers=response_headers,
+                body=_decode(raw, response_headers.get("content-encoding")),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+_CLIENT: HttpClient | None = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Process-wide client shared by every provider."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = HttpClient()
+        return _CLIENT
@@ -0,0 +1,223 @@
+"""
+Provider request pacing.
+
+Two controls are combined per provider:
+
+- A token bucket (``rate`` requests/second, ``burst`` capacity) for global pacing.
+  It is in-process by default and shared by every thread in the worker. When
+  configured with a Redis URL, one bucket is shared by all workers through an
+  atomic Lua script.
+- An AIMD concurrency limit. Each successful request adds ``increase / limit``
+  (so about +``increase`` per window of ``limit`` requests). Each
+  ``ProviderRateLimited`` multiplies the limit by ``decrease``. Threads beyond
+  the current limit wait for a slot.
+
+Usage::
+
+    with get_throttle("yahoo").request():
+        ...  # one HTTP call; raising ProviderRateLimited shrinks the limit
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from quantsentinel.infra.providers.base import ProviderRateLimited
+
+
+@dataclass(frozen=True)
+class RateLimitConfig:
+    rate: float = 2.0  # tokens per second
+    burst: int = 5
+    initial_concurrency: float = 4.0
+    min_concurrency: float = 1.0
+    max_concurrency: float = 8.0
+    increase: float = 1.0
+    decrease: float = 0.5
+
+
+# Per-provider defaults; unknown providers get RateLimitConfig().
+PROVIDER_LIMITS: dict[str, RateLimitConfig] = {
+    "yahoo": RateLimitConfig(rate=2.0, burst=5, initial_concurrency=4.0, max_concurrency=8.0),
+}
+
+
+class Bucket(Protocol):
+    def acquire(self, tokens: float = 1.0) -> None: ...
+
+
+class TokenBucket:
+    """Thread-safe in-process token bucket."""
+
+    def __init__(
+        self,
+        *,
+        rate: float,
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0 or burst <= 0:
+            raise ValueError("rate and burst must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take ``tokens`` now (possibly going negative) and return how long to wait for them."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        wait = self._reserve(tokens)
+        if wait > 0:
+            self._sleep(wait)
+
+
+# KEYS[1] bucket hash; ARGV: rate, burst, tokens, now (seconds). Returns the wait in ms.
+_REDIS_ACQUIRE = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local want = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate) - want
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 60)
+if tokens >= 0 then return 0 end
+return math.ceil(-tokens / rate * 1000)
+"""
+
+
+class RedisTokenBucket:
+    """Token bucket shared by every worker through Redis (same reservation semantics as ``TokenBucket``)."""
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        key: str,
+        rate: float,
+        burst: float,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._key = key
+        self._sleep = sleep
+        self._script = client.register_script(_REDIS_ACQUIRE)
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        # Wall-clock time so every worker agrees on "now".
+        wait_ms = int(self._script(keys=[self._key], args=[self.rate, self.burst, tokens, time.time()]))
+        if wait_ms > 0:
+            self._sleep(wait_ms / 1000.0)
+
+
+class AdaptiveConcurrency:
+    """AIMD concurrency limit shared by the threads of one worker."""
+
+    def __init__(self, config: RateLimitConfig) -> None:
+        self._cfg = config
+        self._limit = float(config.initial_concurrency)
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> float:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _slots(self) -> int:
+        return max(1, math.floor(self._limit))
+
+    @contextmanager
+    def slot(self) -> Generator[None, None, None]:
+        with self._cond:
+            self._cond.wait_for(lambda: self._in_flight < self._slots())
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def on_success(self) -> None:
+        with self._cond:
+            self._limit = min(self._cfg.max_concurrency, self._limit + self._cfg.increase / self._limit)
+            self._cond.notify_all()
+
+    def on_rate_limited(self) -> None:
+        with self._cond:
+            self._limit = max(self._cfg.min_concurrency, self._limit * self._cfg.decrease)
+
+
+class ProviderThrottle:
+    def __init__(self, *, bucket: Bucket, concurrency: AdaptiveConcurrency) -> None:
+        self.bucket = bucket
+        self.concurrency = concurrency
+
+    @contextmanager
+    def request(self) -> Generator[None, None, None]:
+        """One paced request: wait for a concurrency slot, then a token; adapt on the outcome."""
+        with self.concurrency.slot():
+            self.bucket.acquire()
+            try:
+                yield
+            except ProviderRateLimited:
+                self.concurrency.on_rate_limited()
+                raise
+            self.concurrency.on_success()
+
+
+_THROTTLES: dict[str, ProviderThrottle] = {}
+_THROTTLES_LOCK = threading.Lock()
+_REDIS_URL: str | None = None
+
+
+def configure_rate_limits(*, redis_url: str | None) -> None:
+    """Share token buckets across workers through Redis (None keeps them per process)."""
+    global _REDIS_URL
+    with _THROTTLES_LOCK:
+        _REDIS_URL = redis_url
+        _THROTTLES.clear()
+
+
+def _make_bucket(provider: str, config: RateLimitConfig) -> Bucket:
+    if _REDIS_URL:
+        import redis
+
+        client = redis.Redis.from_url(_REDIS_URL)
+        return RedisTokenBucket(client, key=f"quantsentinel:ratelimit:{provider}", rate=config.rate, burst=config.burst)
+    return TokenBucket(rate=config.rate, burst=config.burst)
+
+
+def get_throttle(provider: str) -> ProviderThrottle:
+    """Process-wide throttle for ``provider``, created on first use from ``PROVIDER_LIMITS``."""
+    with _THROTTLES_LOCK:
+        throttle = _THROTTLES.get(provider)
+        if throttle is None:
+            config = PROVIDER_LIMITS.get(provider, RateLimitConfig())
+            throttle = ProviderThrottle(bucket=_make_bucket(provider, config), concurrency=AdaptiveConcurrency(config))
+            _THROTTLES[provider] = throttle
+        return throttle
@@ -0,0 +1,68 @@
+"""
+Provider registry: instrument ``source`` -> price provider.
+
+Ingest tasks resolve providers here instead of constructing one directly. A
+source that names a registered provider uses it; anything else (None, "csv",
+"unknown", vendor dumps) falls back to ``DEFAULT_PROVIDER`` for refreshes.
+
+Providers are built lazily, once per process, and a provider class that declares
+``rate_limit`` seeds ``PROVIDER_LIMITS`` so its shared throttle uses it.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+
+from quantsentinel.infra.providers.base import PriceProvider
+from quantsentinel.infra.providers.rate_limit import PROVIDER_LIMITS
+
+DEFAULT_PROVIDER = "yahoo"
+
+
+def _yahoo() -> PriceProvider:
+    from quantsentinel.infra.providers.yahoo import YahooProvider  # lazy import
+
+    return YahooProvider()
+
+
+_FACTORIES: dict[str, Callable[[], PriceProvider]] = {"yahoo": _yahoo}
+_INSTANCES: dict[str, PriceProvider] = {}
+_LOCK = threading.Lock()
+
+
+def register_provider(name: str, factory: Callable[[], PriceProvider]) -> None:
+    """Register (or replace) the provider built by ``factory`` under ``name``."""
+    name = name.strip().lower()
+    if not name:
+        raise ValueError("provider name required")
+    with _LOCK:
+        _FACTORIES[name] = factory
+        _INSTANCES.pop(name, None)
+        declared = getattr(factory, "rate_limit", None)
+        if declared is not None:
+            PROVIDER_LIMITS.setdefault(name, declared)
+
+
+def registered_providers() -> list[str]:
+    return sorted(_FACTORIES)
+
+
+def provider_name_for_source(source: str | None) -> str:
+    name = (source or "").strip().lower()
+    return name if name in _FACTORIES else DEFAULT_PROVIDER
+
+
+def get_provider(name: str) -> PriceProvider:
+    """Process-wide provider instance for ``name``; raises KeyError when unregistered."""
+    name = name.strip().lower()
+    with _LOCK:
+        provider = _INSTANCES.get(name)
+        if provider is None:
+            provider = _FACTORIES[name]()
+            _INSTANCES[name] = provider
+        return provider
+
+
+def provider_for_source(source: str | None) -> PriceProvider:
+    return get_provider(provider_name_for_source(source))
@@ -0,0 +1,231 @@
+"""
+On-disk provider response cache.
+
+Raw provider payloads are stored gzip-compressed under ``root``, keyed by
+(provider, ticker, start, end, interval)::
+
+    <root>/<provider>/<sha[:2]>/<sha>.json      fetched_at, ttl, ETag, Last-Modified, key
+    <root>/<provider>/<sha[:2]>/<sha>.body.gz   payload bytes as received (decoded)
+
+Fresh entries are served without touching the network. Stale entries are
+revalidated with ``If-None-Match`` / ``If-Modified-Since`` when the provider
+sent validators, so a 304 only refreshes the timestamp. In ``offline`` mode
+any cached entry is served regardless of age and a miss raises instead of
+fetching, so tests and benchmarks can replay recorded payloads.
+
+Re-running a failed refresh or backfill hits the cache for every ticker that
+was already downloaded.
+
+Keys include the request's end date, so daily refreshes add new entries every
+day. Entries fetched more than ``max_age_seconds`` ago are pruned by ``put``:
+on a process's first write and then at most once per ``PRUNE_INTERVAL_SECONDS``
+(never in offline mode, which exists to replay old payloads). Configuring the
+cache does no disk I/O, so processes that only import the Celery app pay nothing.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Default age after which cached responses are deleted, and how often ``put`` prunes.
+MAX_AGE_SECONDS = 30 * 24 * 3600.0
+PRUNE_INTERVAL_SECONDS = 24 * 3600.0
+# Leftover temp files from interrupted writes older than this are removed too.
+_TMP_GRACE_SECONDS = 3600.0
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    provider: str
+    ticker: str
+    start: str
+    end: str
+    interval: str = "1d"
+
+    def digest(self) -> str:
+        raw = "\x1f".join((self.provider, self.ticker, self.start, self.end, self.interval))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    fetched_at: float
+    ttl_seconds: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        return ((now if now is not None else time.time()) - self.fetched_at) < self.ttl_seconds
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        offline: bool = False,
+        max_age_seconds: float | None = MAX_AGE_SECONDS,
+    ) -> None:
+        self.root = Path(root)
+        self.offline = offline
+        self.max_age_seconds = max_age_seconds
+        self._last_prune = 0.0
+
+    def _paths(self, key: CacheKey) -> tuple[Path, Path]:
+        digest = key.digest()
+        base = self.root / key.provider / digest[:2]
+        return base / f"{digest}.json", base / f"{digest}.body.gz"
+
+    def get(self, key: CacheKey) -> CachedResponse | None:
+        meta_path, body_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = gzip.decompress(body_path.read_bytes())
+        except (OSError, ValueError, EOFError):
+            return None
+        if hashlib.sha256(body).hexdigest() != meta.get("sha256"):
+            return None  # torn write or corruption; treat as a miss
+        return CachedResponse(
+            body=body,
+            fetched_at=float(meta["fetched_at"]),
+            ttl_seconds=float(meta["ttl_seconds"]),
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+        )
+
+    def put(
+        self,
+        key: CacheKey,
+        body: bytes,
+        *,
+        ttl_seconds: float,
+        headers: Mapping[str, str] | None = None,
+        fetched_at: float | None = None,
+    ) -> CachedResponse:
+        if self._prune_due():
+            self.prune()
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        entry = CachedResponse(
+            body=body,
+            fetched_at=fetched_at if fetched_at is not None else time.time(),
+            ttl_seconds=ttl_seconds,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+        )
+        meta_path, body_path = self._paths(key)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write(body_path, gzip.compress(body))
+        meta: dict[str, Any] = {
+            "key": [key.provider, key.ticker, key.start, key.end, key.interval],
+            "fetched_at": entry.fetched_at,
+            "ttl_seconds": entry.ttl_seconds,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "sha256": hashlib.sha256(body).hexdigest(),
+        }
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        return entry
+
+    def _prune_due(self) -> bool:
+        if self.max_age_seconds is None or self.offline:
+            return False
+        return time.time() - self._last_prune >= PRUNE_INTERVAL_SECONDS
+
+    def prune(self, *, max_age_seconds: float | None = None, now: float | None = None) -> int:
+        """
+        Delete entries fetched more than ``max_age_seconds`` ago (default: the cache's
+        ``max_age_seconds``), plus unreadable metadata, orphaned bodies and stale temp
+        files. Returns the number of entries removed.
+        """
+        max_age = self.max_age_seconds if max_age_seconds is None else max_age_seconds
+        now = time.time() if now is None else now
+        self._last_prune = now
+        if max_age is None or not self.root.is_dir():
+            return 0
+        removed = 0
+        for meta_path in self.root.glob("*/*/*.json"):
+            try:
+                fetched_at = float(json.loads(meta_path.read_text(encoding="utf-8"))["fetched_at"])
+            except (OSError, ValueError, KeyError, TypeError):
+                fetched_at = None  # unreadable: only its age on disk is left to go by
+            if fetched_at is None:
+                fetched_at = _mtime(meta_path)
+            if now - fetched_at > max_age:
+                meta_path.unlink(missing_ok=True)
+                meta_path.with_name(meta_path.name.removesuffix(".json") + ".body.gz").unlink(missing_ok=True)
+                removed += 1
+        for body_path in self.root.glob("*/*/*.body.gz"):
+            meta_path = body_path.with_name(body_path.name.removesuffix(".body.gz") + ".json")
+            if not meta_path.exists() and now - _mtime(body_path) > _TMP_GRACE_SECONDS:
+                body_path.unlink(missing_ok=True)
+        for tmp_path in self.root.glob("*/*/.tmp-*"):
+            if now - _mtime(tmp_path) > _TMP_GRACE_SECONDS:
+                tmp_path.unlink(missing_ok=True)
+        return removed
+
+    def touch(
+        self,
+        key: CacheKey,
+        entry: CachedResponse,
+        *,
+        ttl_seconds: float,
+        headers: Mapping[str, str] | None = None,
+    ) -> CachedResponse:
+        """Record a successful revalidation (HTTP 304): same body, new timestamp and validators."""
+        kept = {k: v for k, v in (("etag", entry.etag), ("last-modified", entry.last_modified)) if v}
+        return self.put(key, entry.body, ttl_seconds=ttl_seconds, headers={**kept, **(headers or {})})
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return time.time()
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+_CACHE: ResponseCache | None = None
+
+
+def configure_response_cache(
+    root: str | Path | None,
+    *,
+    offline: bool = False,
+    max_age_seconds: float | None = MAX_AGE_SECONDS,
+) -> ResponseCache | None:
+    """
+    Enable the provider response cache under ``root`` (None disables it). Entries
+    older than ``max_age_seconds`` (None keeps everything) are pruned lazily by ``put``.
+    """
+    global _CACHE
+    _CACHE = ResponseCache(root, offline=offline, max_age_seconds=max_age_seconds) if root else None
+    return _CACHE
+
+
+def get_response_cache() -> ResponseCache | None:
+    return _CACHE
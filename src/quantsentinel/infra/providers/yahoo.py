@@ -15,33 +15,36 @@ Contract:
 
 Notes:
 - Uses Yahoo chart endpoint (unofficial, but widely used).
-- No external dependencies (requests/yfinance not required).
+- No external dependencies (requests/yfinance not required); requests go over the
+  shared keep-alive, gzip-enabled client (infra/providers/http_client.py).
 - Built for robustness: timeout + retry + basic data QC.
+- Requests are paced by the shared provider throttle (infra/providers/rate_limit.py).
+- When a response cache is configured (infra/providers/response_cache.py) raw
+  payloads are cached per (ticker, start, end) and revalidated conditionally.
 """
 
 from __future__ import annotations
 
 import json
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import UTC, date, datetime, timedelta
 from decimal import Decimal
 from typing import Any
 
-
-class ProviderError(RuntimeError):
-    pass
-
-
-class ProviderRateLimited(ProviderError):
-    pass
-
-
-class ProviderNotFound(ProviderError):
-    pass
+from quantsentinel.infra.providers.base import (
+    ProviderBase,
+    ProviderBlocked,
+    ProviderCapabilities,
+    ProviderError,
+    ProviderNotFound,
+    ProviderRateLimited,
+)
+from quantsentinel.infra.providers.http_client import HttpClient, HttpResponse, get_http_client
+from quantsentinel.infra.providers.rate_limit import PROVIDER_LIMITS, ProviderThrottle, get_throttle
+from quantsentinel.infra.providers.response_cache import CacheKey, ResponseCache, get_response_cache
 
 
 @dataclass(frozen=True)
@@ -50,6 +53,10 @@ class YahooProviderConfig:
     max_retries: int = 3
     backoff_base_seconds: float = 1.0
     user_agent: str = "QuantSentinel/1.0 (+https://github.com/AlexYuhuFeng/QuantSentinel)"
+    # Response cache lifetimes: a window that ends before today is closed history and
+    # rarely changes; one that reaches today still has an open bar.
+    cache_ttl_seconds: float = 15 * 60
+    history_cache_ttl_seconds: float = 7 * 24 * 3600
 
 
 def _to_unix_seconds(d: date) -> int:
@@ -88,38 +95,111 @@ def _build_chart_url(ticker: str, start: date, end: date) -> str:
     return f"https://query1.finance.yahoo.com/v8/finance/chart/{safe_ticker}?{qs}"
 
 
-def _http_get_json(url: str, cfg: YahooProviderConfig) -> dict[str, Any]:
-    headers = {"User-Agent": cfg.user_agent, "Accept": "application/json"}
-    req = urllib.request.Request(url, headers=headers, method="GET")
+def _retry_after_seconds(headers: Mapping[str, str]) -> float | None:
+    value = headers.get("retry-after")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None  # HTTP-date form; fall back to our own backoff
+
+
+def _http_get(
+    url: str,
+    cfg: YahooProviderConfig,
+    throttle: ProviderThrottle,
+    client: HttpClient,
+    *,
+    extra_headers: Mapping[str, str] | None = None,
+) -> HttpResponse:
+    """
+    GET ``url`` over the pooled ``client``, through the shared ``throttle``.
+
+    429 is a rate limit: the throttle halves concurrency and we retry after
+    ``Retry-After`` (or exponential backoff). 401/403 mean blocked and 404 means an
+    unknown ticker; both fail immediately, since retrying only makes a ban worse.
+    5xx and network errors are retried with backoff. A 304 (answer to a conditional
+    request) is returned to the caller like a 200.
+    """
+    headers = {"User-Agent": cfg.user_agent, "Accept": "application/json", **(extra_headers or {})}
 
     last_err: Exception | None = None
     for attempt in range(1, cfg.max_retries + 1):
+        delay = cfg.backoff_base_seconds * (2 ** (attempt - 1))
         try:
-            with urllib.request.urlopen(req, timeout=cfg.timeout_seconds) as resp:
-                # Basic rate-limit detection by status code (urllib raises on 4xx/5xx in many cases)
-                raw = resp.read().decode("utf-8")
-                return json.loads(raw)
-        except urllib.error.HTTPError as e:
-            # Handle explicit rate limiting / not found
-            if e.code in (401, 403, 429):
-                last_err = ProviderRateLimited(f"Yahoo rate-limited or blocked (HTTP {e.code}).")
-            elif e.code == 404:
-                last_err = ProviderNotFound("Ticker not found on Yahoo.")
-            else:
-                last_err = ProviderError(f"Yahoo HTTP error: {e.code}")
+            with throttle.request():
+                resp = client.get(url, headers=headers, timeout=cfg.timeout_seconds)
+                if resp.status == 429:
+                    raise ProviderRateLimited(
+                        "Yahoo rate-limited the request (HTTP 429).", retry_after=_retry_after_seconds(resp.headers)
+                    )
+                if resp.status in (401, 403):
+                    raise ProviderBlocked(f"Yahoo denied access (HTTP {resp.status}).")
+                if resp.status == 404:
+                    raise ProviderNotFound("Ticker not found on Yahoo.")
+                if resp.status >= 400:
+                    raise ProviderError(f"Yahoo HTTP error: {resp.status}")
+            return resp
+        except (ProviderBlocked, ProviderNotFound):
+            raise
+        except ProviderRateLimited as e:
+            last_err = e
+            if e.retry_after is not None:
+                delay = max(delay, e.retry_after)
         except Exception as e:
             last_err = e
 
-        # backoff
         if attempt < cfg.max_retries:
-            time.sleep(cfg.backoff_base_seconds * (2 ** (attempt - 1)))
+            time.sleep(delay)
 
+    if isinstance(last_err, ProviderError):
+        raise last_err
     raise ProviderError(str(last_err) if last_err else "Yahoo request failed.")
 
 
-class YahooProvider:
-    def __init__(self, config: YahooProviderConfig | None = None) -> None:
+def _http_get_json(url: str, cfg: YahooProviderConfig, throttle: ProviderThrottle, client: HttpClient) -> dict[str, Any]:
+    return json.loads(_http_get(url, cfg, throttle, client).text())
+
+
+class YahooProvider(ProviderBase):
+    # The chart endpoint serves one symbol per request, so batches fall back to per-ticker calls.
+    name = "yahoo"
+    capabilities = ProviderCapabilities(batch=False, max_batch_size=1)
+    rate_limit = PROVIDER_LIMITS["yahoo"]
+
+    def __init__(
+        self,
+        config: YahooProviderConfig | None = None,
+        *,
+        throttle: ProviderThrottle | None = None,
+        client: HttpClient | None = None,
+        cache: ResponseCache | None = None,
+    ) -> None:
         self._cfg = config or YahooProviderConfig()
+        self._throttle = throttle or get_throttle("yahoo")
+        self._client = client or get_http_client()
+        self._cache = cache if cache is not None else get_response_cache()
+
+    def _get_payload(self, url: str, key: CacheKey, ttl_seconds: float) -> dict[str, Any]:
+        cache = self._cache
+        if cache is None:
+            return _http_get_json(url, self._cfg, self._throttle, self._client)
+
+        entry = cache.get(key)
+        if entry is not None and (cache.offline or entry.is_fresh()):
+            return json.loads(entry.body)
+        if cache.offline:
+            raise ProviderError(f"No cached Yahoo response for {key.ticker} {key.start}..{key.end} (offline mode).")
+
+        validators = entry.validators() if entry is not None else None
+        resp = _http_get(url, self._cfg, self._throttle, self._client, extra_headers=validators)
+        if resp.status == 304 and entry is not None:
+            cache.touch(key, entry, ttl_seconds=ttl_seconds, headers=resp.headers)
+            return json.loads(entry.body)
+
+        payload = json.loads(resp.text())
+        if not (payload.get("chart") or {}).get("error"):
+            cache.put(key, resp.body, ttl_seconds=ttl_seconds, headers=resp.headers)
+        return payload
 
     def fetch_daily(self, *, ticker: str, start: date, end: date) -> list[dict[str, Any]]:
         ticker = (ticker or "").strip()
@@ -129,7 +209,9 @@ class YahooProvider:
             return []
 
         url = _build_chart_url(ticker, start, end)
-        payload = _http_get_json(url, self._cfg)
+        closed = end < datetime.now(UTC).date()
+        ttl = self._cfg.history_cache_ttl_seconds if closed else self._cfg.cache_ttl_seconds
+        payload = self._get_payload(url, CacheKey("yahoo", ticker, start.isoformat(), end.isoformat()), ttl)
 
         chart = payload.get("chart") or {}
         error = chart.get("error")
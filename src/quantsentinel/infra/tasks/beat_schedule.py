@@ -11,6 +11,8 @@ from __future__ import annotations
 
 from datetime import timedelta
 
+from quantsentinel.infra.tasks.tasks_ingest import DIFF_WINDOW_DAYS
+
 
 def build_beat_schedule() -> dict:
     """
@@ -23,10 +25,26 @@ def build_beat_schedule() -> dict:
             "schedule": timedelta(hours=24),
             "kwargs": {"task_id": None},  # beat-run has no UI Task id
         },
-        # Monitor alerts every 5 minutes
-        "monitor_alerts_5m": {
+        # Weekly diff refresh: re-fetch the trailing DIFF_WINDOW_DAYS to pick up vendor
+        # revisions, writing only bars whose content changed.
+        "refresh_watchlist_diff_weekly": {
+            "task": "quantsentinel.infra.tasks.tasks_ingest.refresh_watchlist",
+            "schedule": timedelta(days=7),
+            "kwargs": {"task_id": None, "diff_window_days": DIFF_WINDOW_DAYS},
+        },
+        # Load history refresh_watchlist leaves alone: watched tickers without prices or
+        # with an unfinished backfill (tasks_ingest.backfill_history default scope).
+        "backfill_missing_history_daily": {
+            "task": "quantsentinel.infra.tasks.tasks_ingest.backfill_history",
+            "schedule": timedelta(hours=24),
+            "kwargs": {"task_id": None},
+        },
+        # Full alert monitor sweep. Price-driven rules are evaluated right after ingest
+        # via tasks_monitor.on_prices_updated; this sweep covers time-based rules
+        # (staleness/missing_data) and any missed "prices updated" signal.
+        "monitor_alerts_15m": {
             "task": "quantsentinel.infra.tasks.tasks_monitor.run_alert_monitor",
-            "schedule": timedelta(minutes=5),
+            "schedule": timedelta(minutes=15),
             "kwargs": {"task_id": None},
         },
     }
\ No newline at end of file
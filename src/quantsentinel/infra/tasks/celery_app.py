@@ -12,6 +12,9 @@ from __future__ import annotations
 from celery import Celery
 
 from quantsentinel.common.config import get_settings
+from quantsentinel.infra.cache.price_cache import configure_price_cache
+from quantsentinel.infra.providers.rate_limit import configure_rate_limits
+from quantsentinel.infra.providers.response_cache import configure_response_cache
 from quantsentinel.infra.tasks.beat_schedule import build_beat_schedule
 
 
@@ -44,6 +47,13 @@ def _make_celery() -> Celery:
         broker_connection_retry_on_startup=True,
         beat_schedule=build_beat_schedule(),
     )
+    configure_price_cache(settings.price_cache_dir)
+    configure_rate_limits(redis_url=settings.redis_url if settings.provider_rate_limit_redis else None)
+    configure_response_cache(
+        settings.provider_cache_dir,
+        offline=settings.provider_cache_offline,
+        max_age_seconds=settings.provider_cache_max_age_days * 86400 or None,
+    )
 
     return celery
 
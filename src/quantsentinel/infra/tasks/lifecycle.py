@@ -11,6 +11,14 @@ from quantsentinel.services.task_service import TaskService
 T = TypeVar("T")
 
 
+@dataclass(frozen=True)
+class Deferred:
+    """Worker result signalling that a follow-up task (e.g. a chord callback) completes the task."""
+
+    detail: str
+    progress: int = 50
+
+
 @dataclass(frozen=True)
 class TaskLifecycle:
     """Helper for consistent DB task lifecycle updates in worker tasks."""
@@ -29,7 +37,14 @@ class TaskLifecycle:
         *,
         worker: Callable[[Callable[[int, str | None], None]], T],
         success_detail: str | None = None,
+        resume: bool = False,
     ) -> T:
+        """
+        Run ``worker`` with progress reporting and terminal status updates.
+
+        ``resume=True`` continues a task already marked running by an earlier stage.
+        A ``Deferred`` result leaves the task running for a follow-up stage to finish.
+        """
         svc = TaskService()
         task_uuid = self._as_uuid()
 
@@ -43,12 +58,15 @@ class TaskLifecycle:
                     append_log=detail is not None,
                 )
 
-        if task_uuid:
+        if task_uuid and not resume:
             svc.mark_running(task_id=task_uuid)
             report(1, "started")
 
         try:
             result = worker(report)
+            if isinstance(result, Deferred):
+                report(result.progress, result.detail)
+                return result
             if task_uuid:
                 final_detail = success_detail
                 if final_detail is None and isinstance(result, str):
@@ -70,3 +88,9 @@ class TaskLifecycle:
                     append_log=True,
                 )
             raise
+
+    def fail(self, detail: str) -> None:
+        """Mark the task failed from outside ``run`` (e.g. a chord error callback)."""
+        task_uuid = self._as_uuid()
+        if task_uuid:
+            TaskService().mark_failed(task_id=task_uuid, detail=detail, log=detail, append_log=True)
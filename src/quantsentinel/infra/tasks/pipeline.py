@@ -0,0 +1,221 @@
+"""
+Threaded stage pipeline with bounded queues (used by the ingest tasks).
+
+Each stage runs on its own worker thread(s) and passes items downstream through a
+bounded queue. A slow stage therefore blocks its producers (backpressure) instead
+of letting work pile up in memory, while the stages themselves overlap: parsing
+and writing proceed while later fetches are still on the network.
+
+Stage functions are ``fn(item, emit)`` and may emit any number of items. An
+optional ``flush(emit)`` runs once after the stage's input is exhausted, for
+stages that batch. The first exception in any stage stops the pipeline and is
+re-raised by ``run``.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+Emit = Callable[[Any], None]
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+
+class _Aborted(Exception):
+    pass
+
+
+@dataclass
+class StageStats:
+    name: str
+    workers: int
+    capacity: int
+    items_in: int = 0
+    items_out: int = 0
+    busy_seconds: float = 0.0
+    depth: int = 0
+    max_depth: int = 0
+
+    @property
+    def throughput(self) -> float:
+        """Items handled per second of busy time (per worker)."""
+        return self.items_in / self.busy_seconds if self.busy_seconds > 0 else 0.0
+
+    def describe(self) -> str:
+        return f"{self.name} {self.items_in} in {self.throughput:,.1f}/s q={self.depth}/{self.capacity}"
+
+
+class _Stage:
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[Any, Emit], None],
+        *,
+        workers: int,
+        maxsize: int,
+        flush: Callable[[Emit], None] | None,
+    ) -> None:
+        self.name = name
+        self.fn = fn
+        self.flush = flush
+        self.workers = max(1, workers)
+        self.inbox: queue.Queue[Any] = queue.Queue(maxsize=max(1, maxsize))
+        self.stats = StageStats(name=name, workers=self.workers, capacity=max(1, maxsize))
+        self.lock = threading.Lock()
+        self.finished = 0
+
+
+class Pipeline:
+    def __init__(self) -> None:
+        self._stages: list[_Stage] = []
+        self._abort = threading.Event()
+        self._error: BaseException | None = None
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[[Any, Emit], None],
+        *,
+        workers: int = 1,
+        maxsize: int = 32,
+        flush: Callable[[Emit], None] | None = None,
+    ) -> Pipeline:
+        """Append a stage reading from a queue of ``maxsize`` items."""
+        self._stages.append(_Stage(name, fn, workers=workers, maxsize=maxsize, flush=flush))
+        return self
+
+    def stats(self) -> list[StageStats]:
+        out = []
+        for stage in self._stages:
+            with stage.lock:
+                stage.stats.depth = stage.inbox.qsize()
+                out.append(StageStats(**vars(stage.stats)))
+        return out
+
+    def describe(self) -> str:
+        return " | ".join(s.describe() for s in self.stats())
+
+    # -----------------------------
+    # Running
+    # -----------------------------
+
+    def _put(self, q: queue.Queue[Any], item: Any) -> None:
+        while True:
+            if self._abort.is_set():
+                raise _Aborted
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q: queue.Queue[Any]) -> Any:
+        while True:
+            if self._abort.is_set():
+                raise _Aborted
+            try:
+                return q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+
+    def _fail(self, exc: BaseException) -> None:
+        if self._error is None:
+            self._error = exc
+        self._abort.set()
+
+    def _emitter(self, index: int) -> Emit:
+        stage = self._stages[index]
+        downstream = self._stages[index + 1] if index + 1 < len(self._stages) else None
+
+        def emit(item: Any) -> None:
+            with stage.lock:
+                stage.stats.items_out += 1
+            if downstream is not None:
+                self._put(downstream.inbox, item)
+                with downstream.lock:
+                    downstream.stats.max_depth = max(downstream.stats.max_depth, downstream.inbox.qsize())
+
+        return emit
+
+    def _worker(self, index: int) -> None:
+        stage = self._stages[index]
+        emit = self._emitter(index)
+        try:
+            while True:
+                item = self._get(stage.inbox)
+                if item is _DONE:
+                    self._put(stage.inbox, _DONE)  # let sibling workers see it too
+                    break
+                started = time.perf_counter()
+                stage.fn(item, emit)
+                with stage.lock:
+                    stage.stats.items_in += 1
+                    stage.stats.busy_seconds += time.perf_counter() - started
+
+            with stage.lock:
+                stage.finished += 1
+                last = stage.finished == stage.workers
+            if last:
+                if stage.flush is not None:
+                    started = time.perf_counter()
+                    stage.flush(emit)
+                    with stage.lock:
+                        stage.stats.busy_seconds += time.perf_counter() - started
+                if index + 1 < len(self._stages):
+                    self._put(self._stages[index + 1].inbox, _DONE)
+        except _Aborted:
+            pass
+        except BaseException as exc:
+            self._fail(exc)
+
+    def _feed(self, items: Iterable[Any]) -> None:
+        try:
+            for item in items:
+                self._put(self._stages[0].inbox, item)
+            self._put(self._stages[0].inbox, _DONE)
+        except _Aborted:
+            pass
+        except BaseException as exc:
+            self._fail(exc)
+
+    def run(
+        self,
+        items: Iterable[Any],
+        *,
+        on_tick: Callable[[Pipeline], None] | None = None,
+        tick_seconds: float = 2.0,
+    ) -> None:
+        """
+        Push ``items`` through every stage and wait until the last one drains.
+
+        ``on_tick`` is called from the calling thread about every ``tick_seconds``
+        while the pipeline runs (progress reporting stays on the task's thread).
+        """
+        if not self._stages:
+            raise ValueError("pipeline has no stages")
+        threads = [threading.Thread(target=self._feed, args=(items,), name="pipeline-feed", daemon=True)]
+        for index, stage in enumerate(self._stages):
+            threads.extend(
+                threading.Thread(target=self._worker, args=(index,), name=f"pipeline-{stage.name}-{n}", daemon=True)
+                for n in range(stage.workers)
+            )
+        for thread in threads:
+            thread.start()
+
+        next_tick = time.monotonic() + tick_seconds
+        for thread in threads:
+            while thread.is_alive():
+                wait = _POLL_SECONDS * 5 if on_tick is None else min(_POLL_SECONDS * 5, next_tick - time.monotonic())
+                thread.join(timeout=max(0.01, wait))
+                if on_tick is not None and time.monotonic() >= next_tick and not self._abort.is_set():
+                    on_tick(self)
+                    next_tick = time.monotonic() + tick_seconds
+
+        if self._error is not None:
+            raise self._error
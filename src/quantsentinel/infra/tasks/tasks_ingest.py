@@ -4,23 +4,63 @@ Data ingest tasks.
 Goals:
 - Deterministic + idempotent ingestion pipeline
 - Task status tracking (DB Task) when task_id is provided
-- Provider-pluggable (Yahoo today; Bloomberg/Refinitiv later)
+- Provider-pluggable: providers are resolved per instrument ``source`` through
+  infra/providers/registry.py (Yahoo is the default); batch-capable providers get
+  many tickers per call
 - No Streamlit imports
+- Emits a "prices updated" signal after commit so alerts evaluate right after data lands
 """
 
 from __future__ import annotations
 
 import uuid
-from collections.abc import Iterable
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass, field
 from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
 from typing import Any
 
+import numpy as np
 from celery import shared_task
 from sqlalchemy import select
 
+from quantsentinel.domain.market.qc import check_bars
 from quantsentinel.infra.db.engine import session_scope
-from quantsentinel.infra.db.models import Instrument, PriceDaily, RefreshLog
-from quantsentinel.infra.db.repos.prices_repo import PricesRepo
+from quantsentinel.infra.db.models import Instrument, RefreshLog
+from quantsentinel.infra.db.repos.backfill_repo import (
+    STATUS_DONE,
+    STATUS_FAILED,
+    BackfillCheckpoint,
+    BackfillRepo,
+)
+from quantsentinel.infra.db.repos.instruments_repo import InstrumentsRepo
+from quantsentinel.infra.db.repos.prices_repo import (
+    BarDiff,
+    PriceDailyCreate,
+    PricesRepo,
+    UpsertResult,
+)
+from quantsentinel.infra.db.repos.tasks_repo import TasksRepo
+from quantsentinel.infra.providers.base import BatchResult, FetchRequest, PriceProvider
+from quantsentinel.infra.providers.registry import provider_for_source
+from quantsentinel.infra.tasks.pipeline import Pipeline
+
+# Concurrent provider fetches in refresh_watchlist (network-bound, so threads suffice).
+FETCH_WORKERS = 8
+# Fetched bars buffered before the single writer upserts them in one transaction.
+WRITE_BATCH_ROWS = 5000
+# Trailing days re-fetched and diffed against stored bars in diff mode (vendor revisions).
+DIFF_WINDOW_DAYS = 30
+# History loaded by backfill_history, cut into chunks that are fetched in parallel.
+BACKFILL_YEARS = 5
+BACKFILL_CHUNK_DAYS = 365
+# Backfilled bars per COPY merge (and checkpoint transaction).
+BACKFILL_WRITE_ROWS = 50_000
+# Failed chunks listed in the backfill's FINISHED refresh log (the rest are counted).
+MAX_FAILED_SAMPLES = 20
+
+_PRICE_KEYS = ("open", "high", "low", "close", "adj_close")
+_QC_COLUMNS = (*_PRICE_KEYS, "volume")
 
 
 def _utc_now() -> datetime:
@@ -32,14 +72,20 @@ def _today_utc_date() -> date:
 
 
 
-def _list_watched_tickers() -> list[str]:
+def _list_watched_instruments() -> dict[str, str | None]:
+    """Watched tickers (ordered) mapped to their instrument ``source``."""
     with session_scope() as session:
         stmt = (
-            select(Instrument.ticker)
+            select(Instrument.ticker, Instrument.source)
             .where(Instrument.is_watched.is_(True))
             .order_by(Instrument.ticker.asc())
         )
-        return list(session.execute(stmt).scalars().all())
+        return dict(session.execute(stmt).all())
+
+
+def _instrument_source(ticker: str) -> str | None:
+    with session_scope() as session:
+        return session.execute(select(Instrument.source).where(Instrument.ticker == ticker)).scalar_one_or_none()
 
 
 def _latest_price_date(ticker: str) -> date | None:
@@ -48,6 +94,35 @@ def _latest_price_date(ticker: str) -> date | None:
         return repo.get_latest_price_date(ticker)
 
 
+def _latest_price_dates(tickers: list[str]) -> dict[str, date]:
+    with session_scope() as session:
+        return PricesRepo(session).get_latest_price_dates(tickers)
+
+
+def _backfilling_tickers() -> set[str]:
+    """Tickers named by a queued or running backfill_history task."""
+    with session_scope() as session:
+        queued = TasksRepo(session).list_active_args(task_type="backfill_history")
+    return {str(t) for args in queued for t in args.get("tickers") or ()}
+
+
+def _backfill_active(ticker: str) -> bool:
+    with session_scope() as session:
+        found = TasksRepo(session).find_active(task_type="backfill_history", celery_args={"tickers": [ticker]})
+    return found is not None
+
+
+def _fetch_start(latest: date, end: date, *, diff_window_days: int | None) -> date:
+    """
+    First day to fetch: the day after ``latest``. In diff mode the last
+    ``diff_window_days`` are re-fetched as well, so the start is never after ``end``.
+    """
+    start = latest + timedelta(days=1)
+    if diff_window_days is not None:
+        start = min(start, end - timedelta(days=max(0, diff_window_days)))
+    return start
+
+
 def _write_refresh_log(
     *,
     status: str,
@@ -55,6 +130,9 @@ def _write_refresh_log(
     ticker: str | None = None,
     last_date: date | None = None,
     revision_id: uuid.UUID | None = None,
+    rows_inserted: int | None = None,
+    rows_changed: int | None = None,
+    rows_unchanged: int | None = None,
 ) -> None:
     with session_scope() as session:
         session.add(
@@ -65,28 +143,37 @@ def _write_refresh_log(
                 ticker=ticker,
                 last_date=last_date,
                 revision_id=revision_id,
+                rows_inserted=rows_inserted,
+                rows_changed=rows_changed,
+                rows_unchanged=rows_unchanged,
             )
         )
         session.flush()
 
 
-def _provider_fetch_daily_prices(
-    *,
-    ticker: str,
-    start: date,
-    end: date,
-) -> list[dict[str, Any]]:
+def _emit_prices_updated(*, tickers: list[str], revision_id: uuid.UUID) -> None:
     """
-    Provider adapter. Returns list of dict rows with:
-      date, open, high, low, close, adj_close, volume
+    Best-effort "prices updated" signal for event-triggered alert evaluation.
 
-    Current default provider: Yahoo (infra/providers/yahoo.py).
-    If provider is placeholder, it should raise NotImplementedError.
+    Sent by task name so ingest does not import monitor code; never raises.
     """
-    from quantsentinel.infra.providers.yahoo import YahooProvider  # lazy import
+    if not tickers:
+        return
+    try:
+        from celery import current_app
+
+        current_app.send_task(
+            "quantsentinel.infra.tasks.tasks_monitor.on_prices_updated",
+            kwargs={"task_id": None, "tickers": sorted(set(tickers)), "revision_id": str(revision_id)},
+        )
+    except Exception:
+        # Broker unavailable: the periodic monitor beat still covers these tickers.
+        pass
+
 
-    provider = YahooProvider()
-    return provider.fetch_daily(ticker=ticker, start=start, end=end)
+def _get_provider(source: str | None) -> PriceProvider:
+    """Provider for an instrument ``source`` (unknown sources use the default provider)."""
+    return provider_for_source(source)
 
 
 def _to_price_models(
@@ -95,8 +182,8 @@ def _to_price_models(
     rows: Iterable[dict[str, Any]],
     revision_id: uuid.UUID,
     source: str,
-) -> list[PriceDaily]:
-    out: list[PriceDaily] = []
+) -> list[PriceDailyCreate]:
+    out: list[PriceDailyCreate] = []
     for r in rows:
         # Expect date as python date (preferred) or ISO string.
         d = r.get("date")
@@ -104,7 +191,7 @@ def _to_price_models(
             d = date.fromisoformat(d)
 
         out.append(
-            PriceDaily(
+            PriceDailyCreate(
                 ticker=ticker,
                 date=d,
                 open=r.get("open"),
@@ -120,83 +207,664 @@ def _to_price_models(
     return out
 
 
+@dataclass
+class _Fetched:
+    ticker: str
+    start: date
+    end: date
+    models: list[PriceDailyCreate] = field(default_factory=list)
+    error: str | None = None
+    qc: str = ""  # QCSummary.describe() of the fetched bars, empty when clean
+
+
+def _qc_models(models: list[PriceDailyCreate]) -> tuple[list[PriceDailyCreate], str]:
+    """Run market-data QC (domain/market/qc.py): drop rejected bars, describe every flag raised."""
+    if not models:
+        return models, ""
+    columns = {
+        name: np.array([np.nan if (v := getattr(m, name)) is None else float(v) for m in models], dtype=np.float64)
+        for name in _QC_COLUMNS
+    }
+    result = check_bars(np.array([m.date for m in models], dtype="datetime64[D]"), **columns)
+    if result.summary.rejected:
+        models = [m for m, keep in zip(models, result.keep.tolist(), strict=True) if keep]
+    return models, result.summary.describe()
+
+
+def _write_refresh_logs(entries: list[dict[str, Any]]) -> None:
+    """Per-ticker refresh log rows for one writer batch, in a single transaction."""
+    if not entries:
+        return
+    with session_scope() as session:
+        now = _utc_now()
+        session.add_all(RefreshLog(run_ts=now, **entry) for entry in entries)
+        session.flush()
+
+
+@dataclass
+class _Raw:
+    """Fetch-stage output: provider payload for one call, not yet parsed."""
+
+    provider: str
+    requests: list[FetchRequest]
+    batch: BatchResult
+
+
+def _fetch_raw(provider: PriceProvider, requests: list[FetchRequest]) -> _Raw:
+    """
+    Fetch stage: one provider call (one ticker unless the provider is batch-capable).
+    A failing call marks every ticker in it failed instead of raising.
+    """
+    try:
+        batch = provider.fetch_daily_batch(requests)
+    except Exception as exc:
+        batch = BatchResult(errors={req.ticker: exc for req in requests})
+    return _Raw(provider=provider.name, requests=requests, batch=batch)
+
+
+def _parse_raw(raw: _Raw, *, revision_id: uuid.UUID) -> list[_Fetched]:
+    """
+    Parse/QC stage: provider rows -> PriceDailyCreate per ticker. Bars QC rejects
+    (inconsistent OHLC, non-positive prices, duplicate dates) are dropped; a bad
+    payload fails that ticker only.
+    """
+    out: list[_Fetched] = []
+    for req in raw.requests:
+        error = raw.batch.errors.get(req.ticker)
+        if error is None:
+            try:
+                rows = [r for r in raw.batch.rows.get(req.ticker, []) if any(r.get(k) is not None for k in _PRICE_KEYS)]
+                models = _to_price_models(ticker=req.ticker, rows=rows, revision_id=revision_id, source=raw.provider)
+            except Exception as exc:
+                error = exc
+        if error is not None:
+            out.append(_Fetched(ticker=req.ticker, start=req.start, end=req.end, error=f"{type(error).__name__}: {error}"))
+        else:
+            models, qc = _qc_models(models)
+            out.append(_Fetched(ticker=req.ticker, start=req.start, end=req.end, models=models, qc=qc))
+    return out
+
+
+def _fetch_jobs(due: dict[str, FetchRequest], sources: dict[str, str | None]) -> list[tuple[PriceProvider, list[FetchRequest]]]:
+    """Group due tickers by provider and split them into per-call batches."""
+    by_provider: dict[str, tuple[PriceProvider, list[FetchRequest]]] = {}
+    for ticker, req in due.items():
+        provider = _get_provider(sources.get(ticker))
+        by_provider.setdefault(provider.name, (provider, []))[1].append(req)
+
+    jobs: list[tuple[PriceProvider, list[FetchRequest]]] = []
+    for provider, requests in by_provider.values():
+        caps = provider.capabilities
+        size = max(1, caps.max_batch_size) if caps.batch else 1
+        jobs.extend((provider, requests[i : i + size]) for i in range(0, len(requests), size))
+    return jobs
+
+
+def _write_batch(
+    batch: list[_Fetched], *, revision_id: uuid.UUID, diff: bool = False
+) -> tuple[UpsertResult | None, list[dict[str, Any]]]:
+    """
+    Bulk-write stage: upsert the bars of ``batch`` in one transaction. Returns the
+    result (None if the write failed) and the refresh log entries for the batch.
+
+    With ``diff`` the bars are first compared with the stored ones by content hash
+    (``PricesRepo.diff_against_stored``) and only new or changed bars are written;
+    the entries then carry per-ticker ``rows_inserted/changed/unchanged`` counts.
+    """
+    if not batch:
+        return UpsertResult(), []
+    bar_diff: BarDiff | None = None
+    try:
+        with session_scope() as session:
+            repo = PricesRepo(session)
+            models = [m for item in batch for m in item.models]
+            if diff:
+                bar_diff = repo.diff_against_stored(models)
+                models = bar_diff.rows
+            result = repo.upsert_many(models)
+    except Exception as exc:
+        return None, [
+            {"status": "FAILED", "ticker": item.ticker, "detail": f"write: {type(exc).__name__}: {exc}", "revision_id": revision_id}
+            for item in batch
+        ]
+
+    entries: list[dict[str, Any]] = []
+    for item in batch:
+        entry: dict[str, Any] = {"status": "OK", "ticker": item.ticker, "last_date": item.end, "revision_id": revision_id}
+        detail = f"rows={len(item.models)}"
+        if bar_diff is not None:
+            inserted, changed, unchanged = bar_diff.per_ticker.get(item.ticker, (0, 0, 0))
+            entry.update(rows_inserted=inserted, rows_changed=changed, rows_unchanged=unchanged)
+            detail += f" inserted={inserted} changed={changed} unchanged={unchanged}"
+        entry["detail"] = detail + (f" qc={item.qc}" if item.qc else "")
+        entries.append(entry)
+    return result, entries
+
+
+def _wrote_prices(item: _Fetched, entry: dict[str, Any]) -> bool:
+    """Whether a written ticker's stored bars changed (diff entries count it; otherwise any bar)."""
+    if "rows_inserted" in entry:
+        return entry["rows_inserted"] + entry["rows_changed"] > 0
+    return bool(item.models)
+
+
 @shared_task(
     name="quantsentinel.infra.tasks.tasks_ingest.refresh_watchlist",
     bind=True,
     ignore_result=True,
 )
-def refresh_watchlist(self, task_id: str | None = None) -> None:
+def refresh_watchlist(
+    self,
+    task_id: str | None = None,
+    *,
+    max_workers: int = FETCH_WORKERS,
+    diff_window_days: int | None = None,
+) -> None:
     """
     Refresh watched tickers daily prices.
 
+    Runs as a staged pipeline (infra/tasks/pipeline.py) connected by bounded queues:
+
+        fetch (``max_workers`` threads) -> parse/QC -> bulk write -> refresh log
+
+    Tickers are grouped by provider (from the instrument ``source``) and fetched one
+    per call, or in batches for batch-capable providers. Parsing and writing overlap
+    with the network fetches, and a full queue blocks its producers, so memory stays
+    bounded. The write stage is the only price writer: it upserts about
+    ``WRITE_BATCH_ROWS`` rows per transaction. A ticker whose fetch or parse fails is
+    logged FAILED and skipped; the rest of the run carries on. Per-stage throughput
+    and queue depth are reported as task progress.
+
+    Diff mode (``diff_window_days`` set, e.g. ``DIFF_WINDOW_DAYS``) also re-fetches the
+    trailing window so vendor revisions to recent bars are picked up, but writes only
+    bars that are new or whose content differs from the stored bar. Diff counts are
+    recorded on the per-ticker and FINISHED refresh log rows, and only tickers with
+    changed bars signal "prices updated".
+
+    Tickers without any stored bar, or with a queued or running backfill_history
+    task, are logged SKIPPED: their history is loaded by backfill_history, in
+    chunks, and fetching it here as well would duplicate that work.
+
     If task_id is provided (UUID string), updates DB Task progress/status.
     If task_id is None (beat-run), runs without Task tracking.
     """
     from quantsentinel.infra.tasks.lifecycle import TaskLifecycle
 
     def _worker(report):
-        tickers = _list_watched_tickers()
+        sources = _list_watched_instruments()
+        tickers = list(sources)
+        latest_dates = _latest_price_dates(tickers)
         total = max(len(tickers), 1)
         revision_id = uuid.uuid4()
-        _write_refresh_log(status="STARTED", detail=f"tickers={len(tickers)}", revision_id=revision_id)
+        diff = diff_window_days is not None
+        started = f"tickers={len(tickers)}" + (f" diff_window_days={diff_window_days}" if diff else "")
+        _write_refresh_log(status="STARTED", detail=started, revision_id=revision_id)
 
-        for i, ticker in enumerate(tickers, start=1):
-            latest = _latest_price_date(ticker)
-            start = (_today_utc_date() - timedelta(days=365 * 5)) if latest is None else (latest + timedelta(days=1))
-            end = _today_utc_date()
+        end = _today_utc_date()
+        due: dict[str, FetchRequest] = {}
+        skipped: list[dict[str, Any]] = []
+        backfilling = _backfilling_tickers()
+        for ticker in tickers:
+            latest = latest_dates.get(ticker)
+            if latest is None or ticker in backfilling:
+                # History is loaded in chunks by backfill_history, never inline here.
+                skipped.append(
+                    {"status": "SKIPPED", "ticker": ticker, "last_date": latest, "detail": "backfill", "revision_id": revision_id}
+                )
+                continue
+            start = _fetch_start(latest, end, diff_window_days=diff_window_days)
             if start > end:
-                _write_refresh_log(
-                    status="SKIPPED",
-                    ticker=ticker,
-                    last_date=latest,
-                    detail="up-to-date",
-                    revision_id=revision_id,
+                skipped.append(
+                    {"status": "SKIPPED", "ticker": ticker, "last_date": latest, "detail": "up-to-date", "revision_id": revision_id}
                 )
             else:
-                rows = _provider_fetch_daily_prices(ticker=ticker, start=start, end=end)
-                models = _to_price_models(ticker=ticker, rows=rows, revision_id=revision_id, source="yahoo")
-                with session_scope() as session:
-                    PricesRepo(session).upsert_many(models)
-                _write_refresh_log(
-                    status="OK",
-                    ticker=ticker,
-                    last_date=end,
-                    detail=f"rows={len(models)}",
-                    revision_id=revision_id,
-                )
-            report(int(i * 100 / total), f"processed {i}/{len(tickers)} ({ticker})")
-
-        _write_refresh_log(status="FINISHED", detail=f"revision_id={revision_id}", revision_id=revision_id)
-        return f"watchlist refresh completed: revision_id={revision_id}"
+                due[ticker] = FetchRequest(ticker=ticker, start=start, end=end)
+        _write_refresh_logs(skipped)
+
+        updated: list[str] = []
+        failed: list[str] = []
+        totals = UpsertResult()
+        diff_totals = [0, 0, 0]  # inserted, changed, unchanged (diff mode)
+        pending: list[_Fetched] = []
+        pending_rows = 0
+        done = len(skipped)
+
+        def fetch_stage(job, emit) -> None:
+            provider, requests = job
+            emit(_fetch_raw(provider, requests))
+
+        def parse_stage(raw: _Raw, emit) -> None:
+            for item in _parse_raw(raw, revision_id=revision_id):
+                emit(item)
+
+        def write_stage(item: _Fetched, emit) -> None:
+            nonlocal pending_rows
+            if item.error is not None:
+                failed.append(item.ticker)
+                emit([{"status": "FAILED", "ticker": item.ticker, "detail": item.error, "revision_id": revision_id}])
+                return
+            pending.append(item)
+            pending_rows += len(item.models)
+            if pending_rows >= WRITE_BATCH_ROWS:
+                flush_writes(emit)
+
+        def flush_writes(emit) -> None:
+            nonlocal totals, pending, pending_rows
+            if not pending:
+                return
+            result, entries = _write_batch(pending, revision_id=revision_id, diff=diff)
+            if result is None:
+                failed.extend(item.ticker for item in pending)
+            else:
+                updated.extend(item.ticker for item, entry in zip(pending, entries, strict=True) if _wrote_prices(item, entry))
+                if diff:
+                    for entry in entries:
+                        diff_totals[0] += entry["rows_inserted"]
+                        diff_totals[1] += entry["rows_changed"]
+                        diff_totals[2] += entry["rows_unchanged"]
+                totals = UpsertResult(inserted=totals.inserted + result.inserted, updated=totals.updated + result.updated)
+            pending, pending_rows = [], 0
+            emit(entries)
+
+        def log_stage(entries: list[dict[str, Any]], emit) -> None:
+            nonlocal done
+            _write_refresh_logs(entries)
+            done += len(entries)
+
+        queue_size = max(2, 2 * max_workers)
+        pipeline = (
+            Pipeline()
+            .add("fetch", fetch_stage, workers=max_workers, maxsize=queue_size)
+            .add("parse", parse_stage, maxsize=queue_size)
+            .add("write", write_stage, maxsize=queue_size, flush=flush_writes)
+            .add("log", log_stage, maxsize=queue_size)
+        )
+        pipeline.run(
+            _fetch_jobs(due, sources),
+            on_tick=lambda p: report(min(99, int(done * 100 / total)), f"processed {done}/{len(tickers)} | {p.describe()}"),
+        )
+        report(99, f"pipeline: {pipeline.describe()}")
+
+        if diff:
+            counts = {"rows_inserted": diff_totals[0], "rows_changed": diff_totals[1], "rows_unchanged": diff_totals[2]}
+        else:
+            counts = {"rows_inserted": totals.inserted, "rows_changed": totals.updated}
+        _write_refresh_log(
+            status="FINISHED",
+            detail=(
+                f"revision_id={revision_id} updated={len(updated)} failed={len(failed)} "
+                f"skipped={len(skipped)} inserted={totals.inserted} rows_updated={totals.updated}"
+                + (f" unchanged={diff_totals[2]}" if diff else "")
+            ),
+            revision_id=revision_id,
+            **counts,
+        )
+        _emit_prices_updated(tickers=updated, revision_id=revision_id)
+        return (
+            f"watchlist refresh completed: revision_id={revision_id}, "
+            f"updated={len(updated)}, failed={len(failed)}, skipped={len(skipped)}"
+        )
 
     TaskLifecycle(task_id).run(worker=_worker)
 
+
 @shared_task(
     name="quantsentinel.infra.tasks.tasks_ingest.refresh_ticker",
     bind=True,
     ignore_result=True,
 )
-def refresh_ticker(self, task_id: str | None = None, *, ticker: str) -> None:
+def refresh_ticker(
+    self, task_id: str | None = None, *, ticker: str, diff_window_days: int | None = None
+) -> None:
+    """
+    Refresh one ticker from the day after its latest bar; a ticker without history
+    or with an active backfill is left to backfill_history. With ``diff_window_days``
+    the trailing window is re-fetched too and only new or changed bars are written
+    (see ``refresh_watchlist``). Parsing, QC and the write go through the same steps
+    as ``refresh_watchlist``, including its per-ticker refresh log row.
+    """
+
     def _worker(report):
         if not ticker.strip():
             raise ValueError("ticker is required")
         report(10, f"loading latest date for {ticker}")
         latest = _latest_price_date(ticker)
+        if latest is None or _backfill_active(ticker):
+            report(100, f"{ticker} history is loaded by backfill_history")
+            return f"{ticker} left to backfill"
         end = _today_utc_date()
-        start = (end - timedelta(days=365 * 5)) if latest is None else (latest + timedelta(days=1))
+        start = _fetch_start(latest, end, diff_window_days=diff_window_days)
         if start > end:
             report(100, f"{ticker} already up-to-date")
             return f"{ticker} up-to-date"
 
-        rows = _provider_fetch_daily_prices(ticker=ticker, start=start, end=end)
-        models = _to_price_models(ticker=ticker, rows=rows, revision_id=uuid.uuid4(), source="yahoo")
-        report(70, f"persisting {len(models)} rows")
+        revision_id = uuid.uuid4()
+        provider = _get_provider(_instrument_source(ticker))
+        request = FetchRequest(ticker=ticker, start=start, end=end)
+        rows = provider.fetch_daily(ticker=ticker, start=start, end=end)
+        # Same parse/QC step as refresh_watchlist: QC-rejected bars are never written.
+        (item,) = _parse_raw(
+            _Raw(provider=provider.name, requests=[request], batch=BatchResult(rows={ticker: rows})),
+            revision_id=revision_id,
+        )
+        if item.error is not None:
+            raise ValueError(f"{ticker}: {item.error}")
+        report(70, f"persisting {len(item.models)} rows")
+        result, entries = _write_batch([item], revision_id=revision_id, diff=diff_window_days is not None)
+        _write_refresh_logs(entries)
+        (entry,) = entries
+        if result is None:
+            raise RuntimeError(f"{ticker}: {entry['detail']}")
+        if _wrote_prices(item, entry):
+            _emit_prices_updated(tickers=[ticker], revision_id=revision_id)
+        if diff_window_days is not None:
+            return f"refreshed {ticker}: {entry['detail']}"
+        qc = f" qc={item.qc}" if item.qc else ""
+        return f"refreshed {ticker}: rows={len(item.models)} inserted={result.inserted} updated={result.updated}{qc}"
+
+    from quantsentinel.infra.tasks.lifecycle import TaskLifecycle
+
+    TaskLifecycle(task_id).run(worker=_worker)
+
+
+def _instrument_sources(tickers: Collection[str]) -> dict[str, str | None]:
+    """Instrument ``source`` per ticker; tickers without an ``instruments`` row are absent."""
+    if not tickers:
+        return {}
+    with session_scope() as session:
+        stmt = select(Instrument.ticker, Instrument.source).where(Instrument.ticker.in_(list(tickers)))
+        return dict(session.execute(stmt).all())
+
+
+def _chunk_key(day: date, *, chunk_days: int) -> date:
+    """First day of the fixed ``chunk_days`` window containing ``day`` (windows count from 0001-01-01)."""
+    size = max(1, chunk_days)
+    return date.fromordinal((day.toordinal() - 1) // size * size + 1)
+
+
+def _backfill_windows(start: date, end: date, *, chunk_days: int) -> list[tuple[date, date, date]]:
+    """
+    ``[start, end]`` cut on fixed window boundaries as (key, fetch start, fetch end).
+
+    Boundaries do not depend on ``start``/``end``, so a rerun on a later day yields
+    the same keys and lines up with the checkpoints of the earlier run.
+    """
+    out: list[tuple[date, date, date]] = []
+    lo = start
+    while lo <= end:
+        key = _chunk_key(lo, chunk_days=chunk_days)
+        hi = min(key + timedelta(days=max(1, chunk_days) - 1), end)
+        out.append((key, lo, hi))
+        lo = hi + timedelta(days=1)
+    return out
+
+
+def _completed_chunks(tickers: Collection[str]) -> set[tuple[str, date]]:
+    with session_scope() as session:
+        return BackfillRepo(session).completed(tickers)
+
+
+def _unfinished_backfills(tickers: Collection[str], *, chunk_starts: Collection[date]) -> set[str]:
+    with session_scope() as session:
+        return BackfillRepo(session).unfinished(tickers, chunk_starts=chunk_starts)
+
+
+def _record_checkpoints(checkpoints: list[BackfillCheckpoint]) -> None:
+    if not checkpoints:
+        return
+    with session_scope() as session:
+        BackfillRepo(session).record(checkpoints)
+
+
+def _checkpoint(
+    item: _Fetched,
+    status: str,
+    *,
+    chunk_days: int,
+    revision_id: uuid.UUID | None = None,
+    error: str | None = None,
+) -> BackfillCheckpoint:
+    return BackfillCheckpoint(
+        ticker=item.ticker,
+        chunk_start=_chunk_key(item.start, chunk_days=chunk_days),
+        chunk_end=item.end,
+        status=status,
+        rows=len(item.models),
+        error=error,
+        revision_id=revision_id,
+    )
+
+
+def _write_backfill_batch(batch: list[_Fetched], *, revision_id: uuid.UUID, chunk_days: int) -> UpsertResult | None:
+    """
+    Write stage of ``backfill_history``: COPY-merge the bars of ``batch`` and mark its
+    chunks DONE in the same transaction, so a checkpoint never outlives its bars.
+    A failed write marks the chunks FAILED instead and returns None.
+    """
+    if not batch:
+        return UpsertResult()
+    try:
         with session_scope() as session:
-            PricesRepo(session).upsert_many(models)
-        return f"refreshed {ticker}: rows={len(models)}"
+            result = PricesRepo(session).copy_upsert([m for item in batch for m in item.models])
+            BackfillRepo(session).record(
+                _checkpoint(item, STATUS_DONE, chunk_days=chunk_days, revision_id=revision_id) for item in batch
+            )
+    except Exception as exc:
+        error = f"write: {type(exc).__name__}: {exc}"
+        _record_checkpoints([_checkpoint(item, STATUS_FAILED, chunk_days=chunk_days, error=error) for item in batch])
+        return None
+    return result
 
+
+@shared_task(
+    name="quantsentinel.infra.tasks.tasks_ingest.backfill_history",
+    bind=True,
+    ignore_result=True,
+)
+def backfill_history(
+    self,
+    task_id: str | None = None,
+    *,
+    tickers: list[str] | None = None,
+    years: int = BACKFILL_YEARS,
+    chunk_days: int = BACKFILL_CHUNK_DAYS,
+    max_workers: int = FETCH_WORKERS,
+) -> None:
+    """
+    Load ``years`` of daily history for ``tickers``, e.g. right after they were added
+    to the watchlist. Without ``tickers``: watched tickers that have no prices yet or
+    whose earlier backfill did not finish (a FAILED chunk or a window never done),
+    except those another queued or running backfill names.
+
+    Each ticker's range is cut into ``chunk_days`` windows on fixed boundaries, and the
+    chunks run through the same staged pipeline as ``refresh_watchlist``:
+    ``max_workers`` parallel fetches -> parse/QC -> a single writer that COPY-merges
+    about ``BACKFILL_WRITE_ROWS`` bars per transaction. Every chunk is checkpointed in
+    ``backfill_chunks`` by the transaction that writes its bars, and DONE chunks are
+    skipped, so re-running after a failure only fetches what is still missing. A DONE
+    chunk stays done even if it ended before today: the days after it are kept current
+    by refresh_watchlist, not by the backfill.
+    """
     from quantsentinel.infra.tasks.lifecycle import TaskLifecycle
 
+    def _worker(report):
+        end = _today_utc_date()
+        windows = _backfill_windows(end - timedelta(days=365 * years), end, chunk_days=chunk_days)
+        unknown: list[str] = []
+        if tickers is None:
+            sources = _list_watched_instruments()
+            with_prices = _latest_price_dates(list(sources))
+            # The newest window may legitimately be missing (it opened after the last
+            # backfill); refresh_watchlist covers it, so it does not make a ticker due.
+            unfinished = _unfinished_backfills(
+                [t for t in sources if t in with_prices], chunk_starts=[key for key, _, _ in windows[:-1]]
+            )
+            # Tickers an explicitly queued backfill (e.g. from the watchlist) is loading are left to it.
+            backfilling = _backfilling_tickers()
+            sources = {
+                t: s for t, s in sources.items() if (t not in with_prices or t in unfinished) and t not in backfilling
+            }
+        else:
+            wanted = sorted({t.strip() for t in tickers} - {""})
+            sources = _instrument_sources(wanted)
+            unknown = [t for t in wanted if t not in sources]
+        done_chunks = _completed_chunks(list(sources))
+
+        revision_id = uuid.uuid4()
+        due_by_window: dict[date, dict[str, FetchRequest]] = {}
+        resumed = 0
+        for ticker in sources:
+            for key, lo, hi in windows:
+                if (ticker, key) in done_chunks:
+                    resumed += 1
+                    continue
+                due_by_window.setdefault(key, {})[ticker] = FetchRequest(ticker=ticker, start=lo, end=hi)
+        jobs = [job for due in due_by_window.values() for job in _fetch_jobs(due, sources)]
+        pending_chunks = sum(len(due) for due in due_by_window.values())
+        _write_refresh_log(
+            status="STARTED",
+            detail=f"backfill tickers={len(sources)} chunks={pending_chunks + resumed} resumed={resumed}",
+            revision_id=revision_id,
+        )
+        _write_refresh_logs(
+            [{"status": "FAILED", "ticker": t, "detail": "backfill: unknown instrument", "revision_id": revision_id} for t in unknown]
+        )
+
+        loaded: set[str] = set()
+        failed_chunks: list[str] = []
+        totals = UpsertResult()
+        pending: list[_Fetched] = []
+        pending_rows = 0
+        done = 0
+
+        def fetch_stage(job, emit) -> None:
+            provider, requests = job
+            emit(_fetch_raw(provider, requests))
+
+        def parse_stage(raw: _Raw, emit) -> None:
+            for item in _parse_raw(raw, revision_id=revision_id):
+                emit(item)
+
+        def write_stage(item: _Fetched, emit) -> None:
+            nonlocal pending_rows, done
+            if item.error is not None:
+                _record_checkpoints([_checkpoint(item, STATUS_FAILED, chunk_days=chunk_days, error=item.error)])
+                failed_chunks.append(f"{item.ticker}@{item.start}")
+                done += 1
+                return
+            pending.append(item)
+            pending_rows += len(item.models)
+            if pending_rows >= BACKFILL_WRITE_ROWS:
+                flush_writes(emit)
+
+        def flush_writes(emit) -> None:
+            nonlocal totals, pending, pending_rows, done
+            if not pending:
+                return
+            result = _write_backfill_batch(pending, revision_id=revision_id, chunk_days=chunk_days)
+            if result is None:
+                failed_chunks.extend(f"{item.ticker}@{item.start}" for item in pending)
+            else:
+                loaded.update(item.ticker for item in pending if item.models)
+                totals = UpsertResult(inserted=totals.inserted + result.inserted, updated=totals.updated + result.updated)
+            done += len(pending)
+            pending, pending_rows = [], 0
+
+        queue_size = max(2, 2 * max_workers)
+        pipeline = (
+            Pipeline()
+            .add("fetch", fetch_stage, workers=max_workers, maxsize=queue_size)
+            .add("parse", parse_stage, maxsize=queue_size)
+            .add("write", write_stage, maxsize=queue_size, flush=flush_writes)
+        )
+        total = max(pending_chunks, 1)
+        pipeline.run(
+            jobs,
+            on_tick=lambda p: report(min(99, int(done * 100 / total)), f"chunks {done}/{pending_chunks} | {p.describe()}"),
+        )
+
+        detail = (
+            f"backfill revision_id={revision_id} tickers={len(sources)} chunks={pending_chunks} "
+            f"resumed={resumed} failed={len(failed_chunks)} inserted={totals.inserted} rows_updated={totals.updated}"
+        )
+        if failed_chunks:
+            detail += "\nfailed: " + "; ".join(failed_chunks[:MAX_FAILED_SAMPLES])
+        _write_refresh_log(
+            status="FINISHED",
+            detail=detail,
+            revision_id=revision_id,
+            rows_inserted=totals.inserted,
+            rows_changed=totals.updated,
+        )
+        _emit_prices_updated(tickers=sorted(loaded), revision_id=revision_id)
+        if failed_chunks:
+            # Fail the task so it is visibly incomplete; a rerun resumes from the checkpoints.
+            raise RuntimeError(f"{len(failed_chunks)} of {pending_chunks} backfill chunks failed; rerun to resume")
+        return detail
+
+    TaskLifecycle(task_id).run(worker=_worker)
+
+
+def _load_import_chunk(rows: list[PriceDailyCreate], *, source: str) -> UpsertResult:
+    """COPY one import chunk into ``prices_daily`` in its own transaction."""
+    if not rows:
+        return UpsertResult()
+    with session_scope() as session:
+        InstrumentsRepo(session).ensure_many({row.ticker for row in rows}, source=source)
+        return PricesRepo(session).copy_upsert(rows)
+
+
+@shared_task(
+    name="quantsentinel.infra.tasks.tasks_ingest.import_prices_file",
+    bind=True,
+    ignore_result=True,
+)
+def import_prices_file(
+    self,
+    task_id: str | None = None,
+    *,
+    path: str,
+    source: str = "csv",
+    ticker: str | None = None,
+    chunk_rows: int | None = None,
+) -> None:
+    """
+    Bulk-load a vendor CSV/Parquet dump into ``prices_daily`` under one revision id.
+
+    The file is streamed in chunks (infra/providers/csv_import.py), so memory does
+    not grow with file size. Each chunk is COPY-merged in its own transaction;
+    re-running after a failure is safe because the merge is an upsert. Unknown
+    tickers get a minimal ``instruments`` row. Rejected rows are counted and a
+    sample is written to the refresh log.
+    """
+    from quantsentinel.infra.providers.csv_import import CHUNK_ROWS, ImportStats, read_price_file
+    from quantsentinel.infra.tasks.lifecycle import TaskLifecycle
+
+    def _worker(report):
+        revision_id = uuid.uuid4()
+        name = Path(path).name
+        _write_refresh_log(status="STARTED", detail=f"import {name}", revision_id=revision_id)
+        stats = ImportStats()
+        for chunk in read_price_file(
+            path, revision_id=revision_id, source=source, ticker=ticker, chunk_rows=chunk_rows or CHUNK_ROWS
+        ):
+            stats.add(chunk, _load_import_chunk(chunk.rows, source=source))
+            report(
+                min(99, max(1, int(chunk.progress * 100))),
+                f"chunk {stats.chunks}: loaded={stats.rows_loaded} rejected={stats.rows_rejected}",
+            )
+
+        detail = (
+            f"import {name}: revision_id={revision_id} rows={stats.rows_read} loaded={stats.rows_loaded} "
+            f"rejected={stats.rows_rejected} inserted={stats.inserted} updated={stats.updated} "
+            f"tickers={len(stats.tickers)}"
+        )
+        if stats.reject_samples:
+            detail += "\nrejected: " + "; ".join(stats.reject_samples)
+        _write_refresh_log(status="FINISHED", detail=detail, revision_id=revision_id)
+        _emit_prices_updated(tickers=sorted(stats.tickers), revision_id=revision_id)
+        return detail.split("\n", 1)[0]
+
     TaskLifecycle(task_id).run(worker=_worker)
 
 
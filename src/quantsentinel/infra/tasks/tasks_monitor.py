@@ -5,13 +5,39 @@ Strict layering:
 - Celery task = thin entrypoint
 - Core logic delegated to services (AlertsService, TaskService)
 - No Streamlit imports
+
+Sharding:
+- run_alert_monitor plans cost-balanced shards via AlertsService.plan_monitor_shards
+- one shard runs inline; several fan out as a chord of run_rules_batch tasks
+- summarize_rules_batches aggregates shard results and completes the DB Task
+
+Event trigger:
+- ingest tasks send PRICES_UPDATED_TASK with the affected tickers + revision id
+- on_prices_updated evaluates only rules scoping those tickers
 """
 
 from __future__ import annotations
 
-from celery import shared_task
+from typing import Any
+
+from celery import chord, shared_task
+
+from quantsentinel.infra.tasks.lifecycle import Deferred, TaskLifecycle
 
-from quantsentinel.infra.tasks.lifecycle import TaskLifecycle
+PRICES_UPDATED_TASK = "quantsentinel.infra.tasks.tasks_monitor.on_prices_updated"
+
+
+def _format_cycle_detail(result: dict[str, Any]) -> str:
+    detail = (
+        f"rules={result.get('rules_evaluated', 0)}, "
+        f"created={result.get('events_created', 0)}, "
+        f"deduped={result.get('events_deduped', 0)}, "
+        f"silenced={result.get('events_silenced', 0)}"
+    )
+    profile = result.get("profile") or {}
+    if profile:
+        detail += f", ms={profile.get('total_ms', 0):.0f}, queries={profile.get('queries', 0)}"
+    return detail
 
 
 @shared_task(
@@ -19,28 +45,70 @@ from quantsentinel.infra.tasks.lifecycle import TaskLifecycle
     bind=True,
     ignore_result=True,
 )
-def run_alert_monitor(self, task_id: str | None = None) -> None:
+def run_alert_monitor(self, task_id: str | None = None, *, max_shards: int = 8) -> None:
     """
     Periodic alert monitor runner.
 
     Behavior:
     - If task_id is provided (UUID string), updates DB Task progress/status.
     - If task_id is None (beat-run), runs without Task tracking.
+    - When the rule set needs more than one shard, dispatches run_rules_batch
+      tasks in parallel and leaves completion to summarize_rules_batches.
     """
 
     def _worker(report):
-        report(10, "starting monitor cycle")
-
         from quantsentinel.services.alerts_service import AlertsService
 
         alerts = AlertsService()
-        result = alerts.run_monitor_cycle(actor_id=None, task_id=None)
-        detail = (
-            f"rules={result.get('rules_evaluated', 0)}, "
-            f"created={result.get('events_created', 0)}, "
-            f"deduped={result.get('events_deduped', 0)}, "
-            f"silenced={result.get('events_silenced', 0)}"
+        report(5, "planning monitor shards")
+        plan = alerts.plan_monitor_shards(max_shards=max_shards)
+
+        if len(plan.shards) <= 1:
+            report(10, "starting monitor cycle")
+            result = alerts.run_monitor_cycle(actor_id=None, task_id=None)
+            detail = _format_cycle_detail(result)
+            report(95, detail)
+            return detail
+
+        header = [
+            run_rules_batch.s(batch_name=f"shard-{idx}/{len(plan.shards)}", items=shard)
+            for idx, shard in enumerate(plan.shards, start=1)
+        ]
+        body = summarize_rules_batches.s(task_id=task_id, plan=plan.to_dict())
+        body.link_error(on_rules_batch_error.s(task_id=task_id))
+        chord(header)(body)
+        return Deferred(
+            detail=f"dispatched {len(plan.shards)} shards (rules={plan.rules}, cost={plan.total_cost:.0f})",
+            progress=20,
         )
+
+    TaskLifecycle(task_id).run(worker=_worker)
+
+
+@shared_task(
+    name=PRICES_UPDATED_TASK,
+    bind=True,
+    ignore_result=True,
+)
+def on_prices_updated(
+    self,
+    task_id: str | None = None,
+    *,
+    tickers: list[str],
+    revision_id: str | None = None,
+) -> None:
+    """
+    "Prices updated" signal handler emitted by ingest tasks after commit.
+
+    Evaluates only the alert rules whose scope includes the updated tickers.
+    """
+
+    def _worker(report):
+        from quantsentinel.services.alerts_service import AlertsService
+
+        report(10, f"prices updated: tickers={len(tickers)} revision_id={revision_id}")
+        result = AlertsService().run_monitor_for_tickers(tickers=tickers, revision_id=revision_id)
+        detail = _format_cycle_detail(result)
         report(95, detail)
         return detail
 
@@ -50,15 +118,65 @@ def run_alert_monitor(self, task_id: str | None = None) -> None:
 @shared_task(
     name="quantsentinel.infra.tasks.tasks_monitor.run_rules_batch",
     bind=True,
-    ignore_result=True,
 )
-def run_rules_batch(self, task_id: str | None = None, *, batch_name: str = "default") -> None:
+def run_rules_batch(
+    self,
+    task_id: str | None = None,
+    *,
+    batch_name: str = "default",
+    items: list[dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """
+    Evaluate one shard of rule x ticker items.
+
+    Returns the shard's MonitorCycleResult dict so a chord callback can sum totals.
+    """
+
     def _worker(report):
         if not batch_name.strip():
             raise ValueError("batch_name is required")
-        report(20, f"loading rules batch={batch_name}")
-        report(65, "evaluating rules")
-        report(90, "writing alert events")
-        return f"rules batch completed: {batch_name}"
 
-    TaskLifecycle(task_id).run(worker=_worker)
+        from quantsentinel.services.alerts_service import AlertsService
+
+        report(20, f"evaluating rules batch={batch_name} items={len(items or [])}")
+        result = AlertsService().run_rules_batch(items=list(items or []))
+        report(90, _format_cycle_detail(result))
+        return result
+
+    result = TaskLifecycle(task_id).run(
+        worker=_worker,
+        success_detail=f"rules batch completed: {batch_name}",
+    )
+    return {**result, "batch_name": batch_name}
+
+
+@shared_task(
+    name="quantsentinel.infra.tasks.tasks_monitor.summarize_rules_batches",
+    bind=True,
+    ignore_result=True,
+)
+def summarize_rules_batches(
+    self,
+    results: list[dict[str, Any]],
+    task_id: str | None = None,
+    *,
+    plan: dict[str, Any] | None = None,
+) -> None:
+    """Chord callback: aggregate shard totals and finish the parent monitor Task."""
+
+    def _worker(report):
+        from quantsentinel.services.alerts_service import AlertsService
+
+        summary = AlertsService().summarize_monitor_shards(results=list(results or []), plan=plan or {})
+        return f"{_format_cycle_detail(summary)}, shards={len(results or [])}"
+
+    TaskLifecycle(task_id).run(worker=_worker, resume=True)
+
+
+@shared_task(
+    name="quantsentinel.infra.tasks.tasks_monitor.on_rules_batch_error",
+    ignore_result=True,
+)
+def on_rules_batch_error(request, exc, traceback, task_id: str | None = None) -> None:
+    """Chord error callback: a shard failed, so the parent Task is marked failed."""
+    TaskLifecycle(task_id).fail(f"rules batch failed: {exc}")
@@ -10,6 +10,8 @@ from typing import Any
 
 from celery import shared_task
 
+from quantsentinel.common.config import get_settings
+from quantsentinel.infra.artifacts.snapshot_export import export_price_lake as _export_price_lake
 from quantsentinel.infra.db.engine import session_scope
 from quantsentinel.infra.db.repos.audit_repo import AuditEntryCreate, AuditRepo
 from quantsentinel.infra.tasks.lifecycle import TaskLifecycle
@@ -89,6 +91,29 @@ def export_snapshot(
     TaskLifecycle(task_id).run(worker=_worker)
 
 
+@shared_task(
+    name="quantsentinel.infra.tasks.tasks_snapshot.export_price_lake",
+    bind=True,
+    ignore_result=True,
+)
+def export_price_lake(self, task_id: str | None = None, *, buckets: int = 16) -> None:
+    def _worker(report):
+        root = get_settings().price_lake_dir
+        report(10, f"exporting prices_daily to {root}")
+        manifest = _export_price_lake(
+            root,
+            buckets=buckets,
+            on_batch=lambda rows: report(50, f"exported {rows} rows"),
+        )
+        report(95, f"published lake revision {manifest.revision}")
+        return (
+            f"price lake exported: revision={manifest.revision}, "
+            f"rows={manifest.rows}, parts={len(manifest.partitions)}"
+        )
+
+    TaskLifecycle(task_id).run(worker=_worker)
+
+
 def _snapshot_context(*, workspace: str, ticker: str, as_of_date: str | None, language: str) -> dict[str, str]:
     return {
         "workspace": workspace.strip() or "market",
@@ -1,33 +1,89 @@
 from __future__ import annotations
 
-import statistics
 import uuid
-from dataclasses import dataclass
-from datetime import UTC, datetime, timedelta
+from collections.abc import Callable, Collection, Sequence
+from dataclasses import dataclass, field, replace
+from datetime import UTC, date, datetime, timedelta
+from functools import partial
 from typing import Any, ClassVar
 
-from quantsentinel.domain.alerts.expression import evaluate
+from quantsentinel.domain.alerts.evaluator import (
+    FeatureCache,
+    RuleSpec,
+    benchmark_tickers,
+    evaluate_rule,
+    required_history,
+)
 from quantsentinel.domain.alerts.governance import (
     resolve_aggregation_key,
     should_dedup,
     should_silence,
 )
 from quantsentinel.domain.alerts.models import GovernancePolicy
-from quantsentinel.infra.db.engine import session_scope
+from quantsentinel.domain.alerts.profiling import CycleProfile, merge_profiles
+from quantsentinel.domain.alerts.replay import run_replay
+from quantsentinel.domain.alerts.sharding import (
+    ShardItem,
+    partition_by_cost,
+    shard_count,
+    split_rule,
+)
+from quantsentinel.domain.market.correlation import RollingCorrelations
+from quantsentinel.domain.market.models import PriceSeries
+from quantsentinel.infra.cache.price_cache import get_price_cache
+from quantsentinel.infra.db.engine import count_queries, session_scope
 from quantsentinel.infra.db.models import AlertEventStatus, AlertRule, UserRole
 from quantsentinel.infra.db.repos.alerts_repo import AlertRuleCreate, AlertRuleUpdate, AlertsRepo
 from quantsentinel.infra.db.repos.audit_repo import AuditEntryCreate, AuditRepo
-from quantsentinel.infra.db.repos.events_repo import EventsRepo
+from quantsentinel.infra.db.repos.events_repo import AlertEventCreate, EventsRepo
 from quantsentinel.infra.db.repos.instruments_repo import InstrumentsRepo
 from quantsentinel.infra.db.repos.prices_repo import PricesRepo
 from quantsentinel.services.rbac_service import AuditActionType, RBACService
 from quantsentinel.services.task_service import TaskService
 
+# Target estimated cost per monitor shard (see domain.alerts.sharding.RULE_TYPE_COSTS).
+MONITOR_SHARD_TARGET_COST = 2000.0
+
+# Per-process correlation_break state. Full sweeps reseed it from their panel;
+# "prices updated" cycles only shift in the bars that arrived since.
+_CORRELATIONS = RollingCorrelations()
+
 
 def _now() -> datetime:
     return datetime.now(UTC)
 
 
+@dataclass(frozen=True)
+class _PendingHit:
+    rule_id: uuid.UUID
+    ticker: str
+    message: str
+    context: dict[str, Any]
+    asof_date: Any | None
+
+
+@dataclass(frozen=True)
+class _Assignment:
+    rule: AlertRule
+    policy: GovernancePolicy
+    tickers: list[str]
+
+
+@dataclass
+class _HitBuffer:
+    """Hits collected during a cycle, written in one go at the end."""
+
+    hits: list[_PendingHit] = field(default_factory=list)
+    keys: set[tuple[Any, str]] = field(default_factory=set)
+
+    def add(self, hit: _PendingHit) -> None:
+        self.hits.append(hit)
+        self.keys.add((hit.rule_id, hit.ticker))
+
+    def has(self, *, rule_id: Any, ticker: str) -> bool:
+        return (rule_id, ticker) in self.keys
+
+
 @dataclass(frozen=True)
 class MonitorCycleResult:
     rules_evaluated: int
@@ -35,6 +91,7 @@ class MonitorCycleResult:
     events_deduped: int
     events_silenced: int
     detail: str | None = None
+    profile: dict[str, Any] | None = None
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -43,6 +100,25 @@ class MonitorCycleResult:
             "events_deduped": self.events_deduped,
             "events_silenced": self.events_silenced,
             "detail": self.detail,
+            "profile": self.profile,
+        }
+
+
+@dataclass(frozen=True)
+class MonitorShardPlan:
+    shards: list[list[dict[str, Any]]]
+    rules: int
+    watched: int
+    rules_silenced: int
+    total_cost: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "shards": len(self.shards),
+            "rules": self.rules,
+            "watched": self.watched,
+            "rules_silenced": self.rules_silenced,
+            "total_cost": self.total_cost,
         }
 
 
@@ -86,6 +162,44 @@ class AlertsService:
         with session_scope() as session:
             return EventsRepo(session).list_recent(limit=limit)
 
+    def event_rollups(self, *, days: int = 30, top: int = 10) -> dict[str, Any]:
+        """
+        Event counts over the last ``days`` UTC days from the rollup table.
+
+        Returns ``by_day``, ``by_rule``, ``by_ticker`` and ``by_severity`` lists of
+        dicts with ``new``/``acked``/``total`` counts; rules and tickers are the
+        ``top`` busiest, and ``totals`` sums the daily buckets.
+        """
+        since = _now().date() - timedelta(days=max(days, 1) - 1)
+
+        def _counts(new: Any, acked: Any) -> dict[str, int]:
+            return {"new": int(new or 0), "acked": int(acked or 0), "total": int(new or 0) + int(acked or 0)}
+
+        with session_scope() as session:
+            repo = EventsRepo(session)
+            by_day = [{"day": day, **_counts(new, acked)} for day, new, acked in repo.rollup_counts(group_by="day", since=since)]
+            by_rule = [
+                {"rule_id": str(rule_id), "name": name, "severity": severity, **_counts(new, acked)}
+                for rule_id, name, severity, new, acked in repo.rollup_counts(group_by="rule", since=since, limit=top)
+            ]
+            by_ticker = [
+                {"ticker": ticker, **_counts(new, acked)}
+                for ticker, new, acked in repo.rollup_counts(group_by="ticker", since=since, limit=top)
+            ]
+            by_severity = [
+                {"severity": severity, **_counts(new, acked)}
+                for severity, new, acked in repo.rollup_counts(group_by="severity", since=since)
+            ]
+        totals = {key: sum(row[key] for row in by_day) for key in ("new", "acked", "total")}
+        return {
+            "since": since,
+            "totals": totals,
+            "by_day": by_day,
+            "by_rule": by_rule,
+            "by_ticker": by_ticker,
+            "by_severity": by_severity,
+        }
+
     def create_rule(self, *, actor_id: uuid.UUID | None, payload: AlertRuleCreate, actor_role: UserRole | None = None) -> uuid.UUID:
         RBACService.ensure_workspace_mutation_allowed(role=actor_role, workspace="Monitor", action=AuditActionType.CREATE)
         self._validate_rule_payload(payload.rule_type, payload.params_json or {})
@@ -155,6 +269,17 @@ class AlertsService:
                 payload={"silenced_until": until.isoformat()},
             )
 
+    def list_cycle_profiles(self, *, limit: int = 20) -> list[dict[str, Any]]:
+        """Most recent monitor cycle profiles (newest first) from the ``alert_rule_run`` audit trail."""
+        with session_scope() as session:
+            rows = AuditRepo(session).list_by_action("alert_rule_run", limit=limit)
+            out: list[dict[str, Any]] = []
+            for row in rows:
+                payload = row.payload_json or {}
+                if payload.get("profile"):
+                    out.append({"ts": row.ts, "trigger": payload.get("trigger", "schedule"), **payload["profile"]})
+            return out
+
     def ack_event(self, *, event_id: uuid.UUID, actor_id: uuid.UUID | None = None, actor_role: UserRole | None = None) -> None:
         RBACService.ensure_workspace_mutation_allowed(role=actor_role, workspace="Monitor", action=AuditActionType.ACK)
         actor = actor_id or uuid.UUID("00000000-0000-0000-0000-000000000000")
@@ -169,71 +294,403 @@ class AlertsService:
                 payload={},
             )
 
-    def run_monitor_cycle(self, *, actor_id: uuid.UUID | None, task_id: uuid.UUID | None) -> dict[str, Any]:
+    def run_monitor_cycle(
+        self,
+        *,
+        actor_id: uuid.UUID | None,
+        task_id: uuid.UUID | None,
+        tickers: Collection[str] | None = None,
+        revision_id: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Evaluate enabled rules and create alert events.
+
+        With ``tickers`` the cycle is restricted to rules whose scope touches those
+        tickers (a "prices updated" trigger); rules whose correlation benchmark was
+        updated are re-evaluated over their full scope.
+        """
         task_svc = TaskService()
         started = _now()
         if task_id is not None:
             task_svc.set_progress(task_id=task_id, progress=5, detail="loading rules")
+        updated = None if tickers is None else {str(t).strip() for t in tickers if str(t).strip()}
 
-        with session_scope() as session:
+        with session_scope() as session, count_queries(session) as queries:
+            profile = CycleProfile(query_count=queries)
             alerts_repo = AlertsRepo(session)
             events_repo = EventsRepo(session)
             inst_repo = InstrumentsRepo(session)
             prices_repo = PricesRepo(session)
             audit_repo = AuditRepo(session)
-            rules = alerts_repo.list_enabled_rules()
-            watched = inst_repo.list_watched()
-
-            rules_evaluated = created = deduped = silenced = 0
-            for idx, rule in enumerate(rules, start=1):
+            with profile.stage("load_rules"):
+                rules = alerts_repo.list_enabled_rules()
+                watched = inst_repo.list_watched()
+
+            rules_evaluated = silenced = 0
+            assignments: list[_Assignment] = []
+            for rule in rules:
+                scope = self._resolve_scope_tickers(rule=rule, watched=[i.ticker for i in watched])
+                if updated is not None:
+                    scope = self._affected_scope(rule=rule, scope=scope, updated=updated)
+                    if not scope:
+                        continue
                 rules_evaluated += 1
-                policy = GovernancePolicy(
-                    dedup_minutes=int((rule.params_json or {}).get("dedup_minutes", 60)),
-                    aggregation_key=(rule.params_json or {}).get("aggregation_key"),
-                    silenced_until=rule.silenced_until,
-                )
+                policy = self._governance_policy(rule)
                 if should_silence(policy=policy, now=started):
                     silenced += 1
                     continue
-                tickers = self._resolve_scope_tickers(rule=rule, watched=[i.ticker for i in watched])
-                for ticker in tickers:
-                    if self._is_deduped(rule=rule, ticker=ticker, events_repo=events_repo, policy=policy):
-                        deduped += 1
-                        continue
-                    for hit in self._evaluate_rule(rule=rule, ticker=ticker, prices_repo=prices_repo):
-                        agg_key = resolve_aggregation_key(policy=policy, ticker=ticker)
-                        events_repo.create_event(
-                            rule_id=rule.id,
-                            ticker=agg_key,
-                            message=hit["message"],
-                            context=hit.get("context", {}),
-                            asof_date=hit.get("asof_date"),
-                            status=AlertEventStatus.NEW,
-                            ack_by=None,
-                        )
-                        created += 1
-                if task_id is not None:
-                    prog = 15 + int((idx / max(len(rules), 1)) * 75)
-                    task_svc.set_progress(task_id=task_id, progress=prog, detail=f"evaluated {idx}/{len(rules)} rules")
+                assignments.append(_Assignment(rule=rule, policy=policy, tickers=scope))
 
+            def _on_rule_done(idx: int, total: int) -> None:
+                if task_id is not None:
+                    prog = 15 + int((idx / max(total, 1)) * 75)
+                    task_svc.set_progress(task_id=task_id, progress=prog, detail=f"evaluated {idx}/{total} rules")
+
+            pending, deduped = self._evaluate_assignments(
+                assignments=assignments,
+                events_repo=events_repo,
+                prices_repo=prices_repo,
+                on_rule_done=_on_rule_done,
+                profile=profile,
+                incremental=updated is not None,
+            )
+            with profile.stage("write_events"):
+                created = len(self._write_hits(events_repo=events_repo, pending=pending))
+
+            payload: dict[str, Any] = {
+                "rules": len(rules),
+                "watched": len(watched),
+                "rules_evaluated": rules_evaluated,
+                "events_created": created,
+                "events_deduped": deduped,
+                "events_silenced": silenced,
+                "ts": started.isoformat(),
+            }
+            if updated is not None:
+                payload.update({"trigger": "prices_updated", "tickers": len(updated), "revision_id": revision_id})
+            cycle_profile = profile.to_dict()
+            payload["profile"] = cycle_profile
             self._write_audit(
                 audit_repo=audit_repo,
                 action="alert_rule_run",
                 entity_type="alerts",
                 entity_id=None,
                 actor_id=actor_id,
+                payload=payload,
+            )
+
+        return MonitorCycleResult(rules_evaluated, created, deduped, silenced, profile=cycle_profile).to_dict()
+
+    def run_monitor_for_tickers(self, *, tickers: Collection[str], revision_id: str | None = None) -> dict[str, Any]:
+        """Evaluate only the rules affected by freshly ingested prices for ``tickers``."""
+        if not tickers:
+            return MonitorCycleResult(0, 0, 0, 0, detail="no tickers").to_dict()
+        return self.run_monitor_cycle(actor_id=None, task_id=None, tickers=tickers, revision_id=revision_id)
+
+    # -----------------------------
+    # Sharded monitor cycle
+    # -----------------------------
+
+    def plan_monitor_shards(
+        self,
+        *,
+        max_shards: int = 8,
+        target_cost: float = MONITOR_SHARD_TARGET_COST,
+    ) -> MonitorShardPlan:
+        """
+        Partition enabled, non-silenced rules into cost-balanced shards.
+
+        Rules with large scopes are split into rule x ticker chunks so no single
+        item dominates a shard; rules with an aggregation key stay whole so their
+        in-cycle dedup remains local to one worker.
+        """
+        now = _now()
+        with session_scope() as session:
+            rules = AlertsRepo(session).list_enabled_rules()
+            watched = [i.ticker for i in InstrumentsRepo(session).list_watched()]
+
+        items: list[ShardItem] = []
+        silenced = 0
+        for rule in rules:
+            policy = self._governance_policy(rule)
+            if should_silence(policy=policy, now=now):
+                silenced += 1
+                continue
+            tickers = self._resolve_scope_tickers(rule=rule, watched=watched)
+            items.extend(
+                split_rule(
+                    rule_id=str(rule.id),
+                    rule_type=rule.rule_type,
+                    tickers=tickers,
+                    max_cost=float("inf") if policy.aggregation_key else target_cost,
+                )
+            )
+
+        total_cost = sum(item.cost for item in items)
+        n_shards = shard_count(total_cost=total_cost, target_cost=target_cost, max_shards=max_shards)
+        shards = [[item.to_dict() for item in shard] for shard in partition_by_cost(items, max_shards=n_shards)]
+        return MonitorShardPlan(
+            shards=shards,
+            rules=len(rules),
+            watched=len(watched),
+            rules_silenced=silenced,
+            total_cost=total_cost,
+        )
+
+    def run_rules_batch(self, *, items: list[dict[str, Any]]) -> dict[str, Any]:
+        """
+        Evaluate one shard of rule x ticker items and write its hits in bulk.
+
+        Each item is ``{"rule_id": str, "tickers": [str, ...]}`` as produced by
+        ``plan_monitor_shards``. Rules disabled or silenced since planning are skipped
+        and listed under ``silenced_rule_ids`` so the summary counts each rule once.
+        """
+        started = _now()
+        by_rule: dict[str, list[str]] = {}
+        for item in items:
+            by_rule.setdefault(str(item["rule_id"]), []).extend(str(t) for t in item.get("tickers") or [])
+        if not by_rule:
+            return MonitorCycleResult(0, 0, 0, 0).to_dict()
+
+        with session_scope() as session, count_queries(session) as queries:
+            profile = CycleProfile(query_count=queries)
+            events_repo = EventsRepo(session)
+            prices_repo = PricesRepo(session)
+            with profile.stage("load_rules"):
+                rules = AlertsRepo(session).list_rules_by_ids([uuid.UUID(rid) for rid in by_rule])
+
+            rules_evaluated = 0
+            silenced_ids: list[str] = []
+            assignments: list[_Assignment] = []
+            for rule in rules:
+                if not rule.enabled:
+                    continue
+                rules_evaluated += 1
+                policy = self._governance_policy(rule)
+                if should_silence(policy=policy, now=started):
+                    silenced_ids.append(str(rule.id))
+                    continue
+                assignments.append(_Assignment(rule=rule, policy=policy, tickers=by_rule.get(str(rule.id), [])))
+            pending, deduped = self._evaluate_assignments(
+                assignments=assignments,
+                events_repo=events_repo,
+                prices_repo=prices_repo,
+                profile=profile,
+            )
+            with profile.stage("write_events"):
+                created = len(self._write_hits(events_repo=events_repo, pending=pending))
+            shard_profile = profile.to_dict()
+
+        result = MonitorCycleResult(rules_evaluated, created, deduped, len(silenced_ids), profile=shard_profile)
+        return {**result.to_dict(), "silenced_rule_ids": sorted(silenced_ids)}
+
+    def summarize_monitor_shards(
+        self,
+        *,
+        results: list[dict[str, Any]],
+        plan: dict[str, Any],
+        actor_id: uuid.UUID | None = None,
+    ) -> dict[str, Any]:
+        """Aggregate shard results into one cycle result and write the cycle audit entry."""
+        created = sum(int(r.get("events_created", 0)) for r in results)
+        deduped = sum(int(r.get("events_deduped", 0)) for r in results)
+        # A rule split over several shards is reported by each of them; count it once.
+        silenced_ids = {rid for r in results for rid in r.get("silenced_rule_ids") or ()}
+        silenced = int(plan.get("rules_silenced", 0)) + len(silenced_ids)
+        rules = int(plan.get("rules", 0))
+        profile = merge_profiles(r.get("profile") for r in results)
+        result = MonitorCycleResult(
+            rules_evaluated=rules,
+            events_created=created,
+            events_deduped=deduped,
+            events_silenced=silenced,
+            detail=f"shards={len(results)}",
+            profile=profile,
+        )
+        with session_scope() as session:
+            self._write_audit(
+                audit_repo=AuditRepo(session),
+                action="alert_rule_run",
+                entity_type="alerts",
+                entity_id=None,
+                actor_id=actor_id,
                 payload={
-                    "rules": len(rules),
-                    "watched": len(watched),
-                    "rules_evaluated": rules_evaluated,
+                    "rules": rules,
+                    "watched": int(plan.get("watched", 0)),
+                    "shards": len(results),
+                    "rules_evaluated": rules,
                     "events_created": created,
                     "events_deduped": deduped,
                     "events_silenced": silenced,
-                    "ts": started.isoformat(),
+                    "ts": _now().isoformat(),
+                    "profile": profile,
                 },
             )
+        return result.to_dict()
+
+    # -----------------------------
+    # Historical replay
+    # -----------------------------
 
-        return MonitorCycleResult(rules_evaluated, created, deduped, silenced).to_dict()
+    def replay_rule(
+        self,
+        *,
+        rule_id: uuid.UUID,
+        start: date,
+        end: date | None = None,
+        tickers: list[str] | None = None,
+        silence_windows: Sequence[tuple[datetime, datetime]] = (),
+    ) -> dict[str, Any]:
+        """
+        Replay a rule (enabled or not) over ``[start, end]`` and report how often it would have fired.
+
+        Read-only: no alert events or audit entries are written. Scope resolves as in the
+        monitor unless ``tickers`` overrides it. The rule's current ``silenced_until`` is
+        ignored; pass ``silence_windows`` to model silences in the past.
+        """
+        end = end or datetime.now().date()
+        if start > end:
+            raise ValueError("start must be on or before end")
+
+        with session_scope() as session:
+            rule = AlertsRepo(session).get_rule(rule_id)
+            if rule is None:
+                raise ValueError("Rule not found")
+            self._validate_rule_payload(rule.rule_type, rule.params_json or {})
+            if tickers is None:
+                watched = [i.ticker for i in InstrumentsRepo(session).list_watched()]
+                tickers = self._resolve_scope_tickers(rule=rule, watched=watched)
+            spec = RuleSpec.from_rule(rule, tickers)
+            policy = replace(self._governance_policy(rule), silenced_until=None)
+            # Calendar-day warmup so rolling windows are full on the first replayed bar.
+            warmup = timedelta(days=2 * required_history(spec.rule_type, spec.params) + 7)
+            arrays = self._close_arrays(
+                PricesRepo(session),
+                [*spec.tickers, *benchmark_tickers([spec])],
+                start=start - warmup,
+                end=end,
+            )
+            panel = {ticker: PriceSeries(ticker=ticker, dates=dates, closes=closes) for ticker, (dates, closes) in arrays.items()}
+
+        result = run_replay(spec, panel, start=start, end=end, policy=policy, silence_windows=silence_windows)
+        return {"rule_id": str(rule_id), "start": start.isoformat(), "end": end.isoformat(), **result.to_dict()}
+
+    # -----------------------------
+    # Evaluation helpers
+    # -----------------------------
+
+    @staticmethod
+    def _governance_policy(rule: AlertRule) -> GovernancePolicy:
+        return GovernancePolicy(
+            dedup_minutes=int((rule.params_json or {}).get("dedup_minutes", 60)),
+            aggregation_key=(rule.params_json or {}).get("aggregation_key"),
+            silenced_until=rule.silenced_until,
+        )
+
+    def _evaluate_assignments(
+        self,
+        *,
+        assignments: list[_Assignment],
+        events_repo: EventsRepo,
+        prices_repo: PricesRepo,
+        on_rule_done: Callable[[int, int], None] | None = None,
+        profile: CycleProfile | None = None,
+        incremental: bool = False,
+    ) -> tuple[_HitBuffer, int]:
+        """
+        Dedup-screen every rule x ticker, load one shared price panel, then evaluate.
+
+        Correlations come from the process-wide rolling state: ``incremental`` cycles
+        shift in the panel's new bars, others reseed it from the panel.
+        Returns the buffered hits and the number of deduped rule x ticker pairs.
+        Later tickers that map to an aggregation key already hit in this cycle
+        count as deduped, matching the persisted-event dedup semantics.
+        """
+        profile = profile or CycleProfile()
+        deduped = 0
+        screened: list[tuple[_Assignment, RuleSpec]] = []
+        with profile.stage("dedup"):
+            for item in assignments:
+                keep: list[str] = []
+                for ticker in item.tickers:
+                    with profile.measure(item.rule, ticker, evaluation=False):
+                        is_dup = self._is_deduped(rule=item.rule, ticker=ticker, events_repo=events_repo, policy=item.policy)
+                    if is_dup:
+                        deduped += 1
+                    else:
+                        keep.append(ticker)
+                screened.append((item, RuleSpec.from_rule(item.rule, keep)))
+
+        with profile.stage("load_prices"):
+            panel = self._load_panel(prices_repo=prices_repo, specs=[spec for _, spec in screened])
+
+        features = FeatureCache(panel, correlate=partial(_CORRELATIONS.correlations, reseed=not incremental))
+        today = datetime.now().date()
+        pending = _HitBuffer()
+        with profile.stage("evaluate"):
+            for idx, (item, spec) in enumerate(screened, start=1):
+                for ticker in spec.tickers:
+                    agg_key = resolve_aggregation_key(policy=item.policy, ticker=ticker)
+                    if pending.has(rule_id=item.rule.id, ticker=agg_key):
+                        deduped += 1
+                        continue
+                    with profile.measure(item.rule, ticker, evaluation=True):
+                        hits = evaluate_rule(spec, ticker, features, today=today)
+                    for hit in hits:
+                        pending.add(
+                            _PendingHit(
+                                rule_id=item.rule.id,
+                                ticker=agg_key,
+                                message=hit.message,
+                                context=hit.context,
+                                asof_date=hit.asof_date,
+                            )
+                        )
+                if on_rule_done is not None:
+                    on_rule_done(idx, len(screened))
+        return pending, deduped
+
+    @staticmethod
+    def _close_arrays(prices_repo: PricesRepo, tickers: list[str], **bounds: Any) -> dict[str, Any]:
+        """Close arrays via the local price cache when one is configured, else straight from the DB."""
+        cache = get_price_cache()
+        if cache is None:
+            return prices_repo.get_close_arrays(tickers=tickers, **bounds)
+        return cache.read(prices_repo, tickers, **bounds)
+
+    @staticmethod
+    def _load_panel(*, prices_repo: PricesRepo, specs: list[RuleSpec]) -> dict[str, PriceSeries]:
+        """Load the most recent bars each ticker needs across all ``specs`` in one bulk read."""
+        depth: dict[str, int] = {}
+        for spec in specs:
+            if not spec.tickers:
+                continue
+            need = required_history(spec.rule_type, spec.params)
+            for ticker in (*spec.tickers, *benchmark_tickers([spec])):
+                depth[ticker] = max(depth.get(ticker, 0), need)
+        if not depth:
+            return {}
+        arrays = AlertsService._close_arrays(prices_repo, list(depth), days=depth)
+        return {ticker: PriceSeries(ticker=ticker, dates=dates, closes=closes) for ticker, (dates, closes) in arrays.items()}
+
+    @staticmethod
+    def _write_hits(*, events_repo: EventsRepo, pending: _HitBuffer) -> list[uuid.UUID]:
+        """Persist a cycle's hits in one bulk insert; returns the new event ids."""
+        if not pending.hits:
+            return []
+        return events_repo.create_events(
+            [
+                AlertEventCreate(
+                    rule_id=hit.rule_id,
+                    ticker=hit.ticker,
+                    message=hit.message,
+                    context=hit.context,
+                    asof_date=hit.asof_date,
+                    status=AlertEventStatus.NEW,
+                )
+                for hit in pending.hits
+            ]
+        )
 
     def _resolve_scope_tickers(self, *, rule: AlertRule, watched: list[str]) -> list[str]:
         scope = rule.scope_json or {}
@@ -247,6 +704,15 @@ class AlertsService:
         watched_set = set(watched)
         return [t for t in tickers if t in watched_set]
 
+    @staticmethod
+    def _affected_scope(*, rule: AlertRule, scope: list[str], updated: set[str]) -> list[str]:
+        """Subset of ``scope`` whose evaluation can change after ``updated`` tickers received data."""
+        if (rule.rule_type or "").strip() == "correlation_break":
+            benchmark = str((rule.params_json or {}).get("benchmark_ticker", "")).strip()
+            if benchmark and benchmark in updated:
+                return scope
+        return [t for t in scope if t in updated]
+
     def _is_deduped(self, *, rule: AlertRule, ticker: str, events_repo: EventsRepo, policy: GovernancePolicy) -> bool:
         return should_dedup(
             policy=policy,
@@ -262,86 +728,8 @@ class AlertsService:
             raise ValueError("custom_expression requires non-empty expression")
 
     def _evaluate_rule(self, *, rule: AlertRule, ticker: str, prices_repo: PricesRepo) -> list[dict[str, Any]]:
-        params = rule.params_json or {}
-        rtype = (rule.rule_type or "").strip()
-
-        if rtype == "threshold":
-            asof_date, last_close = prices_repo.get_latest_close(ticker=ticker)
-            threshold = float(params.get("value", 0))
-            op = str(params.get("operator", "<")).strip()
-            if asof_date is None or last_close is None:
-                return []
-            value = float(last_close)
-            if (op == "<" and value < threshold) or (op == ">" and value > threshold):
-                return [{"message": f"{ticker}: last close {value:.4f} {op} {threshold:.4f}", "context": {"last_close": value}, "asof_date": asof_date}]
-            return []
-
-        if rtype == "z_score":
-            lookback = int(params.get("lookback", 20))
-            threshold = float(params.get("threshold", 2.0))
-            mean, std = prices_repo.get_return_stats(ticker=ticker, lookback=lookback)
-            asof_date, pct = prices_repo.get_pct_change_over_days(ticker=ticker, days=1)
-            if mean is None or std in (None, 0) or pct is None:
-                return []
-            z = ((pct / 100.0) - mean) / std
-            if abs(z) >= threshold:
-                return [{"message": f"{ticker}: z-score {z:.2f} exceeds {threshold:.2f}", "context": {"z": z}, "asof_date": asof_date}]
-            return []
-
-        if rtype == "volatility":
-            lookback = int(params.get("lookback", 20))
-            threshold = float(params.get("threshold", 0.03))
-            asof_date, _ = prices_repo.get_latest_close(ticker=ticker)
-            _, std = prices_repo.get_return_stats(ticker=ticker, lookback=lookback)
-            if std is not None and std >= threshold:
-                return [{"message": f"{ticker}: volatility {std:.4f} >= {threshold:.4f}", "context": {"vol": std}, "asof_date": asof_date}]
-            return []
-
-        if rtype == "staleness":
-            max_days = int(params.get("max_days", 7))
-            latest = prices_repo.get_latest_price_date(ticker)
-            if latest is None or (datetime.now().date() - latest).days >= max_days:
-                return [{"message": f"{ticker}: stale data", "context": {"max_days": max_days}, "asof_date": latest}]
-            return []
-
-        if rtype == "missing_data":
-            lookback = int(params.get("lookback_days", 30))
-            min_points = int(params.get("min_points", lookback))
-            closes = prices_repo.get_recent_closes(ticker=ticker, days=lookback)
-            if len(closes) < min_points:
-                return [{"message": f"{ticker}: missing data points ({len(closes)}/{min_points})", "context": {}, "asof_date": closes[-1][0] if closes else None}]
-            return []
-
-        if rtype == "correlation_break":
-            benchmark = str(params.get("benchmark_ticker", ""))
-            lookback = int(params.get("lookback", 20))
-            threshold = float(params.get("min_corr", 0.2))
-            s1 = [v for _, v in prices_repo.get_recent_closes(ticker=ticker, days=lookback + 1)]
-            s2 = [v for _, v in prices_repo.get_recent_closes(ticker=benchmark, days=lookback + 1)]
-            if len(s1) < 3 or len(s2) < 3:
-                return []
-            n = min(len(s1), len(s2))
-            r1 = [(s1[i] / s1[i - 1]) - 1 for i in range(1, n) if s1[i - 1] != 0]
-            r2 = [(s2[i] / s2[i - 1]) - 1 for i in range(1, n) if s2[i - 1] != 0]
-            if len(r1) < 3 or len(r2) < 3:
-                return []
-            corr = statistics.correlation(r1[: len(r2)], r2[: len(r1)])
-            asof_date, _ = prices_repo.get_latest_close(ticker=ticker)
-            if corr <= threshold:
-                return [{"message": f"{ticker}: corr({benchmark})={corr:.3f} <= {threshold:.3f}", "context": {"correlation": corr}, "asof_date": asof_date}]
-            return []
-
-        if rtype == "custom_expression":
-            expr = str(params.get("expression", ""))
-            asof_date, close = prices_repo.get_latest_close(ticker=ticker)
-            _, ret_pct = prices_repo.get_pct_change_over_days(ticker=ticker, days=1)
-            mean, vol = prices_repo.get_return_stats(ticker=ticker, lookback=int(params.get("lookback", 20)))
-            ma20 = [x for _, x in prices_repo.get_recent_closes(ticker=ticker, days=20)]
-            ma60 = [x for _, x in prices_repo.get_recent_closes(ticker=ticker, days=60)]
-            ret = (ret_pct or 0.0) / 100.0
-            z = 0.0 if mean is None or vol in (None, 0) else (ret - mean) / vol
-            if evaluate(expr, {"close": float(close or 0), "ret": ret, "vol": float(vol or 0), "z": z, "ma20": statistics.mean(ma20) if ma20 else 0.0, "ma60": statistics.mean(ma60) if ma60 else 0.0}):
-                return [{"message": f"{ticker}: custom expression triggered", "context": {"expression": expr}, "asof_date": asof_date}]
-            return []
-
-        return []
+        """Evaluate one rule for one ticker (ad-hoc checks; cycles use ``_evaluate_assignments``)."""
+        spec = RuleSpec.from_rule(rule, [ticker])
+        panel = self._load_panel(prices_repo=prices_repo, specs=[spec])
+        hits = evaluate_rule(spec, ticker, FeatureCache(panel), today=datetime.now().date())
+        return [{"message": h.message, "context": h.context, "asof_date": h.asof_date} for h in hits]
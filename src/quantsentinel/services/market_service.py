@@ -9,7 +9,7 @@ Strict layering:
 
 from __future__ import annotations
 
-from datetime import date, datetime
+from datetime import UTC, date, datetime
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -25,10 +25,11 @@ from quantsentinel.infra.db.repos.instruments_repo import InstrumentsRepo
 from quantsentinel.infra.db.repos.prices_repo import PricesRepo
 from quantsentinel.infra.db.repos.tasks_repo import TasksRepo
 from quantsentinel.services.rbac_service import AuditActionType, RBACService
+from quantsentinel.services.task_service import TaskService
 
 
 def _now() -> datetime:
-    return datetime.now(datetime.UTC)
+    return datetime.now(UTC)
 
 
 class MarketService:
@@ -40,7 +41,14 @@ class MarketService:
     # Watchlist
     # -----------------------------
 
-    def add_to_watchlist(self, *, ticker: str, actor_id: uuid.UUID | None = None, actor_role: UserRole | None = None) -> None:
+    def add_to_watchlist(
+        self, *, ticker: str, actor_id: uuid.UUID | None = None, actor_role: UserRole | None = None
+    ) -> uuid.UUID | None:
+        """
+        Watch ``ticker``. A ticker without price history gets a background backfill
+        task (tasks_ingest.backfill_history), whose id is returned; while one for the
+        ticker is still queued or running, that task's id is returned instead.
+        """
         ticker = ticker.strip()
         if not ticker:
             raise ValueError("Ticker required.")
@@ -52,6 +60,12 @@ class MarketService:
 
             inst_repo.ensure_exists(ticker=ticker)
             inst_repo.set_watched(ticker=ticker, is_watched=True)
+            needs_backfill = PricesRepo(session).get_latest_price_date(ticker) is None
+            active = (
+                TasksRepo(session).find_active(task_type="backfill_history", celery_args={"tickers": [ticker]})
+                if needs_backfill
+                else None
+            )
 
             audit.write(
                 AuditEntryCreate(
@@ -64,6 +78,18 @@ class MarketService:
                 )
             )
 
+        if not needs_backfill or active is not None:
+            return active
+        # Queued after the commit so the worker sees the watched instrument.
+        return TaskService().queue(
+            task_type="backfill_history",
+            actor_id=actor_id,
+            celery_signature="quantsentinel.infra.tasks.tasks_ingest.backfill_history",
+            celery_args={"tickers": [ticker]},
+            actor_role=actor_role,
+            workspace="Market",
+        )
+
     def remove_from_watchlist(self, *, ticker: str, actor_id: uuid.UUID | None = None, actor_role: UserRole | None = None) -> None:
         RBACService.ensure_workspace_mutation_allowed(role=actor_role, workspace="Market", action=AuditActionType.DELETE)
         with session_scope() as session:
@@ -84,26 +110,21 @@ class MarketService:
             )
 
     def get_watchlist(self) -> list[dict[str, Any]]:
+        """Watched instruments with last close and change, from the ``instrument_latest`` summary."""
         with session_scope() as session:
-            inst_repo = InstrumentsRepo(session)
-            price_repo = PricesRepo(session)
-
-            instruments = inst_repo.list_watched()
+            rows = InstrumentsRepo(session).list_watched_with_latest()
 
             out: list[dict[str, Any]] = []
 
-            for inst in instruments:
-                last, prev = price_repo.get_latest_two_closes(inst.ticker)
-
-                chg = None
-                if last is not None and prev is not None:
-                    chg = float(last) - float(prev)
+            for inst, latest in rows:
+                last = None if latest is None or latest.last_close is None else float(latest.last_close)
+                chg = None if latest is None or latest.change is None else float(latest.change)
 
                 out.append(
                     {
                         "ticker": inst.ticker,
                         "name": inst.name,
-                        "last": None if last is None else float(last),
+                        "last": last,
                         "chg": chg,
                     }
                 )
@@ -178,15 +199,12 @@ class MarketService:
         STALE_DAYS = 7
 
         with session_scope() as session:
-            inst_repo = InstrumentsRepo(session)
-            price_repo = PricesRepo(session)
-
-            watched = inst_repo.list_watched()
+            watched = InstrumentsRepo(session).list_watched_with_latest()
 
             out: list[dict[str, Any]] = []
 
-            for inst in watched:
-                latest_date = price_repo.get_latest_price_date(inst.ticker)
+            for inst, latest in watched:
+                latest_date = None if latest is None else latest.last_date
 
                 if latest_date is None:
                     out.append(
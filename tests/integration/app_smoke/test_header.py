@@ -88,7 +88,7 @@ def _install_main_import_stubs(monkeypatch, fake_st: _FakeStreamlit) -> None:
     monkeypatch.setitem(sys.modules, "quantsentinel.app.ui.notifications", notif_mod)
 
     cfg_mod = ModuleType("quantsentinel.common.config")
-    cfg_mod.get_settings = lambda: SimpleNamespace()
+    cfg_mod.get_settings = lambda: SimpleNamespace(price_cache_dir=None)
     monkeypatch.setitem(sys.modules, "quantsentinel.common.config", cfg_mod)
 
     db_engine_mod = ModuleType("quantsentinel.infra.db.engine")
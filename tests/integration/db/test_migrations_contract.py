@@ -17,10 +17,18 @@ def test_migration_revision_chain() -> None:
     m1 = _load_module(base / "0001_init_schema.py", "m0001")
     m2 = _load_module(base / "0002_add_notifications.py", "m0002")
     m3 = _load_module(base / "0003_add_task_log.py", "m0003")
+    m4 = _load_module(base / "0004_add_alert_event_rollups.py", "m0004")
+    m5 = _load_module(base / "0005_add_instrument_latest.py", "m0005")
+    m6 = _load_module(base / "0006_add_refresh_log_diff_counts.py", "m0006")
+    m7 = _load_module(base / "0007_add_backfill_chunks.py", "m0007")
 
     assert m1.revision == "0001_init_schema"
     assert m2.down_revision == m1.revision
     assert m3.down_revision == m2.revision
+    assert m4.down_revision == m3.revision
+    assert m5.down_revision == m4.revision
+    assert m6.down_revision == m5.revision
+    assert m7.down_revision == m6.revision
 
 
 def test_notification_migration_upgrade_downgrade_calls(monkeypatch) -> None:
@@ -75,3 +83,71 @@ def test_task_log_migration_upgrade_downgrade_calls(monkeypatch) -> None:
 
     assert ("add_column", "tasks", "log") in calls
     assert ("drop_column", "tasks", "log") in calls
+
+
+def test_refresh_log_diff_counts_migration_upgrade_downgrade_calls(monkeypatch) -> None:
+    base = Path("src/quantsentinel/infra/db/migrations/versions")
+    m6 = _load_module(base / "0006_add_refresh_log_diff_counts.py", "m0006b")
+
+    calls: list[tuple[str, str, str]] = []
+
+    def _add_column(table_name, column):
+        calls.append(("add_column", table_name, column.name))
+
+    def _drop_column(table_name, column_name):
+        calls.append(("drop_column", table_name, column_name))
+
+    monkeypatch.setattr(m6.op, "add_column", _add_column)
+    monkeypatch.setattr(m6.op, "drop_column", _drop_column)
+
+    m6.upgrade()
+    m6.downgrade()
+
+    added = [name for op_name, table, name in calls if op_name == "add_column" and table == "refresh_log"]
+    dropped = [name for op_name, table, name in calls if op_name == "drop_column" and table == "refresh_log"]
+    assert added == ["rows_inserted", "rows_changed", "rows_unchanged"]
+    assert dropped == list(reversed(added))
+
+
+def test_backfill_chunks_migration_upgrade_downgrade_calls(monkeypatch) -> None:
+    base = Path("src/quantsentinel/infra/db/migrations/versions")
+    m7 = _load_module(base / "0007_add_backfill_chunks.py", "m0007b")
+
+    calls: list[tuple[str, str]] = []
+    columns: list[str] = []
+
+    def _create_table(name, *cols, **_kwargs):
+        calls.append(("create_table", name))
+        columns.extend(col.name for col in cols)
+
+    def _drop_table(name, **_kwargs):
+        calls.append(("drop_table", name))
+
+    monkeypatch.setattr(m7.op, "create_table", _create_table)
+    monkeypatch.setattr(m7.op, "drop_table", _drop_table)
+
+    m7.upgrade()
+    m7.downgrade()
+
+    assert calls == [("create_table", "backfill_chunks"), ("drop_table", "backfill_chunks")]
+    assert {"ticker", "chunk_start", "chunk_end", "status", "attempts"} <= set(columns)
+
+
+def test_alert_event_rollups_migration_backfills_from_events(monkeypatch) -> None:
+    base = Path("src/quantsentinel/infra/db/migrations/versions")
+    m4 = _load_module(base / "0004_add_alert_event_rollups.py", "m0004b")
+
+    calls: list[tuple[str, str]] = []
+    monkeypatch.setattr(m4.op, "create_table", lambda name, *_a, **_k: calls.append(("create_table", name)))
+    monkeypatch.setattr(m4.op, "create_index", lambda name, *_a, **_k: calls.append(("create_index", name)))
+    monkeypatch.setattr(m4.op, "execute", lambda sql: calls.append(("execute", " ".join(str(sql).split()))))
+    monkeypatch.setattr(m4.op, "drop_index", lambda name, **_k: calls.append(("drop_index", name)))
+    monkeypatch.setattr(m4.op, "drop_table", lambda name, **_k: calls.append(("drop_table", name)))
+
+    m4.upgrade()
+    m4.downgrade()
+
+    assert calls[0] == ("create_table", "alert_event_rollups")
+    backfill = next(sql for kind, sql in calls if kind == "execute")
+    assert backfill.startswith("INSERT INTO alert_event_rollups") and "FROM alert_events" in backfill
+    assert calls[-1] == ("drop_table", "alert_event_rollups")
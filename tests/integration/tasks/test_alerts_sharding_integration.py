@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+
+from quantsentinel.infra.tasks import tasks_monitor
+from quantsentinel.services.alerts_service import AlertsService
+
+
+@dataclass
+class _Rule:
+    id: object
+    name: str
+    rule_type: str
+    params_json: dict
+    scope_json: dict
+    silenced_until: datetime | None
+    enabled: bool = True
+
+
+class _FakeScope:
+    def __enter__(self):
+        return object()
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+def _install(monkeypatch, rules, watched, created, audits):
+    class AlertsRepoStub:
+        def __init__(self, _session):
+            pass
+
+        def list_enabled_rules(self):
+            return list(rules)
+
+        def list_rules_by_ids(self, rule_ids):
+            wanted = set(rule_ids)
+            return [r for r in rules if r.id in wanted]
+
+    class EventsRepoStub:
+        def __init__(self, _session):
+            pass
+
+        def exists_recent(self, **_kwargs):
+            return False
+
+        def create_events(self, events):
+            created.extend({"rule_id": ev.rule_id, "ticker": ev.ticker} for ev in events)
+            return [uuid4() for _ in events]
+
+    class InstRepoStub:
+        def __init__(self, _session):
+            pass
+
+        def list_watched(self):
+            return [SimpleNamespace(ticker=t) for t in watched]
+
+    class PricesRepoStub:
+        def __init__(self, _session):
+            pass
+
+        def get_close_arrays(self, *, tickers, days):
+            today = np.array([datetime.now(UTC).date()], dtype="datetime64[D]")
+            return {t: (today, np.array([100.0])) for t in tickers}
+
+    class AuditRepoStub:
+        def __init__(self, _session):
+            pass
+
+        def write(self, entry):
+            audits.append(entry)
+
+    prefix = "quantsentinel.services.alerts_service"
+    monkeypatch.setattr(f"{prefix}.session_scope", lambda: _FakeScope())
+    monkeypatch.setattr(f"{prefix}.AlertsRepo", AlertsRepoStub)
+    monkeypatch.setattr(f"{prefix}.EventsRepo", EventsRepoStub)
+    monkeypatch.setattr(f"{prefix}.InstrumentsRepo", InstRepoStub)
+    monkeypatch.setattr(f"{prefix}.PricesRepo", PricesRepoStub)
+    monkeypatch.setattr(f"{prefix}.AuditRepo", AuditRepoStub)
+
+
+def test_plan_batches_and_summary_cover_every_ticker_once(monkeypatch) -> None:
+    watched = [f"T{i:03d}" for i in range(50)]
+    rules = [
+        _Rule(uuid4(), "big", "threshold", {"operator": ">", "value": 50}, {}, None),
+        _Rule(uuid4(), "agg", "threshold", {"operator": ">", "value": 50, "aggregation_key": "g"}, {}, None),
+        _Rule(uuid4(), "quiet", "threshold", {}, {}, datetime.now(UTC) + timedelta(hours=1)),
+    ]
+    created: list[dict] = []
+    audits: list = []
+    _install(monkeypatch, rules, watched, created, audits)
+
+    svc = AlertsService()
+    plan = svc.plan_monitor_shards(max_shards=4, target_cost=20)
+
+    assert len(plan.shards) == 4
+    assert plan.rules == 3
+    assert plan.rules_silenced == 1
+    agg_items = [it for shard in plan.shards for it in shard if it["rule_id"] == str(rules[1].id)]
+    assert len(agg_items) == 1 and len(agg_items[0]["tickers"]) == 50
+
+    results = [svc.run_rules_batch(items=shard) for shard in plan.shards]
+    summary = svc.summarize_monitor_shards(results=results, plan=plan.to_dict())
+
+    big_hits = sorted(c["ticker"] for c in created if c["rule_id"] == rules[0].id)
+    agg_hits = [c for c in created if c["rule_id"] == rules[1].id]
+    assert big_hits == watched
+    assert [c["ticker"] for c in agg_hits] == ["g"]
+    assert summary["events_created"] == 51
+    assert summary["events_deduped"] == 49
+    assert summary["events_silenced"] == 1
+    assert summary["rules_evaluated"] == 3
+    assert audits[-1].action == "alert_rule_run"
+    assert audits[-1].payload["shards"] == 4
+    profile = audits[-1].payload["profile"]
+    assert {"load_rules", "dedup", "load_prices", "evaluate", "write_events"} <= set(profile["stages_ms"])
+    assert {r["rule_id"] for r in profile["rules"]} == {str(rules[0].id), str(rules[1].id)}
+    assert sum(r["tickers"] for r in profile["rules"] if r["rule_id"] == str(rules[0].id)) == 50
+
+
+def test_rule_silenced_after_planning_is_counted_once_across_shards(monkeypatch) -> None:
+    watched = [f"T{i:03d}" for i in range(50)]
+    rules = [_Rule(uuid4(), "big", "threshold", {"operator": ">", "value": 50}, {}, None)]
+    audits: list = []
+    _install(monkeypatch, rules, watched, [], audits)
+
+    svc = AlertsService()
+    plan = svc.plan_monitor_shards(max_shards=4, target_cost=20)
+    assert len(plan.shards) > 1
+    rules[0].silenced_until = datetime.now(UTC) + timedelta(hours=1)
+
+    results = [svc.run_rules_batch(items=shard) for shard in plan.shards]
+    summary = svc.summarize_monitor_shards(results=results, plan=plan.to_dict())
+
+    assert all(r["silenced_rule_ids"] == [str(rules[0].id)] for r in results)
+    assert summary["events_silenced"] == 1
+    assert audits[-1].payload["events_silenced"] == 1
+
+def test_run_alert_monitor_dispatches_chord_for_multiple_shards(monkeypatch) -> None:
+    plan = SimpleNamespace(
+        shards=[[{"rule_id": "a", "tickers": ["X"]}], [{"rule_id": "b", "tickers": ["Y"]}]],
+        rules=2,
+        total_cost=2.0,
+        to_dict=lambda: {"rules": 2, "rules_silenced": 0, "watched": 2},
+    )
+    monkeypatch.setattr(AlertsService, "plan_monitor_shards", lambda self, **_kw: plan)
+    monkeypatch.setattr(
+        AlertsService,
+        "run_monitor_cycle",
+        lambda self, **_kw: (_ for _ in ()).throw(AssertionError("inline cycle must not run")),
+    )
+
+    dispatched = {}
+
+    def _fake_chord(header):
+        dispatched["header"] = header
+        return lambda body: dispatched.setdefault("body", body)
+
+    monkeypatch.setattr(tasks_monitor, "chord", _fake_chord)
+
+    tasks_monitor.run_alert_monitor.run(task_id=None, max_shards=2)
+
+    assert [sig.kwargs["items"] for sig in dispatched["header"]] == plan.shards
+    assert dispatched["body"].kwargs["plan"]["rules"] == 2
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import itertools
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from quantsentinel.infra.db.repos.backfill_repo import STATUS_DONE, STATUS_FAILED
+from quantsentinel.infra.db.repos.prices_repo import UpsertResult
+from quantsentinel.infra.providers.base import ProviderBase
+from quantsentinel.infra.tasks import tasks_ingest
+
+TODAY = date(2024, 3, 31)
+
+
+class _FakeScope:
+    def __enter__(self):
+        return object()
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class _Provider(ProviderBase):
+    name = "fake"
+
+    def __init__(self, fetch) -> None:
+        self._fetch = fetch
+
+    def fetch_daily(self, *, ticker, start, end):
+        return self._fetch(ticker=ticker, start=start, end=end)
+
+
+def _bars(start: date, end: date) -> list[dict]:
+    return [{"date": start, "close": 1.0}, {"date": end, "close": 1.0}]
+
+
+def _install(monkeypatch, *, sources, fetch, completed=None, copy=None):
+    logs: list[dict] = []
+    emitted: list[dict] = []
+    checkpoints: list = []
+    written: list = []
+
+    def copy_upsert(models):
+        if copy is not None:
+            copy(models)
+        written.extend(models)
+        return UpsertResult(inserted=len(models))
+
+    monkeypatch.setattr(tasks_ingest, "_instrument_sources", lambda tickers: {t: s for t, s in sources.items() if t in tickers})
+    monkeypatch.setattr(tasks_ingest, "_completed_chunks", lambda _tickers: set(completed or ()))
+    monkeypatch.setattr(tasks_ingest, "_record_checkpoints", lambda items: checkpoints.extend(items))
+    monkeypatch.setattr(tasks_ingest, "_today_utc_date", lambda: TODAY)
+    monkeypatch.setattr(tasks_ingest, "_write_refresh_log", lambda **kwargs: logs.append(kwargs))
+    monkeypatch.setattr(tasks_ingest, "_write_refresh_logs", lambda entries: logs.extend(entries))
+    monkeypatch.setattr(tasks_ingest, "_get_provider", lambda _source: _Provider(fetch))
+    monkeypatch.setattr(tasks_ingest, "session_scope", lambda: _FakeScope())
+    monkeypatch.setattr(tasks_ingest, "PricesRepo", lambda _session: SimpleNamespace(copy_upsert=copy_upsert))
+    monkeypatch.setattr(tasks_ingest, "BackfillRepo", lambda _session: SimpleNamespace(record=lambda items: checkpoints.extend(items)))
+    monkeypatch.setattr(tasks_ingest, "_emit_prices_updated", lambda **kwargs: emitted.append(kwargs))
+    return SimpleNamespace(logs=logs, emitted=emitted, checkpoints=checkpoints, written=written)
+
+
+def test_windows_cover_the_range_on_fixed_boundaries() -> None:
+    windows = tasks_ingest._backfill_windows(date(2024, 1, 10), TODAY, chunk_days=30)
+    later = tasks_ingest._backfill_windows(date(2024, 1, 12), TODAY + timedelta(days=3), chunk_days=30)
+
+    assert windows[0][1] == date(2024, 1, 10) and windows[-1][2] == TODAY
+    for (_, _, hi), (_, lo, _) in itertools.pairwise(windows):
+        assert lo == hi + timedelta(days=1)
+    assert all((hi - key).days < 30 and key <= lo for key, lo, hi in windows)
+    assert [key for key, _, _ in later] == [key for key, _, _ in windows]
+
+
+def test_backfill_fetches_chunks_and_checkpoints_them_with_the_bars(monkeypatch) -> None:
+    fetched: list[tuple[str, date]] = []
+
+    def fetch(*, ticker, start, end):
+        fetched.append((ticker, start))
+        return _bars(start, end)
+
+    run = _install(monkeypatch, sources={"AAA": None, "BBB": None}, fetch=fetch)
+
+    tasks_ingest.backfill_history.run(task_id=None, tickers=["AAA", "BBB", "ZZZ"], years=1, chunk_days=120, max_workers=4)
+
+    windows = tasks_ingest._backfill_windows(TODAY - timedelta(days=365), TODAY, chunk_days=120)
+    assert sorted(fetched) == sorted((t, lo) for t in ("AAA", "BBB") for _, lo, _ in windows)
+    assert {(c.ticker, c.chunk_start) for c in run.checkpoints} == {(t, key) for t in ("AAA", "BBB") for key, _, _ in windows}
+    assert {c.status for c in run.checkpoints} == {STATUS_DONE}
+    assert len(run.written) == 2 * 2 * len(windows)
+    assert {m.revision_id for m in run.written} == {run.logs[0]["revision_id"]}
+    assert {"status": "FAILED", "ticker": "ZZZ", "detail": "backfill: unknown instrument", "revision_id": run.logs[0]["revision_id"]} in run.logs
+    assert run.logs[-1]["status"] == "FINISHED" and run.logs[-1]["rows_inserted"] == len(run.written)
+    assert run.emitted[0]["tickers"] == ["AAA", "BBB"]
+
+
+def test_rerun_skips_done_chunks_and_failed_chunks_fail_the_task(monkeypatch) -> None:
+    windows = tasks_ingest._backfill_windows(TODAY - timedelta(days=365), TODAY, chunk_days=120)
+    first_key = windows[0][0]
+    last_key, _, _ = windows[-1]
+    # A previous run finished the first window and the (still open) newest one.
+    completed = {("AAA", first_key), ("AAA", last_key)}
+    fetched: list[date] = []
+
+    def fetch(*, ticker, start, end):
+        fetched.append(start)
+        if start == windows[1][1]:
+            raise RuntimeError("HTTP 500")
+        return _bars(start, end)
+
+    run = _install(monkeypatch, sources={"AAA": None}, fetch=fetch, completed=completed)
+
+    with pytest.raises(RuntimeError, match="1 of 2 backfill chunks failed"):
+        tasks_ingest.backfill_history.run(task_id=None, tickers=["AAA"], years=1, chunk_days=120)
+
+    assert sorted(fetched) == [lo for _, lo, _ in windows[1:-1]]
+    assert {c.chunk_start: c.status for c in run.checkpoints} == {
+        windows[1][0]: STATUS_FAILED,
+        windows[2][0]: STATUS_DONE,
+    }
+    assert "resumed=2" in run.logs[0]["detail"]
+    assert run.logs[-1]["status"] == "FINISHED" and "failed=1" in run.logs[-1]["detail"]
+
+
+def test_default_scope_is_watched_tickers_without_history_or_with_an_unfinished_backfill(monkeypatch) -> None:
+    fetched: set[str] = set()
+    asked: list = []
+
+    def fetch(*, ticker, start, end):
+        fetched.add(ticker)
+        return _bars(start, end)
+
+    def unfinished(tickers, *, chunk_starts):
+        asked.append((sorted(tickers), list(chunk_starts)))
+        return {"PART"}
+
+    windows = tasks_ingest._backfill_windows(TODAY - timedelta(days=365), TODAY, chunk_days=120)
+    # DONE finished its backfill; a new window opening must not make it due again.
+    _install(monkeypatch, sources={}, fetch=fetch, completed={("DONE", key) for key, _, _ in windows[:-1]})
+    monkeypatch.setattr(tasks_ingest, "_list_watched_instruments", lambda: dict.fromkeys(["BUSY", "DONE", "NEW", "OLD", "PART"]))
+    monkeypatch.setattr(tasks_ingest, "_latest_price_dates", lambda _tickers: {"DONE": TODAY, "OLD": TODAY, "PART": TODAY})
+    monkeypatch.setattr(tasks_ingest, "_unfinished_backfills", unfinished)
+    # BUSY has no prices yet but a backfill queued from the watchlist is loading it.
+    monkeypatch.setattr(tasks_ingest, "_backfilling_tickers", lambda: {"BUSY"})
+
+    tasks_ingest.backfill_history.run(task_id=None, years=1, chunk_days=120)
+
+    assert fetched == {"NEW", "PART"}
+    assert asked == [(["DONE", "OLD", "PART"], [key for key, _, _ in windows[:-1]])]
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from quantsentinel.infra.db.repos.prices_repo import UpsertResult
+from quantsentinel.infra.tasks import tasks_ingest
+
+
+def test_import_loads_every_chunk_under_one_revision(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "vendor.csv"
+    path.write_text("ticker,date,close\nAAA,2024-01-02,1\nAAA,2024-01-03,2\nBBB,2024-01-02,3\nBBB,bad,4\nCCC,2024-01-02,5\n")
+    loaded: list[list] = []
+    logs: list[dict] = []
+    emitted: list[dict] = []
+
+    def load(rows, *, source):
+        loaded.append(rows)
+        return UpsertResult(inserted=len(rows))
+
+    monkeypatch.setattr(tasks_ingest, "_load_import_chunk", load)
+    monkeypatch.setattr(tasks_ingest, "_write_refresh_log", lambda **kwargs: logs.append(kwargs))
+    monkeypatch.setattr(tasks_ingest, "_emit_prices_updated", lambda **kwargs: emitted.append(kwargs))
+
+    tasks_ingest.import_prices_file.run(task_id=None, path=str(path), source="vendor", chunk_rows=2)
+
+    assert [len(rows) for rows in loaded] == [2, 1, 1]
+    revisions = {row.revision_id for rows in loaded for row in rows}
+    assert revisions == {logs[0]["revision_id"]} == {emitted[0]["revision_id"]}
+    assert emitted[0]["tickers"] == ["AAA", "BBB", "CCC"]
+    finished = logs[-1]["detail"]
+    assert logs[-1]["status"] == "FINISHED"
+    assert "loaded=4 rejected=1 inserted=4" in finished and "line 5: bad date 'bad'" in finished
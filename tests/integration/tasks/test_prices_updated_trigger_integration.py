@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+from quantsentinel.infra.db.repos.prices_repo import UpsertResult
+from quantsentinel.infra.providers.base import ProviderBase
+from quantsentinel.infra.tasks import tasks_ingest
+from quantsentinel.services.alerts_service import AlertsService
+
+
+@dataclass
+class _Rule:
+    id: object
+    name: str
+    rule_type: str
+    params_json: dict
+    scope_json: dict
+    silenced_until: datetime | None = None
+
+
+class _AaplOnlyProvider(ProviderBase):
+    name = "yahoo"
+
+    def fetch_daily(self, *, ticker, start, end):
+        return [{"date": "2024-01-10", "close": 1.0}] if ticker == "AAPL" else []
+
+
+class _FakeScope:
+    def __enter__(self):
+        return object()
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+def _install(monkeypatch, rules, watched, evaluated, audits):
+    class AlertsRepoStub:
+        def __init__(self, _session):
+            pass
+
+        def list_enabled_rules(self):
+            return list(rules)
+
+    class EventsRepoStub:
+        def __init__(self, _session):
+            pass
+
+        def exists_recent(self, **_kwargs):
+            return False
+
+        def create_events(self, events):
+            return [object() for _ in events]
+
+    class InstRepoStub:
+        def __init__(self, _session):
+            pass
+
+        def list_watched(self):
+            return [SimpleNamespace(ticker=t) for t in watched]
+
+    class AuditRepoStub:
+        def __init__(self, _session):
+            pass
+
+        def write(self, entry):
+            audits.append(entry)
+
+    prefix = "quantsentinel.services.alerts_service"
+    monkeypatch.setattr(f"{prefix}.session_scope", lambda: _FakeScope())
+    monkeypatch.setattr(f"{prefix}.AlertsRepo", AlertsRepoStub)
+    monkeypatch.setattr(f"{prefix}.EventsRepo", EventsRepoStub)
+    monkeypatch.setattr(f"{prefix}.InstrumentsRepo", InstRepoStub)
+    monkeypatch.setattr(f"{prefix}.PricesRepo", lambda _session: object())
+    monkeypatch.setattr(f"{prefix}.AuditRepo", AuditRepoStub)
+    names = {r.id: r.name for r in rules}
+    monkeypatch.setattr(f"{prefix}.AlertsService._load_panel", staticmethod(lambda **_kwargs: {}))
+    monkeypatch.setattr(
+        f"{prefix}.evaluate_rule",
+        lambda spec, ticker, features, today: evaluated.append((names[spec.rule_id], ticker)) or [],
+    )
+
+
+def test_prices_updated_evaluates_only_rules_scoping_updated_tickers(monkeypatch) -> None:
+    rules = [
+        _Rule(uuid4(), "all", "threshold", {}, {}),
+        _Rule(uuid4(), "other", "threshold", {}, {"tickers": ["MSFT"]}),
+        _Rule(uuid4(), "corr", "correlation_break", {"benchmark_ticker": "SPY"}, {"tickers": ["MSFT", "QQQ"]}),
+    ]
+    evaluated: list[tuple[str, str]] = []
+    audits: list = []
+    _install(monkeypatch, rules, ["AAPL", "MSFT", "QQQ", "SPY"], evaluated, audits)
+
+    result = AlertsService().run_monitor_for_tickers(tickers=["AAPL", "SPY"], revision_id="rev-1")
+
+    assert sorted(evaluated) == [("all", "AAPL"), ("all", "SPY"), ("corr", "MSFT"), ("corr", "QQQ")]
+    assert result["rules_evaluated"] == 2
+    assert audits[-1].payload["trigger"] == "prices_updated"
+    assert audits[-1].payload["revision_id"] == "rev-1"
+
+
+def test_full_sweep_reseeds_correlations_and_trigger_advances_them(monkeypatch) -> None:
+    rules = [_Rule(uuid4(), "corr", "correlation_break", {"benchmark_ticker": "SPY"}, {"tickers": ["MSFT"]})]
+    _install(monkeypatch, rules, ["MSFT", "SPY"], [], [])
+    calls: list[bool] = []
+
+    class _Correlations:
+        def correlations(self, panel, tickers, benchmark, lookback, *, reseed=False):
+            calls.append(reseed)
+            return {}
+
+    def _evaluate(spec, ticker, features, today):
+        features.correlation(ticker, "SPY", 20)
+        return []
+
+    prefix = "quantsentinel.services.alerts_service"
+    monkeypatch.setattr(f"{prefix}._CORRELATIONS", _Correlations())
+    monkeypatch.setattr(f"{prefix}.evaluate_rule", _evaluate)
+
+    svc = AlertsService()
+    svc.run_monitor_cycle(actor_id=None, task_id=None)
+    svc.run_monitor_for_tickers(tickers=["SPY"])
+
+    assert calls == [True, False]
+
+
+def test_prices_updated_with_no_tickers_is_a_noop(monkeypatch) -> None:
+    evaluated: list[tuple[str, str]] = []
+    _install(monkeypatch, [_Rule(uuid4(), "all", "threshold", {}, {})], ["AAPL"], evaluated, [])
+    result = AlertsService().run_monitor_for_tickers(tickers=[])
+    assert result["rules_evaluated"] == 0
+    assert evaluated == []
+
+
+def test_refresh_watchlist_emits_signal_for_tickers_with_new_rows(monkeypatch) -> None:
+    monkeypatch.setattr(tasks_ingest, "_list_watched_instruments", lambda: {"AAPL": "yahoo", "MSFT": "yahoo"})
+    monkeypatch.setattr(tasks_ingest, "_latest_price_dates", lambda tickers: dict.fromkeys(tickers, date(2024, 1, 5)))
+    monkeypatch.setattr(tasks_ingest, "_backfilling_tickers", set)
+    monkeypatch.setattr(tasks_ingest, "_today_utc_date", lambda: datetime(2024, 1, 10, tzinfo=UTC).date())
+    monkeypatch.setattr(tasks_ingest, "_write_refresh_log", lambda **_kwargs: None)
+    monkeypatch.setattr(tasks_ingest, "_write_refresh_logs", lambda _entries: None)
+    monkeypatch.setattr(tasks_ingest, "_get_provider", lambda _source: _AaplOnlyProvider())
+    monkeypatch.setattr(tasks_ingest, "session_scope", lambda: _FakeScope())
+    monkeypatch.setattr(tasks_ingest, "PricesRepo", lambda _session: SimpleNamespace(upsert_many=lambda models: UpsertResult(inserted=len(models))))
+    emitted = []
+    monkeypatch.setattr(tasks_ingest, "_emit_prices_updated", lambda **kwargs: emitted.append(kwargs))
+
+    tasks_ingest.refresh_watchlist.run(task_id=None)
+
+    assert len(emitted) == 1
+    assert emitted[0]["tickers"] == ["AAPL"]
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import threading
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from quantsentinel.infra.db.repos.prices_repo import BarDiff, UpsertResult
+from quantsentinel.infra.providers.base import BatchResult, ProviderBase, ProviderCapabilities
+from quantsentinel.infra.tasks import tasks_ingest
+
+TODAY = date(2024, 1, 10)
+# Latest stored bar of tickers a test does not give one: history exists, a few days are due.
+LAST_BAR = date(2024, 1, 5)
+
+
+class _FakeScope:
+    def __enter__(self):
+        return object()
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class _Provider(ProviderBase):
+    name = "fake"
+
+    def __init__(self, fetch) -> None:
+        self._fetch = fetch
+
+    def fetch_daily(self, *, ticker, start, end):
+        return self._fetch(ticker=ticker, start=start, end=end)
+
+
+def _install(monkeypatch, *, tickers, latest=None, fetch, upsert, provider=None, diff=None):
+    logs: list[dict] = []
+    emitted: list[dict] = []
+    monkeypatch.setattr(tasks_ingest, "_list_watched_instruments", lambda: dict.fromkeys(tickers))
+    monkeypatch.setattr(tasks_ingest, "_latest_price_dates", lambda _tickers: {**dict.fromkeys(tickers, LAST_BAR), **(latest or {})})
+    monkeypatch.setattr(tasks_ingest, "_backfilling_tickers", set)
+    monkeypatch.setattr(tasks_ingest, "_backfill_active", lambda _ticker: False)
+    monkeypatch.setattr(tasks_ingest, "_today_utc_date", lambda: TODAY)
+    monkeypatch.setattr(tasks_ingest, "_write_refresh_log", lambda **kwargs: logs.append(kwargs))
+    monkeypatch.setattr(tasks_ingest, "_write_refresh_logs", lambda entries: logs.extend(entries))
+    monkeypatch.setattr(tasks_ingest, "_get_provider", lambda _source: provider or _Provider(fetch))
+    monkeypatch.setattr(tasks_ingest, "session_scope", lambda: _FakeScope())
+    monkeypatch.setattr(tasks_ingest, "PricesRepo", lambda _session: SimpleNamespace(upsert_many=upsert, diff_against_stored=diff))
+    monkeypatch.setattr(tasks_ingest, "_emit_prices_updated", lambda **kwargs: emitted.append(kwargs))
+    return logs, emitted
+
+
+def _statuses(logs) -> dict[str, str]:
+    return {entry["ticker"]: entry["status"] for entry in logs if entry.get("ticker")}
+
+
+def test_fetch_failures_are_isolated_and_writes_are_batched(monkeypatch) -> None:
+    batches: list[list[str]] = []
+
+    def fetch(*, ticker, start, end):
+        if ticker == "BAD":
+            raise RuntimeError("HTTP 500")
+        return [{"date": "2024-01-09", "close": 1.0}, {"date": "2024-01-10", "close": 2.0}]
+
+    def upsert(models):
+        batches.append(sorted({m.ticker for m in models}))
+        return UpsertResult(inserted=len(models))
+
+    monkeypatch.setattr(tasks_ingest, "WRITE_BATCH_ROWS", 4)
+    logs, emitted = _install(
+        monkeypatch,
+        tickers=["AAA", "BAD", "BBB", "CCC", "OLD"],
+        latest={"OLD": TODAY},
+        fetch=fetch,
+        upsert=upsert,
+    )
+
+    tasks_ingest.refresh_watchlist.run(task_id=None, max_workers=3)
+
+    assert _statuses(logs) == {"AAA": "OK", "BAD": "FAILED", "BBB": "OK", "CCC": "OK", "OLD": "SKIPPED"}
+    assert sorted(t for batch in batches for t in batch) == ["AAA", "BBB", "CCC"]
+    assert len(batches) == 2  # 2 tickers x 2 bars fill one batch, the rest is flushed at the end
+    assert sorted(emitted[0]["tickers"]) == ["AAA", "BBB", "CCC"]
+    assert "failed=1" in logs[-1]["detail"] and "inserted=6" in logs[-1]["detail"]
+
+
+def test_tickers_without_history_or_with_a_backfill_are_left_to_backfill(monkeypatch) -> None:
+    fetched: list[str] = []
+
+    def fetch(*, ticker, start, end):
+        fetched.append(ticker)
+        return [{"date": "2024-01-10", "close": 1.0}]
+
+    logs, emitted = _install(
+        monkeypatch,
+        tickers=["AAA", "BUSY", "NEW"],
+        latest={"NEW": None},
+        fetch=fetch,
+        upsert=lambda models: UpsertResult(inserted=len(models)),
+    )
+    monkeypatch.setattr(tasks_ingest, "_backfilling_tickers", lambda: {"BUSY"})
+
+    tasks_ingest.refresh_watchlist.run(task_id=None)
+
+    assert fetched == ["AAA"]
+    assert _statuses(logs) == {"AAA": "OK", "BUSY": "SKIPPED", "NEW": "SKIPPED"}
+    assert {e["detail"] for e in logs if e.get("status") == "SKIPPED"} == {"backfill"}
+    assert emitted[0]["tickers"] == ["AAA"]
+
+
+@pytest.mark.parametrize(("latest", "active"), [(None, False), (LAST_BAR, True)])
+def test_refresh_ticker_leaves_history_to_backfill(monkeypatch, latest, active) -> None:
+    _install(monkeypatch, tickers=["NEW"], fetch=lambda **_kw: pytest.fail("must not fetch"), upsert=None)
+    monkeypatch.setattr(tasks_ingest, "_latest_price_date", lambda _ticker: latest)
+    monkeypatch.setattr(tasks_ingest, "_backfill_active", lambda _ticker: active)
+    results: list = []
+    monkeypatch.setattr(
+        "quantsentinel.infra.tasks.lifecycle.TaskLifecycle.run", lambda self, *, worker: results.append(worker(lambda *_a: None))
+    )
+
+    tasks_ingest.refresh_ticker.run(task_id=None, ticker="NEW")
+
+    assert results == ["NEW left to backfill"]
+
+def test_failed_write_marks_its_batch_and_run_continues(monkeypatch) -> None:
+    def upsert(models):
+        raise RuntimeError("deadlock detected")
+
+    logs, emitted = _install(
+        monkeypatch,
+        tickers=["AAA", "BBB"],
+        fetch=lambda *, ticker, start, end: [{"date": "2024-01-10", "close": 1.0}],
+        upsert=upsert,
+    )
+
+    tasks_ingest.refresh_watchlist.run(task_id=None)
+
+    assert _statuses(logs) == {"AAA": "FAILED", "BBB": "FAILED"}
+    assert logs[-1]["status"] == "FINISHED"
+    assert emitted[0]["tickers"] == []
+
+
+def test_fetches_overlap_up_to_max_workers(monkeypatch) -> None:
+    # Three fetches must be in flight at once to pass the barrier; a sequential run would time out.
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fetch(*, ticker, start, end):
+        barrier.wait()
+        return [{"date": "2024-01-10", "close": 1.0}]
+
+    logs, _ = _install(
+        monkeypatch,
+        tickers=["AAA", "BBB", "CCC"],
+        fetch=fetch,
+        upsert=lambda models: UpsertResult(inserted=len(models)),
+    )
+
+    tasks_ingest.refresh_watchlist.run(task_id=None, max_workers=3)
+
+    assert set(_statuses(logs).values()) == {"OK"}
+
+
+def test_batch_capable_providers_get_many_tickers_per_call(monkeypatch) -> None:
+    calls: list[list[str]] = []
+
+    class _Batch(ProviderBase):
+        name = "vendor"
+        capabilities = ProviderCapabilities(batch=True, max_batch_size=2)
+
+        def fetch_daily_batch(self, requests):
+            calls.append([r.ticker for r in requests])
+            if "BAD" in calls[-1]:
+                return BatchResult(rows={"CCC": [{"date": "2024-01-10", "close": 1.0}]}, errors={"BAD": RuntimeError("no such symbol")})
+            return BatchResult(rows={r.ticker: [{"date": "2024-01-10", "close": 1.0}] for r in requests})
+
+    models: list = []
+
+    def upsert(batch):
+        models.extend(batch)
+        return UpsertResult(inserted=len(batch))
+
+    logs, emitted = _install(
+        monkeypatch, tickers=["AAA", "BBB", "BAD", "CCC"], fetch=None, upsert=upsert, provider=_Batch()
+    )
+
+    tasks_ingest.refresh_watchlist.run(task_id=None, max_workers=1)
+
+    assert calls == [["AAA", "BBB"], ["BAD", "CCC"]]
+    assert _statuses(logs) == {"AAA": "OK", "BBB": "OK", "BAD": "FAILED", "CCC": "OK"}
+    assert {m.source for m in models} == {"vendor"}
+    assert sorted(emitted[0]["tickers"]) == ["AAA", "BBB", "CCC"]
+
+
+def test_parse_stage_drops_bars_rejected_by_qc(monkeypatch) -> None:
+    written: list = []
+
+    def fetch(*, ticker, start, end):
+        return [
+            {"date": "2024-01-08", "open": 10.0, "high": 11.0, "low": 9.0, "close": 10.5},
+            {"date": "2024-01-09", "open": 10.0, "high": 9.0, "low": 11.0, "close": 10.0},
+            {"date": "2024-01-10", "open": 10.0, "high": 11.0, "low": 9.0, "close": -1.0},
+        ]
+
+    def upsert(models):
+        written.extend(models)
+        return UpsertResult(inserted=len(models))
+
+    logs, _ = _install(monkeypatch, tickers=["AAA"], fetch=fetch, upsert=upsert)
+
+    tasks_ingest.refresh_watchlist.run(task_id=None)
+
+    assert [str(m.date) for m in written] == ["2024-01-08"]
+    ok = next(entry for entry in logs if entry.get("ticker") == "AAA")
+    assert ok["detail"] == "rows=1 qc=OHLC_INCONSISTENT:2,NON_POSITIVE_PRICE:1"
+
+
+def test_diff_mode_refetches_the_window_and_writes_only_changed_bars(monkeypatch) -> None:
+    starts: dict[str, date] = {}
+    written: list = []
+
+    def fetch(*, ticker, start, end):
+        starts[ticker] = start
+        return [{"date": "2024-01-09", "close": 1.0}, {"date": "2024-01-10", "close": 2.0}]
+
+    def diff(models):
+        # AAA's bars are already stored unchanged; BBB has one revised bar.
+        changed = [m for m in models if m.ticker == "BBB" and m.date == date(2024, 1, 9)]
+        return BarDiff(inserted=[], changed=changed, unchanged=len(models) - len(changed), per_ticker={"AAA": (0, 0, 2), "BBB": (0, 1, 1)})
+
+    def upsert(models):
+        written.extend(models)
+        return UpsertResult(updated=len(models))
+
+    logs, emitted = _install(
+        monkeypatch,
+        tickers=["AAA", "BBB"],
+        latest={"AAA": TODAY, "BBB": TODAY},
+        fetch=fetch,
+        upsert=upsert,
+        diff=diff,
+    )
+
+    tasks_ingest.refresh_watchlist.run(task_id=None, diff_window_days=5)
+
+    assert starts == {"AAA": date(2024, 1, 5), "BBB": date(2024, 1, 5)}  # up-to-date tickers are re-fetched
+    assert [(m.ticker, str(m.date)) for m in written] == [("BBB", "2024-01-09")]
+    bbb = next(entry for entry in logs if entry.get("ticker") == "BBB")
+    assert (bbb["rows_inserted"], bbb["rows_changed"], bbb["rows_unchanged"]) == (0, 1, 1)
+    assert bbb["detail"] == "rows=2 inserted=0 changed=1 unchanged=1"
+    assert (logs[-1]["rows_inserted"], logs[-1]["rows_changed"], logs[-1]["rows_unchanged"]) == (0, 1, 3)
+    assert emitted[0]["tickers"] == ["BBB"]
+
+
+def test_refresh_ticker_applies_the_same_qc(monkeypatch) -> None:
+    written: list = []
+
+    def fetch(*, ticker, start, end):
+        return [
+            {"date": "2024-01-09", "open": 10.0, "high": 11.0, "low": 9.0, "close": 10.5},
+            {"date": "2024-01-10", "open": 10.0, "high": 11.0, "low": 9.0, "close": -1.0},
+        ]
+
+    def upsert(models):
+        written.extend(models)
+        return UpsertResult(inserted=len(models))
+
+    _, emitted = _install(monkeypatch, tickers=["AAA"], fetch=fetch, upsert=upsert)
+    monkeypatch.setattr(tasks_ingest, "_latest_price_date", lambda _ticker: LAST_BAR)
+    monkeypatch.setattr(tasks_ingest, "_instrument_source", lambda _ticker: None)
+    results: list = []
+    monkeypatch.setattr(
+        "quantsentinel.infra.tasks.lifecycle.TaskLifecycle.run", lambda self, *, worker: results.append(worker(lambda *_a: None))
+    )
+
+    tasks_ingest.refresh_ticker.run(task_id=None, ticker="AAA")
+
+    assert [str(m.date) for m in written] == ["2024-01-09"]
+    assert results == ["refreshed AAA: rows=1 inserted=1 updated=0 qc=OHLC_INCONSISTENT:1,NON_POSITIVE_PRICE:1"]
+    assert emitted[0]["tickers"] == ["AAA"]
+
+
+def test_refresh_ticker_diff_mode_writes_through_the_batch_writer(monkeypatch) -> None:
+    written: list = []
+
+    def diff(models):
+        return BarDiff(inserted=models[-1:], changed=[], unchanged=len(models) - 1, per_ticker={"AAA": (1, 0, len(models) - 1)})
+
+    def upsert(models):
+        written.extend(models)
+        return UpsertResult(inserted=len(models))
+
+    logs, emitted = _install(
+        monkeypatch,
+        tickers=["AAA"],
+        fetch=lambda *, ticker, start, end: [{"date": "2024-01-09", "close": 1.0}, {"date": "2024-01-10", "close": 2.0}],
+        upsert=upsert,
+        diff=diff,
+    )
+    results: list = []
+    monkeypatch.setattr(tasks_ingest, "_latest_price_date", lambda _ticker: TODAY)
+    monkeypatch.setattr(tasks_ingest, "_instrument_source", lambda _ticker: None)
+    monkeypatch.setattr(
+        "quantsentinel.infra.tasks.lifecycle.TaskLifecycle.run", lambda self, *, worker: results.append(worker(lambda *_a: None))
+    )
+
+    tasks_ingest.refresh_ticker.run(task_id=None, ticker="AAA", diff_window_days=3)
+
+    assert [str(m.date) for m in written] == ["2024-01-10"]
+    (entry,) = logs
+    assert (entry["status"], entry["rows_inserted"], entry["rows_changed"], entry["rows_unchanged"]) == ("OK", 1, 0, 1)
+    assert results == ["refreshed AAA: rows=2 inserted=1 changed=0 unchanged=1"]
+    assert emitted[0]["tickers"] == ["AAA"]
@@ -6,6 +6,7 @@ from types import SimpleNamespace
 from uuid import UUID, uuid4
 
 from quantsentinel.infra.db.models import TaskStatus
+from quantsentinel.infra.db.repos.prices_repo import UpsertResult
 from quantsentinel.infra.tasks.tasks_ingest import refresh_ticker
 from quantsentinel.infra.tasks.tasks_monitor import run_rules_batch
 from quantsentinel.services.task_service import TaskService
@@ -151,11 +152,13 @@ def test_enqueue_then_refresh_ticker_status_flow(monkeypatch) -> None:
     store = _Store()
     _patch_task_db(monkeypatch, store)
 
-    monkeypatch.setattr("quantsentinel.infra.tasks.tasks_ingest._latest_price_date", lambda ticker: None)
+    monkeypatch.setattr("quantsentinel.infra.tasks.tasks_ingest._latest_price_date", lambda ticker: datetime(2024, 1, 5).date())
+    monkeypatch.setattr("quantsentinel.infra.tasks.tasks_ingest._backfill_active", lambda ticker: False)
     monkeypatch.setattr("quantsentinel.infra.tasks.tasks_ingest._today_utc_date", lambda: datetime(2024, 1, 10).date())
+    monkeypatch.setattr("quantsentinel.infra.tasks.tasks_ingest._instrument_source", lambda ticker: "yahoo")
     monkeypatch.setattr(
-        "quantsentinel.infra.tasks.tasks_ingest._provider_fetch_daily_prices",
-        lambda **kwargs: [{"date": "2024-01-10", "close": 100.0}],
+        "quantsentinel.infra.tasks.tasks_ingest._get_provider",
+        lambda source: SimpleNamespace(name=source, fetch_daily=lambda **kwargs: [{"date": "2024-01-10", "close": 100.0}]),
     )
 
     class FakeScope:
@@ -166,7 +169,10 @@ def test_enqueue_then_refresh_ticker_status_flow(monkeypatch) -> None:
             return False
 
     monkeypatch.setattr("quantsentinel.infra.tasks.tasks_ingest.session_scope", lambda: FakeScope())
-    monkeypatch.setattr("quantsentinel.infra.tasks.tasks_ingest.PricesRepo", lambda session: SimpleNamespace(upsert_many=lambda models: None))
+    monkeypatch.setattr("quantsentinel.infra.tasks.tasks_ingest.PricesRepo", lambda session: SimpleNamespace(upsert_many=lambda models: UpsertResult(inserted=len(models))))
+    monkeypatch.setattr("quantsentinel.infra.tasks.tasks_ingest._write_refresh_logs", lambda entries: None)
+    emitted = []
+    monkeypatch.setattr("quantsentinel.infra.tasks.tasks_ingest._emit_prices_updated", lambda **kwargs: emitted.append(kwargs))
 
     svc = TaskService()
     task_id = svc.queue(task_type="refresh_ticker", actor_id=None, celery_signature=None)
@@ -181,6 +187,7 @@ def test_enqueue_then_refresh_ticker_status_flow(monkeypatch) -> None:
     assert row.finished_at is not None
     assert any(kind == "running" for _tid, kind, _status, _p in store.transitions)
     assert any(kind == "success" for _tid, kind, _status, _p in store.transitions)
+    assert [e["tickers"] for e in emitted] == [["AAPL"]]
 
 
 def test_enqueue_then_rules_batch_status_flow(monkeypatch) -> None:
@@ -0,0 +1,107 @@
+from datetime import date, timedelta
+
+import pytest
+
+from quantsentinel.domain.alerts.evaluator import (
+    FeatureCache,
+    RuleSpec,
+    benchmark_tickers,
+    evaluate_rule,
+    evaluate_rules,
+    required_history,
+)
+from quantsentinel.domain.market.models import PriceSeries
+
+TODAY = date(2024, 1, 31)
+
+
+def _series(ticker: str, closes: list[float], *, end: date = TODAY) -> PriceSeries:
+    n = len(closes)
+    return PriceSeries.from_pairs(ticker, [(end - timedelta(days=n - 1 - i), c) for i, c in enumerate(closes)])
+
+
+PANEL = {
+    "AAPL": _series("AAPL", [100, 101, 102, 103, 104]),
+    "ZS": _series("ZS", [100, 101, 100, 101, 100, 101, 110]),
+    "VOL": _series("VOL", [100, 110, 100, 110, 100]),
+    "MISS": _series("MISS", [100, 100, 100]),
+    "STALE": _series("STALE", [100, 100], end=TODAY - timedelta(days=20)),
+    "BENCH": _series("BENCH", [100, 103, 101, 106, 102]),
+    "CORR": _series("CORR", [100, 95, 105, 90, 110]),
+}
+
+
+@pytest.mark.parametrize(
+    ("rule_type", "params", "ticker", "expected"),
+    [
+        ("threshold", {"operator": ">", "value": 90}, "AAPL", True),
+        ("threshold", {"operator": "<", "value": 90}, "AAPL", False),
+        ("z_score", {"lookback": 20, "threshold": 2}, "ZS", True),
+        ("z_score", {"lookback": 20, "threshold": 2}, "AAPL", False),
+        ("volatility", {"lookback": 20, "threshold": 0.03}, "VOL", True),
+        ("volatility", {"lookback": 20, "threshold": 0.03}, "AAPL", False),
+        ("staleness", {"max_days": 7}, "STALE", True),
+        ("staleness", {"max_days": 7}, "AAPL", False),
+        ("staleness", {"max_days": 7}, "NONE", True),
+        ("missing_data", {"lookback_days": 10, "min_points": 5}, "MISS", True),
+        ("missing_data", {"lookback_days": 10, "min_points": 5}, "AAPL", False),
+        ("correlation_break", {"benchmark_ticker": "BENCH", "lookback": 4, "min_corr": 0.2}, "CORR", True),
+        ("correlation_break", {"benchmark_ticker": "BENCH", "lookback": 4, "min_corr": 0.2}, "BENCH", False),
+        ("custom_expression", {"expression": "close > 50 and ma20 > 100"}, "AAPL", True),
+        ("custom_expression", {"expression": "ret < 0"}, "AAPL", False),
+    ],
+)
+def test_evaluate_rule_for_all_rule_types(rule_type: str, params: dict, ticker: str, expected: bool) -> None:
+    spec = RuleSpec(rule_id="r1", rule_type=rule_type, params=params)
+    hits = evaluate_rule(spec, ticker, FeatureCache(PANEL), today=TODAY)
+    assert bool(hits) is expected
+    if hits:
+        assert hits[0].rule_id == "r1"
+        assert hits[0].ticker == ticker
+        assert hits[0].message.startswith(f"{ticker}:")
+
+
+def test_features_are_shared_across_rules() -> None:
+    rules = [
+        RuleSpec(rule_id="vol", rule_type="volatility", params={"lookback": 20}, tickers=("AAPL", "VOL")),
+        RuleSpec(rule_id="z", rule_type="z_score", params={"lookback": 20}, tickers=("AAPL", "VOL")),
+        RuleSpec(rule_id="expr", rule_type="custom_expression", params={"expression": "vol > 0"}, tickers=("AAPL",)),
+    ]
+    cache = FeatureCache(PANEL)
+    evaluate_rules(PANEL, rules, today=TODAY, features=cache)
+    # return_stats(lookback=20) computed once per ticker and reused by z_score/custom_expression
+    assert cache.reused >= 3
+    assert cache.computed == 2 + 2 + 2  # return_stats x2, pct_change x2, mean_close(20/60) for AAPL
+
+
+def test_correlation_aligns_on_dates_and_handles_degenerate_input() -> None:
+    shifted = {
+        "A": _series("A", [100, 101, 99, 102, 98, 103]),
+        "B": _series("B", [50, 51, 49.5, 51, 49, 51.5], end=TODAY + timedelta(days=1)),
+        "FLAT": _series("FLAT", [10, 10, 10, 10, 10, 10]),
+    }
+    cache = FeatureCache(shifted)
+    corr = cache.correlation("A", "B", lookback=10)
+    assert corr is not None and -1.0 <= corr <= 1.0
+    assert cache.correlation("A", "FLAT", lookback=10) is None
+    assert cache.correlation("A", "MISSING", lookback=10) is None
+
+
+def test_required_history_and_benchmarks() -> None:
+    assert required_history("threshold", {}) == 2
+    assert required_history("z_score", {"lookback": 30}) == 31
+    assert required_history("missing_data", {"lookback_days": 15}) == 15
+    assert required_history("custom_expression", {}) == 60
+    specs = [
+        RuleSpec(rule_id=1, rule_type="correlation_break", params={"benchmark_ticker": "SPY"}),
+        RuleSpec(rule_id=2, rule_type="threshold", params={"benchmark_ticker": "QQQ"}),
+    ]
+    assert benchmark_tickers(specs) == {"SPY"}
+
+
+def test_price_series_helpers() -> None:
+    s = PriceSeries.from_pairs("X", [(TODAY, 1.0), (TODAY + timedelta(days=1), None)])
+    assert len(s) == 1
+    assert s.last_date == TODAY
+    assert len(s.tail(0)) == 0
+    assert PriceSeries.empty("X").last_date is None
@@ -1,6 +1,11 @@
+import numpy as np
 import pytest
 
-from quantsentinel.domain.alerts.expression import ExpressionValidationError, evaluate
+from quantsentinel.domain.alerts.expression import (
+    ExpressionValidationError,
+    evaluate,
+    evaluate_vectorized,
+)
 
 
 @pytest.mark.parametrize(
@@ -29,3 +34,41 @@ def test_evaluate_allows_whitelist_ast(expr: str, values: dict[str, float], expe
 def test_evaluate_rejects_malicious_expression(expr: str) -> None:
     with pytest.raises(ExpressionValidationError):
         evaluate(expr, {"ret": 0.1, "vol": 0.2, "close": 10, "z": 1, "ma20": 9, "ma60": 8})
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "close > ma20 and ma20 > ma60",
+        "abs(ret) > 0.01 and min(vol, z) < 1",
+        "max(close, ma20, ma60) == close or not z",
+        "(z if ret > 0 else -z) >= 0.5",
+        "0 < ret < 0.02 or close % 3 == 1",
+        "-ret ** 2 + vol * 2 > 0.1",
+    ],
+)
+def test_evaluate_vectorized_matches_scalar(expr: str) -> None:
+    rng = np.random.default_rng(7)
+    cols = {
+        "close": rng.integers(1, 20, 64).astype(float),
+        "ma20": rng.integers(1, 20, 64).astype(float),
+        "ma60": rng.integers(1, 20, 64).astype(float),
+        "ret": rng.normal(0, 0.02, 64),
+        "vol": rng.uniform(0, 0.1, 64),
+        "z": rng.choice([0.0, -1.0, 0.7, 2.0], 64),
+    }
+    expected = [evaluate(expr, {k: float(v[i]) for k, v in cols.items()}) for i in range(64)]
+    assert evaluate_vectorized(expr, cols).tolist() == expected
+
+
+def test_evaluate_vectorized_division_by_zero_respects_short_circuit() -> None:
+    cols = {"vol": np.array([0.0, 0.5, 0.0]), "ret": np.array([1.0, 1.0, 1.0])}
+    assert evaluate_vectorized("ret / vol > 1", cols).tolist() == [False, True, False]
+    assert evaluate_vectorized("vol == 0 or ret / vol > 1", cols).tolist() == [True, True, True]
+
+
+def test_evaluate_vectorized_rejects_unknown_columns_and_malicious_syntax() -> None:
+    with pytest.raises(ExpressionValidationError):
+        evaluate_vectorized("close > 1", {"price": np.zeros(2)})
+    with pytest.raises(ExpressionValidationError):
+        evaluate_vectorized("__import__('os')", {"close": np.zeros(2)})
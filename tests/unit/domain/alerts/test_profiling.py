@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from quantsentinel.domain.alerts.profiling import CycleProfile, merge_profiles
+
+
+def test_cycle_profile_records_stages_rule_types_and_rule_percentiles() -> None:
+    queries = {"n": 0}
+    profile = CycleProfile(query_count=lambda: queries["n"])
+    rule = SimpleNamespace(id="r1", rule_type="z_score", name="Z")
+
+    with profile.stage("dedup"):
+        for ticker in ("A", "B", "C", "D"):
+            with profile.measure(rule, ticker, evaluation=False):
+                queries["n"] += 1
+    with profile.stage("evaluate"), profile.measure(rule, "A", evaluation=True):
+        pass
+
+    out = profile.to_dict()
+    assert set(out["stages_ms"]) == {"dedup", "evaluate"}
+    assert out["stage_queries"] == {"dedup": 4, "evaluate": 0}
+    assert out["queries"] == 4
+    assert set(out["rule_types_ms"]) == {"z_score"}
+    (r,) = out["rules"]
+    assert (r["rule_id"], r["rule_type"], r["name"], r["tickers"], r["queries"]) == ("r1", "z_score", "Z", 4, 4)
+    assert 0 <= r["p50_ms"] <= r["p95_ms"] <= r["total_ms"]
+
+
+def test_merge_profiles_sums_stages_and_combines_split_rules() -> None:
+    shard = {
+        "total_ms": 10.0,
+        "queries": 3,
+        "stages_ms": {"evaluate": 4.0},
+        "stage_queries": {"dedup": 3},
+        "rule_types_ms": {"threshold": 4.0},
+        "rules": [{"rule_id": "r1", "rule_type": "threshold", "name": "", "tickers": 2, "total_ms": 4.0, "p50_ms": 2.0, "p95_ms": 3.0, "queries": 3}],
+    }
+    other = {**shard, "total_ms": 12.0, "rules": [{**shard["rules"][0], "tickers": 6, "p50_ms": 1.0, "p95_ms": 5.0}]}
+
+    merged = merge_profiles([shard, None, other], top_rules=5)
+
+    assert merged["total_ms"] == 12.0
+    assert merged["queries"] == 6
+    assert merged["stages_ms"] == {"evaluate": 8.0}
+    assert merged["stage_queries"] == {"dedup": 6}
+    (r,) = merged["rules"]
+    assert r["tickers"] == 8 and r["total_ms"] == 8.0
+    assert r["p50_ms"] == 1.25 and r["p95_ms"] == 5.0
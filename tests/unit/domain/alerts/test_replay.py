@@ -0,0 +1,120 @@
+from datetime import UTC, date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from quantsentinel.domain.alerts.evaluator import FeatureCache, RuleSpec, evaluate_rule
+from quantsentinel.domain.alerts.models import GovernancePolicy
+from quantsentinel.domain.alerts.replay import (
+    apply_governance,
+    replay_timeline,
+    run_replay,
+    ticker_signals,
+)
+from quantsentinel.domain.market.models import PriceSeries
+
+START = date(2023, 1, 2)
+
+
+def _walk(ticker: str, n: int, *, seed: int, skip: tuple[int, ...] = ()) -> PriceSeries:
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.cumprod(1 + rng.normal(0, 0.02, n))
+    pairs = [(START + timedelta(days=i), float(c)) for i, c in enumerate(closes) if i not in skip]
+    return PriceSeries.from_pairs(ticker, pairs)
+
+
+PANEL = {
+    "AAA": _walk("AAA", 90, seed=1),
+    "BBB": _walk("BBB", 90, seed=2, skip=(10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 40)),
+    "LATE": _walk("LATE", 60, seed=3).tail(30),
+    "BENCH": _walk("BENCH", 90, seed=4, skip=(5, 50)),
+}
+
+
+def _truncate(panel, day: date):
+    limit = np.datetime64(day, "D")
+    return {t: PriceSeries(ticker=t, dates=s.dates[s.dates <= limit], closes=s.closes[s.dates <= limit]) for t, s in panel.items()}
+
+
+@pytest.mark.parametrize(
+    ("rule_type", "params"),
+    [
+        ("threshold", {"operator": ">", "value": 100}),
+        ("threshold", {"operator": "<", "value": 100}),
+        ("z_score", {"lookback": 10, "threshold": 1.5}),
+        ("volatility", {"lookback": 5, "threshold": 0.02}),
+        ("staleness", {"max_days": 3}),
+        ("missing_data", {"lookback_days": 10, "min_points": 8}),
+        ("correlation_break", {"benchmark_ticker": "BENCH", "lookback": 8, "min_corr": 0.0}),
+        ("custom_expression", {"expression": "abs(z) > 0.8 and close > ma20 or vol > 0 and ret / vol < -1"}),
+    ],
+)
+def test_ticker_signals_match_per_bar_evaluation(rule_type: str, params: dict) -> None:
+    spec = RuleSpec(rule_id="r", rule_type=rule_type, params=params)
+    timeline = replay_timeline(PANEL, ["AAA", "BBB", "LATE"], start=START, end=START + timedelta(days=89))
+    for ticker in ("AAA", "BBB", "LATE"):
+        signals = ticker_signals(spec, ticker, PANEL, timeline)
+        expected = [
+            bool(evaluate_rule(spec, ticker, FeatureCache(_truncate(PANEL, d)), today=d))
+            for d in timeline.astype(object)
+        ]
+        assert signals.tolist() == expected, (rule_type, ticker)
+
+
+def _policy(**kwargs) -> GovernancePolicy:
+    return GovernancePolicy(**kwargs)
+
+
+def _timeline(n: int) -> np.ndarray:
+    return np.arange(np.datetime64(START, "D"), np.datetime64(START, "D") + np.timedelta64(n, "D"))
+
+
+def test_governance_dedup_window_suppresses_consecutive_days() -> None:
+    timeline = _timeline(5)
+    signals = np.array([[True, True, True, False, True]])
+    asof = np.tile(timeline, (1, 1))
+    hits, deduped, silenced = apply_governance(
+        signals, tickers=["AAA"], timeline=timeline, policy=_policy(dedup_minutes=2 * 1440), asof=asof
+    )
+    assert [h.event_date for h in hits] == [START, START + timedelta(days=4)]
+    assert deduped == 2 and silenced == 0
+
+    hits, deduped, _ = apply_governance(signals, tickers=["AAA"], timeline=timeline, policy=_policy(dedup_minutes=60), asof=asof)
+    assert len(hits) == 4 and deduped == 0
+
+
+def test_governance_aggregation_and_silence_windows() -> None:
+    timeline = _timeline(4)
+    signals = np.array([[False, True, True, True], [True, True, False, True]])
+    asof = np.tile(timeline, (2, 1))
+    windows = [(datetime(2023, 1, 4, tzinfo=UTC), datetime(2023, 1, 5, tzinfo=UTC))]
+    hits, deduped, silenced = apply_governance(
+        signals,
+        tickers=["AAA", "BBB"],
+        timeline=timeline,
+        policy=_policy(aggregation_key="basket"),
+        asof=asof,
+        silence_windows=windows,
+    )
+    assert [(h.event_date.day, h.ticker, h.source_ticker) for h in hits] == [(2, "basket", "BBB"), (3, "basket", "AAA"), (5, "basket", "AAA")]
+    assert deduped == 2  # BBB collapsed into the basket on days 3 and 5
+    assert silenced == 1
+
+
+def test_run_replay_counts_hits_and_honours_silenced_until() -> None:
+    spec = RuleSpec(rule_id="r", rule_type="threshold", params={"operator": ">", "value": 0}, tickers=("AAA", "BBB"))
+    result = run_replay(spec, PANEL, start=START, end=START + timedelta(days=9), policy=_policy(dedup_minutes=60))
+    assert result.bars == 10
+    assert result.per_ticker() == {"AAA": 10, "BBB": 10}
+    assert result.to_dict()["hit_count"] == 20
+
+    until = datetime(2023, 1, 7, tzinfo=UTC)
+    silenced = run_replay(spec, PANEL, start=START, end=START + timedelta(days=9), policy=_policy(silenced_until=until))
+    assert silenced.events_silenced == 5
+    assert silenced.hit_count == 10
+
+
+def test_run_replay_empty_scope() -> None:
+    spec = RuleSpec(rule_id="r", rule_type="threshold", params={}, tickers=())
+    result = run_replay(spec, PANEL, start=START, end=START, policy=_policy())
+    assert result.bars == 0 and result.hits == []
@@ -0,0 +1,50 @@
+import pytest
+
+from quantsentinel.domain.alerts.sharding import (
+    ShardItem,
+    estimate_rule_cost,
+    partition_by_cost,
+    shard_count,
+    split_rule,
+)
+
+
+def test_estimate_rule_cost_weights_by_type_and_scope() -> None:
+    assert estimate_rule_cost(rule_type="threshold", n_tickers=10) == 10.0
+    assert estimate_rule_cost(rule_type="correlation_break", n_tickers=10) == 40.0
+    assert estimate_rule_cost(rule_type="unknown", n_tickers=0) == 1.0
+
+
+def test_split_rule_chunks_large_scopes() -> None:
+    tickers = [f"T{i}" for i in range(10)]
+    items = split_rule(rule_id="r1", rule_type="z_score", tickers=tickers, max_cost=9.0)
+    assert [len(it.tickers) for it in items] == [3, 3, 3, 1]
+    assert all(it.cost <= 9.0 for it in items)
+    assert [t for it in items for t in it.tickers] == tickers
+
+
+def test_split_rule_keeps_empty_scope_as_single_item() -> None:
+    items = split_rule(rule_id="r1", rule_type="threshold", tickers=[], max_cost=5.0)
+    assert items == [ShardItem(rule_id="r1", tickers=(), cost=1.0)]
+
+
+def test_partition_by_cost_balances_load() -> None:
+    items = [ShardItem(rule_id=f"r{i}", tickers=(), cost=c) for i, c in enumerate([4, 4, 3, 3, 2, 2])]
+    shards = partition_by_cost(items, max_shards=2)
+    loads = sorted(sum(it.cost for it in shard) for shard in shards)
+    assert loads == [9.0, 9.0]
+    assert sorted(it.rule_id for shard in shards for it in shard) == [f"r{i}" for i in range(6)]
+
+
+def test_partition_by_cost_drops_empty_shards_and_validates() -> None:
+    items = [ShardItem(rule_id="r1", tickers=(), cost=1.0)]
+    assert len(partition_by_cost(items, max_shards=4)) == 1
+    assert partition_by_cost([], max_shards=4) == []
+    with pytest.raises(ValueError):
+        partition_by_cost(items, max_shards=0)
+
+
+def test_shard_count_is_bounded() -> None:
+    assert shard_count(total_cost=100, target_cost=2000, max_shards=8) == 1
+    assert shard_count(total_cost=5000, target_cost=2000, max_shards=8) == 3
+    assert shard_count(total_cost=1e9, target_cost=2000, max_shards=8) == 8
@@ -0,0 +1,126 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from quantsentinel.domain.market.correlation import (
+    RollingCorrelation,
+    RollingCorrelations,
+    correlations_to_benchmark,
+)
+from quantsentinel.domain.market.models import PriceSeries
+
+START = date(2024, 1, 1)
+
+
+def _series(ticker: str, closes, *, skip=()) -> PriceSeries:
+    return PriceSeries.from_pairs(ticker, [(START + timedelta(days=i), c) for i, c in enumerate(closes) if i not in skip])
+
+
+def _naive(a: PriceSeries, b: PriceSeries, lookback: int) -> float | None:
+    _, ia, ib = np.intersect1d(a.dates, b.dates, return_indices=True)
+    ca, cb = a.closes[ia][-(lookback + 1) :], b.closes[ib][-(lookback + 1) :]
+    if ca.shape[0] < 4:
+        return None
+    mask = (ca[:-1] != 0) & (cb[:-1] != 0)
+    ra, rb = ca[1:][mask] / ca[:-1][mask] - 1, cb[1:][mask] / cb[:-1][mask] - 1
+    if ra.shape[0] < 3 or ra.std() == 0 or rb.std() == 0:
+        return None
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+rng = np.random.default_rng(11)
+BENCH = 100 * np.cumprod(1 + rng.normal(0, 0.01, 40))
+PANEL = {
+    "BENCH": _series("BENCH", BENCH, skip=(7,)),
+    "TRACK": _series("TRACK", BENCH * 1.5 + rng.normal(0, 0.3, 40)),
+    "GAPPY": _series("GAPPY", 50 * np.cumprod(1 + rng.normal(0, 0.02, 40)), skip=(30, 31, 35)),
+    "ZERO": _series("ZERO", [*([10.0] * 36), 0.0, 5.0, 6.0, 7.0]),
+    "FLAT": _series("FLAT", [3.0] * 40),
+    "SHORT": _series("SHORT", [1.0, 2.0, 3.0]),
+}
+
+
+@pytest.mark.parametrize("lookback", [3, 5, 20, 60])
+def test_batch_matches_per_ticker_computation(lookback: int) -> None:
+    tickers = [*PANEL, "NONE"]
+    got = correlations_to_benchmark(PANEL, tickers, "BENCH", lookback)
+    for ticker in tickers:
+        expected = _naive(PANEL.get(ticker) or PriceSeries.empty(ticker), PANEL["BENCH"], lookback)
+        if expected is None:
+            assert got[ticker] is None, ticker
+        else:
+            assert got[ticker] == pytest.approx(expected, abs=1e-9), ticker
+    assert got["TRACK"] > 0.5
+    assert got["FLAT"] is None and got["SHORT"] is None and got["NONE"] is None
+
+
+def test_missing_benchmark_yields_none() -> None:
+    assert correlations_to_benchmark(PANEL, ["TRACK"], "SPY", 20) == {"TRACK": None}
+
+
+def test_rolling_updates_match_batch_recomputation() -> None:
+    cutoff = np.datetime64(START + timedelta(days=24), "D")
+    head = {t: PriceSeries(t, s.dates[s.dates <= cutoff], s.closes[s.dates <= cutoff]) for t, s in PANEL.items()}
+    tickers = ["TRACK", "GAPPY", "ZERO", "FLAT"]
+    rolling = RollingCorrelation.from_panel(head, tickers, "BENCH", 10)
+    assert rolling.values() == pytest.approx(correlations_to_benchmark(head, tickers, "BENCH", 10))
+
+    bench = PANEL["BENCH"]
+    for day, bench_close in zip(bench.dates, bench.closes, strict=True):
+        if day <= cutoff:
+            continue
+        bar = {}
+        for t in tickers:
+            s = PANEL[t]
+            at = np.flatnonzero(s.dates == day)
+            if at.size:
+                bar[t] = float(s.closes[at[0]])
+        rolling.update(day, bar, float(bench_close))
+
+    expected = correlations_to_benchmark(PANEL, tickers, "BENCH", 10)
+    for ticker, value in rolling.values().items():
+        if expected[ticker] is None:
+            assert value is None, ticker
+        else:
+            assert value == pytest.approx(expected[ticker], abs=1e-9), ticker
+
+
+def _tail(series: PriceSeries, day: np.datetime64, bars: int) -> PriceSeries:
+    keep = series.dates <= day
+    return PriceSeries(series.ticker, series.dates[keep][-bars:], series.closes[keep][-bars:])
+
+
+def test_store_advances_from_monitor_panels_and_matches_batch() -> None:
+    tickers = ["TRACK", "GAPPY", "ZERO", "FLAT"]
+    store = RollingCorrelations()
+    bench = PANEL["BENCH"]
+    for i, day in enumerate(bench.dates[20:]):
+        # Like a prices-updated cycle: the last lookback + 1 bars of the benchmark and of
+        # the tickers that received data; GAPPY only shows up every third cycle.
+        updated = [t for t in tickers if t != "GAPPY" or i % 3 == 0]
+        panel = {t: _tail(PANEL[t], day, 11) for t in ["BENCH", *updated]}
+        store.correlations(panel, updated, "BENCH", 10)
+
+    full = {t: _tail(s, bench.dates[-1], 40) for t, s in PANEL.items()}
+    expected = correlations_to_benchmark(full, tickers, "BENCH", 10)
+    got = store.correlations(full, tickers, "BENCH", 10)
+    for ticker in tickers:
+        if expected[ticker] is None:
+            assert got[ticker] is None, ticker
+        else:
+            assert got[ticker] == pytest.approx(expected[ticker], abs=1e-9), ticker
+
+
+def test_store_reseed_picks_up_revised_bars() -> None:
+    store = RollingCorrelations()
+    before = store.correlations(PANEL, ["TRACK"], "BENCH", 10)
+    track = PANEL["TRACK"]
+    revised = {**PANEL, "TRACK": PriceSeries("TRACK", track.dates, track.closes[::-1].copy())}
+
+    stale = store.correlations(revised, ["TRACK"], "BENCH", 10)
+    fresh = store.correlations(revised, ["TRACK"], "BENCH", 10, reseed=True)
+
+    assert stale == before  # no bar after the last one seen: nothing to shift in
+    assert fresh["TRACK"] == pytest.approx(correlations_to_benchmark(revised, ["TRACK"], "BENCH", 10)["TRACK"])
+    assert store.correlations(PANEL, ["NONE"], "BENCH", 10) == {"NONE": None}
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import numpy as np
+
+from quantsentinel.domain.market.qc import REJECT_FLAGS, QCConfig, QCFlag, check_bars
+
+
+def _days(n: int, start: str = "2024-01-01") -> np.ndarray:
+    return np.datetime64(start) + np.arange(n)
+
+
+def test_row_checks_flag_inconsistent_ohlc_and_non_positive_prices() -> None:
+    nan = np.nan
+    result = check_bars(
+        _days(5),
+        open=np.array([10.0, 12.5, 10.0, 0.0, nan]),
+        high=np.array([11.0, 12.0, 11.0, 1.0, nan]),
+        low=np.array([9.0, 9.0, 11.5, 0.0, nan]),
+        close=np.array([10.5, 11.0, 10.0, 0.5, 10.0]),
+    )
+
+    assert result.flags.tolist() == [
+        0,
+        QCFlag.OHLC_INCONSISTENT,  # open above high
+        QCFlag.OHLC_INCONSISTENT,  # low above high
+        QCFlag.NON_POSITIVE_PRICE,
+        0,  # missing values never trip a check
+    ]
+    assert result.keep.tolist() == [True, False, False, False, True]
+    assert result.summary.rejected == 3 and result.summary.describe() == "OHLC_INCONSISTENT:2,NON_POSITIVE_PRICE:1"
+
+
+def test_duplicates_keep_the_last_row_per_group_in_input_order() -> None:
+    dates = np.array(["2024-01-03", "2024-01-02", "2024-01-02", "2024-01-02"], dtype="datetime64[D]")
+    groups = np.array(["AAA", "AAA", "AAA", "BBB"])
+
+    result = check_bars(dates, close=np.ones(4), groups=groups)
+
+    assert result.has(QCFlag.DUPLICATE_DATE).tolist() == [False, True, False, False]
+
+
+def test_return_spike_is_flagged_against_the_groups_mad() -> None:
+    rng = np.random.default_rng(7)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 60)))
+    closes[30] *= 1.8  # one bad print
+    other = 50 * np.exp(np.cumsum(rng.normal(0, 0.01, 60)))
+
+    result = check_bars(
+        np.concatenate([_days(60), _days(60)]),
+        close=np.concatenate([closes, other]),
+        groups=np.array(["AAA"] * 60 + ["BBB"] * 60),
+    )
+
+    spikes = np.flatnonzero(result.has(QCFlag.RETURN_SPIKE))
+    assert spikes.tolist() == [30, 31]  # the jump and the reversal; BBB is clean
+    assert result.keep.all()  # spikes are warnings, not rejections
+
+
+def test_short_series_are_not_spike_checked() -> None:
+    result = check_bars(_days(5), close=np.array([1.0, 1.0, 5.0, 1.0, 1.0]))
+    assert not result.has(QCFlag.RETURN_SPIKE).any()
+
+
+def test_zero_volume_runs_and_calendar_gaps() -> None:
+    dates = np.concatenate([_days(8), _days(4, "2024-02-01")])
+    volume = np.array([5, 0, 0, 0, 0, 0, 5, 0, 0, 0, 0, 5], dtype=float)
+
+    result = check_bars(dates, close=np.ones(12), volume=volume, config=QCConfig(zero_volume_run=5, max_gap_days=7))
+
+    assert np.flatnonzero(result.has(QCFlag.ZERO_VOLUME_RUN)).tolist() == [1, 2, 3, 4, 5]
+    assert np.flatnonzero(result.has(QCFlag.CALENDAR_GAP)).tolist() == [8]
+    assert not (result.flags & int(REJECT_FLAGS)).any()
+
+
+def test_runs_and_gaps_do_not_cross_groups() -> None:
+    dates = np.array(["2024-01-01", "2024-01-02", "2024-03-01", "2024-03-02"], dtype="datetime64[D]")
+    result = check_bars(
+        dates,
+        close=np.ones(4),
+        volume=np.zeros(4),
+        groups=np.array(["A", "A", "B", "B"]),
+        config=QCConfig(zero_volume_run=3),
+    )
+    assert result.summary.flagged == 0
+
+
+def test_empty_input() -> None:
+    result = check_bars(np.array([], dtype="datetime64[D]"))
+    assert result.flags.shape == (0,) and result.summary.rows == 0
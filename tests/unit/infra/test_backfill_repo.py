@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import date
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from quantsentinel.infra.db.repos.backfill_repo import (
+    STATUS_DONE,
+    STATUS_FAILED,
+    BackfillCheckpoint,
+    BackfillRepo,
+)
+
+
+class _RecordingSession:
+    def __init__(self, rows=()) -> None:
+        self.statements = []
+        self._rows = list(rows)
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return SimpleNamespace(all=lambda: self._rows, scalars=lambda: SimpleNamespace(all=lambda: self._rows))
+
+
+def _sql(stmt) -> tuple[str, dict]:
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+def test_record_upserts_checkpoints_and_counts_attempts() -> None:
+    session = _RecordingSession()
+    BackfillRepo(session).record(
+        [
+            BackfillCheckpoint("AAA", date(2024, 1, 1), date(2024, 6, 30), STATUS_FAILED, error="HTTP 500"),
+            BackfillCheckpoint("AAA", date(2024, 1, 1), date(2024, 6, 30), STATUS_DONE, rows=120),
+            BackfillCheckpoint("BBB", date(2024, 1, 1), date(2024, 6, 30), STATUS_DONE, rows=118),
+        ]
+    )
+
+    assert len(session.statements) == 1
+    sql, params = _sql(session.statements[0])
+    assert "ON CONFLICT (ticker, chunk_start) DO UPDATE" in sql
+    assert "attempts = (backfill_chunks.attempts + " in sql and "updated_at = now()" in sql
+    assert params["status_m0"] == STATUS_DONE and params["rows_m0"] == 120  # last checkpoint per chunk wins
+    assert "ticker_m2" not in params
+
+
+def test_completed_returns_done_chunks_and_skips_empty_input() -> None:
+    session = _RecordingSession([("AAA", date(2024, 1, 1))])
+
+    assert BackfillRepo(session).completed(["AAA", "BBB"]) == {("AAA", date(2024, 1, 1))}
+    sql, params = _sql(session.statements[0])
+    assert "backfill_chunks.status = " in sql and STATUS_DONE in params.values()
+
+    assert BackfillRepo(session).completed([]) == set()
+    BackfillRepo(session).record([])
+    assert len(session.statements) == 1
+
+
+def test_unfinished_groups_by_ticker_on_failed_or_missing_chunks() -> None:
+    session = _RecordingSession(["AAA"])
+
+    starts = [date(2023, 1, 1), date(2023, 5, 1)]
+    assert BackfillRepo(session).unfinished(["AAA", "BBB"], chunk_starts=starts) == {"AAA"}
+    sql, params = _sql(session.statements[0])
+    assert "GROUP BY backfill_chunks.ticker" in sql
+    assert "count(*) FILTER (WHERE backfill_chunks.status = " in sql and "HAVING" in sql
+    assert STATUS_FAILED in params.values() and 2 in params.values()
+
+    assert BackfillRepo(session).unfinished([], chunk_starts=starts) == set()
+    assert len(session.statements) == 1
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import gzip
+import sys
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from quantsentinel.infra.db.repos.prices_repo import UpsertResult
+from quantsentinel.infra.providers.csv_import import ImportFormatError, ImportStats, read_price_file
+
+VENDOR_CSV = """Symbol,Date,Open,High,Low,Close,Adj Close,Vol
+AAA,2024-01-02,10,11,9,10.5,10.4,"1,000"
+AAA,20240103,10.5,12,10,11,10.9,1200
+BBB,2024-01-02 00:00:00,5,6,4,5.5,,null
+BBB,2024-01-03,5,4,6,5,5,10
+,2024-01-03,1,1,1,1,1,1
+CCC,not-a-date,1,1,1,1,1,1
+CCC,2024-01-04,abc,1,1,1,1,1
+CCC,2024-01-05,,,,,,5
+CCC,2024-01-06,-1,1,1,1,1,1
+DDD,2024-01-02,9,8,7,7.5,7.5,1
+"""
+
+
+def _chunks(path, **kwargs):
+    return list(read_price_file(path, revision_id="rev", source="vendor", **kwargs))
+
+
+def test_csv_rows_are_normalized_and_bad_rows_rejected(tmp_path) -> None:
+    path = tmp_path / "dump.csv"
+    path.write_text(VENDOR_CSV)
+
+    chunks = _chunks(path)
+    rows = [row for chunk in chunks for row in chunk.rows]
+    rejected = [line for chunk in chunks for line in chunk.rejected]
+
+    assert [(r.ticker, r.date) for r in rows] == [
+        ("AAA", date(2024, 1, 2)),
+        ("AAA", date(2024, 1, 3)),
+        ("BBB", date(2024, 1, 2)),
+    ]
+    assert rows[0].volume == Decimal("1000") and rows[0].adj_close == Decimal("10.4")
+    assert rows[2].adj_close is None and rows[2].volume is None
+    assert {r.source for r in rows} == {"vendor"} and {r.revision_id for r in rows} == {"rev"}
+    assert rejected == [
+        "line 5: high < low",
+        "line 6: missing ticker",
+        "line 7: bad date 'not-a-date'",
+        "line 8: bad open 'abc'",
+        "line 9: no prices",
+        "line 10: negative open",
+        "line 11: qc ohlc_inconsistent",
+    ]
+    assert chunks[-1].progress == 1.0
+
+
+@pytest.mark.parametrize("name", ["history.csv.gz", "HISTORY.CSV.GZ"])
+def test_chunks_are_bounded_and_gzip_is_streamed(tmp_path, name) -> None:
+    path = tmp_path / name
+    lines = ["date,close"] + [f"2024-01-{d:02d},{d}" for d in range(1, 26)]
+    path.write_bytes(gzip.compress("\n".join(lines).encode()))
+
+    chunks = _chunks(path, ticker="ONE", chunk_rows=10)
+
+    assert [chunk.read for chunk in chunks] == [10, 10, 5]
+    assert all(row.ticker == "ONE" for chunk in chunks for row in chunk.rows)
+    assert [chunk.progress for chunk in chunks] == sorted(chunk.progress for chunk in chunks)
+
+
+@pytest.mark.parametrize(
+    ("name", "content", "match"),
+    [
+        ("prices.txt", "date,close\n", "unsupported"),
+        ("prices.csv", "date,close\n2024-01-02,1\n", "ticker"),
+        ("prices.csv", "ticker,date,volume\nA,2024-01-02,1\n", "no price column"),
+    ],
+)
+def test_unusable_files_fail_up_front(tmp_path, name, content, match) -> None:
+    path = tmp_path / name
+    path.write_text(content)
+
+    with pytest.raises(ImportFormatError, match=match):
+        _chunks(path)
+
+
+def test_parquet_input_is_read_in_batches(tmp_path, monkeypatch) -> None:
+    # Some app smoke tests leave a bare pandas stub in sys.modules; pyarrow probes pandas on use.
+    if not hasattr(sys.modules.get("pandas"), "__version__"):
+        monkeypatch.delitem(sys.modules, "pandas", raising=False)
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "dump.parquet"
+    table = pa.table(
+        {
+            "ticker": ["AAA"] * 5,
+            "date": [date(2024, 1, d) for d in range(1, 6)],
+            "close": [1.0, 2.0, float("nan"), 4.0, 5.0],
+        }
+    )
+    pq.write_table(table, path)
+
+    chunks = _chunks(path, chunk_rows=2)
+
+    assert [chunk.read for chunk in chunks] == [2, 2, 1]
+    assert [row.close for chunk in chunks for row in chunk.rows] == [Decimal("1.0"), Decimal("2.0"), Decimal("4.0"), Decimal("5.0")]
+    assert chunks[1].rejected == ["line 3: no prices"]
+
+
+def test_stats_accumulate_counts_and_cap_reject_samples(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr("quantsentinel.infra.providers.csv_import.MAX_REJECT_SAMPLES", 2)
+    path = tmp_path / "dump.csv"
+    path.write_text(VENDOR_CSV)
+
+    stats = ImportStats()
+    for chunk in _chunks(path, chunk_rows=4):
+        stats.add(chunk, UpsertResult(inserted=len(chunk.rows)))
+
+    assert (stats.rows_read, stats.rows_loaded, stats.rows_rejected, stats.chunks) == (10, 3, 7, 3)
+    assert stats.inserted == 3 and stats.tickers == {"AAA", "BBB"}
+    assert len(stats.reject_samples) == 2
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from quantsentinel.infra.db.engine import count_queries
+
+
+def test_count_queries_counts_only_statements_on_the_session() -> None:
+    engine = create_engine("sqlite://")
+    with Session(engine) as session, Session(engine) as other:
+        with count_queries(session) as counter:
+            session.execute(text("SELECT 1"))
+            session.execute(text("SELECT 2"))
+            other.execute(text("SELECT 3"))
+        session.execute(text("SELECT 4"))
+    assert counter() == 2
+
+
+def test_count_queries_tolerates_non_session_objects() -> None:
+    with count_queries(object()) as counter:
+        pass
+    assert counter.count == 0
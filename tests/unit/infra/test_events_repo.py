@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, date, datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from quantsentinel.infra.db.models import AlertEventStatus
+from quantsentinel.infra.db.repos.events_repo import AlertEventCreate, EventsRepo
+
+
+class _Result:
+    def __init__(self, row=None) -> None:
+        self._row = row
+
+    def one_or_none(self):
+        return self._row
+
+
+class _RecordingSession:
+    def __init__(self, row=None) -> None:
+        self.statements = []
+        self._row = row
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return _Result(self._row)
+
+
+def _sql(stmt) -> tuple[str, dict]:
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+def _event(i: int) -> AlertEventCreate:
+    return AlertEventCreate(rule_id=uuid.uuid4(), ticker=f"T{i}", message=f"hit {i}", context={"i": i}, asof_date=None)
+
+
+def test_create_events_uses_one_multi_row_insert_per_chunk(monkeypatch) -> None:
+    monkeypatch.setattr(EventsRepo, "BULK_INSERT_CHUNK", 2)
+    session = _RecordingSession()
+    events = [_event(i) for i in range(5)]
+
+    ids = EventsRepo(session).create_events(events)
+
+    assert len(ids) == 5 and len(set(ids)) == 5
+    assert len(session.statements) == 3 + 3  # event chunks, then rollup upsert chunks
+    compiled = session.statements[0].compile(dialect=postgresql.dialect())
+    assert str(compiled).count("VALUES") == 1
+    params = compiled.params
+    assert params["id_m0"] == ids[0] and params["id_m1"] == ids[1]
+    assert params["ticker_m1"] == "T1"
+    assert params["status_m0"] == AlertEventStatus.NEW
+    assert params["event_ts_m0"] == params["event_ts_m1"]
+
+
+def test_create_events_empty_is_a_no_op() -> None:
+    session = _RecordingSession()
+    assert EventsRepo(session).create_events([]) == []
+    assert session.statements == []
+
+
+def test_create_events_upserts_rollup_counts_per_rule_ticker_day_status() -> None:
+    session = _RecordingSession()
+    rule_id = uuid.uuid4()
+    events = [
+        AlertEventCreate(rule_id=rule_id, ticker="AAA", message="a", context=None, asof_date=None),
+        AlertEventCreate(rule_id=rule_id, ticker="AAA", message="b", context=None, asof_date=None),
+        AlertEventCreate(rule_id=rule_id, ticker="BBB", message="c", context=None, asof_date=None),
+    ]
+
+    EventsRepo(session).create_events(events)
+
+    sql, params = _sql(session.statements[-1])
+    assert "INSERT INTO alert_event_rollups" in sql
+    assert "ON CONFLICT (rule_id, ticker, day, status) DO UPDATE SET count = (alert_event_rollups.count + excluded.count)" in sql
+    assert (params["ticker_m0"], params["count_m0"]) == ("AAA", 2)
+    assert (params["ticker_m1"], params["count_m1"]) == ("BBB", 1)
+    assert params["day_m0"] == datetime.now(UTC).date()
+
+
+def test_ack_moves_one_count_from_new_to_acked_on_the_event_day() -> None:
+    rule_id = uuid.uuid4()
+    row = SimpleNamespace(rule_id=rule_id, ticker="AAA", event_ts=datetime(2024, 3, 1, 23, 30, tzinfo=UTC))
+    session = _RecordingSession(row)
+
+    assert EventsRepo(session).ack(event_id=uuid.uuid4(), actor_id=uuid.uuid4()) is True
+
+    update_sql, _ = _sql(session.statements[0])
+    assert "alert_events.status = %(status_1)s" in update_sql and "RETURNING" in update_sql
+    _, params = _sql(session.statements[1])
+    deltas = {params[f"status_m{i}"]: params[f"count_m{i}"] for i in range(2)}
+    assert deltas == {AlertEventStatus.NEW: -1, AlertEventStatus.ACKED: 1}
+    assert params["day_m0"] == date(2024, 3, 1)
+
+
+def test_ack_of_already_acked_event_leaves_rollups_alone() -> None:
+    session = _RecordingSession(None)
+    assert EventsRepo(session).ack(event_id=uuid.uuid4(), actor_id=uuid.uuid4()) is False
+    assert len(session.statements) == 1
+
+
+@pytest.mark.parametrize("group_by", ["day", "rule", "ticker", "severity"])
+def test_rollup_counts_reads_only_the_rollup_table(group_by: str) -> None:
+    class _Rows(_RecordingSession):
+        def execute(self, stmt):
+            self.statements.append(stmt)
+            return SimpleNamespace(all=lambda: [])
+
+    session = _Rows()
+    assert EventsRepo(session).rollup_counts(group_by=group_by, since=date(2024, 1, 1), limit=5) == []
+    sql, _ = _sql(session.statements[0])
+    assert "FROM alert_event_rollups" in sql
+    assert "alert_events " not in sql and "alert_events." not in sql
+
+
+def test_rollup_counts_rejects_unknown_grouping() -> None:
+    with pytest.raises(ValueError):
+        EventsRepo(_RecordingSession()).rollup_counts(group_by="status")
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from quantsentinel.infra.providers.http_client import HttpClient
+
+PAYLOAD = {"chart": {"result": [{"timestamp": list(range(50))}]}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+    seen_encodings: list[str] = []
+
+    def setup(self) -> None:
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self) -> None:
+        type(self).seen_encodings.append(self.headers.get("Accept-Encoding", ""))
+        raw = json.dumps(PAYLOAD).encode()
+        if self.path.startswith("/gzip"):
+            body, encoding = gzip.compress(raw), "gzip"
+        elif self.path.startswith("/deflate"):
+            body, encoding = zlib.compress(raw), "deflate"
+        else:
+            body, encoding = raw, None
+        status = 429 if self.path.startswith("/limited") else 200
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if self.path.endswith("close"):
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+        if self.path.endswith("drop"):
+            # Drop the connection without announcing it, like an idle-timeout on the server.
+            self.close_connection = True
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture()
+def server():
+    _Handler.connections = 0
+    _Handler.seen_encodings = []
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_requests_reuse_one_keep_alive_connection(server) -> None:
+    client = HttpClient()
+
+    for _ in range(5):
+        assert json.loads(client.get(f"{server}/plain?x=1").text()) == PAYLOAD
+
+    assert _Handler.connections == 1
+    assert client.connections_opened == 1
+    client.close()
+
+
+@pytest.mark.parametrize("path", ["/gzip", "/deflate"])
+def test_compressed_bodies_are_requested_and_decoded(server, path) -> None:
+    resp = HttpClient().get(f"{server}{path}")
+
+    assert resp.status == 200 and json.loads(resp.body) == PAYLOAD
+    assert "gzip" in _Handler.seen_encodings[0] and "deflate" in _Handler.seen_encodings[0]
+
+
+def test_error_statuses_are_returned_not_raised(server) -> None:
+    resp = HttpClient().get(f"{server}/limited")
+    assert resp.status == 429
+
+
+def test_server_closed_connections_are_not_reused(server) -> None:
+    client = HttpClient()
+
+    client.get(f"{server}/plain-close")
+    client.get(f"{server}/plain")
+
+    assert _Handler.connections == 2
+
+
+def test_stale_idle_connection_is_replaced_transparently(server) -> None:
+    client = HttpClient()
+    client.get(f"{server}/plain-drop")
+
+    assert client.get(f"{server}/plain").status == 200
+    assert _Handler.connections == 2
+
+
+def test_rejects_non_http_urls() -> None:
+    with pytest.raises(ValueError):
+        HttpClient().get("ftp://example.com/x")
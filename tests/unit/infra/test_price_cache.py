@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+
+import numpy as np
+
+from quantsentinel.infra.cache.price_cache import PriceCache
+from quantsentinel.infra.db.repos.prices_repo import LatestRevision
+
+T0 = datetime(2024, 1, 10, tzinfo=UTC)
+
+
+class _FakePricesRepo:
+    """In-memory bars with per-row ingest timestamps; counts the reads the cache issues."""
+
+    def __init__(self) -> None:
+        self.bars: dict[str, dict[date, tuple[float, datetime]]] = {}
+        self.revisions: dict[str, LatestRevision] = {}
+        self.calls: list[tuple[str, list[str]]] = []
+
+    def put(self, ticker: str, day: date, close: float, *, at: datetime) -> None:
+        self.bars.setdefault(ticker, {})[day] = (close, at)
+        rev = self.revisions.get(ticker)
+        self.revisions[ticker] = LatestRevision(
+            revision_id=(rev.revision_id + 1) if rev else 1,
+            last_date=max(self.bars[ticker]),
+            updated_at=at,
+        )
+
+    def get_latest_revisions(self, tickers):
+        self.calls.append(("latest", list(tickers)))
+        return {t: self.revisions[t] for t in tickers if t in self.revisions}
+
+    def get_close_arrays(self, *, tickers, ingested_after=None):
+        self.calls.append(("delta" if ingested_after is not None else "full", list(tickers)))
+        out = {}
+        for t in tickers:
+            rows = sorted(
+                (d, c) for d, (c, at) in self.bars.get(t, {}).items()
+                if ingested_after is None or at > ingested_after[t]
+            )
+            out[t] = (
+                np.array([d for d, _ in rows], dtype="datetime64[D]"),
+                np.array([c for _, c in rows], dtype=np.float64),
+            )
+        return out
+
+
+def _seed(repo: _FakePricesRepo, ticker: str, n: int, *, at: datetime = T0) -> None:
+    for i in range(n):
+        repo.put(ticker, date(2024, 1, 1) + timedelta(days=i), 100.0 + i, at=at)
+
+
+def test_cold_read_loads_from_db_then_serves_memory_mapped_hits(tmp_path) -> None:
+    repo = _FakePricesRepo()
+    _seed(repo, "AAA", 5)
+    cache = PriceCache(tmp_path)
+
+    first = cache.read(repo, ["AAA"])
+    assert first["AAA"][1].tolist() == [100.0, 101.0, 102.0, 103.0, 104.0]
+    assert [c[0] for c in repo.calls] == ["latest", "full"]
+
+    repo.calls.clear()
+    dates, closes = cache.read(repo, ["AAA"])["AAA"]
+    assert [c[0] for c in repo.calls] == ["latest"]
+    assert isinstance(closes, np.memmap) and dates.dtype == np.dtype("datetime64[D]")
+    assert cache.stats.to_dict() == {"hits": 1, "appended": 0, "reloaded": 1, "evicted": 0}
+
+
+def test_new_bars_after_cached_history_are_appended(tmp_path) -> None:
+    repo = _FakePricesRepo()
+    _seed(repo, "AAA", 3)
+    cache = PriceCache(tmp_path)
+    cache.read(repo, ["AAA"])
+
+    repo.put("AAA", date(2024, 1, 4), 200.0, at=T0 + timedelta(hours=1))
+    repo.calls.clear()
+    dates, closes = cache.read(repo, ["AAA"])["AAA"]
+
+    assert [c[0] for c in repo.calls] == ["latest", "delta"]
+    assert closes.tolist() == [100.0, 101.0, 102.0, 200.0]
+    assert dates[-1] == np.datetime64("2024-01-04")
+    assert cache.stats.appended == 1
+    # Only the current generation is kept on disk.
+    assert len([p for p in (tmp_path / "AAA").iterdir() if p.is_dir()]) == 1
+
+
+def test_rewritten_history_forces_a_full_reload(tmp_path) -> None:
+    repo = _FakePricesRepo()
+    _seed(repo, "AAA", 3)
+    cache = PriceCache(tmp_path)
+    cache.read(repo, ["AAA"])
+
+    repo.put("AAA", date(2024, 1, 2), 999.0, at=T0 + timedelta(hours=1))
+    repo.calls.clear()
+    closes = cache.read(repo, ["AAA"])["AAA"][1]
+
+    assert [c[0] for c in repo.calls] == ["latest", "delta", "full"]
+    assert closes.tolist() == [100.0, 999.0, 102.0]
+    assert cache.stats.reloaded == 2
+
+
+def test_marker_without_new_rows_reloads_and_missing_marker_evicts(tmp_path) -> None:
+    repo = _FakePricesRepo()
+    _seed(repo, "AAA", 3)
+    _seed(repo, "BBB", 2)
+    cache = PriceCache(tmp_path)
+    cache.read(repo, ["AAA", "BBB"])
+
+    # A delete moves the marker without leaving newer rows behind.
+    del repo.bars["AAA"][date(2024, 1, 3)]
+    repo.revisions["AAA"] = LatestRevision(revision_id=99, last_date=date(2024, 1, 2), updated_at=T0 + timedelta(hours=2))
+    del repo.revisions["BBB"]
+
+    out = cache.read(repo, ["AAA", "BBB"])
+    assert out["AAA"][1].tolist() == [100.0, 101.0]
+    assert out["BBB"][0].size == 0
+    assert not (tmp_path / "BBB").exists()
+    assert cache.stats.evicted == 1
+
+
+def test_read_slices_by_window_and_depth(tmp_path) -> None:
+    repo = _FakePricesRepo()
+    _seed(repo, "^GSPC", 10)
+    _seed(repo, "EURUSD=X", 4)
+    cache = PriceCache(tmp_path)
+
+    window = cache.read(repo, ["^GSPC"], start=date(2024, 1, 3), end=date(2024, 1, 5))["^GSPC"]
+    assert window[0].astype(object).tolist() == [date(2024, 1, 3), date(2024, 1, 4), date(2024, 1, 5)]
+
+    out = cache.read(repo, ["^GSPC", "EURUSD=X"], days={"^GSPC": 2})
+    assert out["^GSPC"][1].tolist() == [108.0, 109.0]
+    assert out["EURUSD=X"][1].size == 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["%5EGSPC", "EURUSD%3DX"]
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from quantsentinel.infra.artifacts import storage
+from quantsentinel.infra.artifacts.storage import PriceLake, ticker_bucket
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.fixture(autouse=True)
+def _real_pandas(monkeypatch):
+    # Some app smoke tests leave a bare pandas stub in sys.modules; pyarrow probes pandas on use.
+    if not hasattr(sys.modules.get("pandas"), "__version__"):
+        monkeypatch.delitem(sys.modules, "pandas", raising=False)
+
+
+def _rows(ticker: str, start: date, n: int, base: float) -> list[tuple]:
+    return [
+        (ticker, start + timedelta(days=i), base + i, base + i + 1, base + i - 1, base + i, base + i, 1000.0)
+        for i in range(n)
+    ]
+
+
+def _export(lake: PriceLake, *, buckets: int = 4, part_rows: int = 1000):
+    writer = lake.writer(buckets=buckets, part_rows=part_rows)
+    # Ordered by (ticker, date), as PricesRepo.iter_bar_batches yields them.
+    writer.add_rows(_rows("AAA", date(2022, 12, 30), 5, 10.0))
+    writer.add_rows([*_rows("BBB", date(2023, 6, 1), 3, 50.0), ("BBB", date(2023, 6, 4), None, None, None, None, None, None)])
+    return writer.commit(revisions={"AAA": "r-a", "BBB": "r-b"})
+
+
+def test_export_partitions_by_bucket_and_year_with_manifest(tmp_path) -> None:
+    lake = PriceLake(tmp_path)
+    manifest = _export(lake)
+
+    assert manifest.rows == 9
+    assert manifest.tickers == {"AAA": "r-a", "BBB": "r-b"}
+    parts = {(p.bucket, p.year): p for p in manifest.partitions}
+    a = ticker_bucket("AAA", 4)
+    assert parts[(a, 2022)].rows == 2 and parts[(a, 2022)].max_date == date(2022, 12, 31)
+    assert f"bucket={a:02d}/year=2023/" in parts[(a, 2023)].path
+    assert lake.manifest() == manifest
+    assert json.loads((tmp_path / "manifest.json").read_text())["revision"] == manifest.revision
+
+
+def test_buffered_rows_stay_capped_across_buckets_and_years(tmp_path) -> None:
+    lake = PriceLake(tmp_path)
+    writer = lake.writer(buckets=4, part_rows=50, max_buffered_rows=20)
+    # Ticker-ordered input spreads across every (bucket, year), so no single buffer fills.
+    expected = []
+    for i, ticker in enumerate(["AAA", "BBB", "CCC", "DDD", "EEE", "FFF"]):
+        rows = _rows(ticker, date(2021, 12, 20), 30, 10.0 * (i + 1))
+        expected.extend(rows)
+        writer.add_rows(rows)
+        assert writer.max_buffered <= 20
+    manifest = writer.commit()
+
+    assert manifest.rows == len(expected)
+    assert all(p.rows < 50 for p in manifest.partitions)
+    table = lake.scan(columns=["close"])
+    assert sorted(zip(table.column("ticker").to_pylist(), table.column("date").to_pylist(), strict=True)) == sorted(
+        (r[0], r[1]) for r in expected
+    )
+
+
+def test_scan_prunes_columns_tickers_and_dates(tmp_path) -> None:
+    lake = PriceLake(tmp_path)
+    manifest = _export(lake)
+
+    table = lake.scan(tickers=["AAA"], start=date(2023, 1, 1), columns=["close"])
+    assert table.column_names == ["ticker", "date", "close"]
+    assert table.column("date").to_pylist() == [date(2023, 1, 1), date(2023, 1, 2), date(2023, 1, 3)]
+    assert manifest.select(tickers=["AAA"], end=date(2022, 12, 31)) == [
+        p for p in manifest.partitions if p.bucket == ticker_bucket("AAA", 4) and p.year == 2022
+    ]
+    assert lake.scan(tickers=[]).num_rows == 0
+    with pytest.raises(ValueError):
+        lake.scan(columns=["bogus"])
+
+
+def test_read_close_arrays_matches_repo_shape(tmp_path) -> None:
+    lake = PriceLake(tmp_path)
+    _export(lake, part_rows=2)
+
+    out = lake.read_close_arrays(tickers=["BBB", "AAA", "ZZZ"], end=date(2023, 6, 30))
+    dates, closes = out["AAA"]
+    assert dates.dtype == np.dtype("datetime64[D]") and closes.dtype == np.float64
+    assert closes.tolist() == [10.0, 11.0, 12.0, 13.0, 14.0]
+    # Null closes are dropped, as in PricesRepo.get_close_arrays.
+    assert out["BBB"][1].tolist() == [50.0, 51.0, 52.0]
+    assert out["ZZZ"][0].size == 0
+
+
+def test_new_revision_replaces_manifest_and_prunes_older_ones(tmp_path) -> None:
+    lake = PriceLake(tmp_path)
+    first = _export(lake)
+    second = _export(lake)
+    third = _export(lake)
+
+    assert lake.manifest().revision == third.revision
+    revisions = {p.name for p in tmp_path.iterdir() if p.is_dir()}
+    assert revisions == {second.revision, third.revision}
+    assert first.revision not in revisions
+
+
+def test_commit_keeps_the_parts_of_an_export_still_writing(tmp_path) -> None:
+    lake = PriceLake(tmp_path)
+    old = _export(lake)
+    slow = lake.writer(buckets=4, part_rows=2)
+    slow.add_rows(_rows("CCC", date(2023, 1, 2), 4, 5.0))  # parts already on disk
+    fast = _export(lake)
+
+    assert (tmp_path / slow.revision).is_dir()
+    slow.add_rows(_rows("DDD", date(2023, 1, 2), 1, 7.0))
+    manifest = slow.commit(revisions={"CCC": "r-c", "DDD": "r-d"})
+
+    assert lake.manifest() == manifest
+    assert lake.scan(tickers=["CCC"]).num_rows == 4 and lake.scan(tickers=["DDD"]).num_rows == 1
+    # The first export was published before, so it is pruned; fast is now the previous revision.
+    assert {p.name for p in tmp_path.iterdir() if p.is_dir()} == {fast.revision, slow.revision}
+    assert old.revision not in {fast.revision, slow.revision}
+
+
+def test_abandoned_unpublished_revisions_are_pruned(tmp_path) -> None:
+    lake = PriceLake(tmp_path)
+    crashed = lake.writer(buckets=4, part_rows=2)
+    crashed.add_rows(_rows("CCC", date(2023, 1, 2), 4, 5.0))
+    abandoned = time.time() - storage.ABANDONED_EXPORT_SECONDS - 3600
+    os.utime(tmp_path / crashed.revision, (abandoned, abandoned))
+
+    manifest = _export(lake)
+
+    assert {p.name for p in tmp_path.iterdir() if p.is_dir()} == {manifest.revision}
+
+def test_missing_lake_reads_empty(tmp_path) -> None:
+    lake = PriceLake(tmp_path / "none")
+    assert lake.manifest() is None
+    assert lake.read_close_arrays(tickers=["AAA"])["AAA"][0].size == 0
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from quantsentinel.infra.db.engine import count_queries
+from quantsentinel.infra.db.models import Base, Instrument, PriceDaily
+from quantsentinel.infra.db.repos.prices_repo import PricesRepo
+
+START = date(2024, 1, 1)
+CLOSES = {
+    "AAA": [100, 102, 101, 104, 108],
+    "BBB": [50, 49, 51],
+    "ONE": [10],
+}
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Instrument.__table__, PriceDaily.__table__])
+    with Session(engine) as s:
+        revision = uuid.uuid4()
+        bars = [(t, START + timedelta(days=i), Decimal(c)) for t, closes in CLOSES.items() for i, c in enumerate(closes)]
+        bars.append(("BBB", START + timedelta(days=3), None))
+        s.add_all(Instrument(ticker=t, is_watched=True) for t in CLOSES)
+        # sqlite only autoincrements INTEGER primary keys, so ids are explicit here.
+        s.add_all(PriceDaily(id=i, ticker=t, date=d, close=c, revision_id=revision) for i, (t, d, c) in enumerate(bars, start=1))
+        s.flush()
+        yield s
+
+
+def test_bulk_reads_match_single_ticker_reads_in_one_query_each(session) -> None:
+    repo = PricesRepo(session)
+    tickers = [*CLOSES, "NONE"]
+
+    with count_queries(session) as queries:
+        latest = repo.get_latest_price_dates(tickers)
+        recent = repo.get_recent_closes_many(tickers=tickers, days=3)
+        two = repo.get_latest_two_closes_many(tickers)
+        stats = repo.get_return_stats_many(tickers=tickers, lookback=3)
+    assert queries() == 4
+
+    for ticker in CLOSES:
+        assert latest[ticker] == repo.get_latest_price_date(ticker)
+        assert recent[ticker] == repo.get_recent_closes(ticker=ticker, days=3)
+        assert two[ticker] == repo.get_latest_two_closes(ticker)
+        assert stats[ticker] == repo.get_return_stats(ticker=ticker, lookback=3)
+    assert "NONE" not in latest
+    assert recent["NONE"] == [] and two["NONE"] == (None, None) and stats["NONE"] == (None, None)
+
+
+def test_recent_closes_many_honours_per_ticker_depth(session) -> None:
+    out = PricesRepo(session).get_recent_closes_many(tickers=["AAA", "BBB", "ONE"], days={"AAA": 2, "BBB": 5})
+    assert [c for _, c in out["AAA"]] == [104.0, 108.0]
+    assert [c for _, c in out["BBB"]] == [50.0, 49.0, 51.0]
+    assert out["ONE"] == []
+
+
+def test_bulk_reads_with_no_tickers_skip_the_database(session) -> None:
+    repo = PricesRepo(session)
+    with count_queries(session) as queries:
+        assert repo.get_latest_price_dates([]) == {}
+        assert repo.get_recent_closes_many(tickers=[], days=5) == {}
+        assert repo.get_recent_closes_many(tickers=["AAA"], days={}) == {"AAA": []}
+    assert queries() == 0
+
+
+def test_iter_bar_batches_streams_ordered_float_rows(session) -> None:
+    batches = list(PricesRepo(session).iter_bar_batches(tickers=["BBB", "AAA"], batch_size=3))
+
+    assert [len(b) for b in batches] == [3, 3, 3]
+    rows = [row for batch in batches for row in batch]
+    assert [(t, d) for t, d, *_ in rows] == sorted((t, d) for t, d, *_ in rows)
+    assert rows[0] == ("AAA", START, None, None, None, 100.0, None, None)
+    assert rows[-1][0] == "BBB" and rows[-1][5] is None
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+from sqlalchemy.dialects import postgresql
+
+from quantsentinel.infra.db.repos.prices_repo import PricesRepo
+
+
+class _RecordingSession:
+    def __init__(self, rows) -> None:
+        self.statements = []
+        self._rows = rows
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return self
+
+    def all(self):
+        return self._rows
+
+
+def _sql(stmt) -> str:
+    return " ".join(str(stmt.compile(dialect=postgresql.dialect())).split())
+
+
+def test_close_arrays_aggregate_per_ticker_with_server_side_float_cast() -> None:
+    epoch_days = (np.array(["2024-01-02", "2024-01-03"], dtype="datetime64[D]") - np.datetime64("1970-01-01")).astype(int)
+    session = _RecordingSession([("AAA", list(epoch_days), [101.5, 102.25])])
+
+    out = PricesRepo(session).get_close_arrays(tickers=["AAA", "BBB", "AAA"], start=date(2024, 1, 1), end=date(2024, 1, 31))
+
+    dates, closes = out["AAA"]
+    assert dates.dtype == np.dtype("datetime64[D]") and closes.dtype == np.float64
+    assert dates.tolist() == [date(2024, 1, 2), date(2024, 1, 3)]
+    assert closes.tolist() == [101.5, 102.25]
+    assert out["BBB"][0].size == 0 and out["BBB"][1].dtype == np.float64
+
+    sql = _sql(session.statements[0])
+    assert len(session.statements) == 1
+    assert "CAST(prices_daily.close AS FLOAT)" in sql
+    assert "array_agg(anon_1.date - %(param_1)s ORDER BY anon_1.date)" in sql
+    assert "GROUP BY anon_1.ticker" in sql
+    assert "instruments" not in sql
+
+
+def test_close_arrays_limit_depth_per_ticker_with_row_number() -> None:
+    session = _RecordingSession([])
+    repo = PricesRepo(session)
+
+    repo.get_close_arrays(tickers=["AAA", "BBB"], days={"AAA": 5, "BBB": 21})
+    sql = _sql(session.statements[0])
+    assert "row_number() OVER (PARTITION BY prices_daily.ticker ORDER BY prices_daily.date DESC)" in sql
+    assert sql.count(".rn <=") == 2
+
+    dates, closes = repo.get_close_arrays(tickers=["AAA"], days={})["AAA"]
+    assert dates.size == 0 and closes.size == 0
+    assert len(session.statements) == 1
+    assert repo.get_close_arrays(tickers=[]) == {}
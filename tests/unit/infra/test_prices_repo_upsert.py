@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from quantsentinel.infra.db.repos.prices_repo import (
+    PriceDailyCreate,
+    PricesRepo,
+    UpsertResult,
+    bar_content_hash,
+)
+
+
+class _Result:
+    def __init__(self, flags: list[bool]) -> None:
+        self._flags = flags
+
+    def scalars(self):
+        return self
+
+    def all(self) -> list[bool]:
+        return self._flags
+
+
+class _RecordingSession:
+    """Pretends the first row of every chunk already existed."""
+
+    def __init__(self) -> None:
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        n = len(stmt.compile(dialect=postgresql.dialect()).params) // 10
+        return _Result([i != 0 for i in range(n)])
+
+
+def _bar(day: int, close: str = "1.0", ticker: str = "AAA") -> PriceDailyCreate:
+    return PriceDailyCreate(ticker=ticker, date=date(2024, 1, day), close=Decimal(close), source="yahoo", revision_id=uuid.uuid4())
+
+
+def test_upsert_many_issues_chunked_on_conflict_upserts(monkeypatch) -> None:
+    monkeypatch.setattr(PricesRepo, "UPSERT_CHUNK", 2)
+    session = _RecordingSession()
+
+    result = PricesRepo(session).upsert_many([_bar(d) for d in range(1, 6)])
+
+    assert len(session.statements) == 3 + 1  # upsert chunks, then the instrument_latest refresh
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT ON CONSTRAINT uq_prices_daily_ticker_date DO UPDATE" in sql
+    assert "close = excluded.close" in sql and "ingested_at = now()" in sql
+    assert "RETURNING xmax = 0" in sql
+    assert result == UpsertResult(inserted=2, updated=3)
+    assert result.total == 5
+
+
+def test_upsert_many_keeps_last_duplicate_and_skips_empty_input() -> None:
+    session = _RecordingSession()
+    PricesRepo(session).upsert_many([_bar(1, "1.0"), _bar(2), _bar(1, "9.5")])
+
+    params = session.statements[0].compile(dialect=postgresql.dialect()).params
+    assert params["close_m0"] == Decimal("9.5")
+    assert "date_m2" not in params
+
+    assert PricesRepo(session).upsert_many([]) == UpsertResult()
+    assert len(session.statements) == 2
+
+
+def test_upsert_many_refreshes_instrument_latest_in_the_same_session() -> None:
+    session = _RecordingSession()
+    PricesRepo(session).upsert_many([_bar(1), _bar(2, ticker="BBB"), _bar(3)])
+
+    refresh = session.statements[-1].compile(dialect=postgresql.dialect())
+    sql = " ".join(str(refresh).split())
+    assert sql.startswith("INSERT INTO instrument_latest (ticker, last_date, last_close, prev_close, change, revision_id, updated_at) SELECT")
+    assert "lead(prices_daily.close) OVER (PARTITION BY prices_daily.ticker ORDER BY prices_daily.date DESC)" in sql
+    assert "ON CONFLICT (ticker) DO UPDATE SET last_date = excluded.last_date" in sql
+    assert sorted(v for v in refresh.params.values() if isinstance(v, list))[0] == ["AAA", "BBB"]
+
+
+class _Copy:
+    def __init__(self, sink: list) -> None:
+        self.sink = sink
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+    def write_row(self, row) -> None:
+        self.sink.append(row)
+
+
+class _Cursor(_Copy):
+    def __init__(self, sink: list, commands: list[str]) -> None:
+        super().__init__(sink)
+        self.commands = commands
+
+    def copy(self, sql: str) -> _Copy:
+        self.commands.append(sql)
+        return _Copy(self.sink)
+
+
+class _CopySession(_RecordingSession):
+    """Records COPY rows through a psycopg-like driver connection."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.copied: list[tuple] = []
+        self.commands: list[str] = []
+        driver = SimpleNamespace(cursor=lambda: _Cursor(self.copied, self.commands))
+        self._connection = SimpleNamespace(connection=SimpleNamespace(driver_connection=driver))
+
+    def connection(self):
+        return self._connection
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return SimpleNamespace(one=lambda: (2, 3))
+
+
+def test_copy_upsert_stages_rows_with_copy_then_merges_once() -> None:
+    session = _CopySession()
+
+    result = PricesRepo(session).copy_upsert([_bar(1, "1.0"), _bar(2), _bar(1, "9.5"), _bar(4, ticker="BBB")])
+
+    assert result == UpsertResult(inserted=2, updated=1)
+    assert session.commands == [
+        "COPY prices_daily_stage (ticker, date, open, high, low, close, adj_close, volume, source, revision_id) FROM STDIN"
+    ]
+    assert [(row[0], row[1], row[5]) for row in session.copied] == [
+        ("AAA", date(2024, 1, 1), Decimal("9.5")),
+        ("AAA", date(2024, 1, 2), Decimal("1.0")),
+        ("BBB", date(2024, 1, 4), Decimal("1.0")),
+    ]
+    merge = str(session.statements[1])
+    assert "ON CONFLICT ON CONSTRAINT uq_prices_daily_ticker_date DO UPDATE" in merge
+    assert "ingested_at = now()" in merge
+    assert str(session.statements[2]) == "TRUNCATE prices_daily_stage"
+    assert "instrument_latest" in str(session.statements[3].compile(dialect=postgresql.dialect()))
+
+
+def test_copy_upsert_skips_empty_input() -> None:
+    session = _CopySession()
+    assert PricesRepo(session).copy_upsert([]) == UpsertResult()
+    assert session.statements == [] and session.copied == []
+
+
+def test_bar_content_hash_matches_stored_numeric_rendering() -> None:
+    # numeric(18, 8) renders as 10.50000000 in Postgres; the Python side must agree.
+    stored = PriceDailyCreate(ticker="AAA", date=date(2024, 1, 2), close=Decimal("10.50000000"), source="x", revision_id=None)
+    fetched = PriceDailyCreate(ticker="AAA", date=date(2024, 1, 2), close=10.5, source="y", revision_id=uuid.uuid4())
+    moved = PriceDailyCreate(ticker="AAA", date=date(2024, 1, 2), open=10.5, source="x", revision_id=None)
+
+    assert bar_content_hash(stored) == bar_content_hash(fetched)
+    assert bar_content_hash(stored) != bar_content_hash(moved)
+    assert bar_content_hash(_bar(1, "10.5")) != bar_content_hash(_bar(1, "10.50000001"))
+
+
+class _HashSession:
+    def __init__(self, stored: list[PriceDailyCreate]) -> None:
+        self.rows = [(r.ticker, r.date, bar_content_hash(r)) for r in stored]
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return SimpleNamespace(all=lambda: self.rows)
+
+
+def test_diff_against_stored_splits_new_changed_and_unchanged_bars() -> None:
+    session = _HashSession([_bar(1, "1.0"), _bar(2, "2.0"), _bar(3, "3.0")])
+
+    diff = PricesRepo(session).diff_against_stored(
+        [_bar(1, "1.0"), _bar(2, "2.5"), _bar(3, "3.0"), _bar(4, "4.0"), _bar(4, "4.0", ticker="BBB")]
+    )
+
+    assert [(r.ticker, r.date.day) for r in diff.inserted] == [("AAA", 4), ("BBB", 4)]
+    assert [r.date.day for r in diff.changed] == [2]
+    assert diff.unchanged == 2
+    assert diff.per_ticker == {"AAA": (1, 1, 2), "BBB": (1, 0, 0)}
+    assert len(diff.rows) == 3
+    assert len(session.statements) == 1
+    compiled = session.statements[0].compile(dialect=postgresql.dialect())
+    assert "md5(concat_ws(" in str(compiled) and "(VALUES " in str(compiled)
+    # Each ticker is scanned over its own date span only: BBB does not inherit AAA's range.
+    params = [compiled.params[f"param_{i}"] for i in range(1, 7)]
+    assert params == ["AAA", date(2024, 1, 1), date(2024, 1, 4), "BBB", date(2024, 1, 4), date(2024, 1, 4)]
+
+    assert PricesRepo(session).diff_against_stored([]).rows == []
+    assert len(session.statements) == 1
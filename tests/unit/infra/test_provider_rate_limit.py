@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+
+from quantsentinel.infra.providers import yahoo
+from quantsentinel.infra.providers.base import (
+    ProviderBlocked,
+    ProviderNotFound,
+    ProviderRateLimited,
+)
+from quantsentinel.infra.providers.http_client import HttpResponse
+from quantsentinel.infra.providers.rate_limit import (
+    AdaptiveConcurrency,
+    ProviderThrottle,
+    RateLimitConfig,
+    RedisTokenBucket,
+    TokenBucket,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _throttle(**overrides) -> ProviderThrottle:
+    cfg = RateLimitConfig(**{"rate": 1000.0, "burst": 1000, **overrides})
+    return ProviderThrottle(bucket=TokenBucket(rate=cfg.rate, burst=cfg.burst), concurrency=AdaptiveConcurrency(cfg))
+
+
+def test_token_bucket_allows_burst_then_paces_at_rate() -> None:
+    clock = _Clock()
+    bucket = TokenBucket(rate=2.0, burst=2, clock=clock, sleep=clock.sleep)
+
+    for _ in range(4):
+        bucket.acquire()
+
+    assert clock.sleeps == [0.5, 0.5]
+    clock.now += 10
+    bucket.acquire()
+    assert len(clock.sleeps) == 2  # refilled (capped at burst) while idle
+
+
+def test_redis_bucket_sleeps_for_the_wait_the_script_returns() -> None:
+    calls, sleeps = [], []
+
+    class _Client:
+        def register_script(self, source):
+            assert "HMGET" in source
+            return lambda keys, args: calls.append((keys, args)) or 250
+
+    bucket = RedisTokenBucket(_Client(), key="rl:yahoo", rate=4.0, burst=8, sleep=sleeps.append)
+    bucket.acquire()
+
+    assert calls[0][0] == ["rl:yahoo"] and calls[0][1][:3] == [4.0, 8.0, 1.0]
+    assert sleeps == [0.25]
+
+
+def test_aimd_grows_additively_and_shrinks_multiplicatively_within_bounds() -> None:
+    limiter = AdaptiveConcurrency(RateLimitConfig(initial_concurrency=4.0, min_concurrency=1.0, max_concurrency=6.0))
+
+    for _ in range(4):
+        limiter.on_success()
+    assert 4.9 < limiter.limit < 5.0  # about +1 per window of `limit` successes
+
+    limiter.on_rate_limited()
+    assert 2.4 < limiter.limit < 2.5
+    for _ in range(5):
+        limiter.on_rate_limited()
+    assert limiter.limit == 1.0
+    for _ in range(200):
+        limiter.on_success()
+    assert limiter.limit == 6.0
+
+
+def test_slots_block_beyond_the_current_limit() -> None:
+    limiter = AdaptiveConcurrency(RateLimitConfig(initial_concurrency=1.0))
+    entered = threading.Event()
+
+    def second() -> None:
+        with limiter.slot():
+            entered.set()
+
+    with limiter.slot():
+        t = threading.Thread(target=second)
+        t.start()
+        assert not entered.wait(0.1)
+    t.join(timeout=2)
+    assert entered.is_set() and limiter.in_flight == 0
+
+
+def test_throttle_backs_off_on_rate_limit_and_reraises() -> None:
+    throttle = _throttle(initial_concurrency=4.0)
+
+    with pytest.raises(ProviderRateLimited), throttle.request():
+        raise ProviderRateLimited("429")
+    assert throttle.concurrency.limit == 2.0
+
+    with throttle.request():
+        pass
+    assert throttle.concurrency.limit == 2.5
+
+
+class _FakeClient:
+    def __init__(self, outcomes) -> None:
+        self.outcomes = list(outcomes)
+        self.calls: list[str] = []
+
+    def get(self, url, *, headers=None, timeout=15.0):
+        self.calls.append(url)
+        status, body, response_headers = self.outcomes.pop(0)
+        return HttpResponse(status=status, headers=response_headers, body=json.dumps(body).encode())
+
+
+def _install(monkeypatch, outcomes):
+    sleeps: list[float] = []
+    monkeypatch.setattr(yahoo.time, "sleep", sleeps.append)
+    return _FakeClient(outcomes), sleeps
+
+
+def test_429_is_retried_after_retry_after_and_shrinks_concurrency(monkeypatch) -> None:
+    client, sleeps = _install(monkeypatch, [(429, {}, {"retry-after": "7"}), (200, {"chart": {}}, {})])
+    throttle = _throttle(initial_concurrency=4.0)
+
+    assert yahoo._http_get_json("https://example", yahoo.YahooProviderConfig(), throttle, client) == {"chart": {}}
+    assert len(client.calls) == 2
+    assert sleeps == [7.0]
+    assert throttle.concurrency.limit == 2.5  # halved, then one success
+
+
+@pytest.mark.parametrize(("code", "error"), [(401, ProviderBlocked), (403, ProviderBlocked), (404, ProviderNotFound)])
+def test_blocked_and_not_found_fail_fast_without_retry(monkeypatch, code, error) -> None:
+    client, sleeps = _install(monkeypatch, [(code, {}, {})])
+    throttle = _throttle(initial_concurrency=4.0)
+
+    with pytest.raises(error):
+        yahoo._http_get_json("https://example", yahoo.YahooProviderConfig(), throttle, client)
+    assert len(client.calls) == 1 and sleeps == []
+    assert throttle.concurrency.limit == 4.0
+
+
+def test_persistent_429_raises_rate_limited_after_retries(monkeypatch) -> None:
+    client, sleeps = _install(monkeypatch, [(429, {}, {})] * 3)
+
+    with pytest.raises(ProviderRateLimited):
+        yahoo._http_get_json("https://example", yahoo.YahooProviderConfig(backoff_base_seconds=1.0), _throttle(), client)
+    assert len(client.calls) == 3 and sleeps == [1.0, 2.0]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+
+import pytest
+
+from quantsentinel.infra.providers import rate_limit, registry
+from quantsentinel.infra.providers.base import (
+    FetchRequest,
+    PriceProvider,
+    ProviderBase,
+    ProviderNotFound,
+)
+from quantsentinel.infra.providers.rate_limit import RateLimitConfig
+from quantsentinel.infra.providers.yahoo import YahooProvider
+
+DAY = date(2024, 1, 2)
+
+
+class _Single(ProviderBase):
+    name = "single"
+    rate_limit = RateLimitConfig(rate=9.0, burst=9)
+
+    def fetch_daily(self, *, ticker, start, end):
+        if ticker == "BAD":
+            raise ProviderNotFound("Ticker not found.")
+        return [{"date": start, "close": 1.0, "ticker": ticker}]
+
+
+@pytest.fixture()
+def isolated_registry(monkeypatch):
+    monkeypatch.setattr(registry, "_FACTORIES", dict(registry._FACTORIES))
+    monkeypatch.setattr(registry, "_INSTANCES", {})
+    monkeypatch.setattr(rate_limit, "PROVIDER_LIMITS", dict(rate_limit.PROVIDER_LIMITS))
+    monkeypatch.setattr(registry, "PROVIDER_LIMITS", rate_limit.PROVIDER_LIMITS)
+
+
+def test_default_batch_isolates_failing_tickers() -> None:
+    requests = [FetchRequest("AAA", DAY, DAY), FetchRequest("BAD", DAY, DAY), FetchRequest("CCC", DAY, DAY)]
+
+    result = _Single().fetch_daily_batch(requests)
+
+    assert sorted(result.rows) == ["AAA", "CCC"]
+    assert isinstance(result.errors["BAD"], ProviderNotFound)
+
+
+def test_async_batch_matches_the_sync_batch() -> None:
+    requests = [FetchRequest("AAA", DAY, DAY), FetchRequest("BAD", DAY, DAY)]
+
+    result = asyncio.run(_Single().afetch_daily_batch(requests))
+
+    assert result.rows == {"AAA": [{"date": DAY, "close": 1.0, "ticker": "AAA"}]}
+    assert list(result.errors) == ["BAD"]
+
+
+def test_sources_resolve_to_registered_providers_or_the_default(isolated_registry) -> None:
+    registry.register_provider("Single", _Single)
+
+    assert registry.provider_name_for_source("single") == "single"
+    assert registry.provider_name_for_source(None) == registry.DEFAULT_PROVIDER
+    assert registry.provider_name_for_source("csv") == registry.DEFAULT_PROVIDER
+    assert registry.provider_for_source("SINGLE") is registry.get_provider("single")
+    assert rate_limit.PROVIDER_LIMITS["single"].rate == 9.0
+    with pytest.raises(KeyError):
+        registry.get_provider("nope")
+
+
+def test_yahoo_declares_the_provider_contract() -> None:
+    assert issubclass(YahooProvider, ProviderBase)
+    assert isinstance(YahooProvider(client=object(), throttle=object()), PriceProvider)
+    assert YahooProvider.capabilities.batch is False
+    assert YahooProvider.rate_limit is rate_limit.PROVIDER_LIMITS["yahoo"]
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import time
+from datetime import date
+
+import pytest
+
+from quantsentinel.infra.providers import response_cache, yahoo
+from quantsentinel.infra.providers.base import ProviderError
+from quantsentinel.infra.providers.http_client import HttpResponse
+from quantsentinel.infra.providers.rate_limit import (
+    AdaptiveConcurrency,
+    ProviderThrottle,
+    RateLimitConfig,
+    TokenBucket,
+)
+from quantsentinel.infra.providers.response_cache import CacheKey, ResponseCache
+
+KEY = CacheKey("yahoo", "AAA", "2024-01-02", "2024-01-05")
+PAYLOAD = {
+    "chart": {
+        "result": [
+            {
+                "timestamp": [1704153600],  # 2024-01-02
+                "indicators": {"quote": [{"open": [1.0], "high": [2.0], "low": [0.5], "close": [1.5], "volume": [10]}]},
+            }
+        ],
+        "error": None,
+    }
+}
+
+
+class _FakeClient:
+    def __init__(self, outcomes) -> None:
+        self.outcomes = list(outcomes)
+        self.calls: list[dict] = []
+
+    def get(self, url, *, headers=None, timeout=15.0):
+        self.calls.append(dict(headers or {}))
+        status, body, response_headers = self.outcomes.pop(0)
+        return HttpResponse(status=status, headers=response_headers, body=json.dumps(body).encode() if body else b"")
+
+
+def _provider(cache, outcomes) -> tuple[yahoo.YahooProvider, _FakeClient]:
+    cfg = RateLimitConfig(rate=1000.0, burst=1000)
+    throttle = ProviderThrottle(bucket=TokenBucket(rate=cfg.rate, burst=cfg.burst), concurrency=AdaptiveConcurrency(cfg))
+    client = _FakeClient(outcomes)
+    return yahoo.YahooProvider(throttle=throttle, client=client, cache=cache), client
+
+
+def _fetch(provider):
+    return provider.fetch_daily(ticker="AAA", start=date(2024, 1, 2), end=date(2024, 1, 5))
+
+
+def test_round_trip_and_corruption_is_a_miss(tmp_path) -> None:
+    cache = ResponseCache(tmp_path)
+    cache.put(KEY, b'{"x": 1}', ttl_seconds=60, headers={"ETag": '"v1"'})
+
+    entry = cache.get(KEY)
+    assert entry is not None and entry.body == b'{"x": 1}' and entry.etag == '"v1"'
+    assert entry.is_fresh() and not entry.is_fresh(now=time.time() + 120)
+
+    body_path = next(tmp_path.rglob("*.body.gz"))
+    body_path.write_bytes(b"garbage")
+    assert cache.get(KEY) is None
+
+
+def test_fresh_entry_is_served_without_a_request(tmp_path) -> None:
+    cache = ResponseCache(tmp_path)
+    provider, client = _provider(cache, [(200, PAYLOAD, {"etag": '"v1"'})])
+
+    first = _fetch(provider)
+    second = _fetch(provider)
+
+    assert len(client.calls) == 1
+    assert first == second and first[0]["close"] == 1.5
+
+
+def test_stale_entry_is_revalidated_and_304_refreshes_it(tmp_path) -> None:
+    cache = ResponseCache(tmp_path)
+    cache.put(KEY, json.dumps(PAYLOAD).encode(), ttl_seconds=60, headers={"ETag": '"v1"'}, fetched_at=0.0)
+    provider, client = _provider(cache, [(304, None, {})])
+
+    rows = _fetch(provider)
+
+    assert client.calls[0]["If-None-Match"] == '"v1"'
+    assert rows[0]["close"] == 1.5
+    refreshed = cache.get(KEY)
+    assert refreshed is not None and refreshed.is_fresh() and refreshed.etag == '"v1"'
+
+
+def test_provider_errors_are_not_cached(tmp_path) -> None:
+    cache = ResponseCache(tmp_path)
+    error = {"chart": {"result": None, "error": {"description": "No data found"}}}
+    provider, _ = _provider(cache, [(200, error, {})])
+
+    with pytest.raises(ProviderError, match="No data found"):
+        _fetch(provider)
+    assert cache.get(KEY) is None
+
+
+def test_offline_mode_replays_stale_entries_and_fails_on_miss(tmp_path) -> None:
+    ResponseCache(tmp_path).put(KEY, json.dumps(PAYLOAD).encode(), ttl_seconds=1, fetched_at=0.0)
+    provider, client = _provider(ResponseCache(tmp_path, offline=True), [])
+
+    assert _fetch(provider)[0]["close"] == 1.5
+    with pytest.raises(ProviderError, match="offline"):
+        provider.fetch_daily(ticker="BBB", start=date(2024, 1, 2), end=date(2024, 1, 5))
+    assert client.calls == []
+
+
+def test_prune_removes_entries_older_than_max_age(tmp_path) -> None:
+    cache = ResponseCache(tmp_path, max_age_seconds=3600)
+    fresh = CacheKey("yahoo", "BBB", "2024-01-02", "2024-01-05")
+    cache.put(KEY, b"old", ttl_seconds=60)
+    cache.put(fresh, b"new", ttl_seconds=60)
+    old_meta, old_body = cache._paths(KEY)
+    meta = json.loads(old_meta.read_text())
+    meta["fetched_at"] = time.time() - 7200
+    old_meta.write_text(json.dumps(meta))
+
+    assert cache.prune() == 1
+    assert not old_meta.exists() and not old_body.exists()
+    assert cache.get(KEY) is None
+    assert cache.get(fresh).body == b"new"
+    assert ResponseCache(tmp_path, max_age_seconds=None).prune() == 0
+
+
+def test_configure_does_not_scan_and_the_first_put_prunes(tmp_path, monkeypatch) -> None:
+    ResponseCache(tmp_path).put(KEY, b"old", ttl_seconds=60, fetched_at=time.time() - 7200)
+    monkeypatch.setattr(response_cache, "_CACHE", None)
+
+    cache = response_cache.configure_response_cache(tmp_path, max_age_seconds=3600)
+    assert cache.get(KEY) is not None
+
+    cache.put(CacheKey("yahoo", "BBB", "2024-01-02", "2024-01-05"), b"new", ttl_seconds=60)
+    assert cache.get(KEY) is None
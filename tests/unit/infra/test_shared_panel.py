@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from quantsentinel.infra.cache.shared_panel import (
+    attach_panel,
+    attach_worker_panel,
+    build_close_panel,
+    publish_panel,
+    worker_panel,
+)
+
+
+def _arrays():
+    return {
+        "AAA": (np.array(["2024-01-02", "2024-01-03", "2024-01-05"], dtype="datetime64[D]"), np.array([1.0, 2.0, 3.0])),
+        "BBB": (np.array(["2024-01-03", "2024-01-04"], dtype="datetime64[D]"), np.array([10.0, 20.0])),
+    }
+
+
+def _row_sum(ticker: str) -> float:
+    panel = worker_panel()
+    return float(np.nansum(panel.row(ticker)))
+
+
+def test_build_close_panel_aligns_on_union_of_dates() -> None:
+    panel = build_close_panel(_arrays())
+
+    assert panel.tickers == ("AAA", "BBB")
+    assert panel.dates.astype(str).tolist() == ["2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"]
+    np.testing.assert_array_equal(panel.values, [[1.0, 2.0, np.nan, 3.0], [np.nan, 10.0, 20.0, np.nan]])
+    assert build_close_panel({}).values.shape == (0, 0)
+
+
+@pytest.mark.parametrize("use_file", [False, True])
+def test_attached_views_are_read_only_and_released_on_close(tmp_path, use_file: bool) -> None:
+    panel = build_close_panel(_arrays())
+
+    with publish_panel(panel, directory=tmp_path if use_file else None) as shared:
+        handle = pickle.loads(pickle.dumps(shared.handle))
+        attached = attach_panel(handle)
+        np.testing.assert_array_equal(attached.panel.values, panel.values)
+        with pytest.raises(ValueError):
+            attached.panel.values[0, 0] = 99.0
+        attached.close()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_pool_workers_attach_once_and_read_the_shared_panel() -> None:
+    with (
+        publish_panel(build_close_panel(_arrays())) as shared,
+        ProcessPoolExecutor(max_workers=2, initializer=attach_worker_panel, initargs=(shared.handle,)) as pool,
+    ):
+        assert list(pool.map(_row_sum, ["AAA", "BBB", "AAA"])) == [6.0, 30.0, 6.0]
+
+
+def test_worker_panel_requires_attachment() -> None:
+    with pytest.raises(RuntimeError):
+        worker_panel()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from quantsentinel.infra.tasks.pipeline import Pipeline
+
+
+def test_items_flow_through_all_stages_and_flush_drains_batches() -> None:
+    batches: list[list[int]] = []
+    buffer: list[int] = []
+
+    def batch(item, emit) -> None:
+        buffer.append(item)
+        if len(buffer) == 4:
+            emit(list(buffer))
+            buffer.clear()
+
+    def flush(emit) -> None:
+        if buffer:
+            emit(list(buffer))
+
+    pipeline = (
+        Pipeline()
+        .add("double", lambda item, emit: emit(item * 2), workers=3)
+        .add("batch", batch, flush=flush)
+        .add("sink", lambda item, emit: batches.append(item))
+    )
+    pipeline.run(range(10))
+
+    assert sorted(x for b in batches for x in b) == [x * 2 for x in range(10)]
+    assert [len(b) for b in batches] == [4, 4, 2]
+    stats = {s.name: s for s in pipeline.stats()}
+    assert stats["double"].items_in == 10 and stats["double"].workers == 3
+    assert stats["batch"].items_out == 3 and stats["sink"].items_in == 3
+
+
+def test_bounded_queues_hold_back_fast_producers() -> None:
+    produced = consumed = 0
+    lead: list[int] = []
+    lock = threading.Lock()
+
+    def produce(item, emit) -> None:
+        nonlocal produced
+        with lock:
+            produced += 1
+            lead.append(produced - consumed)
+        emit(item)
+
+    def consume(item, emit) -> None:
+        nonlocal consumed
+        time.sleep(0.005)
+        with lock:
+            consumed += 1
+
+    pipeline = Pipeline().add("produce", produce, maxsize=2).add("consume", consume, maxsize=2)
+    pipeline.run(range(40))
+
+    assert consumed == 40
+    # At most: queue capacity + the item in the consumer's hands + the one being emitted.
+    assert max(lead) <= 4
+    assert max(s.max_depth for s in pipeline.stats()) <= 2
+
+
+def test_stage_errors_stop_the_pipeline_and_are_raised() -> None:
+    seen: list[int] = []
+
+    def explode(item, emit) -> None:
+        if item == 3:
+            raise RuntimeError("boom")
+        emit(item)
+
+    pipeline = Pipeline().add("explode", explode, maxsize=1).add("sink", lambda item, emit: seen.append(item), maxsize=1)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        pipeline.run(range(1000))
+    assert len(seen) < 1000
+
+
+def test_progress_ticks_run_on_the_calling_thread() -> None:
+    ticks: list[tuple[str, str]] = []
+
+    def slow(item, emit) -> None:
+        time.sleep(0.02)
+
+    Pipeline().add("slow", slow).run(
+        range(10),
+        on_tick=lambda p: ticks.append((threading.current_thread().name, p.describe())),
+        tick_seconds=0.05,
+    )
+
+    assert ticks
+    assert {name for name, _ in ticks} == {threading.current_thread().name}
+    assert ticks[0][1].startswith("slow ") and "q=" in ticks[0][1]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from quantsentinel.infra.db.repos.tasks_repo import TasksRepo
+
+
+class _RecordingSession:
+    def __init__(self, rows=()) -> None:
+        self.statements = []
+        self.rows = list(rows)
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return SimpleNamespace(scalar_one_or_none=lambda: None, scalars=lambda: SimpleNamespace(all=lambda: self.rows))
+
+
+def test_find_active_matches_queued_args_of_pending_or_running_tasks() -> None:
+    session = _RecordingSession()
+
+    assert TasksRepo(session).find_active(task_type="backfill_history", celery_args={"tickers": ["AAA"]}) is None
+
+    compiled = session.statements[0].compile(dialect=postgresql.dialect(), compile_kwargs={"render_postcompile": True})
+    sql = str(compiled)
+    assert "JOIN audit_log ON" in sql and "audit_log.entity_id = CAST(tasks.id AS VARCHAR)" in sql
+    assert "@>" in sql and "tasks.status IN" in sql
+    assert {"PENDING", "RUNNING", "task_queued", "backfill_history"} <= {str(getattr(v, "value", v)) for v in compiled.params.values()}
+
+
+def test_list_active_args_reads_queued_args_of_pending_or_running_tasks() -> None:
+    session = _RecordingSession([{"tickers": ["AAA"]}, None])
+
+    assert TasksRepo(session).list_active_args(task_type="backfill_history") == [{"tickers": ["AAA"]}, {}]
+
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "FROM tasks JOIN audit_log ON" in sql and "tasks.status IN" in sql
@@ -18,6 +18,7 @@ def _install_stubs() -> None:
             return False
 
     engine.session_scope = lambda: Scope()
+    engine.count_queries = lambda _session: Scope()
     sys.modules["quantsentinel.infra.db.engine"] = engine
 
     models = types.ModuleType("quantsentinel.infra.db.models")
@@ -87,6 +88,13 @@ def _install_stubs() -> None:
         def ack(self, **_kwargs):
             return None
 
+    @dataclass
+    class AlertEventCreate:
+        rule_id: uuid.UUID
+        ticker: str
+        message: str
+
+    events.AlertEventCreate = AlertEventCreate
     events.EventsRepo = EventsRepo
     sys.modules["quantsentinel.infra.db.repos.events_repo"] = events
 
@@ -123,6 +131,7 @@ def _install_stubs() -> None:
         mod = types.ModuleType(name)
         if cls_name == "evaluate":
             mod.evaluate = lambda *_a, **_k: True
+            mod.evaluate_vectorized = lambda *_a, **_k: None
         elif cls_name == "InstrumentsRepo":
             mod.InstrumentsRepo = type("InstrumentsRepo", (), {"__init__": lambda self, _s: None, "list_watched": lambda self: []})
         elif cls_name == "PricesRepo":
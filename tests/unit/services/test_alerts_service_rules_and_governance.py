@@ -1,41 +1,45 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from datetime import date, timedelta
 from types import SimpleNamespace
 
+import pytest
+
+from quantsentinel.domain.market.models import PriceSeries
+from quantsentinel.services import alerts_service as svc_mod
 from quantsentinel.services.alerts_service import AlertsService
 
 
 class FakePricesRepo:
+    """Serves close histories only; every rule type is derived from them."""
+
+    SERIES = {
+        "AAPL": [100, 101, 102, 103, 104],
+        "ZS": [100, 101, 100, 101, 100, 101, 110],
+        "VOL": [100, 110, 100, 110, 100],
+        "MISS": [100, 100, 100],
+        "BENCH": [100, 103, 101, 106, 102],
+        "CORR": [100, 95, 105, 90, 110],
+    }
+
     def __init__(self) -> None:
         self.today = date(2024, 1, 10)
+        self.calls: list[tuple[str, int]] = []
 
-    def get_latest_close(self, *, ticker: str):
-        return self.today, 100.0
-
-    def get_return_stats(self, *, ticker: str, lookback: int):
-        if ticker == "VOL":
-            return 0.0, 0.05
-        return 0.0, 0.01
+    def get_recent_closes(self, *, ticker: str, days: int):
+        self.calls.append((ticker, days))
+        end = self.today - timedelta(days=20) if ticker == "STALE" else self.today
+        closes = self.SERIES.get(ticker, self.SERIES["AAPL"])[-days:]
+        return [(end - timedelta(days=len(closes) - 1 - i), float(c)) for i, c in enumerate(closes)]
 
-    def get_pct_change_over_days(self, *, ticker: str, days: int):
-        if ticker == "ZS":
-            return self.today, 4.0
-        return self.today, 1.0
+    def get_close_arrays(self, *, tickers, days):
+        return {t: _arrays(self.get_recent_closes(ticker=t, days=days[t])) for t in tickers}
 
-    def get_latest_price_date(self, ticker: str):
-        if ticker == "STALE":
-            return self.today - timedelta(days=20)
-        return self.today
 
-    def get_recent_closes(self, *, ticker: str, days: int):
-        if ticker == "MISS":
-            return [(self.today, 100.0)] * 3
-        if ticker == "BENCH":
-            return [(self.today, x) for x in [100, 101, 102, 103, 104]]
-        if ticker == "CORR":
-            return [(self.today, x) for x in [100, 95, 105, 90, 110]]
-        return [(self.today, x) for x in [100, 101, 102, 103, 104]]
+def _arrays(pairs):
+    series = PriceSeries.from_pairs("", pairs)
+    return series.dates, series.closes
 
 
 def _rule(rule_type: str, params: dict):
@@ -62,6 +66,20 @@ def test_evaluate_all_seven_rule_types() -> None:
     )
 
 
+def test_evaluate_rule_without_hit_and_single_read_per_ticker() -> None:
+    svc = AlertsService()
+    prices = FakePricesRepo()
+    assert svc._evaluate_rule(rule=_rule("threshold", {"operator": "<", "value": 90}), ticker="AAPL", prices_repo=prices) == []
+    assert svc._evaluate_rule(rule=_rule("volatility", {"lookback": 20, "threshold": 0.03}), ticker="AAPL", prices_repo=prices) == []
+    prices.calls.clear()
+    svc._evaluate_rule(
+        rule=_rule("correlation_break", {"benchmark_ticker": "BENCH", "lookback": 4, "min_corr": 0.2}),
+        ticker="CORR",
+        prices_repo=prices,
+    )
+    assert sorted(prices.calls) == [("BENCH", 5), ("CORR", 5)]
+
+
 def test_is_deduped_uses_events_repo_lookup() -> None:
     svc = AlertsService()
     called = {}
@@ -76,3 +94,86 @@ def test_is_deduped_uses_events_repo_lookup() -> None:
     assert svc._is_deduped(rule=rule, ticker="AAPL", events_repo=EventsRepoStub(), policy=policy)
     assert called["window_minutes"] == 30
     assert called["aggregation_key"] == "bucket"
+
+
+def test_replay_rule_reads_history_once_and_writes_nothing(monkeypatch) -> None:
+    rule = SimpleNamespace(
+        id="r-1",
+        rule_type="threshold",
+        params_json={"operator": ">", "value": 100, "dedup_minutes": 2 * 1440},
+        scope_json={"tickers": ["AAPL", "MSFT"]},
+        silenced_until=date(2100, 1, 1),
+    )
+    reads: list[tuple[str, date | None, date]] = []
+
+    class PricesRepoStub:
+        def __init__(self, session) -> None:
+            pass
+
+        def get_close_arrays(self, *, tickers, start, end):
+            out = {}
+            for ticker in tickers:
+                reads.append((ticker, start, end))
+                out[ticker] = _arrays([(date(2024, 1, d), 101.0 if ticker == "AAPL" else 99.0) for d in range(1, 11)])
+            return out
+
+    @contextmanager
+    def _scope():
+        yield object()
+
+    monkeypatch.setattr(svc_mod, "session_scope", _scope)
+    monkeypatch.setattr(svc_mod, "AlertsRepo", lambda session: SimpleNamespace(get_rule=lambda rule_id: rule))
+    monkeypatch.setattr(
+        svc_mod,
+        "InstrumentsRepo",
+        lambda session: SimpleNamespace(list_watched=lambda: [SimpleNamespace(ticker="AAPL"), SimpleNamespace(ticker="MSFT")]),
+    )
+    monkeypatch.setattr(svc_mod, "PricesRepo", PricesRepoStub)
+    monkeypatch.setattr(svc_mod, "EventsRepo", None)
+
+    out = AlertsService().replay_rule(rule_id="r-1", start=date(2024, 1, 3), end=date(2024, 1, 10))
+
+    assert sorted(t for t, _, _ in reads) == ["AAPL", "MSFT"]
+    assert out["bars"] == 8
+    assert out["signals"] == 8
+    assert out["hit_count"] == 3  # Jan 3, 6, 9 with a two-day dedup window
+    assert out["events_deduped"] == 5
+    assert out["events_silenced"] == 0  # current silence is ignored by replay
+    assert [h["event_date"] for h in out["hits"]] == ["2024-01-03", "2024-01-06", "2024-01-09"]
+
+    with pytest.raises(ValueError, match="start"):
+        AlertsService().replay_rule(rule_id="r-1", start=date(2024, 2, 1), end=date(2024, 1, 1))
+
+
+def test_event_rollups_summarizes_rollup_rows(monkeypatch) -> None:
+    seen: list[tuple[str, date | None, int | None]] = []
+    rows = {
+        "day": [(date(2024, 1, 9), 3, 1), (date(2024, 1, 10), 2, 0)],
+        "rule": [("r-1", "Breakout", "HIGH", 4, 1)],
+        "ticker": [("AAPL", 5, 1)],
+        "severity": [("HIGH", 5, 1)],
+    }
+
+    class EventsRepoStub:
+        def __init__(self, session) -> None:
+            pass
+
+        def rollup_counts(self, *, group_by: str, since=None, limit=None):
+            seen.append((group_by, since, limit))
+            return rows[group_by]
+
+    @contextmanager
+    def _scope():
+        yield object()
+
+    monkeypatch.setattr(svc_mod, "session_scope", _scope)
+    monkeypatch.setattr(svc_mod, "EventsRepo", EventsRepoStub)
+
+    out = AlertsService().event_rollups(days=7, top=5)
+
+    assert {g for g, _, _ in seen} == {"day", "rule", "ticker", "severity"}
+    assert all(since == out["since"] for _, since, _ in seen)
+    assert {g: limit for g, _, limit in seen} == {"day": None, "rule": 5, "ticker": 5, "severity": None}
+    assert out["totals"] == {"new": 5, "acked": 1, "total": 6}
+    assert out["by_rule"] == [{"rule_id": "r-1", "name": "Breakout", "severity": "HIGH", "new": 4, "acked": 1, "total": 5}]
+    assert out["by_day"][0] == {"day": date(2024, 1, 9), "new": 3, "acked": 1, "total": 4}
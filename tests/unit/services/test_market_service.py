@@ -83,3 +83,89 @@ def test_get_price_series_returns_dataframe_rows(monkeypatch) -> None:
         {"date": date(2024, 1, 1), "open": 100.0, "high": 101.0, "low": 99.0, "close": 100.5, "volume": 1000},
         {"date": date(2024, 1, 2), "open": 101.0, "high": 103.0, "low": 100.0, "close": 102.5, "volume": 1200},
     ]
+
+
+def test_watchlist_and_anomalies_read_the_latest_summary(monkeypatch) -> None:
+    rows = [
+        (SimpleNamespace(ticker="AAA", name="A"), SimpleNamespace(last_date=date.today(), last_close=10.5, change=-0.5)),
+        (SimpleNamespace(ticker="OLD", name=None), SimpleNamespace(last_date=date(2020, 1, 1), last_close=3.0, change=None)),
+        (SimpleNamespace(ticker="NEW", name=None), None),
+    ]
+    calls = []
+
+    class _InstrumentsRepo:
+        def __init__(self, _session) -> None:
+            pass
+
+        def list_watched_with_latest(self):
+            calls.append("latest")
+            return rows
+
+    monkeypatch.setattr(mod, "session_scope", lambda: _Scope([]))
+    monkeypatch.setattr(mod, "InstrumentsRepo", _InstrumentsRepo)
+    svc = mod.MarketService()
+
+    assert svc.get_watchlist() == [
+        {"ticker": "AAA", "name": "A", "last": 10.5, "chg": -0.5},
+        {"ticker": "OLD", "name": None, "last": 3.0, "chg": None},
+        {"ticker": "NEW", "name": None, "last": None, "chg": None},
+    ]
+    assert [a["id"] for a in svc.get_anomalies()] == ["stale:OLD", "missing:NEW"]
+    assert calls == ["latest", "latest"]
+
+
+def test_add_to_watchlist_queues_one_backfill_only_without_history(monkeypatch) -> None:
+    latest = {"AAA": date(2024, 1, 2), "NEW": None, "BUSY": None}
+    queued: list[dict] = []
+    lookups: list[dict] = []
+
+    class _InstrumentsRepo:
+        def __init__(self, _session) -> None:
+            pass
+
+        def ensure_exists(self, *, ticker):
+            return None
+
+        def set_watched(self, *, ticker, is_watched):
+            return None
+
+    class _PricesRepo:
+        def __init__(self, _session) -> None:
+            pass
+
+        def get_latest_price_date(self, ticker):
+            return latest[ticker]
+
+    class _TasksRepo:
+        def __init__(self, _session) -> None:
+            pass
+
+        def find_active(self, *, task_type, celery_args):
+            lookups.append({"task_type": task_type, **celery_args})
+            return "task-running" if celery_args == {"tickers": ["BUSY"]} else None
+
+    class _TaskService:
+        def queue(self, **kwargs):
+            queued.append(kwargs)
+            return "task-1"
+
+    monkeypatch.setattr(mod, "session_scope", lambda: _Scope([]))
+    monkeypatch.setattr(mod, "InstrumentsRepo", _InstrumentsRepo)
+    monkeypatch.setattr(mod, "PricesRepo", _PricesRepo)
+    monkeypatch.setattr(mod, "AuditRepo", lambda _session: SimpleNamespace(write=lambda _entry: None))
+    monkeypatch.setattr(mod, "TaskService", _TaskService)
+    monkeypatch.setattr(mod, "TasksRepo", _TasksRepo)
+    svc = mod.MarketService()
+
+    assert svc.add_to_watchlist(ticker="AAA", actor_role=mod.UserRole.ADMIN) is None
+    assert svc.add_to_watchlist(ticker=" NEW ", actor_role=mod.UserRole.ADMIN) == "task-1"
+    # A backfill still queued/running for the ticker is reused instead of starting another.
+    assert svc.add_to_watchlist(ticker="BUSY", actor_role=mod.UserRole.ADMIN) == "task-running"
+    assert lookups == [
+        {"task_type": "backfill_history", "tickers": ["NEW"]},
+        {"task_type": "backfill_history", "tickers": ["BUSY"]},
+    ]
+    assert len(queued) == 1
+    assert queued[0]["task_type"] == "backfill_history"
+    assert queued[0]["celery_signature"] == "quantsentinel.infra.tasks.tasks_ingest.backfill_history"
+    assert queued[0]["celery_args"] == {"tickers": ["NEW"]}